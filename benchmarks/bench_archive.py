@@ -0,0 +1,191 @@
+"""
+Benchmark archival of closed projects: the rate rows are moved at, and
+hot-table queries before and after archiving. Scans and aggregates speed
+up with the rows moved out; indexed lookups of a few rows barely change.
+
+Usage:
+    python -m benchmarks.bench_archive [--projects 5000] [--closed 0.8]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import Session
+
+from src.archive import (
+    archive_closed_projects,
+    attach_archive,
+    create_archive_tables,
+    including_archive,
+)
+from src.models import (
+    Assignment,
+    BaseModel,
+    Project,
+    ProjectRequirement,
+    SkillRequirement,
+    TimeRequirement,
+)
+from src.skill_gaps import skill_gaps
+
+TODAY = date(2024, 6, 1)
+CUTOFF = date(2024, 1, 1)
+REQUIREMENTS_PER_PROJECT = 4
+ASSIGNMENTS_PER_REQUIREMENT = 5
+PEOPLE = 5000
+
+
+def populate(engine, projects: int, closed: float) -> None:
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        rows = []
+        for i in range(1, projects + 1):
+            if rng.random() < closed:
+                end = CUTOFF - timedelta(days=rng.randint(1, 1500))
+                status = rng.choice(("Completed", "Completed", "Cancelled"))
+            else:
+                end = TODAY + timedelta(days=rng.randint(-100, 300))
+                status = "Active"
+            rows.append(
+                {
+                    "id": i,
+                    "client_id": 1 + i % 50,
+                    "name": f"Project {i}",
+                    "start_date": end - timedelta(days=180),
+                    "end_date": end,
+                    "status": status,
+                }
+            )
+        conn.execute(insert(Project), rows)
+
+        requirements, children, assignments = [], [], []
+        for project in rows:
+            for r in range(REQUIREMENTS_PER_PROJECT):
+                requirement_id = len(requirements) + 1
+                requirements.append(
+                    {
+                        "id": requirement_id,
+                        "project_id": project["id"],
+                        "description": "Work",
+                        "start_date": project["start_date"],
+                        "end_date": project["end_date"],
+                    }
+                )
+                children.append(
+                    {"requirement_id": requirement_id, "skill_id": rng.randint(1, 300)}
+                )
+                for _ in range(ASSIGNMENTS_PER_REQUIREMENT):
+                    assignments.append(
+                        {
+                            "individual_id": rng.randint(1, PEOPLE),
+                            "requirement_id": requirement_id,
+                            "start_date": project["start_date"],
+                            "end_date": project["end_date"],
+                            "status": (
+                                "Assigned"
+                                if project["status"] == "Active"
+                                else "Completed"
+                            ),
+                        }
+                    )
+        conn.execute(insert(ProjectRequirement), requirements)
+        conn.execute(
+            insert(TimeRequirement),
+            [
+                {
+                    "requirement_id": c["requirement_id"],
+                    "hours_per_week": 20,
+                    "total_hours": 100,
+                }
+                for c in children
+            ],
+        )
+        conn.execute(
+            insert(SkillRequirement),
+            [{**c, "minimum_proficiency": rng.randint(1, 5)} for c in children],
+        )
+        conn.execute(insert(Assignment), assignments)
+
+
+QUERIES = {
+    "assignments of 100 people": lambda db: [
+        db.scalars(
+            select(Assignment).where(
+                Assignment.individual_id == individual_id,
+                Assignment.status == "Assigned",
+            )
+        ).all()
+        for individual_id in range(1, 101)
+    ],
+    "assignments per status": lambda db: db.execute(
+        select(Assignment.status, func.count()).group_by(Assignment.status)
+    ).all(),
+    "hours booked today per person": lambda db: db.execute(
+        select(Assignment.individual_id, func.sum(TimeRequirement.hours_per_week))
+        .join(
+            TimeRequirement,
+            TimeRequirement.requirement_id == Assignment.requirement_id,
+        )
+        .where(Assignment.start_date <= TODAY, Assignment.end_date >= TODAY)
+        .group_by(Assignment.individual_id)
+    ).all(),
+    "skill gap report": lambda db: skill_gaps(db, TODAY),
+}
+
+
+def timed(db, fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        db.expunge_all()
+        start = time.perf_counter()
+        fn(db)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=5000)
+    parser.add_argument("--closed", type=float, default=0.8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'hot.db')}")
+        attach_archive(engine, os.path.join(directory, "archive.db"))
+        BaseModel.metadata.create_all(engine)
+        create_archive_tables(engine)
+        populate(engine, args.projects, args.closed)
+
+        with Session(engine) as db:
+            before = {name: timed(db, query) for name, query in QUERIES.items()}
+            result = archive_closed_projects(db, CUTOFF)
+            after = {name: timed(db, query) for name, query in QUERIES.items()}
+            everything = including_archive(Assignment)
+            union = timed(
+                db,
+                lambda db: db.execute(
+                    select(everything.status, func.count()).group_by(everything.status)
+                ).all(),
+            )
+        engine.dispose()
+
+    print(
+        f"archived {result.projects} projects, {sum(result.rows.values())} rows "
+        f"in {result.seconds:.2f}s ({result.rows_per_second:.0f} rows/s)"
+    )
+    print(f"{'query':<32} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for name in QUERIES:
+        print(
+            f"{name:<32} {before[name] * 1000:>10.2f} {after[name] * 1000:>10.2f} "
+            f"{before[name] / after[name]:>7.1f}x"
+        )
+    print(f"{'assignments per status, all':<32} {'':>10} {union * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
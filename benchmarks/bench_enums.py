@@ -0,0 +1,183 @@
+"""
+Benchmark integer-coded statuses and employment types against strings.
+
+A database is populated with the coded columns declared as strings, as
+before they were coded, and measured; it is then migrated with
+src.migrate_enums and measured again. Sizes are taken after VACUUM.
+
+Usage:
+    python -m benchmarks.bench_enums [--assignments 1000000] [--people 100000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import MetaData, String, create_engine, func, select
+from sqlalchemy.orm import Session
+
+from src.enums import AssignmentStatus, EmploymentType, ProjectStatus
+from src.migrate_enums import CODED_TABLES, migrate_enums
+from src.models.base import BaseModel
+
+TODAY = date(2024, 6, 1)
+PROJECTS = 20_000
+ROWS_PER_INSERT = 50_000
+
+
+def legacy_metadata() -> MetaData:
+    """Copy the schema with the coded columns declared as strings."""
+    legacy = MetaData()
+    for table in BaseModel.metadata.sorted_tables:
+        table.to_metadata(legacy)
+    for table in CODED_TABLES:
+        for column in legacy.tables[table.name].columns:
+            if column.name in ("status", "employment_type"):
+                column.type = String(100)
+    return legacy
+
+
+def populate(engine, legacy: MetaData, assignments: int, people: int) -> None:
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(
+            legacy.tables["individuals"].insert(),
+            [
+                {
+                    "id": i,
+                    "name": f"Person {i}",
+                    "email": f"person{i}@example.com",
+                    "employment_type": rng.choice(EmploymentType.values()),
+                    "hire_date": date(2020, 1, 1),
+                }
+                for i in range(1, people + 1)
+            ],
+        )
+        conn.execute(
+            legacy.tables["projects"].insert(),
+            [
+                {
+                    "id": i,
+                    "client_id": 1 + i % 50,
+                    "name": f"Project {i}",
+                    "start_date": date(2023, 1, 1),
+                    "end_date": date(2025, 1, 1),
+                    "status": rng.choice(ProjectStatus.values()),
+                }
+                for i in range(1, PROJECTS + 1)
+            ],
+        )
+        statuses = AssignmentStatus.values()
+        for offset in range(0, assignments, ROWS_PER_INSERT):
+            rows = []
+            for _ in range(min(ROWS_PER_INSERT, assignments - offset)):
+                start = TODAY + timedelta(days=rng.randint(-400, 200))
+                rows.append(
+                    {
+                        "individual_id": rng.randint(1, people),
+                        "requirement_id": rng.randint(1, PROJECTS * 4),
+                        "start_date": start,
+                        "end_date": start + timedelta(days=90),
+                        "status": rng.choices(statuses, (6, 3, 1))[0],
+                    }
+                )
+            conn.execute(legacy.tables["assignments"].insert(), rows)
+
+
+def size(engine) -> int:
+    with engine.connect() as conn:
+        conn.exec_driver_sql("VACUUM")
+        pages = conn.exec_driver_sql("PRAGMA page_count").scalar()
+        return pages * conn.exec_driver_sql("PRAGMA page_size").scalar()
+
+
+# Filters on the coded columns that read every row of their table; each
+# takes the tables to query, legacy or current
+QUERIES = {
+    "current assignments not cancelled": lambda db, t: db.scalar(
+        select(func.count())
+        .select_from(t["assignments"])
+        .where(
+            t["assignments"].c.status != "Cancelled",
+            t["assignments"].c.start_date <= TODAY,
+            t["assignments"].c.end_date >= TODAY,
+        )
+    ),
+    "assignments per status": lambda db, t: db.execute(
+        select(t["assignments"].c.status, func.count()).group_by(
+            t["assignments"].c.status
+        )
+    ).all(),
+    "contractors per hire year": lambda db, t: db.execute(
+        select(func.strftime("%Y", t["individuals"].c.hire_date), func.count())
+        .where(t["individuals"].c.employment_type == "Contract")
+        .group_by(func.strftime("%Y", t["individuals"].c.hire_date))
+    ).all(),
+    "active projects per client": lambda db, t: db.execute(
+        select(t["projects"].c.client_id, func.count())
+        .where(t["projects"].c.status.in_(("Active", "In Progress")))
+        .group_by(t["projects"].c.client_id)
+    ).all(),
+}
+
+
+def timed(db, tables, fn, repeat: int = 5):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(db, tables)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(engine, tables) -> dict:
+    with Session(engine) as db:
+        return {name: timed(db, tables, query) for name, query in QUERIES.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--assignments", type=int, default=1_000_000)
+    parser.add_argument("--people", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        legacy = legacy_metadata()
+        legacy.create_all(engine)
+        populate(engine, legacy, args.assignments, args.people)
+        before_size = size(engine)
+        before = run(engine, legacy.tables)
+
+        start = time.perf_counter()
+        rows = migrate_enums(engine)
+        migration = time.perf_counter() - start
+        after_size = size(engine)
+        after = run(engine, {table.name: table for table in CODED_TABLES})
+        engine.dispose()
+
+    for name in QUERIES:
+        # Strings group in name order and codes in code order
+        strings, codes = before[name][1], after[name][1]
+        if isinstance(strings, list):
+            strings, codes = sorted(map(tuple, strings)), sorted(map(tuple, codes))
+        assert strings == codes, name
+    print(
+        f"migrated {sum(rows.values())} rows in {migration:.2f}s; database "
+        f"{before_size / 2**20:.1f} MiB -> {after_size / 2**20:.1f} MiB "
+        f"({1 - after_size / before_size:.0%} smaller)"
+    )
+    print(f"{'query':<36} {'strings ms':>10} {'codes ms':>10} {'speedup':>8}")
+    for name in QUERIES:
+        strings, codes = before[name][0], after[name][0]
+        print(
+            f"{name:<36} {strings * 1000:>10.2f} {codes * 1000:>10.2f} "
+            f"{strings / codes:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
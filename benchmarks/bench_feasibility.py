@@ -0,0 +1,153 @@
+"""
+Benchmark the vectorized time requirement feasibility check against a
+per-requirement loop over ORM objects.
+
+Usage:
+    python -m benchmarks.bench_feasibility [--requirements 100000]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session, selectinload
+
+from src.feasibility import business_calendar, check_feasibility
+from src.models import (
+    Assignment,
+    Availability,
+    BaseModel,
+    ProjectRequirement,
+    TimeRequirement,
+)
+
+HOLIDAYS = ["2024-01-01", "2024-05-27", "2024-07-04", "2024-12-25"]
+
+
+def populate(engine, requirements: int) -> None:
+    rng = random.Random(42)
+    base = date(2024, 1, 1)
+    people = requirements // 2
+    with engine.begin() as conn:
+        starts = [
+            base + timedelta(days=rng.randint(0, 300)) for _ in range(requirements)
+        ]
+        conn.execute(
+            insert(ProjectRequirement),
+            [
+                {
+                    "id": i + 1,
+                    "project_id": 1 + i % 500,
+                    "description": "Work",
+                    "start_date": start,
+                    "end_date": start + timedelta(days=rng.randint(14, 120)),
+                }
+                for i, start in enumerate(starts)
+            ],
+        )
+        conn.execute(
+            insert(TimeRequirement),
+            [
+                {
+                    "requirement_id": i + 1,
+                    "hours_per_week": rng.choice((10, 20, 40)),
+                    "total_hours": rng.randint(40, 600),
+                }
+                for i in range(requirements)
+            ],
+        )
+        conn.execute(
+            insert(Availability),
+            [
+                {
+                    "individual_id": i,
+                    "start_date": base,
+                    "end_date": base + timedelta(days=365),
+                    "hours_per_week": rng.choice((20, 32, 40)),
+                }
+                for i in range(1, people + 1)
+            ],
+        )
+        conn.execute(
+            insert(Assignment),
+            [
+                {
+                    "individual_id": rng.randint(1, people),
+                    "requirement_id": i + 1,
+                    "start_date": start,
+                    "end_date": start + timedelta(days=60),
+                    "status": "Assigned",
+                }
+                for i, start in enumerate(starts)
+            ],
+        )
+
+
+def naive(db: Session, holidays) -> list:
+    """Loop over ORM objects, counting working days with Python dates."""
+    holidays = set(date.fromisoformat(day) for day in holidays)
+
+    def days(start, end):
+        count, day = 0, start
+        while day <= end:
+            if day.weekday() < 5 and day not in holidays:
+                count += 1
+            day += timedelta(days=1)
+        return count
+
+    infeasible = []
+    stmt = select(ProjectRequirement).options(
+        selectinload(ProjectRequirement.time_requirement)
+    )
+    for requirement in db.scalars(stmt):
+        time_requirement = requirement.time_requirement
+        if time_requirement is None:
+            continue
+        window = days(requirement.start_date, requirement.end_date)
+        if window * time_requirement.hours_per_week / 5 < time_requirement.total_hours:
+            infeasible.append(requirement.id)
+    return infeasible
+
+
+def timed(label: str, fn, repeat: int = 3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1000:>9.1f}")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requirements", type=int, default=100_000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite:///:memory:")
+    BaseModel.metadata.create_all(engine)
+    populate(engine, args.requirements)
+    calendar = business_calendar(HOLIDAYS, "1111100")
+
+    print(f"{'check':<40} {'ms':>9}")
+    with Session(engine) as db:
+        expected = timed(
+            "per-requirement loop (dates only)", lambda: naive(db, HOLIDAYS), 1
+        )
+        report = timed(
+            "vectorized (dates and assignees)", lambda: check_feasibility(db, calendar)
+        )
+    assert report.infeasible() == expected
+    print(
+        f"{len(report.requirement_ids)} requirements, "
+        f"{len(report.infeasible())} infeasible, "
+        f"{len(report.understaffed())} understaffed, "
+        f"{int(np.count_nonzero(report.fits_staffing))} fully staffed"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Benchmark the vectorized weekly supply and demand forecast against one
+grouped query per week, and the cached forecast against recomputing it.
+
+Usage:
+    python -m benchmarks.bench_forecast [--roles 300] [--requirements 50000] [--weeks 52]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from src.feasibility import epoch_day
+from src.forecast import ROLE, cached_forecast, forecast, week_start
+from src.models import (
+    Availability,
+    BaseModel,
+    IndividualRole,
+    ProjectRequirement,
+    RoleRequirement,
+    TimeRequirement,
+)
+from src.report_cache import ReportCache, enable_version_tracking
+
+START = date(2024, 1, 1)
+
+
+def populate(engine, roles: int, requirements: int) -> None:
+    rng = random.Random(42)
+    people = requirements // 2
+    with engine.begin() as conn:
+        starts = [
+            START + timedelta(days=rng.randint(-60, 360)) for _ in range(requirements)
+        ]
+        conn.execute(
+            insert(ProjectRequirement),
+            [
+                {
+                    "id": i + 1,
+                    "project_id": 1 + i % 500,
+                    "description": "Work",
+                    "start_date": start,
+                    "end_date": start + timedelta(days=rng.randint(14, 180)),
+                }
+                for i, start in enumerate(starts)
+            ],
+        )
+        conn.execute(
+            insert(TimeRequirement),
+            [
+                {
+                    "requirement_id": i + 1,
+                    "hours_per_week": rng.choice((10, 20, 40)),
+                    "total_hours": 100,
+                }
+                for i in range(requirements)
+            ],
+        )
+        conn.execute(
+            insert(RoleRequirement),
+            [
+                {
+                    "requirement_id": i + 1,
+                    "role_id": role,
+                    "number_needed": rng.randint(1, 3),
+                }
+                for i in range(requirements)
+                for role in rng.sample(range(1, roles + 1), 2)
+            ],
+        )
+        conn.execute(
+            insert(IndividualRole),
+            [
+                {
+                    "individual_id": i,
+                    "role_id": rng.randint(1, roles),
+                    "start_date": START - timedelta(days=rng.randint(-100, 1000)),
+                }
+                for i in range(1, people + 1)
+            ],
+        )
+        conn.execute(
+            insert(Availability),
+            [
+                {
+                    "individual_id": i,
+                    "start_date": START + timedelta(days=rng.randint(-100, 100)),
+                    "end_date": START + timedelta(days=rng.randint(200, 500)),
+                    "hours_per_week": rng.choice((20, 32, 40)),
+                }
+                for i in range(1, people + 1)
+            ],
+        )
+
+
+def per_week(db, weeks: int) -> dict:
+    """One grouped demand query and one grouped supply query per week."""
+    demand, supply = {}, {}
+    first = week_start(START)
+    for week in range(weeks):
+        monday = first + timedelta(days=7 * week)
+        sunday = monday + timedelta(days=6)
+
+        def overlap(start, end):
+            return (
+                func.min(epoch_day(end), epoch_day(sunday))
+                - func.max(epoch_day(start), epoch_day(monday))
+                + 1
+            ) / 7.0
+
+        rows = db.execute(
+            select(
+                RoleRequirement.role_id,
+                func.sum(
+                    RoleRequirement.number_needed
+                    * TimeRequirement.hours_per_week
+                    * overlap(
+                        ProjectRequirement.start_date, ProjectRequirement.end_date
+                    )
+                ),
+            )
+            .join(
+                ProjectRequirement,
+                ProjectRequirement.id == RoleRequirement.requirement_id,
+            )
+            .join(
+                TimeRequirement,
+                TimeRequirement.requirement_id == ProjectRequirement.id,
+            )
+            .where(
+                ProjectRequirement.start_date <= sunday,
+                ProjectRequirement.end_date >= monday,
+            )
+            .group_by(RoleRequirement.role_id)
+        )
+        for role_id, hours in rows:
+            demand[role_id, week] = hours
+
+        start = func.max(Availability.start_date, IndividualRole.start_date)
+        rows = db.execute(
+            select(
+                IndividualRole.role_id,
+                func.sum(
+                    Availability.hours_per_week * overlap(start, Availability.end_date)
+                ),
+            )
+            .join(
+                IndividualRole,
+                IndividualRole.individual_id == Availability.individual_id,
+            )
+            .where(start <= sunday, Availability.end_date >= monday)
+            .group_by(IndividualRole.role_id)
+        )
+        for role_id, hours in rows:
+            supply[role_id, week] = hours
+    return {"demand": demand, "supply": supply}
+
+
+def timed(label: str, fn, repeat: int = 3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1000:>9.3f}")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--roles", type=int, default=300)
+    parser.add_argument("--requirements", type=int, default=50_000)
+    parser.add_argument("--weeks", type=int, default=52)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite:///:memory:")
+    BaseModel.metadata.create_all(engine)
+    populate(engine, args.roles, args.requirements)
+    Session = sessionmaker(bind=engine)
+    enable_version_tracking(Session)
+
+    print(f"{'forecast':<40} {'ms':>9}")
+    with Session() as db:
+        expected = timed("one query per week", lambda: per_week(db, args.weeks), 1)
+        result = timed("vectorized", lambda: forecast(db, ROLE, START, args.weeks))
+        cache = ReportCache()
+        cached_forecast(cache, db, ROLE, START, args.weeks)
+        timed(
+            "cached, data unchanged",
+            lambda: cached_forecast(cache, db, ROLE, START, args.weeks),
+            100,
+        )
+
+    rows = {int(key): row for row, key in enumerate(result.keys)}
+    for side in ("demand", "supply"):
+        matrix = getattr(result, side)
+        for (role_id, week), hours in expected[side].items():
+            assert np.isclose(matrix[rows[role_id], week], hours), (side, role_id)
+    print(f"{len(result.keys)} roles over {len(result.weeks)} weeks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark building project templates with a flush per parent against
+preallocated ids and a single flush.
+
+Usage:
+    python -m benchmarks.bench_id_allocation [--templates 20] [--requirements 50]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.ids import IdAllocator
+from src.models import (
+    Assignment,
+    BaseModel,
+    Client,
+    Project,
+    ProjectRequirement,
+    RoleRequirement,
+    SkillRequirement,
+    TimeRequirement,
+)
+
+
+def build_template(db: Session, requirements: int, ids=None) -> None:
+    """
+    Build one client → project → requirements graph.
+
+    Without an allocator every parent is flushed to learn its id, which is
+    how create_sample_data used to work.
+    """
+
+    def add(obj):
+        if ids is not None:
+            ids.assign(obj)
+        db.add(obj)
+        if ids is None:
+            db.flush()
+        return obj
+
+    client = add(Client(name="Template Client", contact_information="c"))
+    project = add(
+        Project(
+            client_id=client.id,
+            name="Template",
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 12, 31),
+            status="Planned",
+        )
+    )
+    for i in range(requirements):
+        requirement = add(
+            ProjectRequirement(
+                project_id=project.id,
+                description=f"Requirement {i}",
+                start_date=date(2024, 1, 1),
+                end_date=date(2024, 6, 30),
+            )
+        )
+        db.add_all(
+            [
+                TimeRequirement(
+                    requirement_id=requirement.id, hours_per_week=40, total_hours=160
+                ),
+                SkillRequirement(
+                    requirement_id=requirement.id, skill_id=1, minimum_proficiency=3
+                ),
+                RoleRequirement(
+                    requirement_id=requirement.id, role_id=1, number_needed=1
+                ),
+                Assignment(
+                    individual_id=1,
+                    requirement_id=requirement.id,
+                    start_date=date(2024, 1, 1),
+                    end_date=date(2024, 6, 30),
+                    status="Planned",
+                ),
+            ]
+        )
+
+
+def run(path: str, templates: int, requirements: int, preallocate: bool) -> float:
+    engine = create_engine(f"sqlite:///{path}")
+    BaseModel.metadata.create_all(engine)
+    start = time.perf_counter()
+    with Session(engine) as db:
+        for _ in range(templates):
+            ids = IdAllocator(db, block_size=requirements + 2) if preallocate else None
+            build_template(db, requirements, ids)
+            db.commit()
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--templates", type=int, default=20)
+    parser.add_argument("--requirements", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        flushed = run(
+            os.path.join(tmp, "flush.db"), args.templates, args.requirements, False
+        )
+        allocated = run(
+            os.path.join(tmp, "hilo.db"), args.templates, args.requirements, True
+        )
+
+    print(f"{'strategy':<22} {'ms/template':>12}")
+    print(f"{'flush per parent':<22} {flushed / args.templates * 1000:>12.1f}")
+    print(f"{'hi/lo single flush':<22} {allocated / args.templates * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
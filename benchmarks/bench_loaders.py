@@ -0,0 +1,206 @@
+"""
+Benchmark resolving nested relationships with lazy loads against a BatchLoader.
+
+Resolves project -> requirements -> assignments -> individual and
+individual -> skills -> skill for a page of parents, counting queries.
+
+Usage:
+    python -m benchmarks.bench_loaders [--parents 200]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import date
+
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.orm import Session
+
+from src.loaders import BatchLoader
+from src.models import (
+    Assignment,
+    BaseModel,
+    Individual,
+    IndividualSkill,
+    Project,
+    ProjectRequirement,
+    Skill,
+)
+
+PROJECTS = 2000
+PEOPLE = 5000
+SKILLS = 500
+REQUIREMENTS_PER_PROJECT = 4
+ASSIGNMENTS_PER_REQUIREMENT = 3
+SKILLS_PER_PERSON = 6
+
+
+def populate(engine) -> None:
+    rng = random.Random(42)
+    day = date(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Skill),
+            [{"id": i, "name": f"Skill {i}"} for i in range(1, SKILLS + 1)],
+        )
+        conn.execute(
+            insert(Individual),
+            [
+                {
+                    "id": i,
+                    "name": f"Person {i}",
+                    "email": f"person{i}@example.com",
+                    "employment_type": "Full-time",
+                    "hire_date": day,
+                }
+                for i in range(1, PEOPLE + 1)
+            ],
+        )
+        conn.execute(
+            insert(IndividualSkill),
+            [
+                {"individual_id": i, "skill_id": skill_id, "proficiency_level": 3}
+                for i in range(1, PEOPLE + 1)
+                for skill_id in rng.sample(range(1, SKILLS + 1), SKILLS_PER_PERSON)
+            ],
+        )
+        conn.execute(
+            insert(Project),
+            [
+                {
+                    "id": i,
+                    "client_id": 1,
+                    "name": f"Project {i}",
+                    "start_date": day,
+                    "end_date": date(2024, 12, 31),
+                    "status": "Active",
+                }
+                for i in range(1, PROJECTS + 1)
+            ],
+        )
+        requirements = [
+            {
+                "id": (p - 1) * REQUIREMENTS_PER_PROJECT + r + 1,
+                "project_id": p,
+                "description": "Work",
+                "start_date": day,
+                "end_date": date(2024, 12, 31),
+            }
+            for p in range(1, PROJECTS + 1)
+            for r in range(REQUIREMENTS_PER_PROJECT)
+        ]
+        conn.execute(insert(ProjectRequirement), requirements)
+        conn.execute(
+            insert(Assignment),
+            [
+                {
+                    "individual_id": rng.randint(1, PEOPLE),
+                    "requirement_id": requirement["id"],
+                    "start_date": day,
+                    "end_date": date(2024, 12, 31),
+                    "status": "Assigned",
+                }
+                for requirement in requirements
+                for _ in range(ASSIGNMENTS_PER_REQUIREMENT)
+            ],
+        )
+
+
+def resolve(projects, people) -> tuple:
+    """Walk both trees through the relationship attributes."""
+    staffing = [
+        [a.individual.name for r in p.requirements for a in r.assignments]
+        for p in projects
+    ]
+    skills = [sorted(link.skill.name for link in person.skills) for person in people]
+    return staffing, skills
+
+
+def lazy(db, parents: int) -> tuple:
+    projects = db.scalars(select(Project).order_by(Project.id).limit(parents)).all()
+    people = db.scalars(select(Individual).order_by(Individual.id).limit(parents)).all()
+    return resolve(projects, people)
+
+
+def batched(db, parents: int) -> tuple:
+    loader = BatchLoader(db)
+    projects = db.scalars(select(Project).order_by(Project.id).limit(parents)).all()
+    people = db.scalars(select(Individual).order_by(Individual.id).limit(parents)).all()
+    loader.prime(projects, "requirements.assignments.individual")
+    loader.prime(people, "skills.skill")
+    return resolve(projects, people)
+
+
+def batched_async(db, parents: int) -> tuple:
+    loader = BatchLoader(db)
+    projects = db.scalars(select(Project).order_by(Project.id).limit(parents)).all()
+    people = db.scalars(select(Individual).order_by(Individual.id).limit(parents)).all()
+
+    async def names(requirement):
+        assignments = await loader.load(requirement, "assignments")
+        people = await asyncio.gather(
+            *(loader.load(assignment, "individual") for assignment in assignments)
+        )
+        return [person.name for person in people]
+
+    async def staffing(project):
+        requirements = await loader.load(project, "requirements")
+        nested = await asyncio.gather(*(names(r) for r in requirements))
+        return [name for group in nested for name in group]
+
+    async def skills(person):
+        links = await loader.load(person, "skills")
+        return sorted(
+            skill.name
+            for skill in await asyncio.gather(
+                *(loader.load(link, "skill") for link in links)
+            )
+        )
+
+    async def main():
+        return await asyncio.gather(
+            asyncio.gather(*(staffing(project) for project in projects)),
+            asyncio.gather(*(skills(person) for person in people)),
+        )
+
+    return tuple(asyncio.run(main()))
+
+
+def timed(engine, label: str, fn, parents: int, repeat: int = 3):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        statements.clear()
+        with Session(engine) as db:
+            start = time.perf_counter()
+            result = fn(db, parents)
+            best = min(best, time.perf_counter() - start)
+    event.remove(engine, "before_cursor_execute", count)
+    print(f"{label:<24} {best * 1000:>10.1f} {len(statements):>8}")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--parents", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite:///:memory:")
+    BaseModel.metadata.create_all(engine)
+    populate(engine)
+
+    print(f"{'loading':<24} {'ms':>10} {'queries':>8}")
+    expected = timed(engine, "lazy loads", lazy, args.parents)
+    assert timed(engine, "BatchLoader.prime", batched, args.parents) == expected
+    result = timed(engine, "BatchLoader.load, async", batched_async, args.parents)
+    assert result == expected
+
+
+if __name__ == "__main__":
+    main()
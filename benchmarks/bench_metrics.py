@@ -0,0 +1,112 @@
+"""
+Benchmark the overhead of recording metrics.
+
+Runs the same workload of short sessions (point lookups, small listings
+and commits) on two engines over identical in-memory databases, one with
+enable_metrics() and one without, alternating between them so machine
+noise hits both alike, and reports the cost per query.
+
+Usage:
+    python -m benchmarks.bench_metrics [--sessions 2000] [--repeat 5]
+"""
+
+import argparse
+import itertools
+import random
+import time
+from datetime import date
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from src.metrics import QUERY_SECONDS, enable_metrics, registry
+from src.models import BaseModel, Individual, Skill
+
+PEOPLE = 5000
+
+# Unique names for the skills the workload adds
+_names = itertools.count()
+
+
+def populate(engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Individual),
+            [
+                {
+                    "id": i,
+                    "name": f"Person {i}",
+                    "email": f"person{i}@example.com",
+                    "employment_type": "Full-time",
+                    "hire_date": date(2020, 1, 1),
+                }
+                for i in range(1, PEOPLE + 1)
+            ],
+        )
+
+
+def workload(Session, sessions: int) -> int:
+    """Run short sessions; return the number of queries issued."""
+    rng = random.Random(42)
+    queries = 0
+    for i in range(sessions):
+        with Session() as db:
+            db.get(Individual, rng.randint(1, PEOPLE))
+            db.scalars(
+                select(Individual)
+                .where(Individual.id.in_(rng.sample(range(1, PEOPLE + 1), 20)))
+                .order_by(Individual.name)
+            ).all()
+            queries += 2
+            if i % 10 == 0:
+                db.add(Skill(name=f"Skill {next(_names)}"))
+                db.commit()
+                queries += 1
+    return queries
+
+
+def timed(Session, sessions: int):
+    start = time.perf_counter()
+    queries = workload(Session, sessions)
+    return time.perf_counter() - start, queries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sessions = {}
+    for label in ("without metrics", "with metrics"):
+        engine = create_engine("sqlite://")
+        BaseModel.metadata.create_all(engine)
+        populate(engine)
+        sessions[label] = sessionmaker(bind=engine)
+    enable_metrics(sessions["with metrics"].kw["bind"], sessions["with metrics"])
+
+    results = {label: (float("inf"), 0) for label in sessions}
+    for _ in range(args.repeat):
+        for label, Session in sessions.items():
+            seconds, queries = timed(Session, args.sessions)
+            results[label] = (min(results[label][0], seconds), queries)
+
+    (plain, queries), (measured, _) = results.values()
+    print(f"{'workload':<20} {'seconds':>9} {'us/query':>9}")
+    for label, (seconds, count) in results.items():
+        print(f"{label:<20} {seconds:>9.3f} {seconds / count * 1e6:>9.1f}")
+    print(
+        f"overhead: {(measured - plain) / queries * 1e6:.1f} us per query "
+        f"({measured / plain - 1:+.1%})"
+    )
+    start = time.perf_counter()
+    exposition = registry.render()
+    print(
+        f"rendered {len(exposition.splitlines())} lines for "
+        f"{len(QUERY_SECONDS._values)} fingerprints in "
+        f"{(time.perf_counter() - start) * 1000:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
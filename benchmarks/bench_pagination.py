@@ -0,0 +1,101 @@
+"""
+Benchmark keyset pagination against OFFSET pagination at increasing depths.
+
+Usage:
+    python -m benchmarks.bench_pagination [--rows 300000] [--page-size 50]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from src.models import Assignment, BaseModel
+from src.pagination import paginate
+
+
+def populate(engine, rows: int) -> None:
+    """Insert assignments with random start dates."""
+    rng = random.Random(42)
+    base = date(2020, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Assignment),
+            [
+                {
+                    "individual_id": rng.randint(1, 5000),
+                    "requirement_id": rng.randint(1, 20000),
+                    "start_date": base + timedelta(days=rng.randint(0, 1500)),
+                    "end_date": base + timedelta(days=1600),
+                    "status": "Assigned",
+                }
+                for _ in range(rows)
+            ],
+        )
+
+
+def offset_page(db: Session, page: int, page_size: int) -> list:
+    """The OFFSET query used by the admin screens before keyset pagination."""
+    stmt = (
+        select(Assignment)
+        .order_by(Assignment.start_date, Assignment.id)
+        .offset(page * page_size)
+        .limit(page_size)
+    )
+    return list(db.scalars(stmt))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        BaseModel.metadata.create_all(engine)
+        populate(engine, args.rows)
+
+        last_page = args.rows // args.page_size - 1
+        depths = sorted({0, 10, 100, 1000, last_page // 2, last_page})
+        print(f"{'page':>8} {'OFFSET ms':>10} {'keyset ms':>10}")
+        with Session(engine) as db:
+            # Walk the keyset pages once to collect the cursor of each depth
+            cursors, cursor = {0: None}, None
+            for page in range(1, last_page + 1):
+                cursor = paginate(
+                    db,
+                    Assignment,
+                    sort_key="start_date",
+                    cursor=cursor,
+                    limit=args.page_size,
+                ).next_cursor
+                cursors[page] = cursor
+                db.expunge_all()
+
+            for depth in depths:
+                start = time.perf_counter()
+                offset_page(db, depth, args.page_size)
+                offset_ms = (time.perf_counter() - start) * 1000
+                db.expunge_all()
+
+                start = time.perf_counter()
+                paginate(
+                    db,
+                    Assignment,
+                    sort_key="start_date",
+                    cursor=cursors[depth],
+                    limit=args.page_size,
+                )
+                keyset_ms = (time.perf_counter() - start) * 1000
+                db.expunge_all()
+                print(f"{depth:>8} {offset_ms:>10.2f} {keyset_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark top-k candidate ranking against scoring and sorting everyone.
+
+Usage:
+    python -m benchmarks.bench_ranking [--candidates 50000] [--k 10]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from src.models import (
+    Assignment,
+    Availability,
+    BaseModel,
+    IndividualRole,
+    ProjectRequirement,
+    RequirementEligibility,
+    Role,
+    RoleLevel,
+    RoleType,
+    TimeRequirement,
+)
+from src.ranking import score_candidates, top_candidates
+
+PROJECTS = 50
+
+
+def populate(engine, candidates: int) -> int:
+    """Insert candidates for requirement 1 with roles, availability and bookings."""
+    rng = random.Random(42)
+    base = date(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(RoleLevel),
+            [{"id": i, "name": f"L{i}", "seniority": i} for i in range(1, 6)],
+        )
+        conn.execute(insert(RoleType), [{"id": 1, "name": "Engineering"}])
+        conn.execute(
+            insert(Role),
+            [
+                {"id": i, "name": f"R{i}", "role_level_id": i, "role_type_id": 1}
+                for i in range(1, 6)
+            ],
+        )
+        conn.execute(
+            insert(ProjectRequirement),
+            [
+                {
+                    "id": i,
+                    "project_id": 1 + i % PROJECTS,
+                    "description": f"Requirement {i}",
+                    "start_date": base,
+                    "end_date": base + timedelta(days=180),
+                }
+                for i in range(1, 501)
+            ],
+        )
+        conn.execute(
+            insert(TimeRequirement),
+            [
+                {"requirement_id": i, "hours_per_week": 10, "total_hours": 260}
+                for i in range(1, 501)
+            ],
+        )
+        people = range(1, candidates + 1)
+        conn.execute(
+            insert(RequirementEligibility),
+            [
+                {"requirement_id": 1, "individual_id": i, "score": rng.randint(0, 8)}
+                for i in people
+            ],
+        )
+        conn.execute(
+            insert(IndividualRole),
+            [
+                {"individual_id": i, "role_id": rng.randint(1, 5), "start_date": base}
+                for i in people
+            ],
+        )
+        conn.execute(
+            insert(Availability),
+            [
+                {
+                    "individual_id": i,
+                    "start_date": base,
+                    "end_date": base + timedelta(days=365),
+                    "hours_per_week": rng.choice((20, 32, 40)),
+                }
+                for i in people
+            ],
+        )
+        conn.execute(
+            insert(Assignment),
+            [
+                {
+                    "individual_id": rng.randint(1, candidates),
+                    "requirement_id": rng.randint(2, 500),
+                    "start_date": base,
+                    "end_date": base + timedelta(days=90),
+                    "status": "Assigned",
+                }
+                for _ in range(candidates // 2)
+            ],
+        )
+    return 1
+
+
+def timed(label: str, fn, repeat: int = 5) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<30} {best * 1000:>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=50_000)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite:///:memory:")
+    BaseModel.metadata.create_all(engine)
+    requirement_id = populate(engine, args.candidates)
+
+    print(f"{'ranking':<30} {'ms':>9}")
+    with Session(engine) as db:
+        timed(
+            "score all + sort",
+            lambda: sorted(
+                score_candidates(db, requirement_id),
+                key=lambda c: (-c.score, c.individual_id),
+            )[: args.k],
+        )
+        timed(
+            f"streaming top-{args.k}",
+            lambda: top_candidates(db, requirement_id, k=args.k),
+        )
+
+
+if __name__ == "__main__":
+    main()
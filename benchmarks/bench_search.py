@@ -0,0 +1,152 @@
+"""
+Benchmark FTS5 search against the LIKE '%term%' search it replaces.
+
+Usage:
+    python -m benchmarks.bench_search [--rows 200000] [--repeat 20]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy import create_engine, insert, or_, select
+from sqlalchemy.orm import Session
+
+from src.models import BaseModel, Individual, Project, ProjectRequirement, Skill
+from src.search import create_search_index, search
+
+SYLLABLES = "ka lo mi ra te zu po ne vi sa do ri fe gu ba ye no ti".split()
+
+TERMS = ["kubernetes", "payments", "flask", "migration", "zzzz"]
+
+
+def vocabulary(rng: random.Random, size: int = 20_000) -> list:
+    """Build a vocabulary of synthetic words plus the benchmark terms."""
+    words = {
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        for _ in range(size)
+    }
+    return sorted(words) + TERMS[:-1]
+
+
+VOCABULARY = vocabulary(random.Random(7))
+
+
+def _text(rng: random.Random, words: int) -> str:
+    # Zipf-like skew: a few words are common, most are rare
+    return " ".join(
+        (
+            VOCABULARY[min(int(rng.paretovariate(1.2)) - 1, len(VOCABULARY) - 1)]
+            if rng.random() < 0.5
+            else rng.choice(VOCABULARY)
+        )
+        for _ in range(words)
+    )
+
+
+def populate(engine, rows: int) -> None:
+    """Fill the searchable tables with random text."""
+    rng = random.Random(42)
+    today = date(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Skill),
+            [
+                {"name": f"{_text(rng, 2)} {i}", "description": _text(rng, 12)}
+                for i in range(rows // 10)
+            ],
+        )
+        conn.execute(
+            insert(Individual),
+            [
+                {
+                    "name": f"{_text(rng, 2)} {i}",
+                    "email": f"person{i}@example.com",
+                    "employment_type": "Full-time",
+                    "hire_date": today,
+                }
+                for i in range(rows)
+            ],
+        )
+        conn.execute(
+            insert(Project),
+            [
+                {
+                    "client_id": 1,
+                    "name": _text(rng, 3),
+                    "description": _text(rng, 30),
+                    "start_date": today,
+                    "end_date": today,
+                    "status": "Planning",
+                }
+                for _ in range(rows)
+            ],
+        )
+        conn.execute(
+            insert(ProjectRequirement),
+            [
+                {
+                    "project_id": 1,
+                    "description": _text(rng, 20),
+                    "start_date": today,
+                    "end_date": today,
+                }
+                for _ in range(rows)
+            ],
+        )
+
+
+def like_search(db: Session, term: str, limit: int = 20) -> list:
+    """The LIKE-based search used by the UI before the FTS5 index."""
+    pattern = f"%{term}%"
+    results = []
+    for model, columns in (
+        (Skill, (Skill.name, Skill.description)),
+        (Project, (Project.name, Project.description)),
+        (ProjectRequirement, (ProjectRequirement.description,)),
+        (Individual, (Individual.name,)),
+    ):
+        stmt = select(model.id).where(or_(*(c.like(pattern) for c in columns)))
+        results.extend(db.execute(stmt.limit(limit)).all())
+    return results[:limit]
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for term in TERMS:
+            fn(term)
+    return (time.perf_counter() - start) / (repeat * len(TERMS)) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        BaseModel.metadata.create_all(engine)
+        populate(engine, args.rows)
+
+        start = time.perf_counter()
+        create_search_index(engine)
+        build = time.perf_counter() - start
+
+        with Session(engine) as db:
+            like_ms = _time(lambda term: like_search(db, term), args.repeat)
+            fts_ms = _time(lambda term: search(db, term), args.repeat)
+
+    print(f"rows per table:      {args.rows}")
+    print(f"index build:         {build:.2f} s")
+    print(f"LIKE search:         {like_ms:.2f} ms/query")
+    print(f"FTS5 search:         {fts_ms:.2f} ms/query")
+    print(f"speedup:             {like_ms / fts_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark naive __dict__ based serialization of ORM objects against the
+field plan serializer working from column tuples.
+
+Usage:
+    python -m benchmarks.bench_serialization [--rows 50000]
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from src import serialization
+from src.models import Assignment, BaseModel
+from src.serialization import dump, dumps, to_dicts
+
+
+def populate(engine, rows: int) -> None:
+    rng = random.Random(42)
+    base = date(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Assignment),
+            [
+                {
+                    "individual_id": rng.randint(1, 5000),
+                    "requirement_id": rng.randint(1, 20000),
+                    "start_date": base + timedelta(days=rng.randint(0, 300)),
+                    "end_date": base + timedelta(days=rng.randint(301, 600)),
+                    "status": "Assigned",
+                }
+                for _ in range(rows)
+            ],
+        )
+
+
+def naive(db: Session) -> bytes:
+    """Load ORM objects and serialize their __dict__, as the API does today."""
+    objects = db.scalars(select(Assignment)).all()
+    data = [
+        {k: v for k, v in obj.__dict__.items() if not k.startswith("_")}
+        for obj in objects
+    ]
+    return json.dumps(data, default=str).encode()
+
+
+def timed(label: str, fn, repeat: int = 3) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<34} {best * 1000:>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite:///:memory:")
+    BaseModel.metadata.create_all(engine)
+    populate(engine, args.rows)
+
+    print(f"{'serializer':<34} {'ms':>9}")
+    with Session(engine) as db:
+
+        def fresh(fn):
+            def run():
+                db.expunge_all()
+                return fn()
+
+            return run
+
+        timed("naive __dict__ + json", fresh(lambda: naive(db)))
+        timed(
+            "plan from loaded objects",
+            fresh(lambda: dumps(to_dicts(db.scalars(select(Assignment)).all()))),
+        )
+        timed("plan from column tuples", fresh(lambda: dumps(dump(db, Assignment))))
+
+        orjson = serialization.orjson
+        serialization.orjson = None
+        try:
+            timed(
+                "column tuples, stdlib json", fresh(lambda: dumps(dump(db, Assignment)))
+            )
+        finally:
+            serialization.orjson = orjson
+
+
+if __name__ == "__main__":
+    main()
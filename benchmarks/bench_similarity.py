@@ -0,0 +1,105 @@
+"""
+Benchmark skill-similarity search for substitute candidates.
+
+Reports the time to build the index, single and batched query latency, and
+an incremental refresh after a few skill changes against a full rebuild.
+
+Usage:
+    python -m benchmarks.bench_similarity [--people 50000] [--skills 300]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from src.change_log import enable_change_capture
+from src.models import BaseModel, IndividualSkill, SkillRequirement
+from src.similarity import SkillVectorIndex
+
+SKILLS_PER_PERSON = 8
+SKILLS_PER_REQUIREMENT = 4
+REQUIREMENTS = 2000
+
+
+def populate(engine, people: int, skills: int) -> None:
+    """Insert skill rows directly; the similarity index only reads these tables."""
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(IndividualSkill),
+            [
+                {
+                    "individual_id": i,
+                    "skill_id": s,
+                    "proficiency_level": rng.randint(1, 5),
+                }
+                for i in range(1, people + 1)
+                for s in rng.sample(range(1, skills + 1), SKILLS_PER_PERSON)
+            ],
+        )
+        conn.execute(
+            insert(SkillRequirement),
+            [
+                {
+                    "requirement_id": r,
+                    "skill_id": s,
+                    "minimum_proficiency": rng.randint(1, 5),
+                }
+                for r in range(1, REQUIREMENTS + 1)
+                for s in rng.sample(range(1, skills + 1), SKILLS_PER_REQUIREMENT)
+            ],
+        )
+
+
+def timed(label: str, fn, repeat: int = 1) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    median = statistics.median(times)
+    print(f"{label:<36} {median * 1000:>9.2f}")
+    return median
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--people", type=int, default=50_000)
+    parser.add_argument("--skills", type=int, default=300)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite:///:memory:")
+    BaseModel.metadata.create_all(engine)
+    populate(engine, args.people, args.skills)
+    Session = sessionmaker(bind=engine)
+    enable_change_capture(Session)
+
+    rng = random.Random(7)
+    print(f"{'operation':<36} {'ms':>9}")
+    with Session() as db:
+        index = SkillVectorIndex()
+        timed("full build", lambda: index.build(db))
+
+        requirement_ids = list(range(1, REQUIREMENTS + 1))
+        timed(
+            "top-10 for one requirement",
+            lambda: index.substitutes([rng.choice(requirement_ids)]),
+            repeat=100,
+        )
+        batch = rng.sample(requirement_ids, 100)
+        elapsed = timed("top-10 for 100 requirements", lambda: index.substitutes(batch))
+        print(f"{'  per requirement':<36} {elapsed * 10:>9.2f}")
+
+        rows = db.scalars(select(IndividualSkill).limit(100)).all()
+        for row in rows:
+            row.proficiency_level = 6 - row.proficiency_level
+        db.commit()
+        timed("refresh after 100 skill changes", lambda: index.refresh(db))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Benchmark the aggregate skill gap report against a per-skill loop.
+
+The loop issues a few queries per skill and per proficiency level; it is
+run over a sample of skills and extrapolated to all of them, and its
+results for the sample are checked against the report.
+
+Usage:
+    python -m benchmarks.bench_skill_gaps [--skills 3000] [--people 20000] [--sample 100]
+"""
+
+import argparse
+import random
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from src.housekeeping import CLOSED_STATUSES
+from src.models import (
+    Assignment,
+    Availability,
+    BaseModel,
+    IndividualSkill,
+    ProjectRequirement,
+    RoleRequirement,
+    SkillRequirement,
+    TimeRequirement,
+)
+from src.skill_gaps import skill_gaps
+
+TODAY = date(2024, 6, 1)
+SKILLS_PER_PERSON = 6
+SKILLS_PER_REQUIREMENT = 3
+
+
+def populate(engine, skills: int, people: int) -> None:
+    rng = random.Random(42)
+    requirements = people // 2
+    with engine.begin() as conn:
+        starts = [
+            TODAY + timedelta(days=rng.randint(-120, 240)) for _ in range(requirements)
+        ]
+        conn.execute(
+            insert(ProjectRequirement),
+            [
+                {
+                    "id": i + 1,
+                    "project_id": 1 + i % 500,
+                    "description": "Work",
+                    "start_date": start,
+                    "end_date": start + timedelta(days=rng.randint(30, 180)),
+                }
+                for i, start in enumerate(starts)
+            ],
+        )
+        conn.execute(
+            insert(TimeRequirement),
+            [
+                {"requirement_id": i + 1, "hours_per_week": 20, "total_hours": 100}
+                for i in range(requirements)
+            ],
+        )
+        conn.execute(
+            insert(RoleRequirement),
+            [
+                {
+                    "requirement_id": i + 1,
+                    "role_id": 1,
+                    "number_needed": rng.randint(1, 3),
+                }
+                for i in range(requirements)
+            ],
+        )
+        conn.execute(
+            insert(SkillRequirement),
+            [
+                {
+                    "requirement_id": i + 1,
+                    "skill_id": skill_id,
+                    "minimum_proficiency": rng.randint(1, 5),
+                }
+                for i in range(requirements)
+                for skill_id in rng.sample(range(1, skills + 1), SKILLS_PER_REQUIREMENT)
+            ],
+        )
+        conn.execute(
+            insert(IndividualSkill),
+            [
+                {
+                    "individual_id": i,
+                    "skill_id": skill_id,
+                    "proficiency_level": rng.randint(1, 5),
+                }
+                for i in range(1, people + 1)
+                for skill_id in rng.sample(range(1, skills + 1), SKILLS_PER_PERSON)
+            ],
+        )
+        conn.execute(
+            insert(Availability),
+            [
+                {
+                    "individual_id": i,
+                    "start_date": date(2024, 1, 1),
+                    "end_date": date(2024, 12, 31),
+                    "hours_per_week": rng.choice((20, 40)),
+                }
+                for i in range(1, people + 1)
+            ],
+        )
+        conn.execute(
+            insert(Assignment),
+            [
+                {
+                    "individual_id": rng.randint(1, people),
+                    "requirement_id": i + 1,
+                    "start_date": start,
+                    "end_date": start + timedelta(days=60),
+                    "status": "Assigned",
+                }
+                for i, start in enumerate(starts)
+            ],
+        )
+
+
+def per_skill(db: Session, skill_ids) -> dict:
+    """Loop over skills, then over each skill's requirements and proficiency levels."""
+    active = or_(Assignment.status.is_(None), Assignment.status.not_in(CLOSED_STATUSES))
+    booked = (
+        select(func.coalesce(func.sum(TimeRequirement.hours_per_week), 0))
+        .join(Assignment, Assignment.requirement_id == TimeRequirement.requirement_id)
+        .where(
+            Assignment.individual_id == IndividualSkill.individual_id,
+            Assignment.start_date <= TODAY,
+            Assignment.end_date >= TODAY,
+            active,
+        )
+        .scalar_subquery()
+    )
+    available = (
+        select(func.coalesce(func.sum(Availability.hours_per_week), 0))
+        .where(
+            Availability.individual_id == IndividualSkill.individual_id,
+            Availability.start_date <= TODAY,
+            Availability.end_date >= TODAY,
+        )
+        .scalar_subquery()
+    )
+    report = {}
+    for skill_id in skill_ids:
+        demand = defaultdict(lambda: [0, 0])
+        rows = db.execute(
+            select(
+                ProjectRequirement.id,
+                ProjectRequirement.start_date,
+                SkillRequirement.minimum_proficiency,
+            )
+            .join(SkillRequirement)
+            .where(
+                SkillRequirement.skill_id == skill_id,
+                ProjectRequirement.end_date >= TODAY,
+            )
+        ).all()
+        for requirement_id, start, proficiency in rows:
+            needed = db.scalar(
+                select(func.sum(RoleRequirement.number_needed)).where(
+                    RoleRequirement.requirement_id == requirement_id
+                )
+            )
+            assigned = db.scalar(
+                select(func.count(Assignment.id)).where(
+                    Assignment.requirement_id == requirement_id, active
+                )
+            )
+            remaining = max(needed or 1, 1) - assigned
+            if remaining > 0:
+                window = max(start, TODAY).strftime("%Y-%m")
+                demand[proficiency, window][0] += 1
+                demand[proficiency, window][1] += remaining
+        for (proficiency, window), (requirements, positions) in demand.items():
+            supply = db.scalar(
+                select(func.count()).where(
+                    IndividualSkill.skill_id == skill_id,
+                    IndividualSkill.proficiency_level >= proficiency,
+                    available > booked,
+                )
+            )
+            report[skill_id, proficiency, window] = (requirements, positions, supply)
+    return report
+
+
+def timed(label: str, fn, repeat: int = 3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<44} {best:>9.3f}")
+    return result, best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--skills", type=int, default=3000)
+    parser.add_argument("--people", type=int, default=20_000)
+    parser.add_argument("--sample", type=int, default=100)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite:///:memory:")
+    BaseModel.metadata.create_all(engine)
+    populate(engine, args.skills, args.people)
+    sample = random.Random(7).sample(range(1, args.skills + 1), args.sample)
+
+    print(f"{'report':<44} {'seconds':>9}")
+    with Session(engine) as db:
+        expected, elapsed = timed(
+            f"per-skill loop, {args.sample} skills", lambda: per_skill(db, sample), 1
+        )
+        print(
+            f"{f'  extrapolated to {args.skills} skills':<44} "
+            f"{elapsed * args.skills / args.sample:>9.3f}"
+        )
+        gaps, _ = timed("aggregate report, all skills", lambda: skill_gaps(db, TODAY))
+
+    sampled = set(sample)
+    actual = {
+        (gap.skill_id, gap.minimum_proficiency, gap.window): (
+            gap.requirements,
+            gap.demand,
+            gap.supply,
+        )
+        for gap in gaps
+        if gap.skill_id in sampled
+    }
+    assert actual == expected
+    print(
+        f"{len(gaps)} groups, {sum(gap.demand for gap in gaps)} open positions, "
+        f"{sum(gap.gap for gap in gaps)} without a free person"
+    )
+
+
+if __name__ == "__main__":
+    main()
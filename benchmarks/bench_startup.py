@@ -0,0 +1,111 @@
+"""
+Benchmark the startup cost of each CLI command.
+
+Every command runs in a fresh interpreter under python -X importtime
+against a small database seeded with the demo data, the way the
+orchestrator starts them. For each, the best wall time over the repeats
+is reported with the time spent importing, the number of modules
+imported and the heaviest top-level imports. The first row imports what
+main.py imported before the CLI, for comparison.
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat 5]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, NamedTuple, Sequence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What main.py imported up front before the commands were split out
+EAGER = "import cProfile, http.server, src.database, src.ids, src.models, src.profiling"
+
+COMMANDS = {
+    "old main.py imports": ["-c", EAGER],
+    "--help": ["main.py", "--help"],
+    "init": ["main.py", "init"],
+    "export skills": ["main.py", "export", "skills"],
+    "match 1": ["main.py", "match", "1"],
+    "report skill-gaps": ["main.py", "report", "skill-gaps"],
+    "report feasibility": ["main.py", "report", "feasibility"],
+}
+
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+class Startup(NamedTuple):
+    seconds: float
+    import_seconds: float
+    modules: int
+    heaviest: List[str]
+
+
+def run(args: Sequence[str], env: Dict[str, str]) -> Startup:
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    seconds = time.perf_counter() - start
+    imports = [
+        (int(own), int(cumulative), len(indent), name)
+        for own, cumulative, indent, name in _IMPORT_LINE.findall(process.stderr)
+    ]
+    top_level = sorted(
+        (entry for entry in imports if entry[2] == 1), key=lambda entry: -entry[1]
+    )
+    return Startup(
+        seconds,
+        sum(entry[0] for entry in imports) / 1e6,
+        len(imports),
+        [f"{name} {cumulative / 1000:.0f}" for _, cumulative, _, name in top_level[:3]],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{os.path.join(directory, 'startup.db')}",
+        }
+        env.pop("METRICS_PORT", None)
+        subprocess.run(
+            [sys.executable, "main.py", "demo"],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            check=True,
+        )
+
+        print(
+            f"{'command':<22} {'wall ms':>8} {'import ms':>10} {'modules':>8}  "
+            "heaviest imports (cumulative ms)"
+        )
+        for label, command in COMMANDS.items():
+            best = min(
+                (run(command, env) for _ in range(args.repeat)),
+                key=lambda startup: startup.seconds,
+            )
+            print(
+                f"{label:<22} {best.seconds * 1000:>8.1f} "
+                f"{best.import_seconds * 1000:>10.1f} {best.modules:>8}  "
+                f"{', '.join(best.heaviest)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark small writes from many threads committing directly against the
+same writes coalesced by a WriteQueue.
+
+Usage:
+    python -m benchmarks.bench_write_queue [--writes 200] [--producers 1 8 64]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from src.models import BaseModel, Client
+from src.write_queue import WriteQueue
+
+
+def add_client(db, name: str) -> int:
+    client = Client(name=name, contact_information=f"{name}@example.com")
+    db.add(client)
+    db.flush()
+    return client.id
+
+
+def direct(Session, producer: int, writes: int, failures: list) -> None:
+    """Each write in its own session and commit, as the get_db() callers do."""
+    for i in range(writes):
+        try:
+            with Session() as db:
+                add_client(db, f"direct-{producer}-{i}")
+                db.commit()
+        except OperationalError:
+            failures.append(1)
+
+
+def coalesced(writer: WriteQueue, producer: int, writes: int, failures: list) -> None:
+    """Each write submitted to the queue, waiting for it like a request would."""
+    for i in range(writes):
+        name = f"queued-{producer}-{i}"
+        try:
+            writer.submit(lambda db: add_client(db, name)).result()
+        except OperationalError:
+            failures.append(1)
+
+
+def run(path: str, producers: int, writes: int, queued: bool):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"timeout": 30})
+    BaseModel.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    writer = WriteQueue(Session) if queued else None
+    failures: list = []
+
+    threads = [
+        threading.Thread(
+            target=coalesced if queued else direct,
+            args=(writer if queued else Session, p, writes, failures),
+        )
+        for p in range(producers)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    batches = None
+    if writer is not None:
+        writer.close()
+        batches = writer.batches
+    engine.dispose()
+    return producers * writes / elapsed, batches, len(failures)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writes", type=int, default=200, help="writes per producer")
+    parser.add_argument("--producers", type=int, nargs="+", default=[1, 8, 64])
+    args = parser.parse_args()
+
+    print(
+        f"{'producers':>9} {'direct w/s':>11} {'failed':>7} "
+        f"{'queued w/s':>11} {'commits':>8} {'failed':>7}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for producers in args.producers:
+            writes = max(1, args.writes * 8 // max(producers, 8))
+            direct_rate, _, direct_failed = run(
+                os.path.join(tmp, f"direct-{producers}.db"), producers, writes, False
+            )
+            queued_rate, commits, queued_failed = run(
+                os.path.join(tmp, f"queued-{producers}.db"), producers, writes, True
+            )
+            print(
+                f"{producers:>9} {direct_rate:>11.0f} {direct_failed:>7} "
+                f"{queued_rate:>11.0f} {commits:>8} {queued_failed:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -13,5 +13,25 @@ load_dotenv()
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///resource_allocation.db")
 
+# Read replica directory; read sessions use the primary when unset
+REPLICA_DIRECTORY = os.getenv("REPLICA_DIRECTORY")
+
+# Seconds a replica may lag the primary before reads fall back to the primary
+REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", "300"))
+
+# Report cache file shared by processes; reports are cached per process when unset
+REPORT_CACHE_FILE = os.getenv("REPORT_CACHE_FILE")
+
+# Archive database file for closed projects; archival is unavailable when unset
+ARCHIVE_DATABASE = os.getenv("ARCHIVE_DATABASE")
+
+# Working days as a Monday-first mask, and holidays as comma separated ISO dates
+WORKWEEK_MASK = os.getenv("WORKWEEK_MASK", "1111100")
+HOLIDAYS = [day.strip() for day in os.getenv("HOLIDAYS", "").split(",") if day.strip()]
+
+# Prometheus metrics: a file written at exit, and a local port serving /metrics
+METRICS_FILE = os.getenv("METRICS_FILE")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0")) or None
+
 # Debug mode
 DEBUG = os.getenv("DEBUG", "False").lower() in ("true", "1", "t")
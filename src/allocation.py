@@ -0,0 +1,191 @@
+"""
+Optimistic allocation of individuals to project requirements.
+
+Allocation workers run in parallel without locking. An allocation reads
+the requirement's head count and the individual's booked hours, checks
+them against RoleRequirement.number_needed and the individual's
+Availability, and then writes the assignment. Over-allocation is prevented
+by also bumping the version_id of the rows those checks were made against:
+the RoleRequirement rows of the requirement and the Availability rows of
+the individual. If another worker allocated against the same rows in the
+meantime, the versioned UPDATE matches no row at flush time and the ORM
+raises StaleDataError; allocate_with_retry() then starts over with fresh
+data.
+"""
+
+import logging
+import random
+import time
+from typing import Callable, List
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from src.enums import AssignmentStatus
+from src.models import (
+    Assignment,
+    Availability,
+    BaseModel,
+    ProjectRequirement,
+    TimeRequirement,
+)
+from src.models.base import utc_now
+
+logger = logging.getLogger(__name__)
+
+ASSIGNED = AssignmentStatus.ASSIGNED
+CANCELLED = AssignmentStatus.CANCELLED
+
+DEFAULT_ATTEMPTS = 10
+
+
+class AllocationError(ValueError):
+    """Raised when an allocation would break a staffing rule; never retried."""
+
+
+def _booked_hours(db: Session, individual_id: int, requirement: ProjectRequirement):
+    """Sum the weekly hours of the individual's assignments overlapping the requirement."""
+    stmt = (
+        select(func.coalesce(func.sum(TimeRequirement.hours_per_week), 0))
+        .select_from(Assignment)
+        .join(
+            TimeRequirement,
+            TimeRequirement.requirement_id == Assignment.requirement_id,
+        )
+        .where(
+            Assignment.individual_id == individual_id,
+            Assignment.status != CANCELLED,
+            Assignment.start_date <= requirement.end_date,
+            Assignment.end_date >= requirement.start_date,
+        )
+    )
+    return db.scalar(stmt)
+
+
+def _touch(objects: List[BaseModel]) -> None:
+    """Update rows so their version_id is checked and bumped at flush."""
+    now = utc_now()
+    for obj in objects:
+        obj.updated_at = now
+
+
+def allocate(db: Session, individual_id: int, requirement_id: int) -> Assignment:
+    """
+    Assign an individual to a project requirement for its whole period.
+
+    The assignment is added to the session but not committed. A conflicting
+    concurrent allocation is only detected when the session flushes.
+
+    Args:
+        db (Session): The database session.
+        individual_id (int): The ID of the individual to assign.
+        requirement_id (int): The ID of the project requirement.
+
+    Returns:
+        Assignment: The new assignment.
+
+    Raises:
+        AllocationError: If the requirement is fully staffed, or the individual
+            has no availability for the period or not enough hours left.
+    """
+    requirement = db.get(ProjectRequirement, requirement_id)
+    if requirement is None:
+        raise AllocationError(f"No project requirement with id {requirement_id}")
+    role_requirements = requirement.role_requirements
+    if not role_requirements:
+        raise AllocationError(f"Requirement {requirement_id} has no role requirements")
+
+    needed = sum(rr.number_needed for rr in role_requirements)
+    assigned = db.scalar(
+        select(func.count(Assignment.id)).where(
+            Assignment.requirement_id == requirement_id,
+            Assignment.status != CANCELLED,
+        )
+    )
+    if assigned >= needed:
+        raise AllocationError(f"Requirement {requirement_id} is fully staffed")
+
+    availabilities = list(
+        db.scalars(
+            select(Availability).where(
+                Availability.individual_id == individual_id,
+                Availability.start_date <= requirement.end_date,
+                Availability.end_date >= requirement.start_date,
+            )
+        )
+    )
+    if not availabilities:
+        raise AllocationError(
+            f"Individual {individual_id} has no availability for requirement {requirement_id}"
+        )
+    hours = (
+        requirement.time_requirement.hours_per_week
+        if requirement.time_requirement
+        else 0
+    )
+    capacity = min(a.hours_per_week for a in availabilities)
+    booked = _booked_hours(db, individual_id, requirement)
+    if booked + hours > capacity:
+        raise AllocationError(
+            f"Individual {individual_id} has {capacity - booked} of the "
+            f"{hours} hours per week requirement {requirement_id} needs"
+        )
+
+    _touch(role_requirements + availabilities)
+    assignment = Assignment(
+        individual_id=individual_id,
+        requirement_id=requirement_id,
+        start_date=requirement.start_date,
+        end_date=requirement.end_date,
+        status=ASSIGNED,
+    )
+    db.add(assignment)
+    return assignment
+
+
+def _is_lock_timeout(error: OperationalError) -> bool:
+    return "database is locked" in str(error.orig)
+
+
+def allocate_with_retry(
+    session_factory: Callable[[], Session],
+    individual_id: int,
+    requirement_id: int,
+    attempts: int = DEFAULT_ATTEMPTS,
+) -> int:
+    """
+    Allocate and commit in a fresh session, retrying on concurrent conflicts.
+
+    Args:
+        session_factory (Callable[[], Session]): Creates the session for each attempt.
+        individual_id (int): The ID of the individual to assign.
+        requirement_id (int): The ID of the project requirement.
+        attempts (int): The maximum number of attempts.
+
+    Returns:
+        int: The ID of the new assignment.
+
+    Raises:
+        AllocationError: If the allocation breaks a staffing rule.
+        StaleDataError: If every attempt conflicted with another writer.
+    """
+    for attempt in range(1, attempts + 1):
+        with session_factory() as db:
+            try:
+                assignment = allocate(db, individual_id, requirement_id)
+                db.commit()
+                return assignment.id
+            except (StaleDataError, OperationalError) as e:
+                db.rollback()
+                if isinstance(e, OperationalError) and not _is_lock_timeout(e):
+                    raise
+                if attempt == attempts:
+                    raise
+                logger.info(
+                    f"Allocation of individual {individual_id} to requirement "
+                    f"{requirement_id} conflicted, retrying (attempt {attempt})."
+                )
+        # Randomised exponential backoff so conflicting workers spread out
+        time.sleep(random.uniform(0, 0.01 * 2**attempt))
@@ -0,0 +1,275 @@
+"""
+Hot/cold archival of closed projects for the Resource Allocation System.
+
+Completed and cancelled projects that ended before a cutoff are moved,
+together with their project requirements, assignments and requirement
+children, out of the hot tables into tables of the same name and columns
+in a separate archive database. The archive is a SQLite database file
+attached to every connection of the engine under the "archive" schema, so
+rows are copied with INSERT ... SELECT and never pass through Python.
+
+Projects are moved a batch at a time, one transaction per batch, oldest id
+first. Copies into the archive replace rows already there, so an archival
+interrupted at any point can simply be run again: moved projects are no
+longer in the hot tables, and a batch whose copy reached the archive but
+whose deletes did not is copied again. Rows of
+requirement_eligibility, a derived index, are deleted rather than
+archived. The deletes are reported to the change log like other set-based
+writes.
+
+Reports that need history can query hot and archived rows together
+through including_archive(), as ``python main.py report --include-archive``
+does. Run ``python main.py archive --cutoff 2023-01-01`` to archive from
+the command line; it attaches the archive configured by
+config.ARCHIVE_DATABASE.
+"""
+
+import logging
+import time
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional, Type
+
+from sqlalchemy import Column, Index, MetaData, Table, delete, event, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, aliased
+
+from src.change_log import DELETE, record_changes
+from src.housekeeping import CLOSED_PROJECT_STATUSES
+from src.models import (
+    Assignment,
+    BaseModel,
+    Project,
+    ProjectRequirement,
+    RequirementEligibility,
+    RoleRequirement,
+    SkillRequirement,
+    TimeRequirement,
+)
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SCHEMA = "archive"
+
+# Projects moved per transaction; also the size of the bound IN list
+DEFAULT_BATCH_SIZE = 500
+
+# Children of project requirements, moved before the requirements themselves
+REQUIREMENT_CHILDREN = (Assignment, TimeRequirement, RoleRequirement, SkillRequirement)
+
+ARCHIVED_MODELS = (Project, ProjectRequirement, *REQUIREMENT_CHILDREN)
+
+archive_metadata = MetaData(schema=ARCHIVE_SCHEMA)
+
+
+def _archive_table(table: Table) -> Table:
+    """Copy a hot table's columns into the archive, without cross-database foreign keys."""
+    archived = Table(
+        table.name,
+        archive_metadata,
+        *(
+            Column(
+                column.name,
+                column.type,
+                primary_key=column.primary_key,
+                nullable=column.nullable,
+                autoincrement=False,
+            )
+            for column in table.columns
+        ),
+    )
+    for column in table.columns:
+        if column.name in ("project_id", "requirement_id"):
+            Index(f"ix_archive_{table.name}_{column.name}", archived.c[column.name])
+    return archived
+
+
+ARCHIVE_TABLES: Dict[str, Table] = {
+    model.__tablename__: _archive_table(model.__table__) for model in ARCHIVED_MODELS
+}
+
+
+class ArchiveResult(NamedTuple):
+    """
+    The outcome of an archival run.
+
+    Attributes:
+        projects (int): The number of projects moved.
+        rows (Dict[str, int]): The number of rows moved per table.
+        batches (int): The number of committed batches.
+        seconds (float): The time the run took.
+    """
+
+    projects: int
+    rows: Dict[str, int]
+    batches: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        """Get the number of rows moved per second."""
+        return sum(self.rows.values()) / self.seconds if self.seconds else 0.0
+
+
+def attach_archive(engine: Engine, path: str) -> None:
+    """
+    Attach an archive database to every new connection of an engine.
+
+    Call this before the engine opens its first connection: connections
+    already in its pool are not attached.
+
+    Args:
+        engine (Engine): A SQLite engine.
+        path (str): The archive database file, or ":memory:".
+
+    Raises:
+        ValueError: If the engine is not a SQLite engine.
+    """
+    if engine.dialect.name != "sqlite":
+        raise ValueError("The archive can only be attached to a SQLite database")
+
+    @event.listens_for(engine, "connect")
+    def attach(dbapi_connection, connection_record):
+        dbapi_connection.execute(
+            f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (str(path),)
+        ).close()
+
+
+def create_archive_tables(engine: Engine) -> None:
+    """
+    Create the archive tables in the attached archive database if they do not exist yet.
+
+    Args:
+        engine (Engine): An engine with the archive attached.
+    """
+    archive_metadata.create_all(engine)
+
+
+def including_archive(model: Type[BaseModel]):
+    """
+    Get an ORM entity over both the hot and the archived rows of a model.
+
+    Use it in place of the model in a select(), e.g.
+    ``projects = including_archive(Project)`` then
+    ``select(projects).where(projects.client_id == client_id)``. Loaded
+    objects are instances of the model; relationships still load from the
+    hot tables only.
+
+    Args:
+        model (Type[BaseModel]): One of ARCHIVED_MODELS.
+
+    Returns:
+        An aliased entity selecting from the union of both tables.
+
+    Raises:
+        ValueError: If the model is not archived.
+    """
+    archived = ARCHIVE_TABLES.get(model.__tablename__)
+    if archived is None:
+        raise ValueError(f"{model.__name__} rows are not archived")
+    hot = model.__table__
+    union = select(*hot.columns).union_all(
+        select(*(archived.c[column.name] for column in hot.columns))
+    )
+    return aliased(model, union.subquery(f"{hot.name}_with_archive"))
+
+
+def _move(db: Session, model: Type[BaseModel], where) -> int:
+    """Copy the matching rows of a model into the archive, then delete them."""
+    hot = model.__table__
+    db.execute(
+        insert(ARCHIVE_TABLES[hot.name])
+        .prefix_with("OR REPLACE")
+        .from_select(list(hot.columns.keys()), select(hot).where(where))
+    )
+    ids = list(
+        db.scalars(
+            delete(model)
+            .where(where)
+            .returning(model.id)
+            .execution_options(synchronize_session=False)
+        )
+    )
+    record_changes(db, hot.name, ids, DELETE)
+    return len(ids)
+
+
+def archive_closed_projects(
+    db: Session,
+    cutoff: date,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+) -> ArchiveResult:
+    """
+    Move closed projects that ended before a cutoff, and their rows, into the archive.
+
+    Each batch is committed on its own, so an interrupted run keeps the
+    batches it finished and can be run again to move the rest.
+
+    Args:
+        db (Session): The database session; its engine must have the archive attached.
+        cutoff (date): Projects ending on or after this day stay in the hot tables.
+        batch_size (int): The number of projects moved per transaction.
+        max_batches (Optional[int]): Stop after this many batches; all by default.
+
+    Returns:
+        ArchiveResult: The projects and rows moved, and how fast.
+
+    Raises:
+        ValueError: If batch_size is less than 1.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    start = time.perf_counter()
+    rows = {model.__tablename__: 0 for model in ARCHIVED_MODELS}
+    projects = batches = 0
+    while max_batches is None or batches < max_batches:
+        project_ids: List[int] = list(
+            db.scalars(
+                select(Project.id)
+                .where(
+                    Project.status.in_(CLOSED_PROJECT_STATUSES),
+                    Project.end_date < cutoff,
+                )
+                .order_by(Project.id)
+                .limit(batch_size)
+            )
+        )
+        if not project_ids:
+            break
+
+        requirement_ids = (
+            select(ProjectRequirement.id)
+            .where(ProjectRequirement.project_id.in_(project_ids))
+            .scalar_subquery()
+        )
+        for child in REQUIREMENT_CHILDREN:
+            rows[child.__tablename__] += _move(
+                db, child, child.requirement_id.in_(requirement_ids)
+            )
+        db.execute(
+            delete(RequirementEligibility)
+            .where(RequirementEligibility.requirement_id.in_(requirement_ids))
+            .execution_options(synchronize_session=False)
+        )
+        rows[ProjectRequirement.__tablename__] += _move(
+            db, ProjectRequirement, ProjectRequirement.project_id.in_(project_ids)
+        )
+        rows[Project.__tablename__] += _move(db, Project, Project.id.in_(project_ids))
+        db.commit()
+
+        projects += len(project_ids)
+        batches += 1
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"Archived {projects} projects, {sum(rows.values())} rows "
+            f"({sum(rows.values()) / elapsed:.0f} rows/s)."
+        )
+
+    result = ArchiveResult(projects, rows, batches, time.perf_counter() - start)
+    logger.info(
+        f"Archival before {cutoff} finished: {projects} projects, "
+        f"{sum(rows.values())} rows in {result.seconds:.1f}s "
+        f"({result.rows_per_second:.0f} rows/s)."
+    )
+    return result
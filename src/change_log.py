@@ -0,0 +1,206 @@
+"""
+Change data capture for the Resource Allocation System.
+
+This module records every ORM insert, update and delete of a BaseModel
+subclass into the append-only change_log table, so that caches, summaries
+and snapshots can process only what changed since they last looked instead
+of rescanning whole tables.
+"""
+
+import logging
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence
+
+from sqlalchemy import delete, func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from src.events import install_hook, remove_hook
+from src.models import BaseModel, ChangeLogEntry
+
+logger = logging.getLogger(__name__)
+
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+
+def _changed_columns(obj: BaseModel) -> List[str]:
+    """
+    Get the names of the mapped columns of an instance with pending changes.
+
+    Args:
+        obj (BaseModel): A dirty instance inside an active flush.
+
+    Returns:
+        List[str]: The column names, in mapper order.
+    """
+    state = inspect(obj)
+    changed = []
+    for attr in state.mapper.column_attrs:
+        if state.attrs[attr.key].history.has_changes():
+            changed.append(attr.columns[0].name)
+    return changed
+
+
+def _entry(obj: BaseModel, operation: str, changed_columns=None) -> dict:
+    return {
+        "table_name": obj.__table__.name,
+        "row_id": obj.id,
+        "operation": operation,
+        "changed_columns": changed_columns,
+    }
+
+
+def _capture_changes(session: Session, flush_context) -> None:
+    """
+    Session after_flush hook writing one change log entry per flushed row.
+
+    The session's new, dirty and deleted collections still hold their
+    pre-flush state here, and primary keys of new rows are already assigned.
+    """
+    entries = []
+    for obj in session.new:
+        if isinstance(obj, BaseModel) and not isinstance(obj, ChangeLogEntry):
+            entries.append(_entry(obj, INSERT))
+    for obj in session.dirty:
+        if isinstance(obj, BaseModel) and not isinstance(obj, ChangeLogEntry):
+            changed = _changed_columns(obj)
+            if changed:
+                entries.append(_entry(obj, UPDATE, changed))
+    for obj in session.deleted:
+        if isinstance(obj, BaseModel) and not isinstance(obj, ChangeLogEntry):
+            entries.append(_entry(obj, DELETE))
+
+    if entries:
+        session.connection().execute(insert(ChangeLogEntry), entries)
+
+
+def enable_change_capture(target) -> None:
+    """
+    Install the change capture hook on a Session class or sessionmaker.
+
+    Calling this more than once for the same target has no further effect.
+
+    Args:
+        target: A Session subclass or a sessionmaker instance.
+    """
+    install_hook(target, "after_flush", _capture_changes)
+
+
+def disable_change_capture(target) -> None:
+    """
+    Remove the change capture hook from a Session class or sessionmaker.
+
+    Args:
+        target: A Session subclass or a sessionmaker instance.
+    """
+    remove_hook(target, "after_flush", _capture_changes)
+
+
+def record_changes(
+    db: Session,
+    table_name: str,
+    row_ids: Iterable[int],
+    operation: str,
+    changed_columns: Optional[Sequence[str]] = None,
+) -> int:
+    """
+    Append change log entries for rows written outside of an ORM flush.
+
+    Set-based UPDATE and DELETE statements bypass the flush hook, so code
+    issuing them should report the affected rows through this function.
+
+    Args:
+        db (Session): The database session.
+        table_name (str): The name of the table the rows belong to.
+        row_ids (Iterable[int]): The primary keys of the affected rows.
+        operation (str): One of "insert", "update" or "delete".
+        changed_columns (Optional[Sequence[str]]): The columns changed by an update.
+
+    Returns:
+        int: The number of entries written.
+    """
+    columns = list(changed_columns) if changed_columns is not None else None
+    entries = [
+        {
+            "table_name": table_name,
+            "row_id": row_id,
+            "operation": operation,
+            "changed_columns": columns,
+        }
+        for row_id in row_ids
+    ]
+    if entries:
+        db.execute(insert(ChangeLogEntry), entries)
+    return len(entries)
+
+
+def read_changes(
+    db: Session,
+    since_seq: int = 0,
+    limit: int = 1000,
+    tables: Optional[Iterable[str]] = None,
+) -> List[ChangeLogEntry]:
+    """
+    Read change log entries after a cursor position.
+
+    Args:
+        db (Session): The database session.
+        since_seq (int): The last sequence number already processed by the caller.
+        limit (int): The maximum number of entries to return.
+        tables (Optional[Iterable[str]]): Restrict the result to these table names.
+
+    Returns:
+        List[ChangeLogEntry]: Entries with seq > since_seq in sequence order. The
+        seq of the last entry is the cursor for the next call.
+    """
+    stmt = select(ChangeLogEntry).where(ChangeLogEntry.id > since_seq)
+    if tables is not None:
+        stmt = stmt.where(ChangeLogEntry.table_name.in_(list(tables)))
+    stmt = stmt.order_by(ChangeLogEntry.id).limit(limit)
+    return list(db.scalars(stmt))
+
+
+def latest_seq(db: Session) -> int:
+    """
+    Get the sequence number of the most recent change log entry.
+
+    Returns:
+        int: The latest sequence number, or 0 if the log is empty.
+    """
+    return db.scalar(select(func.max(ChangeLogEntry.id))) or 0
+
+
+def compact_changes(
+    db: Session,
+    before_seq: Optional[int] = None,
+    older_than: Optional[datetime] = None,
+) -> int:
+    """
+    Delete old change log entries.
+
+    Only entries that every consumer has already read past should be removed.
+    Sequence numbers are never reused after compaction.
+
+    Args:
+        db (Session): The database session.
+        before_seq (Optional[int]): Delete entries with seq < before_seq.
+        older_than (Optional[datetime]): Delete entries created before this time.
+
+    Returns:
+        int: The number of deleted entries.
+
+    Raises:
+        ValueError: If neither before_seq nor older_than is given.
+    """
+    if before_seq is None and older_than is None:
+        raise ValueError("Either before_seq or older_than must be given")
+
+    stmt = delete(ChangeLogEntry)
+    if before_seq is not None:
+        stmt = stmt.where(ChangeLogEntry.id < before_seq)
+    if older_than is not None:
+        stmt = stmt.where(ChangeLogEntry.created_at < older_than)
+    result = db.execute(stmt.execution_options(synchronize_session=False))
+    logger.info(f"Compacted {result.rowcount} change log entries.")
+    return result.rowcount
@@ -0,0 +1,320 @@
+"""
+Command line interface of the Resource Allocation System.
+
+    python main.py init
+    python main.py load individuals people.json
+    python main.py export individuals --fields id,name --output people.json
+    python main.py match 42 -k 5
+    python main.py report skill-gaps
+    python main.py report shortfalls --as-of 2022-01-03 --include-archive
+    python main.py archive --cutoff 2024-01-01
+    python main.py replicate --every 60
+    python main.py demo
+
+Commands are started by the thousand from the orchestrator and most of
+them run for less time than it takes to import SQLAlchemy and the models,
+so this module imports nothing but the standard library and the profiler
+at load time. Each command imports the feature modules it uses inside its
+handler, and only commands that open a session import src.database, which
+builds the engine and installs the session hooks. --help and argument
+errors never get that far. benchmarks/bench_startup.py measures the
+import cost of each command with python -X importtime.
+
+Results are written to stdout (or --output) as JSON and logs to stderr.
+A command exits with 0 on success, 1 when its input is rejected and 2 on
+a usage error.
+"""
+
+import argparse
+import logging
+import sys
+from datetime import date
+from typing import Any, Optional, Sequence
+
+from src.profiling import Profiler, add_profile_argument
+
+logger = logging.getLogger(__name__)
+
+REPORTS = ("skill-gaps", "shortfalls", "feasibility")
+
+
+def _model(table: str):
+    """Get the model mapped to a table, or named table."""
+    from src.models import BaseModel
+
+    for mapper in BaseModel.registry.mappers:
+        if table in (mapper.local_table.name, mapper.class_.__name__):
+            return mapper.class_
+    raise ValueError(f"Unknown table {table}")
+
+
+def _write(data: Any, output: Optional[str]) -> None:
+    """Write data as JSON to a file, or to stdout when output is None or "-"."""
+    from src.serialization import dumps
+
+    encoded = dumps(data) + b"\n"
+    if output in (None, "-"):
+        sys.stdout.buffer.write(encoded)
+        sys.stdout.flush()
+    else:
+        with open(output, "wb") as f:
+            f.write(encoded)
+
+
+def _init(args: argparse.Namespace, profiler: Profiler) -> None:
+    from src.database import init_db, verify_tables
+
+    with profiler.phase("init_db"):
+        init_db()
+    with profiler.phase("verify_tables"):
+        verify_tables()
+
+
+def _load(args: argparse.Namespace, profiler: Profiler) -> None:
+    import json
+
+    from src.database import get_db
+    from src.serialization import load
+
+    model = _model(args.table)
+    if args.input == "-":
+        rows = json.load(sys.stdin)
+    else:
+        with open(args.input, encoding="utf-8") as f:
+            rows = json.load(f)
+    with get_db() as db, profiler.phase("load"):
+        created = load(db, model, rows)
+        db.commit()
+    logger.info(f"Loaded {created} rows into {model.__tablename__}")
+
+
+def _export(args: argparse.Namespace, profiler: Profiler) -> None:
+    from src.database import get_read_db
+    from src.serialization import dump
+
+    model = _model(args.table)
+    fields = args.fields.split(",") if args.fields else None
+    with get_read_db() as db, profiler.phase("export"):
+        rows = dump(db, model, fields=fields, include=args.include, limit=args.limit)
+    _write(rows, args.output)
+
+
+def _match(args: argparse.Namespace, profiler: Profiler) -> None:
+    from src.database import get_read_db
+    from src.ranking import top_candidates
+
+    with get_read_db() as db, profiler.phase("match"):
+        candidates = top_candidates(db, args.requirement_id, args.k)
+    _write([candidate._asdict() for candidate in candidates], args.output)
+
+
+def _report(args: argparse.Namespace, profiler: Profiler) -> None:
+    if args.include_archive:
+        import config
+
+        if args.report == "skill-gaps":
+            raise ValueError(
+                "skill-gaps only covers open work, which is never archived"
+            )
+        if not config.ARCHIVE_DATABASE:
+            raise ValueError("Set ARCHIVE_DATABASE to the archive database file")
+    from src.database import get_db, get_read_db, report_cache
+
+    # Replicas copy the main database only, without the attached archive
+    session = get_db if args.include_archive else get_read_db
+    with session() as db:
+        if report_cache.path:
+            with profiler.phase("load_report_cache"):
+                report_cache.load(db)
+        with profiler.phase(args.report.replace("-", "_")):
+            if args.report == "skill-gaps":
+                from src.skill_gaps import cached_skill_gaps
+
+                gaps = cached_skill_gaps(report_cache, db, args.as_of)
+                data: Any = [{**gap._asdict(), "gap": gap.gap} for gap in gaps]
+            elif args.report == "shortfalls":
+                from src.forecast import cached_forecast
+
+                result = cached_forecast(
+                    report_cache,
+                    db,
+                    args.dimension,
+                    args.as_of,
+                    args.weeks,
+                    args.include_archive,
+                )
+                data = [
+                    {f"{args.dimension}_id": key, "week": week, "hours": hours}
+                    for key, week, hours in result.shortfalls()
+                ]
+            else:
+                from src.feasibility import check_feasibility
+
+                result = check_feasibility(db, include_archive=args.include_archive)
+                data = {
+                    "infeasible": result.infeasible(),
+                    "understaffed": result.understaffed(),
+                }
+        if report_cache.path and report_cache.misses:
+            with profiler.phase("save_report_cache"):
+                report_cache.save()
+    _write(data, args.output)
+
+
+def _archive(args: argparse.Namespace, profiler: Profiler) -> None:
+    import config
+
+    if not config.ARCHIVE_DATABASE:
+        raise ValueError("Set ARCHIVE_DATABASE to the archive database file")
+    from src.archive import archive_closed_projects, create_archive_tables
+    from src.database import get_db, get_engine
+
+    with profiler.phase("create_archive_tables"):
+        create_archive_tables(get_engine())
+    # The batch size default lives in src.archive, which --help does not import
+    options = {"batch_size": args.batch_size} if args.batch_size else {}
+    with get_db() as db, profiler.phase("archive_closed_projects"):
+        archive_closed_projects(
+            db, args.cutoff, max_batches=args.max_batches, **options
+        )
+
+
+def _replicate(args: argparse.Namespace, profiler: Profiler) -> None:
+    import time
+
+    from src.database import replicas
+
+    if replicas is None:
+        raise ValueError("Set REPLICA_DIRECTORY to the replica directory")
+    if args.every is None:
+        with profiler.phase("refresh_replica"):
+            replicas.refresh()
+        _write(replicas.status(), args.output)
+        return
+    replicas.start(args.every)
+    try:
+        while True:
+            time.sleep(args.every)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        replicas.stop()
+
+
+def _demo(args: argparse.Namespace, profiler: Profiler) -> None:
+    from src.database import get_db, init_db, verify_tables
+    from src.demo import create_sample_data, query_data
+
+    with profiler.phase("init_db"):
+        init_db()
+    with profiler.phase("verify_tables"):
+        verify_tables()
+    with get_db() as db:
+        with profiler.phase("create_sample_data"):
+            create_sample_data(db)
+        with profiler.phase("query_data"):
+            query_data(db)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the argument parser of every command, without importing any of them.
+
+    Returns:
+        argparse.ArgumentParser: The parser; each command sets handler.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py", description="Manage resource allocation data."
+    )
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+
+    def command(name: str, handler, help: str) -> argparse.ArgumentParser:
+        sub = commands.add_parser(name, help=help, description=help)
+        sub.set_defaults(handler=handler)
+        add_profile_argument(sub)
+        return sub
+
+    def output(sub: argparse.ArgumentParser) -> None:
+        sub.add_argument(
+            "-o", "--output", help="Write the JSON here instead of to stdout."
+        )
+
+    command("init", _init, "Create the database tables and indexes.")
+
+    sub = command("load", _load, "Create rows from a JSON list of objects.")
+    sub.add_argument("table", help="The table or model, e.g. individuals.")
+    sub.add_argument("input", help='The JSON file, or "-" for stdin.')
+
+    sub = command("export", _export, "Write the rows of a table as JSON.")
+    sub.add_argument("table", help="The table or model, e.g. individuals.")
+    sub.add_argument("--fields", help="Comma separated columns, all by default.")
+    sub.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        help="A relationship to nest; may be repeated.",
+    )
+    sub.add_argument("--limit", type=int)
+    output(sub)
+
+    sub = command("match", _match, "Rank the best candidates for a requirement.")
+    sub.add_argument("requirement_id", type=int)
+    sub.add_argument("-k", type=int, default=10, help="Candidates to return.")
+    output(sub)
+
+    sub = command("report", _report, "Compute a staffing report.")
+    sub.add_argument("report", choices=REPORTS)
+    sub.add_argument(
+        "--as-of", type=date.fromisoformat, help="The report date, today by default."
+    )
+    sub.add_argument("--dimension", choices=("role", "skill"), default="role")
+    sub.add_argument("--weeks", type=int, default=52)
+    sub.add_argument(
+        "--include-archive",
+        action="store_true",
+        help="Include archived projects in shortfalls and feasibility; "
+        "needs ARCHIVE_DATABASE.",
+    )
+    output(sub)
+
+    sub = command("archive", _archive, "Move closed projects into the archive.")
+    sub.add_argument("--cutoff", type=date.fromisoformat, required=True)
+    sub.add_argument("--batch-size", type=int, help="Projects per transaction.")
+    sub.add_argument("--max-batches", type=int)
+
+    sub = command("replicate", _replicate, "Refresh the read replica.")
+    sub.add_argument(
+        "--every",
+        type=float,
+        metavar="SECONDS",
+        help="Keep refreshing at this interval until interrupted.",
+    )
+    output(sub)
+
+    command("demo", _demo, "Create sample data and query it.")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run a command.
+
+    Args:
+        argv (Optional[Sequence[str]]): The arguments, sys.argv[1:] by default.
+
+    Returns:
+        int: The exit status.
+    """
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    profiler = Profiler(args.profile)
+    try:
+        args.handler(args, profiler)
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+    finally:
+        profiler.close()
+    return 0
@@ -5,6 +5,7 @@ This module provides functions and utilities for database operations,
 including initialization, session management, and engine access.
 """
 
+import atexit
 import logging
 from contextlib import contextmanager
 from typing import Generator
@@ -15,9 +16,17 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, sessionmaker
 
 import config
+from src.archive import attach_archive, create_archive_tables
+from src.change_log import enable_change_capture
+from src.eligibility import enable_eligibility_maintenance
+from src.metrics import enable_metrics, registry, track_cache
 
 # Make sure this imports your Base from the models
 from src.models import BaseModel
+from src.replicas import ReplicaManager
+from src.report_cache import ReportCache, enable_version_tracking
+from src.search import create_search_index
+from src.taxonomy import enable_taxonomy_maintenance
 
 # Configure logging
 logging.basicConfig(
@@ -28,9 +37,44 @@ logger = logging.getLogger(__name__)
 # Create the SQLAlchemy engine
 engine = create_engine(config.DATABASE_URL, echo=config.DEBUG)
 
+# Attach the archive of closed projects, when an archive database is configured
+if config.ARCHIVE_DATABASE:
+    attach_archive(engine, config.ARCHIVE_DATABASE)
+
 # Create a configured "Session" class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Record every flushed row change in the change log
+enable_change_capture(SessionLocal)
+
+# Keep the skill closure table in step with the skill taxonomy
+enable_taxonomy_maintenance(SessionLocal)
+
+# Keep the requirement eligibility index in step with flushed changes
+enable_eligibility_maintenance(SessionLocal)
+
+# Invalidate cached reports when the tables they were computed from are written
+enable_version_tracking(SessionLocal)
+
+# Record query, pool, session and commit metrics
+enable_metrics(engine, SessionLocal)
+
+# Export the metrics to a file at exit and on a local endpoint, when configured
+if config.METRICS_FILE:
+    atexit.register(registry.write, config.METRICS_FILE)
+metrics_server = registry.serve(config.METRICS_PORT) if config.METRICS_PORT else None
+
+# Snapshot read replicas, when a replica directory is configured
+replicas = (
+    ReplicaManager(engine, config.REPLICA_DIRECTORY, max_lag=config.REPLICA_MAX_LAG)
+    if config.REPLICA_DIRECTORY
+    else None
+)
+
+# Cached report results, shared through a file when one is configured
+report_cache = ReportCache(path=config.REPORT_CACHE_FILE)
+track_cache("reports", report_cache)
+
 
 @contextmanager
 def get_db() -> Generator[Session, None, None]:
@@ -57,6 +101,31 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+@contextmanager
+def get_read_db() -> Generator[Session, None, None]:
+    """
+    Context manager for a read-only session for reports, exports and matching.
+
+    The session is opened on the newest read replica when one is configured
+    and within the staleness limit, and on the primary otherwise. Nothing
+    should be written through it.
+
+    Yields:
+        Session: The database session.
+
+    Raises:
+        SQLAlchemyError: If there's an error during database operations.
+    """
+    db = replicas.read_session() if replicas is not None else SessionLocal()
+    try:
+        yield db
+    except SQLAlchemyError as e:
+        logger.error(f"Database error occurred: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+
 def init_db() -> None:
     """
     Initialize the database by creating all tables.
@@ -71,6 +140,10 @@ def init_db() -> None:
         # Import all models here to ensure they're registered with Base
 
         BaseModel.metadata.create_all(bind=engine)
+        if engine.dialect.name == "sqlite":
+            create_search_index(engine)
+        if config.ARCHIVE_DATABASE:
+            create_archive_tables(engine)
         logger.info("Database initialized successfully.")
     except SQLAlchemyError as e:
         logger.error(f"Error initializing database: {str(e)}")
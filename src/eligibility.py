@@ -0,0 +1,447 @@
+"""
+Requirement eligibility index for the Resource Allocation System.
+
+This module maintains the requirement_eligibility table, which holds one row
+per (project requirement, individual) pair where the individual meets every
+skill requirement, holds one of the required roles and has availability
+overlapping the requirement's dates. Staffing screens read eligible
+candidates with a single indexed lookup instead of re-evaluating everyone.
+
+The table is kept current by a session after_flush hook which only
+re-evaluates the pairs a flushed change can affect: a changed IndividualSkill
+re-checks that individual against the requirements needing that skill, a
+changed SkillRequirement re-checks that requirement against everyone, and so
+on. Requirements without any skill or role requirement are not indexed.
+
+A skill requirement is also met by any narrower skill in the taxonomy (see
+src/taxonomy.py): someone with Python at level 4 meets "Programming >= 4".
+"""
+
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, delete, insert, inspect, or_, select, union
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from src.events import install_hook
+from src.models import (
+    Availability,
+    Individual,
+    IndividualRole,
+    IndividualSkill,
+    ProjectRequirement,
+    RequirementEligibility,
+    RoleRequirement,
+    Skill,
+    SkillClosure,
+    SkillRequirement,
+)
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of bound values per IN clause
+CHUNK_SIZE = 500
+
+# Tolerance used when comparing stored and expected scores
+SCORE_TOLERANCE = 1e-9
+
+Pairs = Dict[Tuple[int, int], float]
+
+
+def _chunks(values: Iterable[int], size: int = CHUNK_SIZE) -> Iterable[List[int]]:
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def _indexed_requirements(
+    conn: Connection, requirement_ids: Optional[Set[int]] = None
+) -> Dict[int, tuple]:
+    """
+    Get the date windows of requirements that have skill or role criteria.
+
+    Returns:
+        Dict[int, tuple]: Requirement id to (start_date, end_date).
+    """
+    with_criteria = union(
+        select(SkillRequirement.requirement_id),
+        select(RoleRequirement.requirement_id),
+    ).subquery()
+    stmt = select(
+        ProjectRequirement.id,
+        ProjectRequirement.start_date,
+        ProjectRequirement.end_date,
+    ).where(ProjectRequirement.id.in_(select(with_criteria.c[0])))
+
+    if requirement_ids is None:
+        return {row.id: (row.start_date, row.end_date) for row in conn.execute(stmt)}
+
+    windows = {}
+    for chunk in _chunks(requirement_ids):
+        for row in conn.execute(stmt.where(ProjectRequirement.id.in_(chunk))):
+            windows[row.id] = (row.start_date, row.end_date)
+    return windows
+
+
+def _select_in(conn: Connection, stmt, column, values: Optional[Set[int]]):
+    if values is None:
+        yield from conn.execute(stmt)
+        return
+    for chunk in _chunks(values):
+        yield from conn.execute(stmt.where(column.in_(chunk)))
+
+
+def _evaluate(
+    conn: Connection,
+    requirement_ids: Optional[Set[int]] = None,
+    individual_ids: Optional[Set[int]] = None,
+) -> Pairs:
+    """
+    Compute eligible pairs and their scores from the source tables.
+
+    The score is the total proficiency surplus over the minimum proficiency
+    of every required skill.
+
+    Args:
+        conn (Connection): The connection to read from.
+        requirement_ids (Optional[Set[int]]): Requirements to evaluate, or None for all.
+        individual_ids (Optional[Set[int]]): Individuals to evaluate, or None for all.
+
+    Returns:
+        Pairs: (requirement_id, individual_id) to score for every eligible pair.
+    """
+    windows = _indexed_requirements(conn, requirement_ids)
+    if not windows:
+        return {}
+
+    skill_reqs: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+    stmt = select(
+        SkillRequirement.requirement_id,
+        SkillRequirement.skill_id,
+        SkillRequirement.minimum_proficiency,
+    )
+    for row in _select_in(conn, stmt, SkillRequirement.requirement_id, set(windows)):
+        skill_reqs[row.requirement_id].append((row.skill_id, row.minimum_proficiency))
+
+    role_reqs: Dict[int, Set[int]] = defaultdict(set)
+    stmt = select(RoleRequirement.requirement_id, RoleRequirement.role_id)
+    for row in _select_in(conn, stmt, RoleRequirement.requirement_id, set(windows)):
+        role_reqs[row.requirement_id].add(row.role_id)
+
+    # A required skill is met by holding it or any of its descendants
+    required = {skill_id for reqs in skill_reqs.values() for skill_id, _ in reqs}
+    satisfying: Dict[int, Set[int]] = {skill_id: {skill_id} for skill_id in required}
+    stmt = select(SkillClosure.ancestor_id, SkillClosure.descendant_id)
+    for row in _select_in(conn, stmt, SkillClosure.ancestor_id, required):
+        satisfying[row.ancestor_id].add(row.descendant_id)
+
+    levels: Dict[int, Dict[int, int]] = defaultdict(dict)
+    stmt = select(
+        IndividualSkill.individual_id,
+        IndividualSkill.skill_id,
+        IndividualSkill.proficiency_level,
+    )
+    if individual_ids is not None:
+        stmt = stmt.where(IndividualSkill.individual_id.in_(list(individual_ids)))
+    held = set().union(*satisfying.values()) if satisfying else set()
+    for row in _select_in(conn, stmt, IndividualSkill.skill_id, held):
+        levels[row.skill_id][row.individual_id] = row.proficiency_level
+
+    proficiency: Dict[int, Dict[int, int]] = defaultdict(dict)
+    for skill_id, skill_ids in satisfying.items():
+        best = proficiency[skill_id]
+        for held_skill_id in skill_ids:
+            for individual_id, level in levels[held_skill_id].items():
+                if level > best.get(individual_id, -1):
+                    best[individual_id] = level
+
+    holders: Dict[int, Set[int]] = defaultdict(set)
+    role_ids = set().union(*role_reqs.values()) if role_reqs else set()
+    stmt = select(IndividualRole.individual_id, IndividualRole.role_id)
+    if individual_ids is not None:
+        stmt = stmt.where(IndividualRole.individual_id.in_(list(individual_ids)))
+    for row in _select_in(conn, stmt, IndividualRole.role_id, role_ids):
+        holders[row.role_id].add(row.individual_id)
+
+    candidates: Pairs = {}
+    for requirement_id in windows:
+        scores: Optional[Dict[int, float]] = None
+        for skill_id, minimum in skill_reqs.get(requirement_id, []):
+            meeting = {
+                individual_id: level - minimum
+                for individual_id, level in proficiency[skill_id].items()
+                if level >= minimum
+            }
+            if scores is None:
+                scores = {i: float(surplus) for i, surplus in meeting.items()}
+            else:
+                scores = {
+                    i: score + meeting[i] for i, score in scores.items() if i in meeting
+                }
+        if requirement_id in role_reqs:
+            with_role = set().union(*(holders[r] for r in role_reqs[requirement_id]))
+            if scores is None:
+                scores = {i: 0.0 for i in with_role}
+            else:
+                scores = {i: s for i, s in scores.items() if i in with_role}
+        for individual_id, score in (scores or {}).items():
+            candidates[(requirement_id, individual_id)] = score
+
+    available: Dict[int, List[tuple]] = defaultdict(list)
+    stmt = select(
+        Availability.individual_id, Availability.start_date, Availability.end_date
+    ).where(Availability.hours_per_week > 0)
+    candidate_ids = {individual_id for _, individual_id in candidates}
+    for row in _select_in(conn, stmt, Availability.individual_id, candidate_ids):
+        available[row.individual_id].append((row.start_date, row.end_date))
+
+    pairs: Pairs = {}
+    for (requirement_id, individual_id), score in candidates.items():
+        start, end = windows[requirement_id]
+        for available_start, available_end in available[individual_id]:
+            if (end is None or available_start <= end) and (
+                start is None or available_end >= start
+            ):
+                pairs[(requirement_id, individual_id)] = score
+                break
+    return pairs
+
+
+def _replace(
+    conn: Connection,
+    requirement_ids: Optional[Set[int]],
+    individual_ids: Optional[Set[int]],
+    pairs: Pairs,
+) -> None:
+    """Replace the stored rows in the given scope with freshly evaluated pairs."""
+    table = RequirementEligibility.__table__
+    if requirement_ids is None and individual_ids is None:
+        conn.execute(delete(table))
+    elif individual_ids is None:
+        for chunk in _chunks(requirement_ids):
+            conn.execute(delete(table).where(table.c.requirement_id.in_(chunk)))
+    elif requirement_ids is None:
+        for chunk in _chunks(individual_ids):
+            conn.execute(delete(table).where(table.c.individual_id.in_(chunk)))
+    else:
+        for requirement_chunk in _chunks(requirement_ids):
+            for individual_chunk in _chunks(individual_ids):
+                conn.execute(
+                    delete(table).where(
+                        table.c.requirement_id.in_(requirement_chunk),
+                        table.c.individual_id.in_(individual_chunk),
+                    )
+                )
+
+    if pairs:
+        conn.execute(
+            insert(table),
+            [
+                {"requirement_id": r, "individual_id": i, "score": score}
+                for (r, i), score in pairs.items()
+            ],
+        )
+
+
+def _values(obj, key: str) -> Set[int]:
+    """Get the current and previous values of an attribute within a flush."""
+    history = inspect(obj).attrs[key].history
+    return {
+        value
+        for value in (*history.added, *history.unchanged, *history.deleted)
+        if value is not None
+    }
+
+
+def _requirements_needing(
+    conn: Connection, model, key: str, values: Set[int]
+) -> Set[int]:
+    stmt = select(model.requirement_id)
+    column = getattr(model, key)
+    return {row[0] for row in _select_in(conn, stmt, column, values)}
+
+
+def _with_ancestors(conn: Connection, skill_ids: Set[int]) -> Set[int]:
+    stmt = select(SkillClosure.ancestor_id)
+    column = SkillClosure.descendant_id
+    return skill_ids | {row[0] for row in _select_in(conn, stmt, column, skill_ids)}
+
+
+def _requirements_overlapping(conn: Connection, windows: List[tuple]) -> Set[int]:
+    conditions = [
+        and_(
+            or_(
+                ProjectRequirement.start_date.is_(None),
+                ProjectRequirement.start_date <= end,
+            ),
+            or_(
+                ProjectRequirement.end_date.is_(None),
+                ProjectRequirement.end_date >= start,
+            ),
+        )
+        for start, end in windows
+    ]
+    stmt = select(ProjectRequirement.id).where(or_(*conditions))
+    return {row[0] for row in conn.execute(stmt)}
+
+
+def _maintain_eligibility(session: Session, flush_context) -> None:
+    """
+    Session after_flush hook re-evaluating the pairs affected by the flush.
+    """
+    individuals: Set[int] = set()
+    skill_ids: Set[int] = set()
+    role_ids: Set[int] = set()
+    windows: List[tuple] = []
+    requirements: Set[int] = set()
+    removed_individuals: Set[int] = set()
+    moved_below: Set[int] = set()
+
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, IndividualSkill):
+            individuals |= _values(obj, "individual_id")
+            skill_ids |= _values(obj, "skill_id")
+        elif isinstance(obj, IndividualRole):
+            individuals |= _values(obj, "individual_id")
+            role_ids |= _values(obj, "role_id")
+        elif isinstance(obj, Availability):
+            individuals |= _values(obj, "individual_id")
+            starts, ends = _values(obj, "start_date"), _values(obj, "end_date")
+            if starts and ends:
+                windows.append((min(starts), max(ends)))
+        elif isinstance(obj, (SkillRequirement, RoleRequirement)):
+            requirements |= _values(obj, "requirement_id")
+        elif isinstance(obj, ProjectRequirement) and obj.id is not None:
+            requirements.add(obj.id)
+        elif isinstance(obj, Individual) and obj in session.deleted:
+            removed_individuals.add(obj.id)
+        elif isinstance(obj, Skill) and obj not in session.new:
+            state = inspect(obj)
+            if (
+                obj in session.deleted
+                or state.attrs.parent_id.history.has_changes()
+                or state.attrs.parent.history.has_changes()
+            ):
+                moved_below |= _values(obj, "parent_id")
+
+    if not (individuals or requirements or removed_individuals or moved_below):
+        return
+
+    conn = session.connection()
+    if moved_below:
+        # Moving a skill changes what meets requirements on its old and new ancestors
+        ancestors = _with_ancestors(conn, moved_below)
+        requirements |= _requirements_needing(
+            conn, SkillRequirement, "skill_id", ancestors
+        )
+    if individuals:
+        skill_ids = _with_ancestors(conn, skill_ids)
+        affected = _requirements_needing(conn, SkillRequirement, "skill_id", skill_ids)
+        affected |= _requirements_needing(conn, RoleRequirement, "role_id", role_ids)
+        if windows:
+            affected |= _requirements_overlapping(conn, windows)
+        if affected:
+            _replace(
+                conn, affected, individuals, _evaluate(conn, affected, individuals)
+            )
+    if requirements:
+        _replace(conn, requirements, None, _evaluate(conn, requirements))
+    if removed_individuals:
+        _replace(conn, None, removed_individuals, {})
+
+
+def enable_eligibility_maintenance(target) -> None:
+    """
+    Install the eligibility maintenance hook on a Session class or sessionmaker.
+
+    Calling this more than once for the same target has no further effect.
+    Install it after enable_taxonomy_maintenance so that the skill closure is
+    already up to date when eligibility is re-evaluated.
+
+    Args:
+        target: A Session subclass or a sessionmaker instance.
+    """
+    install_hook(target, "after_flush", _maintain_eligibility)
+
+
+def rebuild_eligibility(db: Session) -> int:
+    """
+    Rebuild the whole eligibility index from the source tables.
+
+    Args:
+        db (Session): The database session.
+
+    Returns:
+        int: The number of eligible pairs stored.
+    """
+    conn = db.connection()
+    pairs = _evaluate(conn)
+    _replace(conn, None, None, pairs)
+    logger.info(f"Rebuilt eligibility index with {len(pairs)} pairs.")
+    return len(pairs)
+
+
+def verify_eligibility(
+    db: Session,
+) -> List[Tuple[int, int, Optional[float], Optional[float]]]:
+    """
+    Compare the stored eligibility index with a full re-evaluation.
+
+    Args:
+        db (Session): The database session.
+
+    Returns:
+        List[Tuple[int, int, Optional[float], Optional[float]]]: One
+        (requirement_id, individual_id, expected_score, stored_score) tuple per
+        discrepancy; a score is None when the pair is missing on that side. An
+        empty list means the index is consistent.
+    """
+    conn = db.connection()
+    expected = _evaluate(conn)
+    table = RequirementEligibility.__table__
+    stored = {
+        (row.requirement_id, row.individual_id): row.score
+        for row in conn.execute(
+            select(table.c.requirement_id, table.c.individual_id, table.c.score)
+        )
+    }
+
+    discrepancies = []
+    for pair in sorted(set(expected) | set(stored)):
+        expected_score, stored_score = expected.get(pair), stored.get(pair)
+        if (
+            expected_score is None
+            or stored_score is None
+            or abs(expected_score - stored_score) > SCORE_TOLERANCE
+        ):
+            discrepancies.append((*pair, expected_score, stored_score))
+    if discrepancies:
+        logger.warning(f"Eligibility index has {len(discrepancies)} discrepancies.")
+    return discrepancies
+
+
+def eligible_individuals(
+    db: Session, requirement_id: int, limit: Optional[int] = None
+) -> List[RequirementEligibility]:
+    """
+    Get the individuals eligible for a project requirement, best score first.
+
+    Args:
+        db (Session): The database session.
+        requirement_id (int): The ID of the project requirement.
+        limit (Optional[int]): The maximum number of rows to return.
+
+    Returns:
+        List[RequirementEligibility]: The stored eligibility rows.
+    """
+    stmt = (
+        select(RequirementEligibility)
+        .where(RequirementEligibility.requirement_id == requirement_id)
+        .order_by(
+            RequirementEligibility.score.desc(), RequirementEligibility.individual_id
+        )
+        .limit(limit)
+    )
+    return list(db.scalars(stmt))
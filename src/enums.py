@@ -0,0 +1,110 @@
+"""
+Integer-coded enumerations for the Resource Allocation System.
+
+Statuses and employment types repeat in every row and index entry of the
+largest tables. They are stored as small integer codes through the
+CodedEnum column type, while Python code keeps reading and writing the
+enum members, which are also plain strings: Assignment.status compares
+equal to "Assigned", and plain strings are accepted wherever a member is.
+
+The code of a member is its position in the class, starting at 1. Codes
+are stored in the database, so new members must be appended and existing
+ones never reordered or removed.
+
+This module must not import src.models, since the models import it.
+"""
+
+from enum import Enum
+from typing import Dict, Optional, Type
+
+from sqlalchemy import SmallInteger
+from sqlalchemy.types import TypeDecorator
+
+
+class CodedStrEnum(str, Enum):
+    """A string enumeration whose members format as their value."""
+
+    def __str__(self) -> str:
+        return self.value
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self.value, format_spec)
+
+    @classmethod
+    def values(cls) -> tuple:
+        """Get the values of all members, in code order."""
+        return tuple(member.value for member in cls)
+
+
+class EmploymentType(CodedStrEnum):
+    FULL_TIME = "Full-time"
+    PART_TIME = "Part-time"
+    CONTRACT = "Contract"
+
+
+class ProjectStatus(CodedStrEnum):
+    PLANNING = "Planning"
+    PLANNED = "Planned"
+    ACTIVE = "Active"
+    IN_PROGRESS = "In Progress"
+    COMPLETED = "Completed"
+    CANCELLED = "Cancelled"
+
+
+class AssignmentStatus(CodedStrEnum):
+    ASSIGNED = "Assigned"
+    COMPLETED = "Completed"
+    CANCELLED = "Cancelled"
+
+
+class CodedEnum(TypeDecorator):
+    """
+    Stores the members of a CodedStrEnum as SMALLINT codes.
+
+    Bound values may be members or their string values; loaded values are
+    members. Binding a value outside the enumeration raises ValueError.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum: Type[CodedStrEnum]):
+        super().__init__()
+        self.enum = enum
+        self._codes: Dict[CodedStrEnum, int] = {
+            member: code for code, member in enumerate(enum, start=1)
+        }
+        self._members: Dict[int, CodedStrEnum] = {
+            code: member for member, code in self._codes.items()
+        }
+
+    def process_bind_param(self, value, dialect) -> Optional[int]:
+        if value is None:
+            return None
+        try:
+            return self._codes[self.enum(value)]
+        except ValueError:
+            raise ValueError(
+                f"Invalid {self.enum.__name__} {value!r}. Must be one of: "
+                f"{', '.join(self.enum.values())}"
+            ) from None
+
+    def process_result_value(self, value, dialect) -> Optional[CodedStrEnum]:
+        if value is None:
+            return None
+        return self._members[value]
+
+    def code(self, value) -> int:
+        """
+        Get the stored code of a member or value.
+
+        Args:
+            value: A member of the enumeration or its string value.
+
+        Returns:
+            int: The code.
+        """
+        return self.process_bind_param(value, None)
+
+    def __repr__(self) -> str:
+        return f"CodedEnum({self.enum.__name__})"
@@ -0,0 +1,47 @@
+"""
+Session event hook registration for the Resource Allocation System.
+
+Feature modules install their session hooks through these helpers so that
+installing a hook twice on the same target has no further effect.
+SQLAlchemy's event.contains() cannot be used for that check: it compares
+targets by id(), which is reused once a sessionmaker has been garbage
+collected.
+"""
+
+import weakref
+from collections import defaultdict
+from typing import Callable, DefaultDict
+
+from sqlalchemy import event
+
+_installed: DefaultDict[Callable, weakref.WeakSet] = defaultdict(weakref.WeakSet)
+
+
+def install_hook(target, identifier: str, fn: Callable) -> None:
+    """
+    Listen for an event on a target unless the hook is already installed.
+
+    Args:
+        target: A Session subclass, sessionmaker, Engine or other event target.
+        identifier (str): The event name, e.g. "after_flush".
+        fn (Callable): The listener.
+    """
+    if target in _installed[fn]:
+        return
+    event.listen(target, identifier, fn)
+    _installed[fn].add(target)
+
+
+def remove_hook(target, identifier: str, fn: Callable) -> None:
+    """
+    Remove a hook installed with install_hook.
+
+    Args:
+        target: The target the hook was installed on.
+        identifier (str): The event name.
+        fn (Callable): The listener.
+    """
+    if target not in _installed[fn]:
+        return
+    event.remove(target, identifier, fn)
+    _installed[fn].discard(target)
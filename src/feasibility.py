@@ -0,0 +1,315 @@
+"""
+Working-day-aware feasibility checks for time requirements.
+
+For every project requirement with a TimeRequirement, this module works out
+whether total_hours fits between the requirement's start and end dates at
+hours_per_week, and whether the individuals assigned to it have enough
+availability to provide those hours. Hours are spread evenly over working
+days, which are counted with numpy.busday_count against a business day
+calendar: the working week and holidays come from config.WORKWEEK_MASK and
+config.HOLIDAYS unless given explicitly.
+
+Every requirement is checked at once: the inputs are loaded as columns into
+NumPy arrays and all arithmetic is vectorized, so the check costs two
+queries and a few array operations regardless of the number of
+requirements.
+
+An assignee contributes their available hours per week, capped at the
+requirement's hours_per_week, over the working days where their assignment
+and an availability period overlap the requirement's dates. Days covered by
+several of an assignee's availability periods or assignments count once, at
+the lowest of the overlapping rates, as allocation.py does when it books
+an assignee. Availability also committed to other requirements is not
+deducted.
+
+The requirements and assignments of archived projects (see src/archive.py)
+can be checked too, for reviews of past work.
+"""
+
+import logging
+from datetime import date
+from typing import Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+import config
+from src.archive import including_archive
+from src.enums import AssignmentStatus
+from src.models import Assignment, Availability, ProjectRequirement, TimeRequirement
+
+logger = logging.getLogger(__name__)
+
+CANCELLED = AssignmentStatus.CANCELLED
+
+
+def business_calendar(
+    holidays: Optional[Iterable[Union[date, str]]] = None,
+    weekmask: Optional[str] = None,
+) -> np.busdaycalendar:
+    """
+    Build the calendar of working days.
+
+    Args:
+        holidays (Optional[Iterable[Union[date, str]]]): Non-working dates, config.HOLIDAYS by default.
+        weekmask (Optional[str]): Working weekdays, Monday first, e.g. "1111100";
+            config.WORKWEEK_MASK by default.
+
+    Returns:
+        np.busdaycalendar: The calendar.
+
+    Raises:
+        ValueError: If the weekmask has no working days.
+    """
+    holidays = config.HOLIDAYS if holidays is None else holidays
+    weekmask = config.WORKWEEK_MASK if weekmask is None else weekmask
+    if not weekmask.strip("0 "):
+        raise ValueError(f"Weekmask {weekmask!r} has no working days")
+    return np.busdaycalendar(
+        weekmask=weekmask, holidays=np.array(list(holidays), dtype="datetime64[D]")
+    )
+
+
+def working_days(
+    start: np.ndarray, end: np.ndarray, calendar: np.busdaycalendar
+) -> np.ndarray:
+    """
+    Count the working days of inclusive date ranges.
+
+    Args:
+        start (np.ndarray): First days, as datetime64[D]; NaT for unknown.
+        end (np.ndarray): Last days, as datetime64[D]; NaT for unknown.
+        calendar (np.busdaycalendar): The working day calendar.
+
+    Returns:
+        np.ndarray: The number of working days per range, 0 for empty or unknown ranges.
+    """
+    valid = ~np.isnat(start) & ~np.isnat(end) & (end >= start)
+    counts = np.zeros(len(start), dtype=np.int64)
+    counts[valid] = np.busday_count(
+        start[valid], end[valid] + np.timedelta64(1, "D"), busdaycal=calendar
+    )
+    return counts
+
+
+def disjoint_periods(
+    keys: np.ndarray, start: np.ndarray, end: np.ndarray, rates: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split overlapping inclusive date ranges into disjoint ones, per key.
+
+    Every day covered by a key's ranges is covered by exactly one of the
+    key's resulting ranges, at the lowest rate of the ranges covering it.
+
+    Args:
+        keys (np.ndarray): Non-negative integer group of each range.
+        start (np.ndarray): First days, as datetime64[D]; ranges with NaT or
+            end before start are dropped.
+        end (np.ndarray): Last days, as datetime64[D].
+        rates (np.ndarray): Rate of each range.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: The keys, first
+            days, last days and rates of the disjoint ranges, by key and date.
+    """
+    valid = ~np.isnat(start) & ~np.isnat(end) & (end >= start)
+    keys, rates = keys[valid].astype(np.int64), rates[valid]
+    first = start[valid].astype(np.int64)
+    stop = end[valid].astype(np.int64) + 1
+    if not len(keys):
+        return keys, start[valid], end[valid], rates
+    # Number days per key so that one sorted array holds every key's boundaries
+    origin, span = first.min(), stop.max() - first.min() + 1
+    lower, upper = keys * span + first - origin, keys * span + stop - origin
+    bounds = np.unique(np.concatenate([lower, upper]))
+    # A range covers the segments between its own boundaries
+    low, high = np.searchsorted(bounds, lower), np.searchsorted(bounds, upper)
+    counts = high - low
+    segments = np.repeat(low - np.cumsum(counts) + counts, counts) + np.arange(
+        counts.sum()
+    )
+    segment_rates = np.full(len(bounds) - 1, np.inf)
+    np.minimum.at(segment_rates, segments, np.repeat(rates, counts))
+    covered = np.flatnonzero(np.isfinite(segment_rates))
+    lower, upper = bounds[covered], bounds[covered + 1] - 1
+    return (
+        lower // span,
+        (lower % span + origin).astype("datetime64[D]"),
+        (upper % span + origin).astype("datetime64[D]"),
+        segment_rates[covered],
+    )
+
+
+class FeasibilityReport(NamedTuple):
+    """
+    The feasibility of every project requirement with a time requirement.
+
+    All attributes are arrays aligned with requirement_ids.
+
+    Attributes:
+        requirement_ids (np.ndarray): The IDs of the project requirements.
+        working_days (np.ndarray): Working days between the start and end dates.
+        total_hours (np.ndarray): The hours required.
+        window_hours (np.ndarray): The hours available at hours_per_week over the working days.
+        assigned_hours (np.ndarray): The hours the assignees' availability can provide.
+        fits_window (np.ndarray): Whether total_hours fits between the dates.
+        fits_staffing (np.ndarray): Whether the assignees can provide total_hours.
+    """
+
+    requirement_ids: np.ndarray
+    working_days: np.ndarray
+    total_hours: np.ndarray
+    window_hours: np.ndarray
+    assigned_hours: np.ndarray
+    fits_window: np.ndarray
+    fits_staffing: np.ndarray
+
+    def infeasible(self) -> List[int]:
+        """Get the IDs of the requirements whose hours cannot fit between their dates."""
+        return self.requirement_ids[~self.fits_window].tolist()
+
+    def understaffed(self) -> List[int]:
+        """Get the IDs of the requirements that fit their dates but not their assignees."""
+        return self.requirement_ids[self.fits_window & ~self.fits_staffing].tolist()
+
+
+# The Julian day number of 1970-01-01, the datetime64 epoch
+UNIX_EPOCH_JULIAN_DAY = 2440587.5
+
+
+def epoch_day(column):
+    """Select a date column as days since 1970-01-01, which NumPy reads without parsing."""
+    return func.julianday(column) - UNIX_EPOCH_JULIAN_DAY
+
+
+def epoch_dates(days: np.ndarray) -> np.ndarray:
+    """Convert days since 1970-01-01, NaN for unknown, to datetime64[D]."""
+    dates = np.full(len(days), np.datetime64("NaT"), dtype="datetime64[D]")
+    known = ~np.isnan(days)
+    dates[known] = days[known].astype(np.int64)
+    return dates
+
+
+def fetch_columns(db: Session, stmt, width: int) -> np.ndarray:
+    """Run a query of numeric columns and return its columns, NULLs as NaN."""
+    rows = db.connection().execute(stmt).all()
+    if not rows:
+        return np.empty((width, 0), dtype=np.float64)
+    return np.array(list(zip(*rows)), dtype=np.float64)
+
+
+def check_feasibility(
+    db: Session,
+    calendar: Optional[np.busdaycalendar] = None,
+    requirement_ids: Optional[Iterable[int]] = None,
+    include_archive: bool = False,
+) -> FeasibilityReport:
+    """
+    Check the time requirements of project requirements against their dates and assignees.
+
+    Args:
+        db (Session): The database session.
+        calendar (Optional[np.busdaycalendar]): The working day calendar,
+            business_calendar() by default.
+        requirement_ids (Optional[Iterable[int]]): Restrict the check to these
+            requirements, all by default.
+        include_archive (bool): Check archived requirements too; the session's
+            engine must have the archive attached.
+
+    Returns:
+        FeasibilityReport: One entry per requirement with a time requirement, by id.
+
+    Raises:
+        ValueError: If the calendar has no working days.
+    """
+    calendar = calendar if calendar is not None else business_calendar()
+    days_per_week = int(calendar.weekmask.sum())
+    if not days_per_week:
+        raise ValueError("The business calendar has no working days")
+    requirements, times, assignments = ProjectRequirement, TimeRequirement, Assignment
+    if include_archive:
+        requirements, times, assignments = map(
+            including_archive, (requirements, times, assignments)
+        )
+    restrict = (
+        [times.requirement_id.in_(list(requirement_ids))]
+        if requirement_ids is not None
+        else []
+    )
+
+    stmt = (
+        select(
+            requirements.id,
+            epoch_day(requirements.start_date),
+            epoch_day(requirements.end_date),
+            times.hours_per_week,
+            times.total_hours,
+        )
+        .join(times, times.requirement_id == requirements.id)
+        .where(*restrict)
+        .order_by(requirements.id)
+    )
+    ids, starts, ends, hours_per_week, total_hours = fetch_columns(db, stmt, 5)
+    ids = ids.astype(np.int64)
+    starts, ends = epoch_dates(starts), epoch_dates(ends)
+
+    days = working_days(starts, ends, calendar)
+    window_hours = days * hours_per_week / days_per_week
+
+    # Each assignee's availability periods overlapping their assignment
+    pairs = (
+        select(
+            assignments.requirement_id,
+            assignments.individual_id,
+            epoch_day(assignments.start_date),
+            epoch_day(assignments.end_date),
+            epoch_day(Availability.start_date),
+            epoch_day(Availability.end_date),
+            Availability.hours_per_week,
+        )
+        .join(
+            Availability,
+            and_(
+                Availability.individual_id == assignments.individual_id,
+                Availability.start_date <= assignments.end_date,
+                Availability.end_date >= assignments.start_date,
+            ),
+        )
+        .join(times, times.requirement_id == assignments.requirement_id)
+        .where(
+            assignments.status.is_(None) | (assignments.status != CANCELLED), *restrict
+        )
+    )
+    owners, individuals, *periods, rates = fetch_columns(db, pairs, 7)
+    owners = np.searchsorted(ids, owners.astype(np.int64))
+    assigned_start, assigned_end, available_start, available_end = map(
+        epoch_dates, periods
+    )
+    # Clip each period to the requirement's dates too
+    lo = np.maximum.reduce([assigned_start, available_start, starts[owners]])
+    hi = np.minimum.reduce([assigned_end, available_end, ends[owners]])
+    rates = np.minimum(rates, hours_per_week[owners])
+    # Count each assignee's days once, however many of their periods overlap
+    individuals = individuals.astype(np.int64)
+    width = individuals.max(initial=0) + 1
+    assignees, keys = np.unique(owners * width + individuals, return_inverse=True)
+    keys, lo, hi, rates = disjoint_periods(keys, lo, hi, rates)
+    owners = assignees[keys] // width
+    supplied = working_days(lo, hi, calendar) * rates / days_per_week
+    assigned_hours = np.bincount(owners, weights=supplied, minlength=len(ids))
+
+    report = FeasibilityReport(
+        requirement_ids=ids,
+        working_days=days,
+        total_hours=total_hours,
+        window_hours=window_hours,
+        assigned_hours=assigned_hours,
+        fits_window=window_hours >= total_hours,
+        fits_staffing=assigned_hours >= total_hours,
+    )
+    logger.info(
+        f"Checked {len(ids)} time requirements: {int((~report.fits_window).sum())} "
+        f"do not fit their dates, {len(report.understaffed())} are understaffed."
+    )
+    return report
@@ -0,0 +1,304 @@
+"""
+Weekly supply and demand forecasts by role or skill.
+
+Demand is the hours per week project requirements need over their dates:
+RoleRequirement.number_needed times TimeRequirement.hours_per_week for each
+role, and hours_per_week times the requirement's total headcount (at least
+one) for each required skill. Supply is the Availability hours per week of
+the individuals holding a role, from the role's start date, or a skill.
+Someone holding several roles or skills counts towards each of them.
+
+Hours per week are spread evenly over the calendar days of each interval,
+so an interval covering part of a week contributes its share of that week.
+All intervals are binned at once: every interval adds its daily rate at its
+first day and removes it after its last day in a difference array, one row
+per role or skill, whose running sum over days is summed per week. The
+cost is a query per side and a few array operations, whatever the number
+of weeks or roles.
+
+Demand can include the requirements of archived projects (see
+src/archive.py), for forecasts of past weeks.
+
+cached_forecast() keeps forecasts in a ReportCache (see
+src/report_cache.py) until one of the tables they were computed from is
+written.
+"""
+
+import logging
+from datetime import date, timedelta
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.archive import including_archive
+from src.feasibility import epoch_day, fetch_columns
+from src.models import (
+    Availability,
+    IndividualRole,
+    IndividualSkill,
+    ProjectRequirement,
+    RoleRequirement,
+    SkillRequirement,
+    TimeRequirement,
+)
+from src.report_cache import ReportCache, register_result_type
+
+logger = logging.getLogger(__name__)
+
+ROLE = "role"
+SKILL = "skill"
+
+# The tables each forecast dimension is computed from
+SOURCE_TABLES = {
+    ROLE: (
+        "role_requirements",
+        "project_requirements",
+        "time_requirements",
+        "individual_roles",
+        "availabilities",
+    ),
+    SKILL: (
+        "skill_requirements",
+        "role_requirements",
+        "project_requirements",
+        "time_requirements",
+        "individual_skills",
+        "availabilities",
+    ),
+}
+
+
+@register_result_type
+class Forecast(NamedTuple):
+    """
+    Weekly demand and supply hours by role or skill.
+
+    Attributes:
+        dimension (str): "role" or "skill".
+        weeks (np.ndarray): The first day (a Monday) of each week, as datetime64[D].
+        keys (np.ndarray): The role or skill IDs, ascending; one row of demand and supply each.
+        demand (np.ndarray): Hours needed, shaped (len(keys), len(weeks)).
+        supply (np.ndarray): Hours available, shaped (len(keys), len(weeks)).
+    """
+
+    dimension: str
+    weeks: np.ndarray
+    keys: np.ndarray
+    demand: np.ndarray
+    supply: np.ndarray
+
+    def gap(self) -> np.ndarray:
+        """Get supply minus demand per key and week; negative where short."""
+        return self.supply - self.demand
+
+    def shortfalls(self, tolerance: float = 1e-6) -> List[Tuple[int, date, float]]:
+        """
+        List the weeks where demand exceeds supply.
+
+        Args:
+            tolerance (float): Shortfalls of at most this many hours are ignored.
+
+        Returns:
+            List[Tuple[int, date, float]]: (key, week start, missing hours), by key then week.
+        """
+        gap = self.gap()
+        return [
+            (int(self.keys[row]), self.weeks[column].item(), float(-gap[row, column]))
+            for row, column in zip(*np.nonzero(gap < -tolerance))
+        ]
+
+
+def week_start(day: date) -> date:
+    """Get the Monday of the week containing a day."""
+    return day - timedelta(days=day.weekday())
+
+
+def _bin_weekly(
+    columns: np.ndarray, keys: np.ndarray, first_day: int, weeks: int
+) -> np.ndarray:
+    """
+    Accumulate hours-per-week intervals into weekly bins.
+
+    Args:
+        columns (np.ndarray): Rows of key, first day, last day and hours per week,
+            with days since 1970-01-01.
+        keys (np.ndarray): The sorted keys, one output row each.
+        first_day (int): The first day of the first week, in days since 1970-01-01.
+        weeks (int): The number of weeks.
+
+    Returns:
+        np.ndarray: The hours per key and week.
+    """
+    owner, start, end, rate = columns
+    days = weeks * 7
+    # Day offsets into the horizon, with end exclusive
+    start = np.clip(start - first_day, 0, days)
+    end = np.clip(end - first_day + 1, 0, days)
+    inside = end > start
+    row = np.searchsorted(keys, owner[inside]) * (days + 1)
+    daily_rate = rate[inside] / 7
+    diff = np.bincount(
+        np.concatenate([row + start[inside], row + end[inside]]).astype(np.int64),
+        weights=np.concatenate([daily_rate, -daily_rate]),
+        minlength=len(keys) * (days + 1),
+    ).reshape(len(keys), days + 1)
+    daily = np.cumsum(diff[:, :days], axis=1)
+    return daily.reshape(len(keys), weeks, 7).sum(axis=2)
+
+
+def _demand_query(dimension: str, first: date, last: date, include_archive: bool):
+    requirements, times, roles, skills = (
+        ProjectRequirement,
+        TimeRequirement,
+        RoleRequirement,
+        SkillRequirement,
+    )
+    if include_archive:
+        requirements, times, roles, skills = map(
+            including_archive, (requirements, times, roles, skills)
+        )
+    overlaps = (requirements.start_date <= last) & (requirements.end_date >= first)
+    if dimension == ROLE:
+        key, rate = roles.role_id, roles.number_needed * times.hours_per_week
+        source = roles
+    else:
+        headcount = (
+            select(func.sum(roles.number_needed))
+            .where(roles.requirement_id == skills.requirement_id)
+            .scalar_subquery()
+        )
+        key = skills.skill_id
+        rate = times.hours_per_week * func.max(func.coalesce(headcount, 1), 1)
+        source = skills
+    return (
+        select(
+            key,
+            epoch_day(requirements.start_date),
+            epoch_day(requirements.end_date),
+            rate,
+        )
+        .select_from(source)
+        .join(requirements, requirements.id == source.requirement_id)
+        .join(times, times.requirement_id == requirements.id)
+        .where(overlaps)
+    )
+
+
+def _supply_query(dimension: str, first: date, last: date):
+    overlaps = (Availability.start_date <= last) & (Availability.end_date >= first)
+    if dimension == ROLE:
+        return (
+            select(
+                IndividualRole.role_id,
+                epoch_day(func.max(Availability.start_date, IndividualRole.start_date)),
+                epoch_day(Availability.end_date),
+                Availability.hours_per_week,
+            )
+            .join(
+                IndividualRole,
+                IndividualRole.individual_id == Availability.individual_id,
+            )
+            .where(overlaps, IndividualRole.start_date <= Availability.end_date)
+        )
+    return (
+        select(
+            IndividualSkill.skill_id,
+            epoch_day(Availability.start_date),
+            epoch_day(Availability.end_date),
+            Availability.hours_per_week,
+        )
+        .join(
+            IndividualSkill, IndividualSkill.individual_id == Availability.individual_id
+        )
+        .where(overlaps)
+    )
+
+
+def forecast(
+    db: Session,
+    dimension: str = ROLE,
+    start: Optional[date] = None,
+    weeks: int = 52,
+    include_archive: bool = False,
+) -> Forecast:
+    """
+    Forecast weekly demand and supply hours by role or skill.
+
+    Args:
+        db (Session): The database session.
+        dimension (str): "role" or "skill".
+        start (Optional[date]): A day of the first week, today by default.
+        weeks (int): The number of weeks to forecast.
+        include_archive (bool): Include the demand of archived projects; the
+            session's engine must have the archive attached.
+
+    Returns:
+        Forecast: The weekly hours of every role or skill with demand or supply
+        in the horizon.
+
+    Raises:
+        ValueError: If the dimension is unknown or weeks is less than 1.
+    """
+    if dimension not in SOURCE_TABLES:
+        raise ValueError(f"Unknown forecast dimension: {dimension}")
+    if weeks < 1:
+        raise ValueError("weeks must be at least 1")
+
+    first = week_start(start or date.today())
+    last = first + timedelta(days=weeks * 7 - 1)
+    demand = fetch_columns(
+        db, _demand_query(dimension, first, last, include_archive), 4
+    )
+    supply = fetch_columns(db, _supply_query(dimension, first, last), 4)
+
+    keys = np.unique(np.concatenate([demand[0], supply[0]]))
+    first_day = (first - date(1970, 1, 1)).days
+    result = Forecast(
+        dimension=dimension,
+        weeks=np.datetime64(first, "D") + np.arange(weeks) * 7,
+        keys=keys.astype(np.int64),
+        demand=_bin_weekly(demand, keys, first_day, weeks),
+        supply=_bin_weekly(supply, keys, first_day, weeks),
+    )
+    logger.info(
+        f"Forecast {weeks} weeks from {first} for {len(keys)} {dimension}s from "
+        f"{demand.shape[1]} demand and {supply.shape[1]} supply intervals."
+    )
+    return result
+
+
+def cached_forecast(
+    cache: ReportCache,
+    db: Session,
+    dimension: str = ROLE,
+    start: Optional[date] = None,
+    weeks: int = 52,
+    include_archive: bool = False,
+) -> Forecast:
+    """
+    Get a forecast from a report cache, computing it only if its source tables changed.
+
+    Args:
+        cache (ReportCache): The report cache.
+        db (Session): The database session.
+        dimension (str): "role" or "skill".
+        start (Optional[date]): A day of the first week, today by default.
+        weeks (int): The number of weeks to forecast.
+        include_archive (bool): Include the demand of archived projects.
+
+    Returns:
+        Forecast: The forecast, as returned by forecast().
+    """
+    first = week_start(start or date.today())
+    return cache.get_or_compute(
+        "forecast",
+        SOURCE_TABLES.get(dimension, ()),
+        lambda: forecast(db, dimension, first, weeks, include_archive),
+        db,
+        dimension=dimension,
+        start=first,
+        weeks=weeks,
+        include_archive=include_archive,
+    )
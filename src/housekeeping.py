@@ -0,0 +1,174 @@
+"""
+Set-based lifecycle operations for the Resource Allocation System.
+
+Each operation here is a single UPDATE statement rather than a loop over
+loaded objects, so nightly housekeeping holds the SQLite write lock for
+milliseconds instead of minutes. The statements bypass the session flush,
+so every operation reports the rows it touched to the change log itself.
+updated_at is maintained by the column's onupdate default, which also
+applies to UPDATE statements; versioned rows get their version_id bumped
+explicitly so concurrent optimistic writers see the change.
+
+The operations do not commit; the caller decides the transaction boundary.
+"""
+
+import logging
+from datetime import date
+from typing import Dict, List, Optional, Type
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from src.change_log import UPDATE, record_changes
+from src.enums import AssignmentStatus, ProjectStatus
+from src.models import Assignment, BaseModel, Project, ProjectRequirement
+
+logger = logging.getLogger(__name__)
+
+COMPLETED = AssignmentStatus.COMPLETED
+CANCELLED = AssignmentStatus.CANCELLED
+
+# Statuses that housekeeping never changes
+CLOSED_STATUSES = (COMPLETED, CANCELLED)
+CLOSED_PROJECT_STATUSES = (ProjectStatus.COMPLETED, ProjectStatus.CANCELLED)
+
+
+def _execute(db: Session, model: Type[BaseModel], stmt, columns: List[str]) -> int:
+    """Run an UPDATE ... RETURNING id and record the affected rows."""
+    ids = list(
+        db.scalars(
+            stmt.returning(model.id).execution_options(synchronize_session="fetch")
+        )
+    )
+    record_changes(db, model.__tablename__, ids, UPDATE, [*columns, "updated_at"])
+    return len(ids)
+
+
+def close_expired_assignments(db: Session, today: Optional[date] = None) -> int:
+    """
+    Mark every open assignment whose end date has passed as completed.
+
+    Args:
+        db (Session): The database session.
+        today (Optional[date]): The reference date, defaults to today.
+
+    Returns:
+        int: The number of assignments closed.
+    """
+    today = today or date.today()
+    stmt = (
+        update(Assignment)
+        .where(
+            Assignment.end_date < today,
+            Assignment.status.is_(None) | Assignment.status.not_in(CLOSED_STATUSES),
+        )
+        .values(status=COMPLETED, version_id=Assignment.version_id + 1)
+    )
+    count = _execute(db, Assignment, stmt, ["status", "version_id"])
+    logger.info(f"Closed {count} expired assignments.")
+    return count
+
+
+def complete_finished_projects(db: Session, today: Optional[date] = None) -> int:
+    """
+    Mark every open project whose end date has passed as completed.
+
+    Args:
+        db (Session): The database session.
+        today (Optional[date]): The reference date, defaults to today.
+
+    Returns:
+        int: The number of projects completed.
+    """
+    today = today or date.today()
+    stmt = (
+        update(Project)
+        .where(
+            Project.end_date < today,
+            Project.status.is_(None) | Project.status.not_in(CLOSED_PROJECT_STATUSES),
+        )
+        .values(status=ProjectStatus.COMPLETED)
+    )
+    count = _execute(db, Project, stmt, ["status"])
+    logger.info(f"Completed {count} finished projects.")
+    return count
+
+
+def _clamp(value, low: date, high: date):
+    """SQL for a date column expression limited to between low and high."""
+    return func.max(func.min(value, high), low)
+
+
+def reschedule_requirement(
+    db: Session, requirement: ProjectRequirement, start_date: date, end_date: date
+) -> int:
+    """
+    Move a project requirement to new dates and shift its assignments with it.
+
+    Every assignment on the requirement is moved by the same number of days
+    as the requirement's start date, and its dates are then clamped to the
+    new dates of the requirement, so it never starts after it ends. A
+    requirement without a start date has nothing to shift from; its
+    assignments are only clamped.
+
+    Args:
+        db (Session): The database session.
+        requirement (ProjectRequirement): The requirement to move.
+        start_date (date): The new start date.
+        end_date (date): The new end date.
+
+    Returns:
+        int: The number of assignments moved.
+
+    Raises:
+        ValueError: If end_date is before start_date.
+    """
+    if end_date < start_date:
+        raise ValueError("End date must not be before the start date")
+
+    days = (start_date - requirement.start_date).days if requirement.start_date else 0
+    shift = f"{days:+d} days"
+    requirement.start_date = start_date
+    requirement.end_date = end_date
+    # Flush the requirement through the ORM so its session hooks run
+    db.flush()
+
+    stmt = (
+        update(Assignment)
+        .where(Assignment.requirement_id == requirement.id)
+        .values(
+            start_date=_clamp(
+                func.date(Assignment.start_date, shift), start_date, end_date
+            ),
+            end_date=_clamp(
+                func.date(Assignment.end_date, shift), start_date, end_date
+            ),
+            version_id=Assignment.version_id + 1,
+        )
+    )
+    count = _execute(db, Assignment, stmt, ["start_date", "end_date", "version_id"])
+    logger.info(f"Moved {count} assignments of requirement {requirement.id}.")
+    return count
+
+
+def nightly_housekeeping(db: Session, today: Optional[date] = None) -> Dict[str, int]:
+    """
+    Run the nightly lifecycle updates in one short transaction.
+
+    Args:
+        db (Session): The database session.
+        today (Optional[date]): The reference date, defaults to today.
+
+    Returns:
+        Dict[str, int]: The number of rows affected by each operation.
+    """
+    try:
+        counts = {
+            "assignments_closed": close_expired_assignments(db, today),
+            "projects_completed": complete_finished_projects(db, today),
+        }
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return counts
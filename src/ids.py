@@ -0,0 +1,125 @@
+"""
+Client-side id allocation for the Resource Allocation System.
+
+Building an object graph one flush at a time, just to learn each parent's
+autoincrement id, costs a round trip and a partial unit of work per object.
+Instead, blocks of ids are reserved from the id_sequences table (the hi/lo
+pattern) and handed out in memory, so a whole graph can be built with its
+foreign keys filled in and written by a single batched flush.
+
+A block starts above the highest id already in the table, so allocated ids
+never collide with rows inserted by autoincrement before the reservation.
+They can collide with rows inserted by autoincrement after it: SQLite gives
+such a row the highest id in use plus one, which may be an id in the block
+that has not been handed out yet. The tables have no AUTOINCREMENT sequence
+that could be moved past the block, so while a transaction allocates ids for
+a table, every row it inserts into that table must take its id from the
+allocator. Blocks are reserved inside the session's transaction and only
+hold for it; an IdAllocator drops its blocks when the transaction ends.
+"""
+
+import logging
+from typing import Dict, Iterator, Optional, Type, TypeVar
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session, SessionTransaction
+
+from src.models import BaseModel, IdSequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOCK_SIZE = 100
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def reserve_ids(db: Session, model: Type[BaseModel], count: int) -> range:
+    """
+    Reserve a block of consecutive ids for a table.
+
+    Args:
+        db (Session): The database session.
+        model (Type[BaseModel]): The model to reserve ids for.
+        count (int): The number of ids to reserve.
+
+    Returns:
+        range: The reserved ids.
+
+    Raises:
+        ValueError: If count is not positive.
+    """
+    if count <= 0:
+        raise ValueError("Must reserve at least one id")
+
+    table = model.__table__
+    floor = select(func.coalesce(func.max(table.c.id), 0) + 1).scalar_subquery()
+    stmt = (
+        update(IdSequence)
+        .where(IdSequence.name == table.name)
+        .values(next_value=func.max(IdSequence.next_value, floor) + count)
+        .returning(IdSequence.next_value)
+        .execution_options(synchronize_session=False)
+    )
+    # Reserving must not flush the half-built graph waiting for these ids
+    with db.no_autoflush:
+        end = db.scalar(stmt)
+        if end is None:
+            db.execute(insert(IdSequence).values(name=table.name, next_value=1))
+            end = db.scalar(stmt)
+    logger.debug(f"Reserved {table.name} ids {end - count} to {end - 1}.")
+    return range(end - count, end)
+
+
+class IdAllocator:
+    """
+    Hands out primary keys from blocks reserved with reserve_ids().
+
+    Within the session's transaction, new rows for a table the allocator has
+    handed out ids for must get their ids from it rather than autoincrement.
+
+    Attributes:
+        db (Session): The session whose transaction the blocks are reserved in.
+        block_size (int): The number of ids reserved per table at a time.
+    """
+
+    def __init__(self, db: Session, block_size: int = DEFAULT_BLOCK_SIZE):
+        self.db = db
+        self.block_size = block_size
+        self._blocks: Dict[str, Iterator[int]] = {}
+        self._transaction: Optional[SessionTransaction] = None
+
+    def next_id(self, model: Type[BaseModel]) -> int:
+        """
+        Get the next unused id for a table.
+
+        Args:
+            model (Type[BaseModel]): The model to allocate an id for.
+
+        Returns:
+            int: The allocated id.
+        """
+        # Unused ids from an ended transaction may since have gone to other rows
+        if self.db.get_transaction() is not self._transaction:
+            self._blocks.clear()
+        name = model.__tablename__
+        value = next(self._blocks.get(name, iter(())), None)
+        if value is None:
+            block = iter(reserve_ids(self.db, model, self.block_size))
+            self._blocks[name] = block
+            self._transaction = self.db.get_transaction()
+            value = next(block)
+        return value
+
+    def assign(self, obj: ModelT) -> ModelT:
+        """
+        Give an object an id unless it already has one.
+
+        Args:
+            obj (ModelT): The new object.
+
+        Returns:
+            ModelT: The same object, for use in expressions.
+        """
+        if obj.id is None:
+            obj.id = self.next_id(type(obj))
+        return obj
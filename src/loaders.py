@@ -0,0 +1,236 @@
+"""
+Batched relationship loading for the Resource Allocation System.
+
+Resolving a nested field such as individual -> skills -> skill for a list
+of parents one parent at a time lazy loads each relationship with its own
+query. A BatchLoader, created once per request, loads a relationship for
+many parents with one IN query per chunk of keys instead, and remembers
+what it loaded for the rest of the request. Loaded values are also set on
+the parents as their committed relationship values, so reading the
+attribute afterwards does not query again.
+
+Synchronous callers hand the loader the whole list of parents:
+``loader.load_many(individuals, "skills")`` or
+``loader.prime(projects, "requirements.assignments.individual")``, which
+costs one query per level of the path rather than one per parent.
+
+Asyncio callers await ``loader.load(parent, "skills")`` one parent at a
+time, typically from resolvers run with asyncio.gather(). Loads requested
+within one tick of the event loop are collected and fetched together when
+the tick ends, one query per relationship, so a tree of resolvers costs
+one query per level as well. The session may be a Session or an
+AsyncSession.
+
+Every relationship between the models in src.models joins on one foreign
+key column, which is what the loader supports.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Type, Union
+
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import RelationshipProperty, Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.models import BaseModel
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 500
+
+
+@lru_cache(maxsize=None)
+def _relationship(model: Type[BaseModel], name: str) -> RelationshipProperty:
+    """Get a relationship of a model, checking that the loader supports it."""
+    relationships = inspect(model).relationships
+    if name not in relationships:
+        raise ValueError(f"{model.__name__} has no relationship {name}")
+    relationship = relationships[name]
+    if len(relationship.local_remote_pairs) != 1 or relationship.secondary is not None:
+        raise ValueError(f"Cannot batch load relationship {model.__name__}.{name}")
+    return relationship
+
+
+@lru_cache(maxsize=None)
+def _key_attributes(relationship: RelationshipProperty) -> Tuple[str, str]:
+    """Get the attribute holding the key on the parent and on the target."""
+    ((local, remote),) = relationship.local_remote_pairs
+    return (
+        relationship.parent.get_property_by_column(local).key,
+        relationship.mapper.get_property_by_column(remote).key,
+    )
+
+
+class BatchLoader:
+    """
+    Loads relationships of many parents with one IN query per relationship.
+
+    Create one loader per request: what it loads is memoized and never
+    refreshed.
+
+    Attributes:
+        db (Union[Session, AsyncSession]): The session queried.
+        queries (int): The number of queries issued so far.
+    """
+
+    def __init__(self, db: Union[Session, AsyncSession]):
+        self.db = db
+        self.queries = 0
+        # Loaded values by relationship and key
+        self._cache: Dict[RelationshipProperty, Dict[Any, Any]] = defaultdict(dict)
+        # Keys and their waiting futures, by relationship, for the current tick
+        self._pending: Dict[RelationshipProperty, Dict[Any, List[asyncio.Future]]] = (
+            defaultdict(lambda: defaultdict(list))
+        )
+        self._dispatch_scheduled = False
+
+    def _fetch(
+        self, db: Session, relationship: RelationshipProperty, keys: Iterable[Any]
+    ) -> None:
+        """Query the related objects of the keys not loaded yet and cache them."""
+        cache = self._cache[relationship]
+        wanted = sorted({key for key in keys if key not in cache and key is not None})
+        if not wanted:
+            return
+        target = relationship.mapper.class_
+        _, remote = _key_attributes(relationship)
+        found: Dict[Any, List[BaseModel]] = defaultdict(list)
+        for start in range(0, len(wanted), CHUNK_SIZE):
+            chunk = wanted[start : start + CHUNK_SIZE]
+            stmt = (
+                select(target)
+                .where(getattr(target, remote).in_(chunk))
+                .order_by(target.id)
+            )
+            self.queries += 1
+            for obj in db.scalars(stmt):
+                found[getattr(obj, remote)].append(obj)
+        for key in wanted:
+            matches = found.get(key, [])
+            if relationship.uselist:
+                cache[key] = matches
+            else:
+                cache[key] = matches[0] if matches else None
+
+    def _value(self, relationship: RelationshipProperty, parent: BaseModel) -> Any:
+        """Get a parent's cached value and set it on the parent."""
+        local, _ = _key_attributes(relationship)
+        key = getattr(parent, local)
+        if key is None:
+            value = [] if relationship.uselist else None
+        else:
+            value = self._cache[relationship][key]
+        set_committed_value(parent, relationship.key, value)
+        return value
+
+    def load_many(self, parents: Sequence[BaseModel], name: str) -> List[Any]:
+        """
+        Load one relationship of many parents of the same model.
+
+        Parents whose relationship is already loaded are not queried for.
+
+        Args:
+            parents (Sequence[BaseModel]): The parents.
+            name (str): The relationship to load.
+
+        Returns:
+            List[Any]: The value of the relationship of each parent: a list,
+                or an object or None for a many-to-one relationship.
+
+        Raises:
+            ValueError: If the loader cannot load the relationship.
+            TypeError: If the loader's session is an AsyncSession.
+        """
+        if isinstance(self.db, AsyncSession):
+            raise TypeError("Use await load() with an AsyncSession")
+        if not parents:
+            return []
+        relationship = _relationship(type(parents[0]), name)
+        local, _ = _key_attributes(relationship)
+        unloaded = [parent for parent in parents if name not in parent.__dict__]
+        self._fetch(self.db, relationship, (getattr(p, local) for p in unloaded))
+        for parent in unloaded:
+            self._value(relationship, parent)
+        return [getattr(parent, name) for parent in parents]
+
+    def prime(self, parents: Sequence[BaseModel], path: str) -> None:
+        """
+        Load a dotted path of relationships, one level at a time.
+
+        Args:
+            parents (Sequence[BaseModel]): The parents, all of the same model.
+            path (str): Relationship names separated by dots, e.g. "skills.skill".
+
+        Raises:
+            ValueError: If the loader cannot load a relationship on the path.
+        """
+        level = list(parents)
+        for name in path.split("."):
+            values = self.load_many(level, name)
+            level = []
+            for value in values:
+                if isinstance(value, list):
+                    level.extend(value)
+                elif value is not None:
+                    level.append(value)
+            if not level:
+                return
+
+    async def load(self, parent: BaseModel, name: str) -> Any:
+        """
+        Load one relationship of one parent, batched with the other loads of this tick.
+
+        Args:
+            parent (BaseModel): The parent.
+            name (str): The relationship to load.
+
+        Returns:
+            Any: The value of the relationship: a list, or an object or None
+                for a many-to-one relationship.
+
+        Raises:
+            ValueError: If the loader cannot load the relationship.
+        """
+        relationship = _relationship(type(parent), name)
+        if name in parent.__dict__:
+            return getattr(parent, name)
+        local, _ = _key_attributes(relationship)
+        key = getattr(parent, local)
+        if key is None or key in self._cache[relationship]:
+            return self._value(relationship, parent)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[relationship][key].append(future)
+        if not self._dispatch_scheduled:
+            self._dispatch_scheduled = True
+            asyncio.get_running_loop().call_soon(
+                lambda: asyncio.ensure_future(self._dispatch())
+            )
+        await future
+        return self._value(relationship, parent)
+
+    async def _dispatch(self) -> None:
+        """Fetch every load requested during the tick that just ended."""
+        pending, self._pending = self._pending, defaultdict(lambda: defaultdict(list))
+        self._dispatch_scheduled = False
+        for relationship, waiting in pending.items():
+            try:
+                if isinstance(self.db, AsyncSession):
+                    await self.db.run_sync(self._fetch, relationship, list(waiting))
+                else:
+                    self._fetch(self.db, relationship, waiting)
+            except Exception as e:
+                logger.error(f"Batch load of {relationship} failed: {str(e)}")
+                for futures in waiting.values():
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(e)
+                continue
+            for futures in waiting.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_result(None)
@@ -0,0 +1,562 @@
+"""
+Operational metrics for the Resource Allocation System.
+
+A MetricsRegistry holds counters, histograms and metrics read from a
+callback at collection time, and renders them in the Prometheus text
+exposition format, to a file (for the node exporter's textfile collector)
+or on a local HTTP endpoint.
+
+enable_metrics() feeds the module-level registry from engine, pool and
+session events:
+
+- db_query_seconds: query latency per statement fingerprint. Statements
+  are normalized (literals, IN lists and multi-row VALUES collapsed) and
+  hashed; db_query_statement_info maps each fingerprint to its statement.
+- db_pool_checkout_seconds: the wait for a connection from the pool, and
+  db_pool_connections: the connections checked out, idle and in overflow.
+- db_session_seconds: the lifetime of a session's outermost transaction.
+- db_commit_seconds: the duration of commits, flush included.
+- db_rows_loaded_total: the objects loaded from query results, per model.
+
+Caches with hits and misses counters, such as a ReportCache, can be added
+with track_cache().
+
+Recording is cheap enough to leave on: a query costs two clock reads, a
+cached fingerprint lookup and a histogram update under a lock, a few
+microseconds in all.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+from src.events import install_hook
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Longest statement text exported in db_query_statement_info
+MAX_STATEMENT_LENGTH = 200
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Start times kept in Session.info
+SESSION_START_KEY = "metrics_session_start"
+COMMIT_START_KEY = "metrics_commit_start"
+
+Sample = Tuple[str, Tuple[Tuple[str, str], ...], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """
+    A monotonically increasing count, per combination of label values.
+
+    Attributes:
+        name (str): The metric name.
+        help (str): Its description.
+        labelnames (Tuple[str, ...]): The names of its labels.
+    """
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """
+        Add to the count.
+
+        Args:
+            *labels (str): The label values, in labelnames order.
+            amount (float): The amount to add.
+        """
+        with self._lock:
+            self._values[labels] += amount
+
+    def value(self, *labels: str) -> float:
+        """Get the count for label values."""
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield self.name, tuple(zip(self.labelnames, labels)), value
+
+
+class Histogram:
+    """
+    Observations counted in cumulative buckets, per combination of label values.
+
+    Attributes:
+        name (str): The metric name.
+        help (str): Its description.
+        labelnames (Tuple[str, ...]): The names of its labels.
+        buckets (Tuple[float, ...]): The bucket upper bounds, ascending.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: the count of each bucket (the last one unbounded) and the sum
+        self._values: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Record an observation.
+
+        Args:
+            value (float): The observed value.
+            *labels (str): The label values, in labelnames order.
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def count(self, *labels: str) -> int:
+        """Get the number of observations for label values."""
+        state = self._values.get(labels)
+        return sum(state[0]) if state else 0
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            values = [(labels, list(s[0]), s[1]) for labels, s in self._values.items()]
+        for labels, counts, total in values:
+            pairs = tuple(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = _format_value(bound)
+                yield f"{self.name}_bucket", (*pairs, ("le", le)), cumulative
+            yield f"{self.name}_sum", pairs, total
+            yield f"{self.name}_count", pairs, cumulative
+
+
+class CallbackMetric:
+    """
+    A metric whose values are read from a callback when collected.
+
+    Attributes:
+        name (str): The metric name.
+        help (str): Its description.
+        type (str): "gauge" or "counter".
+        labelnames (Tuple[str, ...]): The names of its labels.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        collect: Callable[[], Iterable[Tuple[Tuple[str, ...], float]]],
+        labelnames: Tuple[str, ...] = (),
+        type: str = "gauge",
+    ):
+        self.name = name
+        self.help = help
+        self.type = type
+        self.labelnames = labelnames
+        self._collect = collect
+
+    def samples(self) -> Iterator[Sample]:
+        for labels, value in self._collect():
+            yield self.name, tuple(zip(self.labelnames, labels)), value
+
+
+class MetricsRegistry:
+    """A named set of metrics, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        """
+        Add a metric, or get the metric already registered under its name.
+
+        Args:
+            metric: A Counter, Histogram or CallbackMetric.
+
+        Returns:
+            The registered metric.
+
+        Raises:
+            ValueError: If another kind of metric has the name.
+        """
+        with self._lock:
+            existing = self._metrics.setdefault(metric.name, metric)
+        if type(existing) is not type(metric):
+            raise ValueError(f"Metric {metric.name} is already registered")
+        return existing
+
+    def counter(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        """Register a Counter."""
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        """Register a Histogram."""
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition, one metric family after another.
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {_escape(metric.help)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                if labels:
+                    pairs = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels)
+                    name = f"{name}{{{pairs}}}"
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """
+        Write the exposition to a file, replacing it atomically.
+
+        Args:
+            path (str): The file, e.g. in the node exporter's textfile directory.
+        """
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(temporary, path)
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+        """
+        Serve the exposition on /metrics from a background thread.
+
+        Args:
+            port (int): The port; 0 picks a free one.
+            host (str): The interface to listen on, the loopback by default.
+
+        Returns:
+            ThreadingHTTPServer: The running server; call shutdown() to stop it.
+        """
+        # Imported here: http.server costs every command's startup, and few serve
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(
+            target=server.serve_forever, name="metrics", daemon=True
+        ).start()
+        logger.info(f"Serving metrics on http://{host}:{server.server_port}/metrics")
+        return server
+
+
+registry = MetricsRegistry()
+
+QUERY_SECONDS = registry.histogram(
+    "db_query_seconds", "Query latency by statement fingerprint.", ("fingerprint",)
+)
+CHECKOUT_SECONDS = registry.histogram(
+    "db_pool_checkout_seconds", "Wait for a connection from the pool."
+)
+SESSION_SECONDS = registry.histogram(
+    "db_session_seconds", "Lifetime of a session's outermost transaction."
+)
+COMMIT_SECONDS = registry.histogram(
+    "db_commit_seconds", "Duration of session commits, flush included."
+)
+ROWS_LOADED = registry.counter(
+    "db_rows_loaded_total", "Objects loaded from query results.", ("model",)
+)
+
+# Normalized statement text by fingerprint
+_statements: Dict[str, str] = {}
+
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_REPEATED_ROWS = re.compile(r"(\(\?\))(?:\s*,\s*\(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    Get the fingerprint of a SQL statement.
+
+    Statements differing only in literal values, in the length of IN lists
+    or in the number of VALUES rows share a fingerprint.
+
+    Args:
+        statement (str): The SQL sent to the database.
+
+    Returns:
+        str: 12 hexadecimal digits.
+    """
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(?)", normalized)
+    normalized = _REPEATED_ROWS.sub(r"\1", normalized)
+    digest = hashlib.blake2b(normalized.encode(), digest_size=6).hexdigest()
+    _statements.setdefault(digest, normalized[:MAX_STATEMENT_LENGTH])
+    return digest
+
+
+registry.register(
+    CallbackMetric(
+        "db_query_statement_info",
+        "The normalized statement of each query fingerprint.",
+        lambda: (((fp, sql), 1) for fp, sql in list(_statements.items())),
+        ("fingerprint", "statement"),
+    )
+)
+
+_pools: "weakref.WeakSet[Pool]" = weakref.WeakSet()
+
+
+def _pool_connections() -> Iterator[Tuple[Tuple[str, ...], float]]:
+    totals: Dict[str, float] = defaultdict(float)
+    for pool in list(_pools):
+        for state, method in (
+            ("checked_out", "checkedout"),
+            ("idle", "checkedin"),
+            ("overflow", "overflow"),
+        ):
+            if hasattr(pool, method):
+                totals[state] += max(getattr(pool, method)(), 0)
+    return (((state,), value) for state, value in totals.items())
+
+
+registry.register(
+    CallbackMetric(
+        "db_pool_connections",
+        "Connections of the instrumented pools, by state.",
+        _pool_connections,
+        ("state",),
+    )
+)
+
+
+# Caches exported by track_cache(), by label
+_caches: Dict[str, object] = {}
+
+
+def _cache_requests() -> Iterator[Tuple[Tuple[str, ...], float]]:
+    for name, cache in list(_caches.items()):
+        yield (name, "hit"), cache.hits
+        yield (name, "miss"), cache.misses
+
+
+def _cache_hit_ratios() -> Iterator[Tuple[Tuple[str, ...], float]]:
+    for name, cache in list(_caches.items()):
+        total = cache.hits + cache.misses
+        yield (name,), cache.hits / total if total else 0.0
+
+
+registry.register(
+    CallbackMetric(
+        "cache_requests_total",
+        "Lookups of the tracked caches, by result.",
+        _cache_requests,
+        ("cache", "result"),
+        type="counter",
+    )
+)
+registry.register(
+    CallbackMetric(
+        "cache_hit_ratio",
+        "Share of the lookups of the tracked caches that hit.",
+        _cache_hit_ratios,
+        ("cache",),
+    )
+)
+
+
+def track_cache(name: str, cache) -> None:
+    """
+    Export the hits, misses and hit ratio of a cache.
+
+    Args:
+        name (str): The cache label value.
+        cache: An object with hits and misses counters, e.g. a ReportCache.
+    """
+    _caches[name] = cache
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Engine before_cursor_execute hook starting the query clock."""
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Engine after_cursor_execute hook recording the query latency."""
+    elapsed = time.perf_counter() - conn.info["metrics_query_start"].pop()
+    QUERY_SECONDS.observe(elapsed, fingerprint(statement))
+
+
+def _handle_error(exception_context) -> None:
+    """Engine handle_error hook dropping the clock of a failed query."""
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("metrics_query_start"):
+        connection.info["metrics_query_start"].pop()
+
+
+def _time_checkouts(pool: Pool) -> None:
+    """Wrap a pool's connect() to record the wait for a connection."""
+    if getattr(pool.connect, "_timed", False):
+        return
+    connect = pool.connect
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            CHECKOUT_SECONDS.observe(time.perf_counter() - start)
+
+    timed_connect._timed = True
+    pool.connect = timed_connect
+    _pools.add(pool)
+
+
+def _engine_disposed(engine: Engine) -> None:
+    """Engine engine_disposed hook timing the checkouts of the new pool."""
+    _time_checkouts(engine.pool)
+
+
+def _session_started(session, transaction) -> None:
+    """Session after_transaction_create hook starting the session clock."""
+    if transaction.parent is None:
+        session.info[SESSION_START_KEY] = time.perf_counter()
+
+
+def _session_ended(session, transaction) -> None:
+    """Session after_transaction_end hook recording the session lifetime."""
+    if transaction.parent is None:
+        start = session.info.pop(SESSION_START_KEY, None)
+        if start is not None:
+            SESSION_SECONDS.observe(time.perf_counter() - start)
+
+
+def _commit_started(session) -> None:
+    """Session before_commit hook starting the commit clock."""
+    session.info[COMMIT_START_KEY] = time.perf_counter()
+
+
+def _commit_ended(session) -> None:
+    """Session after_commit hook recording the commit duration."""
+    start = session.info.pop(COMMIT_START_KEY, None)
+    if start is not None:
+        COMMIT_SECONDS.observe(time.perf_counter() - start)
+
+
+def _row_loaded(session, instance) -> None:
+    """Session loaded_as_persistent hook counting loaded objects per model."""
+    ROWS_LOADED.inc(type(instance).__name__)
+
+
+def enable_metrics(engine: Engine, target=None) -> None:
+    """
+    Feed the module registry from an engine, its pool and sessions.
+
+    Calling this more than once for the same engine or target has no
+    further effect.
+
+    Args:
+        engine (Engine): The engine whose queries and pool are measured.
+        target: A Session subclass or sessionmaker whose sessions are measured.
+    """
+    install_hook(engine, "before_cursor_execute", _before_cursor_execute)
+    install_hook(engine, "after_cursor_execute", _after_cursor_execute)
+    install_hook(engine, "handle_error", _handle_error)
+    install_hook(engine, "engine_disposed", _engine_disposed)
+    _time_checkouts(engine.pool)
+    if target is not None:
+        install_hook(target, "after_transaction_create", _session_started)
+        install_hook(target, "after_transaction_end", _session_ended)
+        install_hook(target, "before_commit", _commit_started)
+        install_hook(target, "after_commit", _commit_ended)
+        install_hook(target, "loaded_as_persistent", _row_loaded)
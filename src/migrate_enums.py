@@ -0,0 +1,206 @@
+"""
+Migration of string statuses and employment types to integer codes.
+
+Databases created before the columns became CodedEnum columns hold
+individuals.employment_type, projects.status and assignments.status as
+strings. SQLite cannot change the type of a column in place, so each of
+these tables is rebuilt: a copy is created with the current schema, the
+rows are copied with the strings mapped to their codes in SQL, and the copy
+replaces the original, getting back its indexes and triggers. Only the
+columns the original table has are copied; columns added to the model
+since, such as assignments.version_id, get their defaults. Every table is
+rebuilt in one transaction, so a failure leaves the database as it was.
+
+Values are checked before anything is changed, and a table is skipped when
+its column is already an integer column, so the migration can be run again
+safely. Run ``python -m src.migrate_enums`` to migrate the configured
+database, and its archive when one is configured.
+"""
+
+import logging
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import String, Table, case, select, text, type_coerce
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateTable
+
+from src.enums import CodedEnum
+from src.models import Assignment, Individual, Project
+
+logger = logging.getLogger(__name__)
+
+CODED_TABLES = (Individual.__table__, Project.__table__, Assignment.__table__)
+
+
+def _coded_column(table: Table) -> str:
+    """Get the name of a table's CodedEnum column."""
+    return next(c.name for c in table.columns if isinstance(c.type, CodedEnum))
+
+
+def _qualified(table: Table, name: Optional[str] = None) -> str:
+    """Quote a table name, with its schema if it has one."""
+    name = f'"{name or table.name}"'
+    return f'"{table.schema}".{name}' if table.schema else name
+
+
+def _declared_columns(connection: Connection, table: Table) -> Dict[str, str]:
+    """Get the declared types of the columns a table has in the database, by name."""
+    schema = f'"{table.schema}".' if table.schema else ""
+    return {
+        row[1]: row[2].upper()
+        for row in connection.exec_driver_sql(
+            f'PRAGMA {schema}table_info("{table.name}")'
+        )
+    }
+
+
+def _needs_migration(connection: Connection, table: Table, column: str) -> bool:
+    """Check whether a table's coded column is still declared as a string."""
+    declared = _declared_columns(connection, table)
+    if column not in declared:
+        raise ValueError(f"Table {table.name} has no column {column}")
+    return "INT" not in declared[column]
+
+
+def _check_values(connection: Connection, table: Table, column: str) -> None:
+    """Raise if a column holds a value without a code."""
+    coded = table.c[column].type
+    values = connection.scalars(
+        select(type_coerce(table.c[column], String)).distinct()
+    ).all()
+    unknown = [value for value in values if value not in (None, *coded.enum.values())]
+    if unknown:
+        raise ValueError(
+            f"Cannot migrate {table.name}.{column}: unknown values "
+            f"{', '.join(repr(value) for value in unknown)}"
+        )
+
+
+def _rebuild(connection: Connection, table: Table, column: str) -> int:
+    """Rebuild a table with its coded column's strings replaced by codes."""
+    coded = table.c[column].type
+    existing = _declared_columns(connection, table)
+    names = [c.name for c in table.columns if c.name in existing]
+    new = table.to_metadata(table.metadata, name=f"{table.name}_new")
+    try:
+        connection.exec_driver_sql(
+            f"DROP TABLE IF EXISTS {_qualified(table, new.name)}"
+        )
+        connection.execute(CreateTable(new))
+        codes = case(
+            {member.value: coded.code(member) for member in coded.enum},
+            value=type_coerce(table.c[column], String),
+        )
+        # Columns missing from the original get their defaults
+        copied = connection.execute(
+            new.insert().from_select(
+                names,
+                select(
+                    *(
+                        codes.label(name) if name == column else table.c[name]
+                        for name in names
+                    )
+                ),
+            )
+        ).rowcount
+        triggers = connection.scalars(
+            text(
+                f"SELECT sql FROM {_qualified(table, 'sqlite_master')} "
+                "WHERE type = 'trigger' AND tbl_name = :name"
+            ),
+            {"name": table.name},
+        ).all()
+        connection.exec_driver_sql(f"DROP TABLE {_qualified(table)}")
+        connection.exec_driver_sql(
+            f'ALTER TABLE {_qualified(table, new.name)} RENAME TO "{table.name}"'
+        )
+    finally:
+        table.metadata.remove(new)
+    for index in table.indexes:
+        index.create(connection)
+    for trigger in triggers:
+        connection.exec_driver_sql(trigger)
+    return copied
+
+
+def migrate_enums(
+    engine: Engine, tables: Optional[Iterable[Table]] = None
+) -> Dict[str, int]:
+    """
+    Convert string statuses and employment types to their integer codes.
+
+    Foreign key enforcement is switched off on the migrating connection
+    while the tables are rebuilt, as SQLite requires for referenced tables.
+
+    Args:
+        engine (Engine): A SQLite engine.
+        tables (Optional[Iterable[Table]]): The tables to migrate, all with
+            one CodedEnum column; CODED_TABLES by default.
+
+    Returns:
+        Dict[str, int]: The number of rows copied per migrated table; tables
+            already migrated are left out.
+
+    Raises:
+        ValueError: If the engine is not a SQLite engine, or a column holds a
+            value that has no code.
+    """
+    if engine.dialect.name != "sqlite":
+        raise ValueError("Only SQLite databases can be migrated")
+
+    migrated = {}
+    with engine.connect() as connection:
+        enforced = connection.exec_driver_sql("PRAGMA foreign_keys").scalar()
+        connection.exec_driver_sql("PRAGMA foreign_keys = OFF")
+        pending = []
+        for table in CODED_TABLES if tables is None else tables:
+            column = _coded_column(table)
+            if not _needs_migration(connection, table, column):
+                logger.info(f"{table.name}.{column} is already migrated.")
+                continue
+            _check_values(connection, table, column)
+            pending.append((table, column))
+        connection.commit()
+        try:
+            if pending:
+                with connection.begin():
+                    # pysqlite only opens a transaction on the first DML
+                    # statement; BEGIN makes the DDL of every rebuild part of it
+                    connection.exec_driver_sql("BEGIN IMMEDIATE")
+                    for table, column in pending:
+                        migrated[table.name] = _rebuild(connection, table, column)
+        finally:
+            connection.exec_driver_sql(f"PRAGMA foreign_keys = {int(enforced)}")
+            connection.commit()
+        for table, column in pending:
+            logger.info(
+                f"Migrated {migrated[table.name]} rows of {table.name}.{column}."
+            )
+    return migrated
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import config
+    from src.archive import ARCHIVE_TABLES
+    from src.database import get_engine
+    from src.profiling import Profiler, add_profile_argument
+
+    parser = argparse.ArgumentParser(
+        description="Convert string statuses and employment types to integer codes."
+    )
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    profiler = Profiler(args.profile)
+    tables = list(CODED_TABLES)
+    if config.ARCHIVE_DATABASE:
+        tables += [
+            ARCHIVE_TABLES[table.name]
+            for table in CODED_TABLES
+            if table.name in ARCHIVE_TABLES
+        ]
+    with profiler.phase("migrate_enums"):
+        migrate_enums(get_engine(), tables)
+    profiler.close()
@@ -1,18 +1,23 @@
 from .assignment import Assignment
 from .availability import Availability
 from .base import Base, BaseModel
+from .change_log_entry import ChangeLogEntry
 from .client import Client
+from .id_sequence import IdSequence
 from .individual import Individual
 from .individual_role import IndividualRole
 from .individual_skill import IndividualSkill
 from .project import Project
 from .project_requirement import ProjectRequirement
+from .requirement_eligibility import RequirementEligibility
 from .role import Role
 from .role_level import RoleLevel
 from .role_requirement import RoleRequirement
 from .role_type import RoleType
 from .skill import Skill
+from .skill_closure import SkillClosure
 from .skill_requirement import SkillRequirement
+from .skill_synonym import SkillSynonym
 from .time_requirement import TimeRequirement
 
 __all__ = [
@@ -33,4 +38,9 @@ __all__ = [
     "SkillRequirement",
     "RoleRequirement",
     "Assignment",
+    "ChangeLogEntry",
+    "RequirementEligibility",
+    "SkillSynonym",
+    "SkillClosure",
+    "IdSequence",
 ]
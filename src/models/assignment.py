@@ -1,10 +1,12 @@
 from datetime import date
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Date, ForeignKey, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Date, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
+from src.enums import AssignmentStatus, CodedEnum
 from src.models.base import BaseModel
+from src.validation import RowError, ValidationError, validate_fields
 
 if TYPE_CHECKING:
     from src.models.individual import Individual
@@ -21,7 +23,8 @@ class Assignment(BaseModel):
         requirement_id (Mapped[int]): The ID of the project requirement.
         start_date (Mapped[date]): The start date of the assignment.
         end_date (Mapped[date]): The end date of the assignment.
-        status (Mapped[str]): The status of the assignment.
+        status (Mapped[AssignmentStatus]): The status of the assignment, stored as a small integer code.
+        version_id (Mapped[int]): The optimistic concurrency version, bumped on every update.
         individual (Mapped["Individual"]): The assigned individual.
         requirement (Mapped["ProjectRequirement"]): The associated project requirement.
     """
@@ -34,14 +37,26 @@ class Assignment(BaseModel):
     requirement_id: Mapped[int] = mapped_column(
         ForeignKey("project_requirements.id"), nullable=False, index=True
     )
-    start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    start_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
     end_date: Mapped[date] = mapped_column(Date, nullable=False)
-    status: Mapped[str] = mapped_column(String(20))
+    status: Mapped[AssignmentStatus] = mapped_column(
+        CodedEnum(AssignmentStatus), index=True
+    )
+    version_id: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
 
     individual: Mapped["Individual"] = relationship(back_populates="assignments")
     requirement: Mapped["ProjectRequirement"] = relationship(
         back_populates="assignments"
     )
 
+    __mapper_args__ = {"version_id_col": version_id}
+
+    @validates("status")
+    def validate_status(self, key, status):
+        if status is None:
+            raise ValidationError([RowError(None, key, "Status is required")])
+        validate_fields(self.__table__, {key: status})
+        return AssignmentStatus(status)
+
     def __repr__(self) -> str:
         return f"<Assignment(id={self.id}, individual_id={self.individual_id}, requirement_id={self.requirement_id}, status='{self.status}')>"
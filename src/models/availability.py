@@ -19,6 +19,7 @@ class Availability(BaseModel):
         start_date (Mapped[date]): The start date of the availability period.
         end_date (Mapped[date]): The end date of the availability period.
         hours_per_week (Mapped[int]): The number of available hours per week.
+        version_id (Mapped[int]): The optimistic concurrency version, bumped on every update.
         individual (Mapped["Individual"]): The associated individual.
     """
 
@@ -27,11 +28,14 @@ class Availability(BaseModel):
     individual_id: Mapped[int] = mapped_column(
         ForeignKey("individuals.id"), nullable=False, index=True
     )
-    start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    start_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
     end_date: Mapped[date] = mapped_column(Date, nullable=False)
     hours_per_week: Mapped[int] = mapped_column(Integer, nullable=False)
+    version_id: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
 
     individual: Mapped["Individual"] = relationship(back_populates="availabilities")
 
+    __mapper_args__ = {"version_id_col": version_id}
+
     def __repr__(self) -> str:
         return f"<Availability(id={self.id}, individual_id={self.individual_id}, start_date='{self.start_date}', end_date='{self.end_date}')>"
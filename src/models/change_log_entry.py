@@ -0,0 +1,41 @@
+from typing import List, Optional
+
+from sqlalchemy import JSON, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column, synonym
+
+from src.models.base import BaseModel
+
+
+class ChangeLogEntry(BaseModel):
+    """
+    Represents one captured row change in the Resource Allocation System.
+
+    Entries are appended by the change capture session hook (see
+    src/change_log.py) and are never updated. The primary key doubles as the
+    sequence number; the table uses SQLite AUTOINCREMENT so sequence numbers
+    are never reused, even after old entries have been compacted away.
+
+    Attributes:
+        id (Mapped[int]): The sequence number of the change.
+        seq (Mapped[int]): Alias of id.
+        table_name (Mapped[str]): The name of the table the changed row belongs to.
+        row_id (Mapped[int]): The primary key of the changed row.
+        operation (Mapped[str]): One of "insert", "update" or "delete".
+        changed_columns (Mapped[Optional[List[str]]]): The columns changed by an update.
+    """
+
+    __tablename__ = "change_log"
+    __table_args__ = (
+        Index("ix_change_log_table_seq", "table_name", "id"),
+        {"sqlite_autoincrement": True},
+    )
+
+    table_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    row_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    operation: Mapped[str] = mapped_column(String(10), nullable=False)
+    changed_columns: Mapped[Optional[List[str]]] = mapped_column(JSON)
+
+    seq = synonym("id")
+
+    def __repr__(self) -> str:
+        return f"<ChangeLogEntry(seq={self.id}, table_name='{self.table_name}', row_id={self.row_id}, operation='{self.operation}')>"
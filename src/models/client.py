@@ -40,4 +40,4 @@ class Client(BaseModel):
         Returns:
           str: A string representation of the client, including its id, name, and contact_information
         """
-        return f"<Client(id={self.id}, name'{self.name}', email='{self.contact_informatiom}')>"
+        return f"<Client(id={self.id}, name='{self.name}', contact_information='{self.contact_information}')>"
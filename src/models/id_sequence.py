@@ -0,0 +1,26 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import BaseModel
+
+
+class IdSequence(BaseModel):
+    """
+    Represents the hi/lo id sequence of one table in the Resource Allocation System.
+
+    Blocks of ids are reserved by advancing next_value (see src/ids.py), so
+    whole object graphs can be given their primary keys before the first
+    flush.
+
+    Attributes:
+        name (Mapped[str]): The name of the table the sequence allocates ids for.
+        next_value (Mapped[int]): The first id not yet reserved.
+    """
+
+    __tablename__ = "id_sequences"
+
+    name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
+    next_value: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<IdSequence(name='{self.name}', next_value={self.next_value})>"
@@ -4,7 +4,9 @@ from typing import TYPE_CHECKING, List
 from sqlalchemy import Date, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
+from src.enums import CodedEnum, EmploymentType
 from src.models.base import BaseModel
+from src.validation import RowError, ValidationError, validate_fields
 
 if TYPE_CHECKING:
     from src.models.assignment import Assignment
@@ -18,10 +20,10 @@ class Individual(BaseModel):
     Represents an individual in the Resource Allocation System.
 
     Attributes:
-        individual_id (Mapped[int]): The unique identifier for the individual.
-        individual_name (Mapped[str]): The name of the individual.
+        id (Mapped[int]): The unique identifier for the individual.
+        name (Mapped[str]): The name of the individual.
         email (Mapped[str]): The email address of the individual (unique).
-        employment_type (Mapped[str]): Type of employment Full-time or Contract.
+        employment_type (Mapped[EmploymentType]): Type of employment Full-time, Part-time or Contract, stored as a small integer code.
         hire_date (Mapped[date]): The date when the individual was hired.
         skills (Mapped[List["IndividualSkill"]]): List of skills associated with this individual.
         assignments (Mapped[List["Assignment"]]): List of assignments for this individual.
@@ -31,14 +33,14 @@ class Individual(BaseModel):
 
     __tablename__ = "individuals"
 
-    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
     email: Mapped[str] = mapped_column(
         String(100), nullable=False, unique=True, index=True
     )
-    employment_type: Mapped[str] = mapped_column(
-        String(100), nullable=False, index=True
+    employment_type: Mapped[EmploymentType] = mapped_column(
+        CodedEnum(EmploymentType), nullable=False, index=True
     )
-    hire_date: Mapped[date] = mapped_column(Date)
+    hire_date: Mapped[date] = mapped_column(Date, index=True)
 
     # role_id: Mapped[int] = mapped_column(ForeignKey("role.id"), nullable=False)
     skills: Mapped[List["IndividualSkill"]] = relationship(back_populates="individual")
@@ -50,18 +52,15 @@ class Individual(BaseModel):
 
     @validates("hire_date")
     def validate_hire_date(self, key, hire_date):
-        if hire_date > date.today():
-            raise ValueError("Hire date cannot be in the future")
+        validate_fields(self.__table__, {key: hire_date})
         return hire_date
 
     @validates("employment_type")
     def validate_employment_type(self, key, employment_type):
-        valid_types = ["Full-time", "Part-time", "Contract"]
-        if employment_type not in valid_types:
-            raise ValueError(
-                f"Invalid employment type. Must be one of: {', '.join(valid_types)}"
-            )
-        return employment_type
+        if employment_type is None:
+            raise ValidationError([RowError(None, key, "Employment type is required")])
+        validate_fields(self.__table__, {key: employment_type})
+        return EmploymentType(employment_type)
 
     def __repr__(self) -> str:
-        return f"<Individual(individual_id={self.individual_id}, name='{self.individual_name}', email='{self.email}')>"
+        return f"<Individual(id={self.id}, name='{self.name}', email='{self.email}')>"
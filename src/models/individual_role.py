@@ -18,7 +18,7 @@ class IndividualRole(BaseModel):
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, nullable=True)
 
     individual_id: Mapped[int] = mapped_column(
-        ForeignKey("individuals.id"), nullable=False
+        ForeignKey("individuals.id"), nullable=False, index=True
     )
     role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"), nullable=False)
     start_date: Mapped[date] = mapped_column(Date, nullable=False)
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Integer, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, Integer, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import BaseModel
@@ -14,6 +14,9 @@ class IndividualSkill(BaseModel):
     __tablename__ = "individual_skills"
     __table_args__ = (
         UniqueConstraint("individual_id", "skill_id", name="uq_individual_skill"),
+        Index(
+            "ix_individual_skills_skill_proficiency", "skill_id", "proficiency_level"
+        ),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -4,7 +4,9 @@ from typing import TYPE_CHECKING, List, Optional
 from sqlalchemy import Date, ForeignKey, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
+from src.enums import CodedEnum, ProjectStatus
 from src.models.base import BaseModel
+from src.validation import RowError, ValidationError, validate_fields
 
 if TYPE_CHECKING:
     from src.models.client import Client
@@ -22,19 +24,21 @@ class Project(BaseModel):
         desription (Mapped[srt]): A description of the project. Type text.
         start_date (Mapped[date]): The start date of the project.
         end_date (Mapped[date]): The end date of the project.
-        status (Mapped[str]): The current status of the project.
+        status (Mapped[ProjectStatus]): The current status of the project, stored as a small integer code.
         client (Mapped["Client"]): The associated client.
         requirements (Mapped[List["ProjectRequirement"]]): List of requirements for this project.
     """
 
     __tablename__ = "projects"
 
-    client_id: Mapped[int] = mapped_column(ForeignKey("clients.id"), nullable=False)
+    client_id: Mapped[int] = mapped_column(
+        ForeignKey("clients.id"), nullable=False, index=True
+    )
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text)
-    start_date: Mapped[date] = mapped_column(Date, nullable=False)
-    end_date: Mapped[date] = mapped_column(Date, nullable=False)
-    status: Mapped[str] = mapped_column(String(100))
+    start_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    end_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    status: Mapped[ProjectStatus] = mapped_column(CodedEnum(ProjectStatus), index=True)
 
     client: Mapped["Client"] = relationship(back_populates="projects")
     requirements: Mapped[List["ProjectRequirement"]] = relationship(
@@ -54,12 +58,33 @@ class Project(BaseModel):
             date: The validated end date.
 
         Raises:
-            ValueError: If the end_date is before or equal to the start_date.
+            ValidationError: If the end_date is before or equal to the start_date.
         """
-        if end_date and self.start_date and end_date <= self.start_date:
-            raise ValueError("End date must be after the start date")
+        validate_fields(
+            self.__table__, {"start_date": self.start_date, "end_date": end_date}
+        )
         return end_date
 
+    @validates("status")
+    def validate_status(self, key, status):
+        """
+        Validate the status and convert it to a ProjectStatus member.
+
+        Args:
+            key (str): The name of the attribute being validated.
+            status (str): The status to validate.
+
+        Returns:
+            ProjectStatus: The validated status.
+
+        Raises:
+            ValidationError: If the status is missing or not a ProjectStatus value.
+        """
+        if status is None:
+            raise ValidationError([RowError(None, key, "Status is required")])
+        validate_fields(self.__table__, {key: status})
+        return ProjectStatus(status)
+
     def __repr__(self) -> str:
         """Return a string representation of the Project instance."""
         return f"<Project(id={self.id}, name='{self.name}', status='{self.status}')>"
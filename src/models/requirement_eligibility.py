@@ -0,0 +1,53 @@
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Float, ForeignKey, Index, UniqueConstraint, desc
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.models.base import BaseModel
+
+if TYPE_CHECKING:
+    from src.models.individual import Individual
+    from src.models.project_requirement import ProjectRequirement
+
+
+class RequirementEligibility(BaseModel):
+    """
+    Represents a materialized match between a project requirement and an eligible individual.
+
+    Rows are maintained by src/eligibility.py and should not be written directly.
+
+    Attributes:
+        requirement_id (Mapped[int]): The ID of the project requirement.
+        individual_id (Mapped[int]): The ID of the eligible individual.
+        score (Mapped[float]): The match score, higher is better.
+        requirement (Mapped["ProjectRequirement"]): The associated project requirement.
+        individual (Mapped["Individual"]): The associated individual.
+    """
+
+    __tablename__ = "requirement_eligibility"
+    __table_args__ = (
+        UniqueConstraint(
+            "requirement_id", "individual_id", name="uq_requirement_eligibility"
+        ),
+        Index("ix_requirement_eligibility_individual", "individual_id"),
+        Index(
+            "ix_requirement_eligibility_score",
+            "requirement_id",
+            desc("score"),
+            "individual_id",
+        ),
+    )
+
+    requirement_id: Mapped[int] = mapped_column(
+        ForeignKey("project_requirements.id"), nullable=False
+    )
+    individual_id: Mapped[int] = mapped_column(
+        ForeignKey("individuals.id"), nullable=False
+    )
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+
+    requirement: Mapped["ProjectRequirement"] = relationship()
+    individual: Mapped["Individual"] = relationship()
+
+    def __repr__(self) -> str:
+        return f"<RequirementEligibility(requirement_id={self.requirement_id}, individual_id={self.individual_id}, score={self.score})>"
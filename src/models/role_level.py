@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import String
+from sqlalchemy import Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base import BaseModel
@@ -16,14 +16,18 @@ class RoleLevel(BaseModel):
     Attributes:
         id (Mapped[int]): The unique identifier for the role level.
         name (Mapped[str]): The name of the role level.
+        seniority (Mapped[int]): The rank of the level, higher is more senior.
         roles (Mapped[List["Role"]]): List of roles associated with this level.
     """
 
     __tablename__ = "role_levels"
 
     name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
+    seniority: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
     roles: Mapped[List["Role"]] = relationship(back_populates="role_level")
 
     def __repr__(self) -> str:
-        return f"<RoleLevel(id={self.id}, name='{self.name}')>"
+        return (
+            f"<RoleLevel(id={self.id}, name='{self.name}', seniority={self.seniority})>"
+        )
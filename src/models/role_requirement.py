@@ -25,11 +25,16 @@ class RoleRequirement(BaseModel):
     # Number of individuals with this role needed for the requirement
     number_needed: Mapped[int] = mapped_column(Integer, nullable=False)
 
+    # Optimistic concurrency version, bumped on every update
+    version_id: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+
     # Ensure uniqueness of requirement-role combination
     __table_args__ = (
         UniqueConstraint("requirement_id", "role_id", name="uq_role_requirement"),
     )
 
+    __mapper_args__ = {"version_id_col": version_id}
+
     # Relationships to related models
     requirement: Mapped["ProjectRequirement"] = relationship(
         back_populates="role_requirements"
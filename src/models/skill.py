@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import String, Text
+from sqlalchemy import ForeignKey, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base import BaseModel
@@ -8,6 +8,7 @@ from src.models.base import BaseModel
 if TYPE_CHECKING:
     from src.models.individual_skill import IndividualSkill
     from src.models.skill_requirement import SkillRequirement
+    from src.models.skill_synonym import SkillSynonym
 
 
 class Skill(BaseModel):
@@ -18,6 +19,10 @@ class Skill(BaseModel):
         id (Mapped[int]): The unique identifier for the skill.
         name (Mapped[str]): The name of the skill.
         description (Mapped[str]): A description of the skill.
+        parent_id (Mapped[Optional[int]]): The ID of the broader parent skill, if any.
+        parent (Mapped[Optional["Skill"]]): The broader parent skill.
+        children (Mapped[List["Skill"]]): The narrower skills directly below this one.
+        synonyms (Mapped[List["SkillSynonym"]]): Alternative names of this skill.
         individuals (Mapped[List["IndividualSkill"]]): List of individuals possessing this skill.
         skill_requirements (Mapped[List["SkillRequirement"]]): List of project requirements needing this skill.
     """
@@ -26,11 +31,20 @@ class Skill(BaseModel):
 
     name: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
     description: Mapped[Optional[str]] = mapped_column(Text)
+    # Load the old parent on change so hooks can see where a skill moved from
+    parent_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("skills.id"), index=True, active_history=True
+    )
 
+    parent: Mapped[Optional["Skill"]] = relationship(
+        back_populates="children", remote_side="Skill.id", active_history=True
+    )
+    children: Mapped[List["Skill"]] = relationship(back_populates="parent")
+    synonyms: Mapped[List["SkillSynonym"]] = relationship(back_populates="skill")
     individuals: Mapped[List["IndividualSkill"]] = relationship(back_populates="skill")
     skill_requirements: Mapped[List["SkillRequirement"]] = relationship(
         back_populates="skill"
     )
 
     def __repr__(self) -> str:
-        return f"<Skill(id={self.id}, name='{self.name}', category='{self.category}')>"
+        return f"<Skill(id={self.id}, name='{self.name}', parent_id={self.parent_id})>"
@@ -0,0 +1,33 @@
+from sqlalchemy import ForeignKey, Index, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import BaseModel
+
+
+class SkillClosure(BaseModel):
+    """
+    Represents an ancestor/descendant pair in the skill taxonomy.
+
+    The table holds the transitive closure of Skill.parent_id, including a
+    depth 0 row linking every skill to itself, so "all descendants of X" is a
+    single indexed lookup. Rows are maintained by src/taxonomy.py and should
+    not be written directly.
+
+    Attributes:
+        ancestor_id (Mapped[int]): The ID of the ancestor skill.
+        descendant_id (Mapped[int]): The ID of the descendant skill.
+        depth (Mapped[int]): The number of parent links between the two skills.
+    """
+
+    __tablename__ = "skill_closure"
+    __table_args__ = (
+        UniqueConstraint("ancestor_id", "descendant_id", name="uq_skill_closure"),
+        Index("ix_skill_closure_descendant", "descendant_id", "ancestor_id"),
+    )
+
+    ancestor_id: Mapped[int] = mapped_column(ForeignKey("skills.id"), nullable=False)
+    descendant_id: Mapped[int] = mapped_column(ForeignKey("skills.id"), nullable=False)
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<SkillClosure(ancestor_id={self.ancestor_id}, descendant_id={self.descendant_id}, depth={self.depth})>"
@@ -0,0 +1,32 @@
+from typing import TYPE_CHECKING
+
+from sqlalchemy import ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.models.base import BaseModel
+
+if TYPE_CHECKING:
+    from src.models.skill import Skill
+
+
+class SkillSynonym(BaseModel):
+    """
+    Represents an alternative name of a skill in the Resource Allocation System.
+
+    Attributes:
+        skill_id (Mapped[int]): The ID of the skill this name refers to.
+        name (Mapped[str]): The alternative name (unique).
+        skill (Mapped["Skill"]): The associated skill.
+    """
+
+    __tablename__ = "skill_synonyms"
+
+    skill_id: Mapped[int] = mapped_column(
+        ForeignKey("skills.id"), nullable=False, index=True
+    )
+    name: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+
+    skill: Mapped["Skill"] = relationship(back_populates="synonyms")
+
+    def __repr__(self) -> str:
+        return f"<SkillSynonym(id={self.id}, skill_id={self.skill_id}, name='{self.name}')>"
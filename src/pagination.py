@@ -0,0 +1,237 @@
+"""
+Keyset pagination for the Resource Allocation System.
+
+Listings of the large entities are paged by seeking past the last row of
+the previous page on (sort_key, id) rather than with OFFSET, so every page
+costs one index range scan no matter how deep it is. The position is handed
+to the caller as an opaque cursor string.
+
+Every sort key offered here is indexed and NOT NULL. In SQLite an index on
+a column is also ordered by rowid, which is the id, so it serves the
+(sort_key, id) ordering directly.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Type
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from src.models import (
+    Assignment,
+    Availability,
+    BaseModel,
+    Individual,
+    Project,
+    ProjectRequirement,
+)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class ListingSpec(NamedTuple):
+    """
+    What a listing may be sorted and filtered by.
+
+    Attributes:
+        sort_keys (tuple): Columns the listing can be sorted by.
+        filters (tuple): Columns that can be filtered by value.
+        date_range (tuple): The (start, end) columns a date range filter matches
+            against; the row matches when its period overlaps the range.
+    """
+
+    sort_keys: tuple
+    filters: tuple
+    date_range: tuple
+
+
+LISTINGS: Dict[Type[BaseModel], ListingSpec] = {
+    Individual: ListingSpec(
+        sort_keys=("id", "name", "email", "hire_date"),
+        filters=("employment_type",),
+        date_range=("hire_date", "hire_date"),
+    ),
+    Project: ListingSpec(
+        sort_keys=("id", "start_date", "end_date"),
+        filters=("client_id", "status"),
+        date_range=("start_date", "end_date"),
+    ),
+    ProjectRequirement: ListingSpec(
+        sort_keys=("id", "start_date", "end_date"),
+        filters=("project_id",),
+        date_range=("start_date", "end_date"),
+    ),
+    Assignment: ListingSpec(
+        sort_keys=("id", "start_date"),
+        filters=("individual_id", "requirement_id", "status"),
+        date_range=("start_date", "end_date"),
+    ),
+    Availability: ListingSpec(
+        sort_keys=("id", "start_date"),
+        filters=("individual_id",),
+        date_range=("start_date", "end_date"),
+    ),
+}
+
+
+class Page(NamedTuple):
+    """
+    One page of a listing.
+
+    Attributes:
+        items (List[BaseModel]): The rows on this page.
+        next_cursor (Optional[str]): The cursor of the next page, or None on the last page.
+    """
+
+    items: List[BaseModel]
+    next_cursor: Optional[str]
+
+
+def _encode_cursor(position: list) -> str:
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor") from None
+    if not isinstance(position, list) or len(position) != 5:
+        raise ValueError("Invalid cursor")
+    return position
+
+
+def _spec(model: Type[BaseModel]) -> ListingSpec:
+    if model not in LISTINGS:
+        raise ValueError(f"{model.__name__} has no paginated listing")
+    return LISTINGS[model]
+
+
+def paginate(
+    db: Session,
+    model: Type[BaseModel],
+    sort_key: str = "id",
+    descending: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    **filters: Any,
+) -> Page:
+    """
+    Get one page of a listing.
+
+    Args:
+        db (Session): The database session.
+        model (Type[BaseModel]): The model to list, one of the LISTINGS keys.
+        sort_key (str): The column to sort by; ties are broken by id.
+        descending (bool): Sort in descending order.
+        cursor (Optional[str]): The next_cursor of the previous page, or None for the first page.
+        limit (int): The page size, at most MAX_PAGE_SIZE.
+        date_from (Optional[date]): Only rows whose period ends on or after this date.
+        date_to (Optional[date]): Only rows whose period starts on or before this date.
+        **filters: Column equality filters; a list or tuple value matches any of its items.
+
+    Returns:
+        Page: The rows and the cursor of the next page.
+
+    Raises:
+        ValueError: If the sort key, a filter, the limit or the cursor is not valid
+            for this listing.
+    """
+    spec = _spec(model)
+    if sort_key not in spec.sort_keys:
+        raise ValueError(
+            f"Cannot sort {model.__name__} by {sort_key}. "
+            f"Must be one of: {', '.join(spec.sort_keys)}"
+        )
+    unknown = set(filters) - set(spec.filters)
+    if unknown:
+        raise ValueError(
+            f"Cannot filter {model.__name__} by {', '.join(sorted(unknown))}. "
+            f"Must be one of: {', '.join(spec.filters)}"
+        )
+    if not 0 < limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"Page size must be between 1 and {MAX_PAGE_SIZE}")
+
+    column = getattr(model, sort_key)
+    stmt = select(model)
+    for name, value in filters.items():
+        if isinstance(value, (list, tuple, set)):
+            stmt = stmt.where(getattr(model, name).in_(list(value)))
+        else:
+            stmt = stmt.where(getattr(model, name) == value)
+    start_column, end_column = (getattr(model, name) for name in spec.date_range)
+    if date_from is not None:
+        stmt = stmt.where(end_column >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(start_column <= date_to)
+
+    if cursor is not None:
+        table, cursor_key, cursor_descending, value, last_id = _decode_cursor(cursor)
+        if (table, cursor_key, cursor_descending) != (
+            model.__tablename__,
+            sort_key,
+            descending,
+        ):
+            raise ValueError("Cursor does not belong to this listing")
+        if column.type.python_type is date:
+            value = date.fromisoformat(value)
+        if sort_key == "id":
+            seek = column < last_id if descending else column > last_id
+        else:
+            position = tuple_(column, model.id)
+            seek = (
+                position < tuple_(value, last_id)
+                if descending
+                else position > tuple_(value, last_id)
+            )
+        stmt = stmt.where(seek)
+
+    if descending:
+        stmt = stmt.order_by(column.desc(), model.id.desc())
+    else:
+        stmt = stmt.order_by(column, model.id)
+    items = list(db.scalars(stmt.limit(limit + 1)))
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        value = getattr(last, sort_key)
+        if isinstance(value, date):
+            value = value.isoformat()
+        next_cursor = _encode_cursor(
+            [model.__tablename__, sort_key, descending, value, last.id]
+        )
+    return Page(items, next_cursor)
+
+
+def iterate(
+    db: Session, model: Type[BaseModel], page_size: int = MAX_PAGE_SIZE, **options
+) -> Iterator[BaseModel]:
+    """
+    Iterate over a whole listing one keyset page at a time.
+
+    Args:
+        db (Session): The database session.
+        model (Type[BaseModel]): The model to list.
+        page_size (int): The number of rows fetched per query.
+        **options: Any other paginate() argument except cursor and limit.
+
+    Yields:
+        BaseModel: The rows of the listing in order.
+    """
+    cursor = None
+    while True:
+        page = paginate(db, model, cursor=cursor, limit=page_size, **options)
+        yield from page.items
+        if page.next_cursor is None:
+            return
+        cursor = page.next_cursor
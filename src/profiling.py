@@ -0,0 +1,186 @@
+"""
+Per-phase profiling of the main script and the batch commands.
+
+Each command accepts ``--profile [DIRECTORY]``. With it, every top-level
+phase of the command (creating sample data, querying, archiving, ...) runs
+under cProfile with tracemalloc tracing, and gets a summary of its wall
+time, the memory it allocated and kept, its peak traced memory and its top
+allocation sites. The cProfile stats and the closing tracemalloc snapshot
+of each phase are saved in the directory, numbered in the order the
+phases ran, for ``python -m pstats`` or snakeviz and for
+tracemalloc.Snapshot.load().
+
+Without the option a Profiler is disabled: phase() returns a shared
+nullcontext, and neither cProfile nor tracemalloc is ever started, so the
+commands run exactly as before. cProfile is not even imported, as it pulls
+in optparse and friends at every command's startup.
+"""
+
+import argparse
+import logging
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Iterator, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRECTORY = "profiles"
+
+# Allocation sites listed in each phase summary
+TOP_ALLOCATIONS = 3
+
+_DISABLED = nullcontext()
+
+# Allocations made by tracemalloc and the import machinery are left out
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+)
+
+
+class PhaseProfile(NamedTuple):
+    """
+    The profile of one phase.
+
+    Attributes:
+        name (str): The phase.
+        seconds (float): The wall time the phase took.
+        allocated (int): Bytes allocated during the phase and still held at its end.
+        peak (int): The peak traced memory during the phase, in bytes.
+        top (List[str]): The allocation sites that grew most, largest first.
+        stats_path (str): The saved cProfile stats.
+        snapshot_path (str): The saved tracemalloc snapshot at the end of the phase.
+    """
+
+    name: str
+    seconds: float
+    allocated: int
+    peak: int
+    top: List[str]
+    stats_path: str
+    snapshot_path: str
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.seconds:.3f}s, "
+            f"{self.allocated / 2**20:+.2f} MiB held, "
+            f"{self.peak / 2**20:.2f} MiB peak"
+        )
+
+
+class Profiler:
+    """
+    Profiles the phases of a command when enabled.
+
+    Attributes:
+        directory (Optional[str]): Where profiles are saved; None when disabled.
+        phases (List[PhaseProfile]): The profiled phases, in order.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self.phases: List[PhaseProfile] = []
+        self._active: Optional[str] = None
+        self._started_tracing = False
+
+    @property
+    def enabled(self) -> bool:
+        """Check whether phases are profiled."""
+        return self.directory is not None
+
+    def phase(self, name: str):
+        """
+        Get a context manager profiling one phase.
+
+        Args:
+            name (str): The phase, used in the summary and the file names.
+
+        Returns:
+            A context manager; a no-op one when the profiler is disabled.
+
+        Raises:
+            ValueError: If another phase is being profiled.
+        """
+        if not self.enabled:
+            return _DISABLED
+        if self._active is not None:
+            raise ValueError(
+                f"Cannot profile {name} inside {self._active}: phases do not nest"
+            )
+        return self._profile(name)
+
+    @contextmanager
+    def _profile(self, name: str) -> Iterator[None]:
+        import cProfile
+
+        os.makedirs(self.directory, exist_ok=True)
+        prefix = os.path.join(self.directory, f"{len(self.phases) + 1:02d}_{name}")
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        before = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        tracemalloc.reset_peak()
+        profile = cProfile.Profile()
+
+        self._active = name
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            seconds = time.perf_counter() - start
+            self._active = None
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+            profile.dump_stats(f"{prefix}.prof")
+            after.dump(f"{prefix}.snapshot")
+            differences = after.compare_to(before, "lineno")
+            result = PhaseProfile(
+                name=name,
+                seconds=seconds,
+                allocated=sum(stat.size_diff for stat in differences),
+                peak=peak,
+                top=[str(stat) for stat in differences[:TOP_ALLOCATIONS]],
+                stats_path=f"{prefix}.prof",
+                snapshot_path=f"{prefix}.snapshot",
+            )
+            self.phases.append(result)
+            logger.info(f"Profiled {result}; saved {result.stats_path}")
+
+    def report(self) -> None:
+        """Log the summary of every profiled phase."""
+        if not self.phases:
+            return
+        logger.info(f"Profile summary, saved in {self.directory}:")
+        for phase in self.phases:
+            logger.info(f"  {phase}")
+            for line in phase.top:
+                logger.info(f"      {line}")
+
+    def close(self) -> None:
+        """Log the summary and stop tracemalloc if profiling started it."""
+        self.report()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+def add_profile_argument(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the --profile option to a command's argument parser.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser.
+    """
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=DEFAULT_DIRECTORY,
+        metavar="DIRECTORY",
+        help="profile each phase and save the profiles in DIRECTORY "
+        f"(default: {DEFAULT_DIRECTORY})",
+    )
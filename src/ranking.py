@@ -0,0 +1,268 @@
+"""
+Top-k candidate ranking for project requirements.
+
+Candidates for a requirement are the individuals of the requirement
+eligibility index (see src/eligibility.py). Each candidate is scored on
+four features:
+
+- surplus: total proficiency levels above the required minimums, as stored
+  in the eligibility index;
+- seniority: the highest RoleLevel.seniority of the roles they hold by the
+  end of the requirement;
+- free_capacity: the fraction of their weekly available hours not yet booked
+  by overlapping assignments, between 0 and 1;
+- continuity: 1 when they are already assigned elsewhere on the same
+  project, 0 otherwise.
+
+Candidates are streamed from the eligibility index best surplus first, with
+their other features computed by correlated subqueries only as rows are
+fetched, and pushed through a heap bounded to k entries. Every feature but
+surplus has a known maximum, so the stream stops at the first candidate
+that could not beat the k-th best even with top marks on the rest, and the
+remaining candidates are never scored.
+"""
+
+import heapq
+import logging
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import exists, func, select
+from sqlalchemy.orm import Session
+
+from src.enums import AssignmentStatus
+from src.models import (
+    Assignment,
+    Availability,
+    IndividualRole,
+    ProjectRequirement,
+    RequirementEligibility,
+    Role,
+    RoleLevel,
+    TimeRequirement,
+)
+
+logger = logging.getLogger(__name__)
+
+CANCELLED = AssignmentStatus.CANCELLED
+
+# Number of candidates fetched from the database at a time
+BATCH_SIZE = 100
+
+# Tolerance when comparing a score against an upper bound
+SCORE_TOLERANCE = 1e-9
+
+
+class RankingWeights(NamedTuple):
+    """
+    The weight of each feature in a candidate's score.
+
+    Attributes:
+        surplus (float): Per proficiency level above the required minimum.
+        seniority (float): Per seniority rank of their most senior role.
+        free_capacity (float): For a fully free week, scaled by the free fraction.
+        continuity (float): For already working on the same project.
+    """
+
+    surplus: float = 1.0
+    seniority: float = 0.5
+    free_capacity: float = 2.0
+    continuity: float = 1.0
+
+
+DEFAULT_WEIGHTS = RankingWeights()
+
+
+class RankedCandidate(NamedTuple):
+    """
+    A scored candidate for a project requirement.
+
+    Attributes:
+        individual_id (int): The ID of the individual.
+        score (float): The weighted sum of the features.
+        surplus (float): Proficiency levels above the required minimums.
+        seniority (int): The seniority rank of their most senior role.
+        free_capacity (float): The fraction of their weekly hours still free.
+        continuity (int): 1 when already assigned on the same project.
+    """
+
+    individual_id: int
+    score: float
+    surplus: float
+    seniority: int
+    free_capacity: float
+    continuity: int
+
+
+def _candidates(requirement: ProjectRequirement):
+    """
+    Build the query returning the raw features of each candidate, best surplus
+    first and then by individual id, matching ix_requirement_eligibility_score.
+    """
+    eligibility = RequirementEligibility
+    start, end = requirement.start_date, requirement.end_date
+    live = Assignment.status.is_(None) | (Assignment.status != CANCELLED)
+
+    seniority = (
+        select(func.max(RoleLevel.seniority))
+        .select_from(IndividualRole)
+        .join(Role, Role.id == IndividualRole.role_id)
+        .join(RoleLevel, RoleLevel.id == Role.role_level_id)
+        .where(
+            IndividualRole.individual_id == eligibility.individual_id,
+            IndividualRole.start_date <= end,
+        )
+        .scalar_subquery()
+    )
+    hours = (
+        select(func.min(Availability.hours_per_week))
+        .where(
+            Availability.individual_id == eligibility.individual_id,
+            Availability.start_date <= end,
+            Availability.end_date >= start,
+            Availability.hours_per_week > 0,
+        )
+        .scalar_subquery()
+    )
+    booked = (
+        select(func.sum(TimeRequirement.hours_per_week))
+        .select_from(Assignment)
+        .join(
+            TimeRequirement,
+            TimeRequirement.requirement_id == Assignment.requirement_id,
+        )
+        .where(
+            Assignment.individual_id == eligibility.individual_id,
+            live,
+            Assignment.start_date <= end,
+            Assignment.end_date >= start,
+        )
+        .scalar_subquery()
+    )
+    continuing = exists().where(
+        Assignment.individual_id == eligibility.individual_id,
+        live,
+        ProjectRequirement.id == Assignment.requirement_id,
+        ProjectRequirement.project_id == requirement.project_id,
+        ProjectRequirement.id != requirement.id,
+    )
+
+    return (
+        select(
+            eligibility.individual_id,
+            eligibility.score,
+            func.coalesce(seniority, 0),
+            func.coalesce(hours, 0),
+            func.coalesce(booked, 0),
+            continuing,
+        )
+        .where(eligibility.requirement_id == requirement.id)
+        .order_by(eligibility.score.desc(), eligibility.individual_id)
+    )
+
+
+def score_candidates(
+    db: Session, requirement_id: int, weights: RankingWeights = DEFAULT_WEIGHTS
+) -> Iterator[RankedCandidate]:
+    """
+    Stream the scored candidates of a project requirement.
+
+    Candidates come best surplus first, then by individual id; features are
+    only computed for the candidates consumed.
+
+    Args:
+        db (Session): The database session.
+        requirement_id (int): The ID of the project requirement.
+        weights (RankingWeights): The weight of each feature.
+
+    Yields:
+        RankedCandidate: One per eligible individual.
+
+    Raises:
+        ValueError: If the requirement does not exist.
+    """
+    requirement = db.get(ProjectRequirement, requirement_id)
+    if requirement is None:
+        raise ValueError(f"No project requirement with id {requirement_id}")
+
+    w_surplus, w_seniority, w_capacity, w_continuity = weights
+    stmt = _candidates(requirement).execution_options(yield_per=BATCH_SIZE)
+    result = db.execute(stmt)
+    for individual_id, surplus, seniority, hours, booked, continuity in result:
+        free = max(0.0, min(1.0, 1 - booked / hours)) if hours else 0.0
+        continuity = int(continuity)
+        score = (
+            w_surplus * surplus
+            + w_seniority * seniority
+            + w_capacity * free
+            + w_continuity * continuity
+        )
+        yield RankedCandidate(
+            individual_id, score, surplus, seniority, free, continuity
+        )
+
+
+def top_candidates(
+    db: Session,
+    requirement_id: int,
+    k: int = 10,
+    weights: Optional[RankingWeights] = None,
+) -> List[RankedCandidate]:
+    """
+    Get the k best candidates for a project requirement.
+
+    Args:
+        db (Session): The database session.
+        requirement_id (int): The ID of the project requirement.
+        k (int): The number of candidates to return.
+        weights (Optional[RankingWeights]): The weight of each feature, DEFAULT_WEIGHTS by default.
+
+    Returns:
+        List[RankedCandidate]: Best first; ties go to the lower individual id.
+
+    Raises:
+        ValueError: If k is not positive, a weight is negative or the
+            requirement does not exist.
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    weights = weights or DEFAULT_WEIGHTS
+    negative = [name for name, value in weights._asdict().items() if value < 0]
+    if negative:
+        raise ValueError(f"Ranking weights must not be negative: {', '.join(negative)}")
+
+    # The most any candidate can score on top of their surplus
+    max_seniority = db.scalar(select(func.max(RoleLevel.seniority))) or 0
+    headroom = (
+        weights.seniority * max_seniority + weights.free_capacity + weights.continuity
+    )
+
+    heap: List[Tuple[Tuple[float, int], RankedCandidate]] = []
+    candidates = score_candidates(db, requirement_id, weights)
+    scored = 0
+    for candidate in candidates:
+        if len(heap) == k:
+            # Best possible scores only decrease along the stream
+            floor, floor_id = heap[0][0][0], -heap[0][0][1]
+            best_possible = weights.surplus * candidate.surplus + headroom
+            if best_possible < floor - SCORE_TOLERANCE:
+                break
+            if (
+                best_possible <= floor + SCORE_TOLERANCE
+                and candidate.individual_id > floor_id
+            ):
+                # Could at best tie the k-th best, which has the lower id. With
+                # surplus weighted, so can every later candidate; without,
+                # a later candidate with a lower id might still win a tie.
+                if weights.surplus:
+                    break
+                continue
+        scored += 1
+        entry = ((candidate.score, -candidate.individual_id), candidate)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry[0] > heap[0][0]:
+            heapq.heapreplace(heap, entry)
+    candidates.close()
+
+    logger.debug(f"Ranked requirement {requirement_id} scoring {scored} candidates.")
+    return [candidate for _, candidate in sorted(heap, reverse=True)]
@@ -0,0 +1,330 @@
+"""
+Snapshot read replicas for the Resource Allocation System.
+
+Heavy read-only work (reports, exports, matching) should not compete with
+the nightly writes on the primary database. A ReplicaManager periodically
+copies the primary into a new replica file with the SQLite online backup
+API, a limited number of pages per step, so writers only wait for one
+step at a time rather than for the whole copy. A write to the primary
+during a copy makes SQLite restart it, so a finished replica is always a
+consistent snapshot; a copy that keeps being restarted gives up after
+max_restarts rather than looping for as long as the writes continue.
+
+Each refresh writes a new generation file and older generations are
+deleted, so a replica is never written to while it is being read. Replica
+sessions are opened read-only and without connection pooling, so every
+new session sees the newest generation. The generation files are the
+only state: a manager picks up the generations already in its directory,
+including those written by other processes, so short-lived commands read
+the replicas that ``python main.py replicate`` keeps refreshing.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from src.change_log import latest_seq
+from src.models.base import utc_now
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGES_PER_STEP = 1024
+DEFAULT_MAX_LAG = 300.0
+DEFAULT_MAX_RESTARTS = 10
+
+_GENERATION = re.compile(r"replica-(\d{6})\.db")
+
+
+class ReplicaSnapshot(NamedTuple):
+    """
+    One finished replica generation.
+
+    Attributes:
+        path (str): The replica file.
+        generation (int): The generation number, increasing with each refresh.
+        taken_at (datetime): When the copy finished; the replica matches the primary as of then.
+        seq (int): The primary's latest change log sequence number included in the replica.
+        pages (int): The number of database pages copied.
+        seconds (float): How long the copy took; 0 for a replica found on disk.
+    """
+
+    path: str
+    generation: int
+    taken_at: datetime
+    seq: int
+    pages: int
+    seconds: float
+
+
+class ReplicaManager:
+    """
+    Maintains snapshot replicas of a SQLite primary and routes read sessions to them.
+
+    Attributes:
+        primary (Engine): The engine of the primary database.
+        directory (str): The directory holding the replica files.
+        pages_per_step (int): The number of pages copied while holding the read lock.
+        step_sleep (float): Seconds to pause between steps, giving writers a turn.
+        max_lag (float): The default staleness limit in seconds for read sessions.
+        keep (int): The number of replica generations kept on disk.
+        max_restarts (int): How many times a copy may be restarted by writes
+            to the primary before the refresh fails.
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        directory: str,
+        pages_per_step: int = DEFAULT_PAGES_PER_STEP,
+        step_sleep: float = 0.0,
+        max_lag: float = DEFAULT_MAX_LAG,
+        keep: int = 2,
+        max_restarts: int = DEFAULT_MAX_RESTARTS,
+    ):
+        if primary.dialect.name != "sqlite" or primary.url.database in (
+            None,
+            "",
+            ":memory:",
+        ):
+            raise ValueError("Replicas need a file based SQLite primary database")
+        self.primary = primary
+        self.directory = directory
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep
+        self.max_lag = max_lag
+        self.keep = max(keep, 1)
+        self.max_restarts = max_restarts
+        self._snapshots: List[ReplicaSnapshot] = []
+        self._engines: Dict[str, Engine] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._primary_sessions = sessionmaker(bind=primary)
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+
+    def _inspect(self, path: str, generation: int) -> Optional[ReplicaSnapshot]:
+        """Describe a replica file found on disk, or None if it cannot be read."""
+        try:
+            taken_at = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+            with self._session(path) as db:
+                seq = latest_seq(db)
+                pages = db.scalar(text("PRAGMA page_count"))
+        except (OSError, SQLAlchemyError) as e:
+            logger.warning(f"Ignoring replica {path}: {str(e)}")
+            return None
+        return ReplicaSnapshot(path, generation, taken_at, seq, pages, 0.0)
+
+    def _scan(self) -> None:
+        """Track the generations in the directory, including other processes' ones."""
+        with self._lock:
+            known = {snapshot.path: snapshot for snapshot in self._snapshots}
+        found = []
+        for name in sorted(os.listdir(self.directory)):
+            match = _GENERATION.fullmatch(name)
+            if match is None:
+                continue
+            path = os.path.join(self.directory, name)
+            snapshot = known.get(path) or self._inspect(path, int(match.group(1)))
+            if snapshot is not None:
+                found.append(snapshot)
+        with self._lock:
+            self._snapshots = found[-self.keep :]
+            current = {snapshot.path for snapshot in self._snapshots}
+            forgotten = [path for path in self._engines if path not in current]
+            engines = [self._engines.pop(path) for path in forgotten]
+        for engine in engines:
+            engine.dispose()
+
+    def refresh(self) -> ReplicaSnapshot:
+        """
+        Copy the primary into a new replica generation.
+
+        Returns:
+            ReplicaSnapshot: The new replica.
+
+        Raises:
+            RuntimeError: If writes to the primary restarted the copy more
+                than max_restarts times.
+        """
+        self._scan()
+        latest = self.latest()
+        generation = latest.generation + 1 if latest else 1
+        path = os.path.join(self.directory, f"replica-{generation:06d}.db")
+        partial = path + ".partial"
+        pages = restarts = last_remaining = 0
+
+        def progress(status, remaining, total):
+            nonlocal pages, restarts, last_remaining
+            # A write sends the copy back to the start: the pages left go up, or
+            # the page count changes. A step that found the primary locked copies
+            # nothing and leaves both as they were, so it is not a restart. Until
+            # a step gets through, backup() reports no pages at all.
+            if pages and (remaining > last_remaining or total != pages):
+                restarts += 1
+                if restarts > self.max_restarts:
+                    raise RuntimeError(
+                        f"Replica copy restarted {restarts} times by writes to "
+                        "the primary, giving up"
+                    )
+            pages, last_remaining = total, remaining
+            # backup()'s own sleep only applies when a step finds the primary locked
+            if remaining and self.step_sleep:
+                time.sleep(self.step_sleep)
+
+        start = time.perf_counter()
+        try:
+            with closing(sqlite3.connect(self.primary.url.database)) as source, closing(
+                sqlite3.connect(partial)
+            ) as target:
+                source.backup(
+                    target,
+                    pages=self.pages_per_step,
+                    progress=progress,
+                )
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        seconds = time.perf_counter() - start
+        os.replace(partial, path)
+
+        with self._session(path) as db:
+            seq = latest_seq(db)
+        snapshot = ReplicaSnapshot(path, generation, utc_now(), seq, pages, seconds)
+        with self._lock:
+            self._snapshots.append(snapshot)
+            expired, self._snapshots = (
+                self._snapshots[: -self.keep],
+                self._snapshots[-self.keep :],
+            )
+        for old in expired:
+            self._discard(old.path)
+        logger.info(
+            f"Replica {generation} copied {pages} pages in {seconds:.2f}s "
+            f"({pages / seconds if seconds else 0:.0f} pages/s, {restarts} restarts)."
+        )
+        return snapshot
+
+    def latest(self) -> Optional[ReplicaSnapshot]:
+        """Get the newest replica, or None before the first refresh."""
+        with self._lock:
+            return self._snapshots[-1] if self._snapshots else None
+
+    def lag(self) -> Optional[float]:
+        """Get the age of the newest replica in seconds, or None without one."""
+        snapshot = self.latest()
+        if snapshot is None:
+            return None
+        return (utc_now() - snapshot.taken_at).total_seconds()
+
+    def status(self) -> dict:
+        """
+        Report replica lag and the throughput of the last copy.
+
+        Returns:
+            dict: The generation, lag in seconds and in change log entries,
+                pages copied, seconds taken, and pages and bytes per second.
+        """
+        snapshot = self.latest()
+        if snapshot is None:
+            return {"generation": None}
+        with self._primary_sessions() as db:
+            primary_seq = latest_seq(db)
+        page_size = os.path.getsize(snapshot.path) / max(snapshot.pages, 1)
+        rate = snapshot.pages / snapshot.seconds if snapshot.seconds else 0.0
+        return {
+            "generation": snapshot.generation,
+            "lag_seconds": self.lag(),
+            "lag_changes": primary_seq - snapshot.seq,
+            "pages": snapshot.pages,
+            "copy_seconds": snapshot.seconds,
+            "pages_per_second": rate,
+            "bytes_per_second": rate * page_size,
+        }
+
+    def read_session(self, max_lag: Optional[float] = None) -> Session:
+        """
+        Open a read-only session on the newest replica.
+
+        Falls back to a session on the primary when there is no replica yet
+        or the newest one is older than the staleness limit.
+
+        Args:
+            max_lag (Optional[float]): The staleness limit in seconds, defaults to max_lag.
+
+        Returns:
+            Session: A session on the newest replica, or on the primary.
+        """
+        max_lag = self.max_lag if max_lag is None else max_lag
+        self._scan()
+        snapshot = self.latest()
+        if (
+            snapshot is None
+            or (utc_now() - snapshot.taken_at).total_seconds() > max_lag
+        ):
+            logger.warning(
+                f"No replica within {max_lag:.0f}s of the primary, reading the primary."
+            )
+            return self._primary_sessions()
+        return self._session(snapshot.path)
+
+    def start(self, interval: float) -> None:
+        """
+        Refresh the replica every interval seconds on a background thread.
+
+        Args:
+            interval (float): Seconds between the end of one refresh and the start of the next.
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.is_set():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error(f"Replica refresh failed: {str(e)}")
+                self._stop.wait(interval)
+
+        self._thread = threading.Thread(target=run, name="replica-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresh thread and close replica connections."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        for engine in self._engines.values():
+            engine.dispose()
+
+    def _session(self, path: str) -> Session:
+        with self._lock:
+            if path not in self._engines:
+                self._engines[path] = create_engine(
+                    f"sqlite:///file:{path}?mode=ro&uri=true", poolclass=NullPool
+                )
+            return Session(self._engines[path])
+
+    def _discard(self, path: str) -> None:
+        with self._lock:
+            engine = self._engines.pop(path, None)
+        if engine is not None:
+            engine.dispose()
+        # Sessions still open on the file keep reading it until they close
+        if os.path.exists(path):
+            os.remove(path)
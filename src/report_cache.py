@@ -0,0 +1,506 @@
+"""
+Versioned cache for expensive report results.
+
+Aggregate reports (forecasts, fill rates, skill gaps) read a handful of
+tables and are requested far more often than those tables change. A
+ReportCache stores each result under its report name and parameters
+together with the version vector of the tables it was computed from: one
+counter per table, bumped whenever a session writes to that table. A
+cached result is served as long as the counters of its tables have not
+moved since, which costs a dictionary lookup and a tuple comparison.
+
+The counters are bumped by session hooks installed with
+enable_version_tracking(): after every flush for the tables of the
+flushed rows, for set-based ORM INSERT, UPDATE and DELETE statements, and
+again after commit, so a result computed from another session between a
+flush and its commit is not kept. Statements run on a bare Connection
+bypass the hooks; code issuing them should call TableVersions.bump().
+The counters live in memory and only see writes made by this process.
+
+The counters are what a long-lived process checks on every lookup. To
+carry results across processes, such as the short-lived CLI commands, a
+result computed with a session is also stamped with the latest change log
+sequence number (see src/change_log.py) read before it was computed.
+save() writes the stamped results that are still current to disk, and
+load() keeps only those whose tables have no later change log entry, so
+change capture must be enabled on the sessions writing those tables for
+persisted results to be trusted. Results computed without a session are
+never saved.
+
+Saved files are JSON. Besides JSON values they hold tuples, dicts, dates,
+NumPy arrays and the NamedTuple result types registered with
+register_result_type(), and nothing else, so loading a file never runs
+code from it.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict, defaultdict
+from datetime import date, datetime
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    Hashable,
+    Iterable,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from sqlalchemy.orm import Session
+
+from src.change_log import latest_seq, read_changes
+from src.events import install_hook
+from src.models import BaseModel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 256
+
+# Tables written by the current transaction, kept in Session.info
+PENDING_TABLES_KEY = "report_cache_pending_tables"
+
+# The format of saved cache files, bumped when it changes
+FILE_VERSION = 1
+
+# The key tagging values that are not plain JSON in saved cache files
+TYPE_KEY = "$type"
+
+# The NamedTuple result types saved cache files may hold, by name
+RESULT_TYPES: Dict[str, Type[tuple]] = {}
+
+
+class TableVersions:
+    """
+    Per-table write counters.
+
+    Reading a counter takes no lock; bumping one takes the instance lock so
+    concurrent bumps are never lost.
+    """
+
+    def __init__(self):
+        self._versions: DefaultDict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def bump(self, *table_names: str) -> None:
+        """
+        Record a write to tables, invalidating results computed from them.
+
+        Args:
+            *table_names (str): The names of the written tables.
+        """
+        with self._lock:
+            for table_name in table_names:
+                self._versions[table_name] += 1
+
+    def vector(self, table_names: Tuple[str, ...]) -> Tuple[int, ...]:
+        """
+        Get the current counters of tables.
+
+        Args:
+            table_names (Tuple[str, ...]): The table names.
+
+        Returns:
+            Tuple[int, ...]: One counter per table, in the same order.
+        """
+        versions = self._versions
+        return tuple(versions.get(table_name, 0) for table_name in table_names)
+
+
+# The counters bumped by the session hooks
+table_versions = TableVersions()
+
+
+def _pending(session: Session) -> set:
+    return session.info.setdefault(PENDING_TABLES_KEY, set())
+
+
+def _track_flush(session: Session, flush_context) -> None:
+    """Session after_flush hook bumping the tables of the flushed rows."""
+    tables = {
+        obj.__table__.name
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, BaseModel)
+    }
+    if tables:
+        _pending(session).update(tables)
+        table_versions.bump(*tables)
+
+
+def _track_statement(orm_execute_state) -> None:
+    """Session do_orm_execute hook bumping the table of set-based writes."""
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None:
+        table_name = mapper.local_table.name
+        _pending(orm_execute_state.session).add(table_name)
+        table_versions.bump(table_name)
+
+
+def _track_commit(session: Session) -> None:
+    """Session after_commit hook bumping the tables written by the transaction."""
+    tables = session.info.pop(PENDING_TABLES_KEY, None)
+    if tables:
+        table_versions.bump(*tables)
+
+
+def _forget_rollback(session: Session, previous_transaction) -> None:
+    """Session after_soft_rollback hook dropping the rolled back tables."""
+    if previous_transaction.parent is None:
+        session.info.pop(PENDING_TABLES_KEY, None)
+
+
+def enable_version_tracking(target) -> None:
+    """
+    Install the table version hooks on a Session class or sessionmaker.
+
+    Calling this more than once for the same target has no further effect.
+
+    Args:
+        target: A Session subclass or a sessionmaker instance.
+    """
+    install_hook(target, "after_flush", _track_flush)
+    install_hook(target, "do_orm_execute", _track_statement)
+    install_hook(target, "after_commit", _track_commit)
+    install_hook(target, "after_soft_rollback", _forget_rollback)
+
+
+def register_result_type(cls: Type[tuple]) -> Type[tuple]:
+    """
+    Allow a NamedTuple report result type in saved cache files.
+
+    Usable as a class decorator.
+
+    Args:
+        cls (Type[tuple]): The NamedTuple class.
+
+    Returns:
+        Type[tuple]: The class.
+    """
+    RESULT_TYPES[cls.__name__] = cls
+    return cls
+
+
+def _encode(value: Any) -> Any:
+    """Convert a result to JSON values, tagging the types JSON lacks."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    # A NumPy value implies NumPy is imported; src.database imports this
+    # module, and commands that never touch NumPy should not pay for it
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(value, np.generic):
+        return _encode(value.item())
+    if (
+        np is not None
+        and isinstance(value, np.ndarray)
+        and value.dtype.kind in "biufmM"
+    ):
+        # Dates go through ISO strings, which np.array() parses back
+        data = value.astype(str) if value.dtype.kind in "mM" else value
+        return {
+            TYPE_KEY: "ndarray",
+            "dtype": value.dtype.str,
+            "shape": list(value.shape),
+            "data": data.tolist(),
+        }
+    if isinstance(value, datetime):
+        return {TYPE_KEY: "datetime", "value": value.isoformat()}
+    if isinstance(value, date):
+        return {TYPE_KEY: "date", "value": value.isoformat()}
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        name = type(value).__name__
+        if RESULT_TYPES.get(name) is not type(value):
+            raise ValueError(f"{name} is not a registered result type")
+        return {TYPE_KEY: name, "fields": [_encode(item) for item in value]}
+    if isinstance(value, tuple):
+        return {TYPE_KEY: "tuple", "items": [_encode(item) for item in value]}
+    if isinstance(value, dict):
+        return {
+            TYPE_KEY: "dict",
+            "items": [[_encode(k), _encode(v)] for k, v in value.items()],
+        }
+    raise ValueError(f"Cannot save a {type(value).__name__} in the report cache")
+
+
+def _decode(value: Any) -> Any:
+    """Convert JSON values written by _encode() back to a result."""
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    kind = value.get(TYPE_KEY)
+    if kind == "ndarray":
+        import numpy as np
+
+        dtype = np.dtype(value["dtype"])
+        return np.array(value["data"], dtype=dtype).reshape(value["shape"])
+    if kind == "datetime":
+        return datetime.fromisoformat(value["value"])
+    if kind == "date":
+        return date.fromisoformat(value["value"])
+    if kind == "tuple":
+        return tuple(_decode(item) for item in value["items"])
+    if kind == "dict":
+        return {_decode(k): _decode(v) for k, v in value["items"]}
+    if kind in RESULT_TYPES:
+        return RESULT_TYPES[kind](*(_decode(item) for item in value["fields"]))
+    raise ValueError(f"Unknown saved result type {kind}")
+
+
+class _Entry:
+    __slots__ = ("tables", "vector", "seq", "value", "saved")
+
+    def __init__(
+        self,
+        tables: Tuple[str, ...],
+        vector: Tuple[int, ...],
+        seq: Optional[int],
+        value: Any = None,
+        saved: Any = None,
+    ):
+        self.tables = tables
+        self.vector = vector
+        self.seq = seq
+        self.value = value
+        # The JSON form of a value loaded from a file, until it is first used
+        self.saved = saved
+
+    def decoded(self) -> bool:
+        """Decode a loaded value on its first use; False if it cannot be."""
+        if self.saved is not None:
+            try:
+                self.value = _decode(self.saved)
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Ignoring saved report result: {str(e)}")
+                return False
+            self.saved = None
+        return True
+
+
+class ReportCache:
+    """
+    An LRU cache of report results invalidated by table version counters.
+
+    Attributes:
+        max_entries (int): The number of results kept; the least recently used is evicted first.
+        path (Optional[str]): The file used by save() and load(), if any.
+        versions (TableVersions): The table counters results are checked against.
+        hits (int): The number of lookups served from the cache.
+        misses (int): The number of lookups that computed their result.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        path: Optional[str] = None,
+        versions: Optional[TableVersions] = None,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.path = path
+        self.versions = versions if versions is not None else table_versions
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(name: str, params: Dict[str, Any]) -> Hashable:
+        """
+        Build the cache key of a report.
+
+        Args:
+            name (str): The report name.
+            params (Dict[str, Any]): The report parameters; values must be hashable.
+
+        Returns:
+            Hashable: The key.
+        """
+        return (name, tuple(sorted(params.items())))
+
+    def get_or_compute(
+        self,
+        name: str,
+        tables: Iterable[str],
+        compute: Callable[[], Any],
+        db: Optional[Session] = None,
+        **params: Any,
+    ) -> Any:
+        """
+        Get a report result, computing it if it is missing or stale.
+
+        The table counters and the change log sequence number are read
+        before compute() runs, so a write that lands while the report is
+        being computed leaves the result stale.
+
+        Args:
+            name (str): The report name.
+            tables (Iterable[str]): The names of the tables the report reads.
+            compute (Callable[[], Any]): Computes the result.
+            db (Optional[Session]): The session compute() reads from; results
+                computed without one are not saved.
+            **params (Any): The report parameters.
+
+        Returns:
+            Any: The result, shared with later callers; do not modify it.
+        """
+        key = self.key(name, params)
+        entry = self._entries.get(key)
+        if (
+            entry is not None
+            and self.versions.vector(entry.tables) == entry.vector
+            and entry.decoded()
+        ):
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+        self.misses += 1
+        tables = tuple(sorted(set(tables)))
+        vector = self.versions.vector(tables)
+        seq = latest_seq(db) if db is not None else None
+        value = compute()
+        self._store(key, _Entry(tables, vector, seq, value))
+        return value
+
+    def _store(self, key: Hashable, entry: _Entry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, name: Optional[str] = None) -> int:
+        """
+        Drop cached results.
+
+        Args:
+            name (Optional[str]): Drop only the results of this report; all by default.
+
+        Returns:
+            int: The number of results dropped.
+        """
+        with self._lock:
+            keys = [key for key in self._entries if name is None or key[0] == name]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def save(self, path: Optional[str] = None) -> int:
+        """
+        Write the cached results that are still current to disk.
+
+        Only results computed with a session are written, each with the
+        change log sequence number it was computed at; results that cannot
+        be saved are skipped with a warning.
+
+        Args:
+            path (Optional[str]): The file to write, self.path by default.
+
+        Returns:
+            int: The number of results saved.
+
+        Raises:
+            ValueError: If no path is given or configured.
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("No cache file configured")
+        with self._lock:
+            current = [
+                (key, entry)
+                for key, entry in self._entries.items()
+                if entry.seq is not None
+                and self.versions.vector(entry.tables) == entry.vector
+            ]
+        entries = []
+        for key, entry in current:
+            try:
+                value = entry.saved if entry.saved is not None else _encode(entry.value)
+            except ValueError as e:
+                logger.warning(f"Not saving report {key[0]}: {str(e)}")
+                continue
+            entries.append(
+                {
+                    "key": _encode(key),
+                    "tables": list(entry.tables),
+                    "seq": entry.seq,
+                    "value": value,
+                }
+            )
+        partial = path + ".partial"
+        with open(partial, "w", encoding="utf-8") as file:
+            json.dump({"version": FILE_VERSION, "entries": entries}, file)
+        os.replace(partial, path)
+        logger.info(f"Saved {len(entries)} report results to {path}.")
+        return len(entries)
+
+    def load(self, db: Session, path: Optional[str] = None) -> int:
+        """
+        Read results saved with save(), keeping those whose tables have not changed since.
+
+        A missing file loads nothing, and so does an unreadable one, with a
+        warning. Results are decoded when first used, so their result types
+        only need to be registered by then.
+
+        Args:
+            db (Session): The database session, used to read the change log.
+            path (Optional[str]): The file to read, self.path by default.
+
+        Returns:
+            int: The number of results loaded.
+
+        Raises:
+            ValueError: If no path is given or configured.
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("No cache file configured")
+        if not os.path.exists(path):
+            return 0
+        try:
+            with open(path, encoding="utf-8") as file:
+                saved = json.load(file)
+            if saved.get("version") != FILE_VERSION:
+                raise ValueError(f"unsupported version {saved.get('version')}")
+            entries = [
+                (
+                    _decode(entry["key"]),
+                    tuple(entry["tables"]),
+                    entry["seq"],
+                    entry["value"],
+                )
+                for entry in saved["entries"]
+            ]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring report cache file {path}: {str(e)}")
+            return 0
+
+        loaded = 0
+        for key, tables, seq, value in entries:
+            if read_changes(db, seq, limit=1, tables=tables):
+                continue
+            self._store(
+                key, _Entry(tables, self.versions.vector(tables), seq, saved=value)
+            )
+            loaded += 1
+        logger.info(f"Loaded {loaded} of {len(entries)} report results from {path}.")
+        return loaded
@@ -0,0 +1,246 @@
+"""
+Full-text search for the Resource Allocation System.
+
+This module keeps SQLite FTS5 indexes over skills, projects, project
+requirements and individuals. The indexes are external-content FTS5 tables:
+they store only the token index and read the text back from the source
+tables, and triggers on the source tables keep them in sync. Results are
+ranked with bm25, with name matches weighted above description matches.
+Skill searches also match skill synonyms (see src/taxonomy.py).
+
+Run ``python -m src.search rebuild`` to rebuild the indexes from scratch.
+"""
+
+import logging
+import re
+from typing import Iterable, List, NamedTuple, Optional, Union
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Search kind to (source table, FTS table, indexed columns, column weights)
+SEARCH_INDEXES = {
+    "skill": ("skills", "skills_fts", ("name", "description"), (10.0, 1.0)),
+    "project": ("projects", "projects_fts", ("name", "description"), (10.0, 1.0)),
+    "requirement": (
+        "project_requirements",
+        "project_requirements_fts",
+        ("description",),
+        (1.0,),
+    ),
+    "individual": ("individuals", "individuals_fts", ("name",), (1.0,)),
+}
+
+# Synonym matches are reported as hits on the skill they name
+SYNONYM_INDEX = ("skill_synonyms", "skill_synonyms_fts", ("name",), (10.0,))
+
+
+def _indexes() -> List[tuple]:
+    return [*SEARCH_INDEXES.values(), SYNONYM_INDEX]
+
+
+class SearchResult(NamedTuple):
+    """
+    A ranked full-text search hit.
+
+    Attributes:
+        kind (str): The kind of entity, one of the SEARCH_INDEXES keys.
+        id (int): The primary key of the matching row.
+        title (str): The first indexed column of the matching row.
+        rank (float): The bm25 rank; lower is a better match.
+    """
+
+    kind: str
+    id: int
+    title: str
+    rank: float
+
+
+def _ddl(source: str, fts: str, columns: tuple) -> List[str]:
+    """Build the statements creating an FTS5 table and its sync triggers."""
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    delete_old = (
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) "
+        f"VALUES('delete', old.id, {old_values});"
+    )
+    insert_new = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{source}', content_rowid='id')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source} BEGIN "
+        f"{insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source} BEGIN "
+        f"{delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {source} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def _run(bind: Union[Engine, Connection, Session], statements: Iterable[str]) -> None:
+    if isinstance(bind, Engine):
+        with bind.begin() as conn:
+            _run(conn, statements)
+        return
+    for statement in statements:
+        bind.execute(text(statement))
+
+
+def _table_exists(bind: Union[Connection, Session], name: str) -> bool:
+    return (
+        bind.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": name},
+        ).first()
+        is not None
+    )
+
+
+def create_search_index(bind: Union[Engine, Connection, Session]) -> None:
+    """
+    Create the FTS5 tables and sync triggers if they do not exist yet.
+
+    Newly created indexes are populated from the existing rows.
+
+    Args:
+        bind: An engine, connection or session on the SQLite database.
+    """
+    if isinstance(bind, Engine):
+        with bind.begin() as conn:
+            create_search_index(conn)
+        return
+    for source, fts, columns, _ in _indexes():
+        existed = _table_exists(bind, fts)
+        _run(bind, _ddl(source, fts, columns))
+        if not existed:
+            _run(bind, [f"INSERT INTO {fts}({fts}) VALUES('rebuild')"])
+    logger.info("Search index created.")
+
+
+def drop_search_index(bind: Union[Engine, Connection, Session]) -> None:
+    """
+    Drop the FTS5 tables and their sync triggers.
+
+    Args:
+        bind: An engine, connection or session on the SQLite database.
+    """
+    statements = []
+    for _, fts, _, _ in _indexes():
+        for suffix in ("ai", "ad", "au"):
+            statements.append(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+        statements.append(f"DROP TABLE IF EXISTS {fts}")
+    _run(bind, statements)
+
+
+def rebuild_search_index(bind: Union[Engine, Connection, Session]) -> None:
+    """
+    Rebuild every FTS5 index from its source table.
+
+    Args:
+        bind: An engine, connection or session on the SQLite database.
+    """
+    _run(
+        bind,
+        [f"INSERT INTO {fts}({fts}) VALUES('rebuild')" for _, fts, _, _ in _indexes()],
+    )
+    logger.info("Search index rebuilt.")
+
+
+def match_expression(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term and all terms must match, so user
+    input can never be interpreted as FTS5 query syntax.
+
+    Args:
+        query (str): The text typed by the user.
+
+    Returns:
+        Optional[str]: The MATCH expression, or None if the text has no words.
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search(
+    db: Session,
+    query: str,
+    kinds: Optional[Iterable[str]] = None,
+    limit: int = 20,
+) -> List[SearchResult]:
+    """
+    Search skills, projects, requirements and individuals.
+
+    Args:
+        db (Session): The database session.
+        query (str): The text typed by the user.
+        kinds (Optional[Iterable[str]]): Restrict the search to these kinds.
+        limit (int): The maximum number of results.
+
+    Returns:
+        List[SearchResult]: The matches, best first.
+
+    Raises:
+        ValueError: If an unknown kind is requested.
+    """
+    kinds = list(SEARCH_INDEXES) if kinds is None else list(kinds)
+    unknown = set(kinds) - set(SEARCH_INDEXES)
+    if unknown:
+        raise ValueError(f"Unknown search kinds: {', '.join(sorted(unknown))}")
+
+    expression = match_expression(query)
+    if expression is None or not kinds:
+        return []
+
+    selects = []
+    for kind in kinds:
+        _, fts, columns, weights = SEARCH_INDEXES[kind]
+        weight_args = ", ".join(str(w) for w in weights)
+        selects.append(
+            f"SELECT '{kind}' AS kind, rowid AS id, {columns[0]} AS title, "
+            f"bm25({fts}, {weight_args}) AS rank FROM {fts} WHERE {fts} MATCH :query"
+        )
+    if "skill" in kinds:
+        _, fts, _, weights = SYNONYM_INDEX
+        selects.append(
+            f"SELECT 'skill' AS kind, synonym.skill_id AS id, skill.name AS title, "
+            f"bm25({fts}, {weights[0]}) AS rank FROM {fts} "
+            f"JOIN skill_synonyms AS synonym ON synonym.id = {fts}.rowid "
+            f"JOIN skills AS skill ON skill.id = synonym.skill_id "
+            f"WHERE {fts} MATCH :query"
+        )
+    sql = (
+        "SELECT kind, id, title, MIN(rank) AS best FROM ("
+        + " UNION ALL ".join(selects)
+        + ") GROUP BY kind, id ORDER BY best LIMIT :limit"
+    )
+    rows = db.execute(text(sql), {"query": expression, "limit": limit})
+    return [SearchResult(*row) for row in rows]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from src.database import get_engine
+    from src.profiling import Profiler, add_profile_argument
+
+    parser = argparse.ArgumentParser(description="Manage the full-text search index.")
+    parser.add_argument("command", choices=["create", "rebuild", "drop"])
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    profiler = Profiler(args.profile)
+    with profiler.phase(f"{args.command}_search_index"):
+        {
+            "create": create_search_index,
+            "rebuild": rebuild_search_index,
+            "drop": drop_search_index,
+        }[args.command](get_engine())
+    profiler.close()
@@ -0,0 +1,300 @@
+"""
+Batched serialization of models to dicts and JSON.
+
+Converting ORM objects one at a time (reflecting over each instance's
+__dict__ and loading relationships lazily) costs more than the queries
+behind our API. Instead, a field plan is compiled once per model and
+field selection: the columns to select and the names to zip them with. A
+listing is then serialized straight from column tuples, without building
+ORM objects, and each included relationship costs one more IN query for
+the whole batch rather than one query per row.
+
+JSON is encoded with orjson when it is installed, which handles dates and
+datetimes natively, and with the standard library otherwise. load() goes
+the other way, creating rows from dumped dicts with their ISO dates
+parsed back.
+"""
+
+import json
+from datetime import date, datetime
+from functools import lru_cache
+from operator import attrgetter
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session
+
+from src.models import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+CHUNK_SIZE = 500
+
+
+class FieldPlan(NamedTuple):
+    """
+    The compiled serialization of one model and field selection.
+
+    Attributes:
+        model (Type[BaseModel]): The model serialized.
+        names (Tuple[str, ...]): The output keys, in column order.
+        columns (tuple): The mapped columns to select, matching names.
+        getter (Callable): Reads the values of names from a loaded instance as a tuple.
+    """
+
+    model: Type[BaseModel]
+    names: Tuple[str, ...]
+    columns: tuple
+    getter: Any
+
+
+@lru_cache(maxsize=None)
+def field_plan(
+    model: Type[BaseModel], fields: Optional[Tuple[str, ...]] = None
+) -> FieldPlan:
+    """
+    Compile the field plan of a model.
+
+    Args:
+        model (Type[BaseModel]): The model to serialize.
+        fields (Optional[Tuple[str, ...]]): The column attributes to output, all by default.
+
+    Returns:
+        FieldPlan: The cached plan.
+
+    Raises:
+        ValueError: If a field is not a column attribute of the model.
+    """
+    available = [attr.key for attr in inspect(model).column_attrs]
+    if fields is None:
+        names = tuple(available)
+    else:
+        unknown = set(fields) - set(available)
+        if unknown:
+            raise ValueError(
+                f"{model.__name__} has no column {', '.join(sorted(unknown))}"
+            )
+        names = tuple(fields)
+    columns = tuple(getattr(model, name) for name in names)
+    getter = attrgetter(*names)
+    if len(names) == 1:
+        # attrgetter of a single name returns the bare value, not a tuple
+        single = getter
+
+        def getter(obj):
+            return (single(obj),)
+
+    return FieldPlan(model, names, columns, getter)
+
+
+def _plan(model: Type[BaseModel], fields: Optional[Sequence[str]]) -> FieldPlan:
+    return field_plan(model, tuple(fields) if fields is not None else None)
+
+
+def to_dicts(
+    objects: Iterable[BaseModel], fields: Optional[Sequence[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Serialize already loaded instances of one model.
+
+    Args:
+        objects (Iterable[BaseModel]): The instances, all of the same model.
+        fields (Optional[Sequence[str]]): The column attributes to output, all by default.
+
+    Returns:
+        List[Dict[str, Any]]: One dict per instance.
+    """
+    objects = list(objects)
+    if not objects:
+        return []
+    plan = _plan(type(objects[0]), fields)
+    names, getter = plan.names, plan.getter
+    return [dict(zip(names, getter(obj))) for obj in objects]
+
+
+def _attach(
+    db: Session,
+    model: Type[BaseModel],
+    rows: List[Dict[str, Any]],
+    keys: List[Dict[str, Any]],
+    name: str,
+) -> None:
+    """Load one relationship of a batch of rows with IN queries and attach it."""
+    relationship = inspect(model).relationships[name]
+    if len(relationship.local_remote_pairs) != 1 or relationship.secondary is not None:
+        raise ValueError(f"Cannot serialize relationship {model.__name__}.{name}")
+    ((local, remote),) = relationship.local_remote_pairs
+    target = relationship.mapper.class_
+    plan = _plan(target, None)
+    remote_attr = relationship.mapper.get_property_by_column(remote).key
+
+    wanted = sorted({key[local.key] for key in keys if key[local.key] is not None})
+    related: Dict[Any, List[Dict[str, Any]]] = {}
+    for start in range(0, len(wanted), CHUNK_SIZE):
+        chunk = wanted[start : start + CHUNK_SIZE]
+        stmt = (
+            select(*plan.columns)
+            .where(getattr(target, remote_attr).in_(chunk))
+            .order_by(target.id)
+        )
+        for values in db.execute(stmt):
+            item = dict(zip(plan.names, values))
+            related.setdefault(item[remote_attr], []).append(item)
+
+    for row, key in zip(rows, keys):
+        matches = related.get(key[local.key], [])
+        if relationship.uselist:
+            row[name] = matches
+        else:
+            row[name] = matches[0] if matches else None
+
+
+def dump(
+    db: Session,
+    model: Type[BaseModel],
+    *criteria,
+    fields: Optional[Sequence[str]] = None,
+    include: Sequence[str] = (),
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Query and serialize rows of a model without building ORM objects.
+
+    Args:
+        db (Session): The database session.
+        model (Type[BaseModel]): The model to serialize.
+        *criteria: WHERE criteria for the query.
+        fields (Optional[Sequence[str]]): The column attributes to output, all by default.
+        include (Sequence[str]): Relationships to nest, each loaded with one IN query
+            per chunk of rows; nested rows have all their columns.
+        limit (Optional[int]): The most rows to return.
+
+    Returns:
+        List[Dict[str, Any]]: One dict per row, ordered by id.
+    """
+    plan = _plan(model, fields)
+    relationships = inspect(model).relationships
+    # Columns the relationships join on, selected even when not output
+    join_columns = []
+    for name in include:
+        if name not in relationships:
+            raise ValueError(f"{model.__name__} has no relationship {name}")
+        for local, _ in relationships[name].local_remote_pairs:
+            if local.key not in plan.names and local.key not in join_columns:
+                join_columns.append(local.key)
+
+    stmt = select(*plan.columns, *(getattr(model, key) for key in join_columns))
+    stmt = stmt.where(*criteria).order_by(model.id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    width = len(plan.names)
+    result = db.execute(stmt).all()
+    rows = [dict(zip(plan.names, values)) for values in result]
+    if include:
+        keys = [
+            {**row, **dict(zip(join_columns, values[width:]))}
+            for row, values in zip(rows, result)
+        ]
+        for name in include:
+            _attach(db, model, rows, keys, name)
+    return rows
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data: Any) -> bytes:
+    """
+    Encode serialized rows as JSON.
+
+    Args:
+        data (Any): Dicts and lists as returned by dump() or to_dicts().
+
+    Returns:
+        bytes: UTF-8 encoded JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, default=_default, separators=(",", ":")).encode()
+
+
+@lru_cache(maxsize=None)
+def _parsers(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Get the parser of each date and datetime column, which dumps() writes as ISO strings."""
+    parsers = {}
+    for attr in inspect(model).column_attrs:
+        try:
+            python_type = attr.columns[0].type.python_type
+        except NotImplementedError:
+            continue
+        if python_type is datetime:
+            parsers[attr.key] = datetime.fromisoformat
+        elif python_type is date:
+            parsers[attr.key] = date.fromisoformat
+    return parsers
+
+
+def load(db: Session, model: Type[BaseModel], rows: Iterable[Dict[str, Any]]) -> int:
+    """
+    Create rows of a model from serialized dicts, as returned by dump().
+
+    Rows are added as ORM objects and flushed a chunk at a time, so the
+    flush hooks (change capture, eligibility and taxonomy maintenance) see
+    them. Dates and datetimes may be given as ISO strings. Nothing is
+    committed; the caller decides the transaction boundary.
+
+    Args:
+        db (Session): The database session.
+        model (Type[BaseModel]): The model to create.
+        rows (Iterable[Dict[str, Any]]): Column values by attribute name,
+            without nested relationships.
+
+    Returns:
+        int: The number of rows created.
+
+    Raises:
+        ValueError: If a row has a key that is not a column attribute of the model.
+    """
+    available = set(field_plan(model).names)
+    parsers = _parsers(model)
+    created = 0
+    chunk: List[BaseModel] = []
+    for row in rows:
+        unknown = row.keys() - available
+        if unknown:
+            raise ValueError(
+                f"{model.__name__} has no column {', '.join(sorted(unknown))}"
+            )
+        values = {
+            key: (
+                parsers[key](value)
+                if key in parsers and isinstance(value, str)
+                else value
+            )
+            for key, value in row.items()
+        }
+        chunk.append(model(**values))
+        if len(chunk) == CHUNK_SIZE:
+            db.add_all(chunk)
+            db.flush()
+            created += len(chunk)
+            chunk = []
+    db.add_all(chunk)
+    db.flush()
+    return created + len(chunk)
@@ -0,0 +1,392 @@
+"""
+Per-client sharding for the Resource Allocation System.
+
+Tenant data (a client's projects, their requirements and the assignments
+against them) can be stored in separate SQLite files, so the largest
+clients no longer slow down every query of the small ones. The main
+database stays the source of truth for clients and the shared reference
+data (skills, roles, individuals and their skills, roles and
+availability), which is replicated into every shard so tenant queries can
+join against it locally.
+
+A ShardRouter picks the shard of a client: clients listed as dedicated get
+a file of their own, all others are spread over a fixed number of shared
+files by id. Shards are opened lazily and created on first use.
+
+Shard sessions get the same session hooks as the main database's: each
+shard keeps its own change log and requirement eligibility index, which
+are rebuilt whenever reference data is replicated or tenants migrated.
+
+Replicated reference data is read-only in the shards. Allocation checks
+made inside a shard only see that shard's assignments, so individuals
+booked from several shards are not guarded against over-allocation.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Generator, List, Optional, Sequence, TypeVar
+
+from sqlalchemy import Table, create_engine, delete, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.change_log import DELETE, INSERT, enable_change_capture, record_changes
+from src.eligibility import enable_eligibility_maintenance, rebuild_eligibility
+from src.metrics import enable_metrics
+from src.models import (
+    Assignment,
+    Availability,
+    BaseModel,
+    ChangeLogEntry,
+    Client,
+    Individual,
+    IndividualRole,
+    IndividualSkill,
+    Project,
+    ProjectRequirement,
+    RequirementEligibility,
+    Role,
+    RoleLevel,
+    RoleRequirement,
+    RoleType,
+    Skill,
+    SkillClosure,
+    SkillRequirement,
+    SkillSynonym,
+    TimeRequirement,
+)
+from src.taxonomy import enable_taxonomy_maintenance
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CHUNK_SIZE = 1000
+
+# Tables copied from the main database into every shard, parents first
+REFERENCE_TABLES: List[Table] = [
+    model.__table__
+    for model in (
+        Client,
+        Skill,
+        SkillSynonym,
+        SkillClosure,
+        RoleType,
+        RoleLevel,
+        Role,
+        Individual,
+        IndividualSkill,
+        IndividualRole,
+        Availability,
+    )
+]
+
+# Tables holding a client's own rows, parents first
+TENANT_TABLES: List[Table] = [
+    model.__table__
+    for model in (
+        Project,
+        ProjectRequirement,
+        TimeRequirement,
+        SkillRequirement,
+        RoleRequirement,
+        Assignment,
+    )
+]
+
+# Tables each shard maintains for itself
+LOCAL_TABLES: List[Table] = [ChangeLogEntry.__table__, RequirementEligibility.__table__]
+
+
+def _tenant_filter(table: Table, client_ids: Sequence[int]):
+    """Build the WHERE clause selecting the rows of a tenant table owned by the clients."""
+    projects = select(Project.id).where(Project.client_id.in_(client_ids))
+    if table is Project.__table__:
+        return table.c.client_id.in_(client_ids)
+    if table is ProjectRequirement.__table__:
+        return table.c.project_id.in_(projects)
+    requirements = select(ProjectRequirement.id).where(
+        ProjectRequirement.project_id.in_(projects)
+    )
+    return table.c.requirement_id.in_(requirements)
+
+
+def _upsert(table: Table):
+    """Build an INSERT that overwrites rows already present with the same id."""
+    stmt = sqlite_insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.id],
+        set_={
+            column.name: stmt.excluded[column.name]
+            for column in table.columns
+            if column.name != "id"
+        },
+    )
+
+
+def _copy_rows(source, target, table: Table, where=None, upsert=False) -> List[int]:
+    """
+    Copy the rows of a table between connections in chunks.
+
+    With upsert, rows already in the target are overwritten rather than
+    rejected, so an interrupted copy can be run again.
+
+    Returns:
+        List[int]: The ids of the rows copied.
+    """
+    stmt = select(table)
+    if where is not None:
+        stmt = stmt.where(where)
+    result = source.execute(stmt.order_by(table.c.id))
+    write = _upsert(table) if upsert else insert(table)
+    copied: List[int] = []
+    while True:
+        rows = [row._asdict() for row in result.fetchmany(CHUNK_SIZE)]
+        if not rows:
+            return copied
+        target.execute(write, rows)
+        copied.extend(row["id"] for row in rows)
+
+
+class ShardRouter:
+    """
+    Routes tenant data to per-client SQLite shard files.
+
+    Attributes:
+        directory (str): The directory holding the shard files.
+        shard_count (int): The number of shared shards clients are spread over.
+        dedicated (Dict[int, str]): Client ids mapped to the name of a shard of their own.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        shard_count: int = 4,
+        dedicated: Optional[Dict[int, str]] = None,
+    ):
+        if shard_count < 1:
+            raise ValueError("Must have at least one shard")
+        self.directory = directory
+        self.shard_count = shard_count
+        self.dedicated = dict(dedicated or {})
+        self._engines: Dict[str, Engine] = {}
+        self._sessions: Dict[str, sessionmaker] = {}
+
+    @property
+    def shard_names(self) -> List[str]:
+        """The names of all shards, shared ones first."""
+        shared = [f"shard_{i:02d}" for i in range(self.shard_count)]
+        return shared + sorted(set(self.dedicated.values()) - set(shared))
+
+    def shard_for(self, client_id: int) -> str:
+        """
+        Get the name of the shard holding a client's data.
+
+        Args:
+            client_id (int): The ID of the client.
+
+        Returns:
+            str: The shard name.
+        """
+        if client_id in self.dedicated:
+            return self.dedicated[client_id]
+        return f"shard_{client_id % self.shard_count:02d}"
+
+    def engine(self, name: str) -> Engine:
+        """
+        Get the engine of a shard, creating the shard file on first use.
+
+        Args:
+            name (str): The shard name.
+
+        Returns:
+            Engine: The shard's engine.
+        """
+        if name not in self._engines:
+            path = os.path.join(self.directory, f"{name}.db")
+            engine = create_engine(f"sqlite:///{path}")
+            BaseModel.metadata.create_all(
+                engine, tables=REFERENCE_TABLES + TENANT_TABLES + LOCAL_TABLES
+            )
+            sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            # The same hooks as the main database's SessionLocal
+            enable_change_capture(sessions)
+            enable_taxonomy_maintenance(sessions)
+            enable_eligibility_maintenance(sessions)
+            enable_metrics(engine, sessions)
+            self._engines[name] = engine
+            self._sessions[name] = sessions
+        return self._engines[name]
+
+    def session(self, name: str) -> Session:
+        """
+        Open a session on a shard.
+
+        Args:
+            name (str): The shard name.
+
+        Returns:
+            Session: A new session bound to the shard.
+        """
+        self.engine(name)
+        return self._sessions[name]()
+
+    @contextmanager
+    def get_db(self, client_id: int) -> Generator[Session, None, None]:
+        """
+        Context manager for a session on the shard of a client, like get_db().
+
+        Args:
+            client_id (int): The ID of the client whose data is accessed.
+
+        Yields:
+            Session: A session bound to the client's shard.
+
+        Raises:
+            SQLAlchemyError: If there's an error during database operations.
+        """
+        db = self.session(self.shard_for(client_id))
+        try:
+            yield db
+        except SQLAlchemyError as e:
+            logger.error(f"Database error occurred on client {client_id}: {str(e)}")
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def fan_out(self, operation: Callable[[Session], T]) -> Dict[str, T]:
+        """
+        Run a read operation on every shard in parallel.
+
+        Args:
+            operation (Callable[[Session], T]): Called with a session on each shard.
+                Returned ORM objects are detached, so load what is needed first.
+
+        Returns:
+            Dict[str, T]: The result of each shard, by shard name.
+        """
+
+        def run(name: str) -> T:
+            with self.session(name) as db:
+                return operation(db)
+
+        names = self.shard_names
+        # Open the shards up front; creating them is not thread safe
+        for name in names:
+            self.engine(name)
+        with ThreadPoolExecutor(max_workers=len(names)) as pool:
+            return dict(zip(names, pool.map(run, names)))
+
+    def scalars(self, stmt) -> List:
+        """
+        Run a select on every shard in parallel and concatenate the results.
+
+        Args:
+            stmt: The select statement.
+
+        Returns:
+            List: The scalar results of all shards, in shard order.
+        """
+        results = self.fan_out(lambda db: list(db.scalars(stmt)))
+        return [item for name in self.shard_names for item in results[name]]
+
+    def replicate_reference_data(self, source: Session) -> Dict[str, int]:
+        """
+        Refresh the reference tables of every shard from the main database.
+
+        Each shard is refreshed in one transaction, so readers never see it
+        half copied, and its eligibility index is rebuilt in the same
+        transaction.
+
+        Args:
+            source (Session): A session on the main database.
+
+        Returns:
+            Dict[str, int]: The number of rows copied into each shard, per table.
+        """
+        connection = source.connection()
+        counts = {}
+        for name in self.shard_names:
+            with self.session(name) as db:
+                target = db.connection()
+                for table in reversed(REFERENCE_TABLES):
+                    target.execute(delete(table))
+                counts.update(
+                    {
+                        table.name: len(_copy_rows(connection, target, table))
+                        for table in REFERENCE_TABLES
+                    }
+                )
+                rebuild_eligibility(db)
+                db.commit()
+            logger.info(f"Replicated reference data to {name}.")
+        return counts
+
+    def migrate_tenant_data(self, source: Session) -> Dict[str, int]:
+        """
+        Move every client's tenant rows from the main database into its shard.
+
+        Rows are copied shard by shard and deleted from the main database
+        only when every shard has committed; the deletes are recorded in the
+        main database's change log, and the inserts in each shard's. Copies
+        overwrite rows already in a shard, so a migration that failed part
+        way can be run again. Each shard's eligibility index is rebuilt with
+        its copy.
+
+        Args:
+            source (Session): A session on the main database.
+
+        Returns:
+            Dict[str, int]: The number of rows moved per shard.
+        """
+        clients: Dict[str, List[int]] = {}
+        for client_id in source.scalars(select(Client.id)):
+            clients.setdefault(self.shard_for(client_id), []).append(client_id)
+
+        connection = source.connection()
+        moved = {}
+        for name, client_ids in clients.items():
+            moved[name] = 0
+            with self.session(name) as db:
+                for table in TENANT_TABLES:
+                    ids = _copy_rows(
+                        connection,
+                        db.connection(),
+                        table,
+                        _tenant_filter(table, client_ids),
+                        upsert=True,
+                    )
+                    record_changes(db, table.name, ids, INSERT)
+                    moved[name] += len(ids)
+                rebuild_eligibility(db)
+                db.commit()
+            logger.info(
+                f"Moved {moved[name]} rows of {len(client_ids)} clients to {name}."
+            )
+
+        # Children first, while their parents still identify the client
+        all_clients = [c for client_ids in clients.values() for c in client_ids]
+        connection.execute(
+            delete(RequirementEligibility.__table__).where(
+                _tenant_filter(RequirementEligibility.__table__, all_clients)
+            )
+        )
+        for table in reversed(TENANT_TABLES):
+            ids = connection.scalars(
+                delete(table)
+                .where(_tenant_filter(table, all_clients))
+                .returning(table.c.id)
+            ).all()
+            record_changes(source, table.name, ids, DELETE)
+        source.commit()
+        return moved
+
+    def dispose(self) -> None:
+        """Close the connections of every open shard."""
+        for engine in self._engines.values():
+            engine.dispose()
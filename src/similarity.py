@@ -0,0 +1,406 @@
+"""
+Skill-similarity search for substitute candidates.
+
+When nobody meets a requirement exactly, the nearest substitutes are the
+people whose skills look most like what the requirement asks for. Every
+individual is represented as a vector over skill ids weighted by
+proficiency level, and every project requirement as a vector weighted by
+minimum proficiency. Vectors are L2-normalized and kept as the rows of a
+dense float32 NumPy matrix, so the cosine similarity of a query against
+everyone is one matrix product. Queries are scored a block of rows at a
+time and only the top k of each block is kept, which bounds the memory of
+searching many queries at once.
+
+The matrix takes 4 bytes per person per skill column, about 60 MB for 50k
+people over 300 skills.
+
+A SkillVectorIndex is built once from the database and then kept current
+with refresh(), which reads the change log (see src/change_log.py) since the
+last build or refresh and recomputes only the vectors of the individuals
+and requirements whose skills changed. Change capture must be enabled on
+the sessions writing skills for refresh() to see their changes.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.change_log import DELETE, latest_seq, read_changes
+from src.models import IndividualSkill, SkillRequirement
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of bound values per IN clause
+CHUNK_SIZE = 500
+
+# Number of matrix rows scored together
+DEFAULT_BLOCK_SIZE = 8192
+
+# Change log entries read per page while refreshing
+CHANGES_PER_PAGE = 1000
+
+
+class SimilarityMatch(NamedTuple):
+    """
+    A search hit ranked by cosine similarity.
+
+    Attributes:
+        id (int): The ID of the matching individual or project requirement.
+        similarity (float): The cosine similarity, from 0 (no shared skill) to 1.
+    """
+
+    id: int
+    similarity: float
+
+
+class SkillVectors:
+    """
+    A growable matrix of L2-normalized skill vectors keyed by entity id.
+
+    Removed entities leave a zeroed row behind, which can never match; the
+    rows are compacted on the next full build.
+
+    Attributes:
+        ids (np.ndarray): The entity id of each used row, 0 for removed rows.
+        matrix (np.ndarray): The float32 vectors, one row per entity.
+    """
+
+    def __init__(self, dimensions: int = 0, capacity: int = 1024):
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.matrix = np.zeros((capacity, dimensions), dtype=np.float32)
+        self._rows: Dict[int, int] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, entity_id: int) -> bool:
+        return entity_id in self._rows
+
+    def resize(self, dimensions: int) -> None:
+        """Widen the matrix to at least the given number of columns."""
+        rows, columns = self.matrix.shape
+        if dimensions > columns:
+            wider = np.zeros((rows, max(dimensions, columns * 2)), dtype=np.float32)
+            wider[:, :columns] = self.matrix
+            self.matrix = wider
+
+    def set(self, entity_id: int, weights: Dict[int, float]) -> None:
+        """
+        Store the vector of an entity, replacing any previous one.
+
+        Args:
+            entity_id (int): The ID of the individual or requirement.
+            weights (Dict[int, float]): Column index to weight; no weights removes the entity.
+        """
+        norm = float(np.sqrt(sum(w * w for w in weights.values())))
+        if not norm:
+            self.remove(entity_id)
+            return
+        row = self._rows.get(entity_id)
+        if row is None:
+            row = self._count
+            if row == len(self.ids):
+                self.ids = np.concatenate([self.ids, np.zeros_like(self.ids)])
+                self.matrix = np.concatenate([self.matrix, np.zeros_like(self.matrix)])
+            self._rows[entity_id] = row
+            self.ids[row] = entity_id
+            self._count += 1
+        vector = self.matrix[row]
+        vector[:] = 0
+        vector[list(weights)] = np.fromiter(weights.values(), np.float32) / norm
+
+    def remove(self, entity_id: int) -> None:
+        """Forget the vector of an entity, if it has one."""
+        row = self._rows.pop(entity_id, None)
+        if row is not None:
+            self.ids[row] = 0
+            self.matrix[row] = 0
+
+    def vector(self, entity_id: int) -> Optional[np.ndarray]:
+        """Get the normalized vector of an entity, or None if it has none."""
+        row = self._rows.get(entity_id)
+        return None if row is None else self.matrix[row]
+
+    def top_k(
+        self,
+        queries: np.ndarray,
+        k: int,
+        exclude: Iterable[int] = (),
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> List[List[SimilarityMatch]]:
+        """
+        Find the rows most similar to each query vector.
+
+        Args:
+            queries (np.ndarray): Normalized query vectors, one per row.
+            k (int): The number of matches to return per query.
+            exclude (Iterable[int]): Entity ids never to return.
+            block_size (int): The number of rows scored at a time.
+
+        Returns:
+            List[List[SimilarityMatch]]: Per query, best first; rows sharing no
+            skill with the query are left out.
+
+        Raises:
+            ValueError: If k is not positive.
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        columns = min(queries.shape[1], self.matrix.shape[1])
+        queries = queries[:, :columns]
+        excluded = np.fromiter(exclude, dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+
+        for start in range(0, self._count, block_size):
+            stop = min(start + block_size, self._count)
+            scores = queries @ self.matrix[start:stop, :columns].T
+            if len(excluded):
+                scores[:, np.isin(self.ids[start:stop], excluded)] = 0
+            if stop - start > k:
+                keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, keep, axis=1)
+            else:
+                keep = np.broadcast_to(np.arange(stop - start), scores.shape)
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            best_rows = np.concatenate([best_rows, keep + start], axis=1)
+            if best_scores.shape[1] > k:
+                keep = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+
+        results = []
+        for scores, rows in zip(best_scores, best_rows):
+            ids = self.ids[rows]
+            order = np.lexsort((ids, -scores))
+            results.append(
+                [
+                    SimilarityMatch(int(ids[i]), float(scores[i]))
+                    for i in order
+                    if scores[i] > 0
+                ]
+            )
+        return results
+
+
+def _chunks(values: Iterable[int], size: int = CHUNK_SIZE) -> Iterable[List[int]]:
+    values = sorted(values)
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+class SkillVectorIndex:
+    """
+    Skill vectors of every individual and project requirement.
+
+    Attributes:
+        individuals (SkillVectors): Vectors weighted by proficiency level.
+        requirements (SkillVectors): Vectors weighted by minimum proficiency.
+        seq (int): The change log sequence number the index is current with.
+        block_size (int): The number of rows scored at a time.
+    """
+
+    # Source table, owner column and weight column of each side
+    SOURCES = {
+        "individuals": (IndividualSkill, "individual_id", "proficiency_level"),
+        "requirements": (SkillRequirement, "requirement_id", "minimum_proficiency"),
+    }
+
+    def __init__(self, block_size: int = DEFAULT_BLOCK_SIZE):
+        self.block_size = block_size
+        self.individuals = SkillVectors()
+        self.requirements = SkillVectors()
+        self.seq = 0
+        self._columns: Dict[int, int] = {}
+        # Skill row id to owner id, to know whose vector a deleted row belonged to
+        self._owners: Dict[str, Dict[int, int]] = {side: {} for side in self.SOURCES}
+
+    def _column(self, skill_id: int) -> int:
+        column = self._columns.get(skill_id)
+        if column is None:
+            column = self._columns[skill_id] = len(self._columns)
+            self.individuals.resize(len(self._columns))
+            self.requirements.resize(len(self._columns))
+        return column
+
+    def _load(self, db: Session, side: str, owner_ids: Optional[Set[int]]) -> int:
+        """Recompute the vectors of some owners on one side, or of all of them."""
+        model, owner_column, weight_column = self.SOURCES[side]
+        owner = getattr(model, owner_column)
+        stmt = select(model.id, owner, model.skill_id, getattr(model, weight_column))
+        batches = (
+            [db.execute(stmt)]
+            if owner_ids is None
+            else (
+                db.execute(stmt.where(owner.in_(chunk))) for chunk in _chunks(owner_ids)
+            )
+        )
+
+        weights: Dict[int, Dict[int, float]] = defaultdict(dict)
+        owners = self._owners[side]
+        for rows in batches:
+            for row_id, owner_id, skill_id, weight in rows:
+                column = self._column(skill_id)
+                vector = weights[owner_id]
+                vector[column] = max(vector.get(column, 0.0), float(weight))
+                owners[row_id] = owner_id
+
+        vectors: SkillVectors = getattr(self, side)
+        for owner_id in owner_ids if owner_ids is not None else list(weights):
+            vectors.set(owner_id, weights.get(owner_id, {}))
+        return len(weights)
+
+    def build(self, db: Session) -> "SkillVectorIndex":
+        """
+        Build the index from scratch.
+
+        Args:
+            db (Session): The database session.
+
+        Returns:
+            SkillVectorIndex: The index itself.
+        """
+        self.seq = latest_seq(db)
+        self._columns.clear()
+        self.individuals = SkillVectors()
+        self.requirements = SkillVectors()
+        self._owners = {side: {} for side in self.SOURCES}
+        people = self._load(db, "individuals", None)
+        requirements = self._load(db, "requirements", None)
+        logger.info(
+            f"Built skill vectors of {people} individuals and {requirements} "
+            f"requirements over {len(self._columns)} skills."
+        )
+        return self
+
+    def refresh(self, db: Session) -> int:
+        """
+        Apply the skill changes recorded in the change log since the last refresh.
+
+        Args:
+            db (Session): The database session.
+
+        Returns:
+            int: The number of individual and requirement vectors recomputed.
+        """
+        tables = {
+            model.__tablename__: side for side, (model, _, _) in self.SOURCES.items()
+        }
+        changed: Dict[str, Set[int]] = {side: set() for side in self.SOURCES}
+        rows: Dict[str, Set[int]] = {side: set() for side in self.SOURCES}
+        while True:
+            entries = read_changes(db, self.seq, CHANGES_PER_PAGE, tables)
+            if not entries:
+                break
+            for entry in entries:
+                side = tables[entry.table_name]
+                owner_id = self._owners[side].get(entry.row_id)
+                if owner_id is not None:
+                    changed[side].add(owner_id)
+                if entry.operation == DELETE:
+                    self._owners[side].pop(entry.row_id, None)
+                else:
+                    rows[side].add(entry.row_id)
+            self.seq = entries[-1].seq
+
+        for side, (model, owner_column, _) in self.SOURCES.items():
+            # The current owners of inserted and updated rows
+            owner = getattr(model, owner_column)
+            for chunk in _chunks(rows[side]):
+                changed[side].update(
+                    db.scalars(select(owner).where(model.id.in_(chunk)))
+                )
+            if changed[side]:
+                self._load(db, side, changed[side])
+
+        recomputed = sum(len(ids) for ids in changed.values())
+        if recomputed:
+            logger.info(f"Recomputed {recomputed} skill vectors.")
+        return recomputed
+
+    def query_vector(self, skills: Dict[int, float]) -> np.ndarray:
+        """
+        Build a normalized query vector from skill weights.
+
+        Args:
+            skills (Dict[int, float]): Skill id to weight, e.g. a proficiency level.
+
+        Returns:
+            np.ndarray: The vector; skills nobody holds are ignored.
+        """
+        vector = np.zeros(len(self._columns), dtype=np.float32)
+        for skill_id, weight in skills.items():
+            column = self._columns.get(skill_id)
+            if column is not None:
+                vector[column] = weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def search(
+        self, skills: Dict[int, float], k: int = 10, exclude: Iterable[int] = ()
+    ) -> List[SimilarityMatch]:
+        """
+        Find the individuals whose skills are most similar to some skill weights.
+
+        Args:
+            skills (Dict[int, float]): Skill id to weight.
+            k (int): The number of matches to return.
+            exclude (Iterable[int]): Individual ids never to return.
+
+        Returns:
+            List[SimilarityMatch]: Best first.
+        """
+        vector = self.query_vector(skills)
+        return self.individuals.top_k(vector, k, exclude, self.block_size)[0]
+
+    def substitutes(
+        self, requirement_ids: Iterable[int], k: int = 10, exclude: Iterable[int] = ()
+    ) -> Dict[int, List[SimilarityMatch]]:
+        """
+        Find the individuals most similar to the skill requirements of some requirements.
+
+        Args:
+            requirement_ids (Iterable[int]): The IDs of the project requirements.
+            k (int): The number of matches to return per requirement.
+            exclude (Iterable[int]): Individual ids never to return, e.g. those
+                already eligible (see src/eligibility.py).
+
+        Returns:
+            Dict[int, List[SimilarityMatch]]: Per requirement, best first; empty
+            for requirements without skill requirements.
+        """
+        requirement_ids = list(requirement_ids)
+        found = [i for i in requirement_ids if i in self.requirements]
+        results: Dict[int, List[SimilarityMatch]] = {i: [] for i in requirement_ids}
+        if found:
+            vectors = [self.requirements.vector(i) for i in found]
+            queries = np.stack(vectors)[:, : len(self._columns)]
+            for requirement_id, matches in zip(
+                found, self.individuals.top_k(queries, k, exclude, self.block_size)
+            ):
+                results[requirement_id] = matches
+        return results
+
+    def similar_requirements(
+        self, individual_id: int, k: int = 10
+    ) -> List[SimilarityMatch]:
+        """
+        Find the project requirements whose skills best fit an individual.
+
+        Args:
+            individual_id (int): The ID of the individual.
+            k (int): The number of matches to return.
+
+        Returns:
+            List[SimilarityMatch]: Best first; empty if the individual has no skills.
+        """
+        vector = self.individuals.vector(individual_id)
+        if vector is None:
+            return []
+        return self.requirements.top_k(vector, k, (), self.block_size)[0]
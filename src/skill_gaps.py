@@ -0,0 +1,266 @@
+"""
+Skill gap analysis for workforce planning.
+
+For every skill, the report compares the positions that open skill
+requirements still need to fill, grouped by minimum proficiency and by the
+month the work starts, against the number of people holding the skill at
+or above that proficiency who have free capacity today.
+
+A skill requirement is open when its project requirement has not ended,
+its project is not completed or cancelled, and it has fewer active
+assignments than its headcount: the sum of its RoleRequirement.number_needed,
+or one without role requirements. The remaining positions are its demand.
+A person has free capacity when their availability on the day exceeds the
+weekly hours of their active assignments running that day.
+
+The whole report is two grouped queries, one per side, and a cumulative
+sum over proficiency levels, whatever the number of skills.
+"""
+
+import logging
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from src.housekeeping import CLOSED_PROJECT_STATUSES, CLOSED_STATUSES
+from src.models import (
+    Assignment,
+    Availability,
+    IndividualSkill,
+    Project,
+    ProjectRequirement,
+    RoleRequirement,
+    SkillRequirement,
+    TimeRequirement,
+)
+from src.report_cache import ReportCache, register_result_type
+
+logger = logging.getLogger(__name__)
+
+# The tables the report is computed from
+SOURCE_TABLES = (
+    "skill_requirements",
+    "role_requirements",
+    "project_requirements",
+    "projects",
+    "assignments",
+    "time_requirements",
+    "availabilities",
+    "individual_skills",
+)
+
+
+@register_result_type
+class SkillGap(NamedTuple):
+    """
+    Open positions against free people for one skill, proficiency and start month.
+
+    Attributes:
+        skill_id (int): The ID of the skill.
+        minimum_proficiency (int): The proficiency the requirements ask for.
+        window (str): The month the work starts, as YYYY-MM; work already
+            running counts towards the current month.
+        requirements (int): The number of open requirements.
+        demand (int): The positions those requirements still need.
+        supply (int): The people with the skill at or above minimum_proficiency
+            and free capacity.
+    """
+
+    skill_id: int
+    minimum_proficiency: int
+    window: str
+    requirements: int
+    demand: int
+    supply: int
+
+    @property
+    def gap(self) -> int:
+        """Get the positions that cannot be filled from the free people, at least 0."""
+        return max(self.demand - self.supply, 0)
+
+
+def _active(status, closed=CLOSED_STATUSES):
+    return or_(status.is_(None), status.not_in(closed))
+
+
+def _demand_query(as_of: date):
+    headcount = func.max(
+        func.coalesce(
+            select(func.sum(RoleRequirement.number_needed))
+            .where(RoleRequirement.requirement_id == ProjectRequirement.id)
+            .scalar_subquery(),
+            1,
+        ),
+        1,
+    )
+    assigned = (
+        select(func.count(Assignment.id))
+        .where(
+            Assignment.requirement_id == ProjectRequirement.id,
+            _active(Assignment.status),
+        )
+        .scalar_subquery()
+    )
+    open_requirements = (
+        select(
+            ProjectRequirement.id.label("requirement_id"),
+            func.strftime(
+                "%Y-%m", func.max(ProjectRequirement.start_date, as_of)
+            ).label("window"),
+            (headcount - assigned).label("remaining"),
+        )
+        .outerjoin(Project, Project.id == ProjectRequirement.project_id)
+        .where(
+            ProjectRequirement.end_date >= as_of,
+            _active(Project.status, CLOSED_PROJECT_STATUSES),
+        )
+        .cte("open_requirements")
+    )
+    return (
+        select(
+            SkillRequirement.skill_id,
+            SkillRequirement.minimum_proficiency,
+            open_requirements.c.window,
+            func.count(),
+            func.sum(open_requirements.c.remaining),
+        )
+        .join(
+            open_requirements,
+            open_requirements.c.requirement_id == SkillRequirement.requirement_id,
+        )
+        .where(open_requirements.c.remaining > 0)
+        .group_by(
+            SkillRequirement.skill_id,
+            SkillRequirement.minimum_proficiency,
+            open_requirements.c.window,
+        )
+    )
+
+
+def _supply_query(as_of: date):
+    available = (
+        select(
+            Availability.individual_id,
+            func.sum(Availability.hours_per_week).label("hours"),
+        )
+        .where(Availability.start_date <= as_of, Availability.end_date >= as_of)
+        .group_by(Availability.individual_id)
+        .cte("available")
+    )
+    booked = (
+        select(
+            Assignment.individual_id,
+            func.sum(TimeRequirement.hours_per_week).label("hours"),
+        )
+        .join(
+            TimeRequirement,
+            TimeRequirement.requirement_id == Assignment.requirement_id,
+        )
+        .where(
+            Assignment.start_date <= as_of,
+            Assignment.end_date >= as_of,
+            _active(Assignment.status),
+        )
+        .group_by(Assignment.individual_id)
+        .cte("booked")
+    )
+    free = (
+        select(available.c.individual_id)
+        .outerjoin(booked, booked.c.individual_id == available.c.individual_id)
+        .where(available.c.hours > func.coalesce(booked.c.hours, 0))
+        .cte("free")
+    )
+    return (
+        select(
+            IndividualSkill.skill_id,
+            IndividualSkill.proficiency_level,
+            func.count(),
+        )
+        .join(free, free.c.individual_id == IndividualSkill.individual_id)
+        .group_by(IndividualSkill.skill_id, IndividualSkill.proficiency_level)
+    )
+
+
+def _at_or_above(rows: List[Tuple[int, int, int]]) -> Dict[Tuple[int, int], int]:
+    """
+    Turn people counts per skill and exact level into counts at or above each level.
+
+    Args:
+        rows (List[Tuple[int, int, int]]): (skill_id, proficiency_level, people).
+
+    Returns:
+        Dict[Tuple[int, int], int]: People per (skill_id, level), for levels 0 to the
+        highest level held.
+    """
+    if not rows:
+        return {}
+    skill_ids, levels, counts = (np.array(column) for column in zip(*rows))
+    levels = np.maximum(levels, 0)
+    keys, row = np.unique(skill_ids, return_inverse=True)
+    matrix = np.zeros((len(keys), levels.max() + 1), dtype=np.int64)
+    np.add.at(matrix, (row, levels), counts)
+    cumulative = np.cumsum(matrix[:, ::-1], axis=1)[:, ::-1]
+    return {
+        (int(skill_id), level): int(people)
+        for skill_id, totals in zip(keys, cumulative)
+        for level, people in enumerate(totals)
+    }
+
+
+def skill_gaps(db: Session, as_of: Optional[date] = None) -> List[SkillGap]:
+    """
+    Compare open skill demand with the people free to meet it.
+
+    Args:
+        db (Session): The database session.
+        as_of (Optional[date]): The day the report is for, today by default.
+
+    Returns:
+        List[SkillGap]: One entry per skill, minimum proficiency and start month
+        with open demand, ordered by skill, proficiency and month.
+    """
+    as_of = as_of or date.today()
+    conn = db.connection()
+    supply = _at_or_above(conn.execute(_supply_query(as_of)).all())
+    gaps = [
+        SkillGap(
+            skill_id=skill_id,
+            minimum_proficiency=proficiency,
+            window=window,
+            requirements=requirements,
+            demand=int(demand),
+            supply=supply.get((skill_id, max(proficiency, 0)), 0),
+        )
+        for skill_id, proficiency, window, requirements, demand in conn.execute(
+            _demand_query(as_of)
+        )
+    ]
+    gaps.sort(key=lambda gap: (gap.skill_id, gap.minimum_proficiency, gap.window))
+    logger.info(
+        f"Skill gaps as of {as_of}: {sum(gap.demand for gap in gaps)} open positions "
+        f"over {len(gaps)} groups, {sum(gap.gap for gap in gaps)} without a free person."
+    )
+    return gaps
+
+
+def cached_skill_gaps(
+    cache: ReportCache, db: Session, as_of: Optional[date] = None
+) -> List[SkillGap]:
+    """
+    Get the skill gap report from a report cache, computing it only if its source tables changed.
+
+    Args:
+        cache (ReportCache): The report cache.
+        db (Session): The database session.
+        as_of (Optional[date]): The day the report is for, today by default.
+
+    Returns:
+        List[SkillGap]: The report, as returned by skill_gaps().
+    """
+    as_of = as_of or date.today()
+    return cache.get_or_compute(
+        "skill_gaps", SOURCE_TABLES, lambda: skill_gaps(db, as_of), db, as_of=as_of
+    )
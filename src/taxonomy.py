@@ -0,0 +1,344 @@
+"""
+Skill taxonomy for the Resource Allocation System.
+
+Skills form a hierarchy through Skill.parent_id ("Python" under
+"Programming") and can have alternative names (SkillSynonym). The
+skill_closure table stores the transitive closure of that hierarchy so that
+questions like "who has any descendant of Programming at proficiency >= 3"
+are answered with one indexed join instead of a recursive walk.
+
+The closure is kept current by a session after_flush hook. Ancestor and
+descendant sets are cached in process, separately for each engine (the
+primary, shards and replicas are different databases). A flush that
+changes the taxonomy clears its engine's cache, and so do the commit or
+rollback that end its transaction, so no set read from uncommitted or
+rolled back closure rows outlives it.
+"""
+
+import logging
+import weakref
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from sqlalchemy import (
+    and_,
+    delete,
+    func,
+    insert,
+    inspect,
+    literal,
+    select,
+    true,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, aliased
+
+from src.events import install_hook
+from src.models import IndividualSkill, Skill, SkillClosure, SkillSynonym
+from src.models.base import utc_now
+
+logger = logging.getLogger(__name__)
+
+# Session.info key marking a transaction that changed the taxonomy
+CHANGED_KEY = "taxonomy_changed"
+
+# Skill id sets by skill id
+SkillSets = Dict[int, FrozenSet[int]]
+
+# The ancestor and descendant sets of each engine
+_caches: "weakref.WeakKeyDictionary[Engine, Tuple[SkillSets, SkillSets]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _engine(db: Session) -> Engine:
+    return db.get_bind().engine
+
+
+def _cache(db: Session) -> Tuple[SkillSets, SkillSets]:
+    """Get the ancestor and descendant caches of a session's engine."""
+    engine = _engine(db)
+    cache = _caches.get(engine)
+    if cache is None:
+        cache = _caches[engine] = ({}, {})
+    return cache
+
+
+def clear_taxonomy_cache(engine: Optional[Engine] = None) -> None:
+    """
+    Forget cached ancestor and descendant sets.
+
+    Args:
+        engine (Optional[Engine]): The engine whose sets are forgotten, all by default.
+    """
+    if engine is None:
+        _caches.clear()
+    else:
+        _caches.pop(engine, None)
+
+
+def _taxonomy_changed(session: Session) -> None:
+    """Clear the cache of a session whose transaction changes the taxonomy."""
+    session.info[CHANGED_KEY] = True
+    clear_taxonomy_cache(_engine(session))
+
+
+def _transaction_ended(session: Session) -> None:
+    """Session after_commit hook clearing the cache after a taxonomy change."""
+    if session.info.pop(CHANGED_KEY, False):
+        clear_taxonomy_cache(_engine(session))
+
+
+def _transaction_rolled_back(session: Session, previous_transaction) -> None:
+    """Session after_soft_rollback hook clearing the cache after a taxonomy change."""
+    _transaction_ended(session)
+
+
+def _subtree(conn: Connection, skill_id: int) -> Set[int]:
+    stmt = select(SkillClosure.descendant_id).where(
+        SkillClosure.ancestor_id == skill_id
+    )
+    return {row[0] for row in conn.execute(stmt)} | {skill_id}
+
+
+def _timestamps() -> tuple:
+    """Get bound created_at and updated_at values for INSERT ... SELECT."""
+    column = SkillClosure.__table__.c.created_at
+    now = utc_now()
+    return literal(now, column.type), literal(now, column.type)
+
+
+def _link(conn: Connection, skill_id: int, parent_id: Optional[int]) -> None:
+    """Add the closure rows of a new leaf skill."""
+    table = SkillClosure.__table__
+    conn.execute(
+        insert(table),
+        [{"ancestor_id": skill_id, "descendant_id": skill_id, "depth": 0}],
+    )
+    if parent_id is not None:
+        conn.execute(
+            insert(table).from_select(
+                ["ancestor_id", "descendant_id", "depth", "created_at", "updated_at"],
+                select(
+                    table.c.ancestor_id,
+                    literal(skill_id),
+                    table.c.depth + 1,
+                    *_timestamps(),
+                ).where(table.c.descendant_id == parent_id),
+            )
+        )
+
+
+def _detach(conn: Connection, subtree: Set[int]) -> None:
+    """Remove the links between a subtree and the ancestors of its root."""
+    table = SkillClosure.__table__
+    conn.execute(
+        delete(table).where(
+            table.c.descendant_id.in_(subtree), table.c.ancestor_id.not_in(subtree)
+        )
+    )
+
+
+def _attach(conn: Connection, skill_id: int, parent_id: int) -> None:
+    """Link every node of a detached subtree to the ancestors of a new parent."""
+    table = SkillClosure.__table__
+    above = table.alias("above")
+    below = table.alias("below")
+    conn.execute(
+        insert(table).from_select(
+            ["ancestor_id", "descendant_id", "depth", "created_at", "updated_at"],
+            select(
+                above.c.ancestor_id,
+                below.c.descendant_id,
+                above.c.depth + below.c.depth + 1,
+                *_timestamps(),
+            )
+            .select_from(above.join(below, true()))
+            .where(above.c.descendant_id == parent_id, below.c.ancestor_id == skill_id),
+        )
+    )
+
+
+def _parent_changed(obj: Skill) -> bool:
+    state = inspect(obj)
+    return (
+        state.attrs.parent_id.history.has_changes()
+        or state.attrs.parent.history.has_changes()
+    )
+
+
+def _maintain_closure(session: Session, flush_context) -> None:
+    """
+    Session after_flush hook keeping skill_closure in step with Skill.parent_id.
+
+    Raises:
+        ValueError: If a skill is moved below one of its own descendants.
+    """
+    new = sorted(
+        (obj for obj in session.new if isinstance(obj, Skill)), key=lambda s: s.id
+    )
+    moved = [
+        obj for obj in session.dirty if isinstance(obj, Skill) and _parent_changed(obj)
+    ]
+    deleted = [obj for obj in session.deleted if isinstance(obj, Skill)]
+    if not (new or moved or deleted):
+        return
+
+    conn = session.connection()
+    for skill in new:
+        _link(conn, skill.id, skill.parent_id)
+    for skill in moved:
+        subtree = _subtree(conn, skill.id)
+        if skill.parent_id in subtree:
+            raise ValueError(
+                f"Skill {skill.id} cannot be placed below its own descendant"
+            )
+        _detach(conn, subtree)
+        if skill.parent_id is not None:
+            _attach(conn, skill.id, skill.parent_id)
+    table = SkillClosure.__table__
+    for skill in deleted:
+        _detach(conn, _subtree(conn, skill.id))
+        conn.execute(
+            delete(table).where(
+                (table.c.ancestor_id == skill.id) | (table.c.descendant_id == skill.id)
+            )
+        )
+    _taxonomy_changed(session)
+
+
+def enable_taxonomy_maintenance(target) -> None:
+    """
+    Install the skill closure maintenance hook on a Session class or sessionmaker.
+
+    Calling this more than once for the same target has no further effect.
+
+    Args:
+        target: A Session subclass or a sessionmaker instance.
+    """
+    install_hook(target, "after_flush", _maintain_closure)
+    install_hook(target, "after_commit", _transaction_ended)
+    install_hook(target, "after_soft_rollback", _transaction_rolled_back)
+
+
+def rebuild_closure(db: Session) -> int:
+    """
+    Rebuild the skill closure table from Skill.parent_id.
+
+    Args:
+        db (Session): The database session.
+
+    Returns:
+        int: The number of closure rows stored.
+    """
+    parents = dict(db.execute(select(Skill.id, Skill.parent_id)).all())
+    rows = []
+    for skill_id in parents:
+        depth, node, seen = 0, skill_id, set()
+        while node is not None and node not in seen:
+            seen.add(node)
+            rows.append(
+                {"ancestor_id": node, "descendant_id": skill_id, "depth": depth}
+            )
+            node, depth = parents.get(node), depth + 1
+
+    conn = db.connection()
+    conn.execute(delete(SkillClosure.__table__))
+    if rows:
+        conn.execute(insert(SkillClosure.__table__), rows)
+    _taxonomy_changed(db)
+    logger.info(f"Rebuilt skill closure with {len(rows)} rows.")
+    return len(rows)
+
+
+def ancestor_ids(db: Session, skill_id: int) -> FrozenSet[int]:
+    """
+    Get a skill and all of its broader skills.
+
+    Args:
+        db (Session): The database session.
+        skill_id (int): The ID of the skill.
+
+    Returns:
+        FrozenSet[int]: The IDs of the skill and its ancestors.
+    """
+    ancestors = _cache(db)[0]
+    if skill_id not in ancestors:
+        stmt = select(SkillClosure.ancestor_id).where(
+            SkillClosure.descendant_id == skill_id
+        )
+        ancestors[skill_id] = frozenset(db.scalars(stmt)) | {skill_id}
+    return ancestors[skill_id]
+
+
+def descendant_ids(db: Session, skill_id: int) -> FrozenSet[int]:
+    """
+    Get a skill and all of its narrower skills.
+
+    Args:
+        db (Session): The database session.
+        skill_id (int): The ID of the skill.
+
+    Returns:
+        FrozenSet[int]: The IDs of the skill and its descendants.
+    """
+    descendants = _cache(db)[1]
+    if skill_id not in descendants:
+        stmt = select(SkillClosure.descendant_id).where(
+            SkillClosure.ancestor_id == skill_id
+        )
+        descendants[skill_id] = frozenset(db.scalars(stmt)) | {skill_id}
+    return descendants[skill_id]
+
+
+def individuals_with_skill(
+    db: Session, skill_id: int, minimum_proficiency: int = 0
+) -> List[int]:
+    """
+    Get the individuals holding a skill or any narrower skill at a minimum proficiency.
+
+    Args:
+        db (Session): The database session.
+        skill_id (int): The ID of the skill.
+        minimum_proficiency (int): The minimum proficiency level.
+
+    Returns:
+        List[int]: The IDs of the matching individuals, ascending.
+    """
+    closure = aliased(SkillClosure)
+    stmt = (
+        select(IndividualSkill.individual_id)
+        .join(
+            closure,
+            and_(
+                closure.descendant_id == IndividualSkill.skill_id,
+                closure.ancestor_id == skill_id,
+            ),
+        )
+        .where(IndividualSkill.proficiency_level >= minimum_proficiency)
+        .distinct()
+        .order_by(IndividualSkill.individual_id)
+    )
+    return list(db.scalars(stmt))
+
+
+def resolve_skill(db: Session, name: str) -> Optional[Skill]:
+    """
+    Find a skill by its name or one of its synonyms, ignoring case.
+
+    Args:
+        db (Session): The database session.
+        name (str): The name to look up.
+
+    Returns:
+        Optional[Skill]: The skill, or None if no skill has that name.
+    """
+    skill = db.scalars(
+        select(Skill).where(func.lower(Skill.name) == name.lower())
+    ).first()
+    if skill is None:
+        skill = db.scalars(
+            select(Skill)
+            .join(SkillSynonym, SkillSynonym.skill_id == Skill.id)
+            .where(func.lower(SkillSynonym.name) == name.lower())
+        ).first()
+    return skill
@@ -0,0 +1,364 @@
+"""
+Batch validation for the Resource Allocation System.
+
+The checks in this module run over whole columns of a batch of rows and
+report every invalid value at once, so bulk Core inserts get the same data
+integrity as ORM object construction. The ORM validators on the models call
+validate_fields() with the single value being set, which runs the very same
+rules.
+
+This module must not import src.models, since the models import it.
+"""
+
+import logging
+from datetime import date
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from sqlalchemy import Date, Table, insert, select
+from sqlalchemy.orm import Session
+
+from src.enums import AssignmentStatus, EmploymentType, ProjectStatus
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 500
+
+EMPLOYMENT_TYPES = EmploymentType.values()
+PROJECT_STATUSES = ProjectStatus.values()
+ASSIGNMENT_STATUSES = AssignmentStatus.values()
+
+
+class RowError(NamedTuple):
+    """
+    One invalid value.
+
+    Attributes:
+        row (Optional[int]): The index of the row in the batch, or None for a single object.
+        field (str): The column holding the invalid value.
+        message (str): What is wrong with it.
+    """
+
+    row: Optional[int]
+    field: str
+    message: str
+
+    def __str__(self) -> str:
+        if self.row is None:
+            return self.message
+        return f"Row {self.row}, {self.field}: {self.message}"
+
+
+class ValidationError(ValueError):
+    """
+    Raised when a batch or a single object fails validation.
+
+    Attributes:
+        errors (List[RowError]): Every invalid value found.
+    """
+
+    def __init__(self, errors: Sequence[RowError]):
+        self.errors = list(errors)
+        super().__init__("; ".join(str(error) for error in self.errors))
+
+
+def one_of(allowed: Sequence[Any]) -> Callable[[List[Any]], List[int]]:
+    """Build a check failing the values that are not in allowed."""
+    allowed = frozenset(allowed)
+
+    def check(values: List[Any]) -> List[int]:
+        return [
+            i
+            for i, value in enumerate(values)
+            if value is not None and value not in allowed
+        ]
+
+    return check
+
+
+def between(low: int, high: int) -> Callable[[List[Any]], List[int]]:
+    """Build a check failing the values outside low..high inclusive."""
+
+    def check(values: List[Any]) -> List[int]:
+        return [
+            i
+            for i, value in enumerate(values)
+            if value is not None and not low <= value <= high
+        ]
+
+    return check
+
+
+def not_in_future(values: List[Optional[date]]) -> List[int]:
+    """Fail the dates after today."""
+    today = date.today()
+    return [i for i, value in enumerate(values) if value is not None and value > today]
+
+
+def ordered(strict: bool) -> Callable[[List[Any], List[Any]], List[int]]:
+    """Build a check failing the rows whose end comes before their start."""
+
+    def check(starts: List[Any], ends: List[Any]) -> List[int]:
+        return [
+            i
+            for i, (start, end) in enumerate(zip(starts, ends))
+            if start is not None
+            and end is not None
+            and (end <= start if strict else end < start)
+        ]
+
+    return check
+
+
+class Rule(NamedTuple):
+    """
+    A check over one or more columns of a batch.
+
+    Attributes:
+        fields (Tuple[str, ...]): The columns passed to the check; errors are
+            reported against the last one.
+        check (Callable[..., List[int]]): Takes one list of values per field and
+            returns the indexes of the failing rows.
+        message (str): The error message for a failing row.
+    """
+
+    fields: Tuple[str, ...]
+    check: Callable[..., List[int]]
+    message: str
+
+
+RULES: Dict[str, List[Rule]] = {
+    "individuals": [
+        Rule(
+            ("employment_type",),
+            one_of(EMPLOYMENT_TYPES),
+            f"Invalid employment type. Must be one of: {', '.join(EMPLOYMENT_TYPES)}",
+        ),
+        Rule(("hire_date",), not_in_future, "Hire date cannot be in the future"),
+    ],
+    "projects": [
+        Rule(
+            ("start_date", "end_date"),
+            ordered(strict=True),
+            "End date must be after the start date",
+        ),
+        Rule(
+            ("status",),
+            one_of(PROJECT_STATUSES),
+            f"Invalid project status. Must be one of: {', '.join(PROJECT_STATUSES)}",
+        ),
+    ],
+    "project_requirements": [
+        Rule(
+            ("start_date", "end_date"),
+            ordered(strict=False),
+            "End date must not be before the start date",
+        ),
+    ],
+    "assignments": [
+        Rule(
+            ("start_date", "end_date"),
+            ordered(strict=False),
+            "End date must not be before the start date",
+        ),
+        Rule(
+            ("status",),
+            one_of(ASSIGNMENT_STATUSES),
+            "Invalid assignment status. Must be one of: "
+            f"{', '.join(ASSIGNMENT_STATUSES)}",
+        ),
+    ],
+    "availabilities": [
+        Rule(
+            ("start_date", "end_date"),
+            ordered(strict=False),
+            "End date must not be before the start date",
+        ),
+        Rule(
+            ("hours_per_week",),
+            between(0, 168),
+            "Hours per week must be between 0 and 168",
+        ),
+    ],
+}
+
+
+def _column(rows: Sequence[Mapping[str, Any]], field: str) -> List[Any]:
+    return [row.get(field) for row in rows]
+
+
+def _check_required(table: Table, rows: Sequence[Mapping[str, Any]]) -> List[RowError]:
+    """Fail the missing values of NOT NULL columns without a default."""
+    errors = []
+    for column in table.columns:
+        if (
+            column.nullable
+            or column.primary_key
+            or column.default is not None
+            or column.server_default is not None
+        ):
+            continue
+        values = _column(rows, column.name)
+        errors.extend(
+            RowError(i, column.name, "Value is required")
+            for i, value in enumerate(values)
+            if value is None
+        )
+    return errors
+
+
+def _check_types(table: Table, rows: Sequence[Mapping[str, Any]]) -> List[RowError]:
+    """Fail the values of date columns that are not dates."""
+    errors = []
+    for column in table.columns:
+        if not isinstance(column.type, Date):
+            continue
+        values = _column(rows, column.name)
+        errors.extend(
+            RowError(i, column.name, "Must be a date")
+            for i, value in enumerate(values)
+            if value is not None and not isinstance(value, date)
+        )
+    return errors
+
+
+def _check_foreign_keys(
+    db: Session, table: Table, rows: Sequence[Mapping[str, Any]]
+) -> List[RowError]:
+    """Fail the foreign key values with no matching row, one query per chunk."""
+    errors = []
+    for column in table.columns:
+        for foreign_key in column.foreign_keys:
+            target = foreign_key.column
+            values = _column(rows, column.name)
+            wanted = sorted({value for value in values if value is not None})
+            found = set()
+            for start in range(0, len(wanted), CHUNK_SIZE):
+                chunk = wanted[start : start + CHUNK_SIZE]
+                found.update(db.scalars(select(target).where(target.in_(chunk))))
+            errors.extend(
+                RowError(i, column.name, f"No {target.table.name} row with id {value}")
+                for i, value in enumerate(values)
+                if value is not None and value not in found
+            )
+    return errors
+
+
+def _check_rules(
+    table: Table, rows: Sequence[Mapping[str, Any]], fields=None
+) -> List[RowError]:
+    errors = []
+    for rule in RULES.get(table.name, []):
+        if fields is not None and not set(rule.fields) <= fields:
+            continue
+        columns = [_column(rows, field) for field in rule.fields]
+        errors.extend(
+            RowError(i, rule.fields[-1], rule.message) for i in rule.check(*columns)
+        )
+    return errors
+
+
+def validate_rows(
+    table: Table, rows: Sequence[Mapping[str, Any]], db: Optional[Session] = None
+) -> List[RowError]:
+    """
+    Validate a batch of rows for a table.
+
+    Args:
+        table (Table): The table the rows are for, e.g. Individual.__table__.
+        rows (Sequence[Mapping[str, Any]]): The rows, keyed by column name.
+        db (Optional[Session]): The database session; foreign keys are only
+            checked when one is given.
+
+    Returns:
+        List[RowError]: Every invalid value, ordered by row.
+    """
+    errors = _check_required(table, rows) + _check_types(table, rows)
+    # Rules compare values, so they only run over rows of the right types
+    bad_rows = {error.row for error in errors}
+    good = [i for i in range(len(rows)) if i not in bad_rows]
+    errors += [
+        error._replace(row=good[error.row])
+        for error in _check_rules(table, [rows[i] for i in good])
+    ]
+    if db is not None:
+        errors += _check_foreign_keys(db, table, rows)
+    return sorted(errors, key=lambda error: error.row)
+
+
+def check_rows(
+    table: Table, rows: Sequence[Mapping[str, Any]], db: Optional[Session] = None
+) -> None:
+    """
+    Validate a batch of rows for a table and raise on any invalid value.
+
+    Args:
+        table (Table): The table the rows are for.
+        rows (Sequence[Mapping[str, Any]]): The rows, keyed by column name.
+        db (Optional[Session]): The database session, to check foreign keys.
+
+    Raises:
+        ValidationError: With every invalid value of the batch.
+    """
+    errors = validate_rows(table, rows, db)
+    if errors:
+        raise ValidationError(errors)
+
+
+def validate_fields(table: Table, values: Mapping[str, Any]) -> None:
+    """
+    Validate the values of a single object being set through the ORM.
+
+    Only the rules whose fields are all given are run, so a validator can
+    pass just the attribute being set plus the attributes it is compared to.
+
+    Args:
+        table (Table): The table of the object.
+        values (Mapping[str, Any]): The values, keyed by column name.
+
+    Raises:
+        ValidationError: If any rule fails.
+    """
+    errors = _check_rules(table, [values], fields=set(values))
+    if errors:
+        raise ValidationError([error._replace(row=None) for error in errors])
+
+
+def bulk_insert(db: Session, model, rows: Sequence[Mapping[str, Any]]) -> int:
+    """
+    Validate a batch of rows and insert them with one Core INSERT.
+
+    The insert bypasses the session flush, so the new rows are reported to
+    the change log here; derived tables such as the eligibility index are
+    not maintained and must be rebuilt after loading their source tables.
+
+    Args:
+        db (Session): The database session.
+        model: The model to insert rows of.
+        rows (Sequence[Mapping[str, Any]]): The rows, keyed by column name.
+
+    Returns:
+        int: The number of rows inserted.
+
+    Raises:
+        ValidationError: With every invalid value, before anything is inserted.
+    """
+    if not rows:
+        return 0
+    # Imported here since src.change_log imports the models, which import us
+    from src.change_log import INSERT, record_changes
+
+    check_rows(model.__table__, rows, db)
+    ids = list(db.scalars(insert(model).returning(model.id), list(rows)))
+    record_changes(db, model.__tablename__, ids, INSERT)
+    logger.info(f"Inserted {len(rows)} {model.__tablename__} rows.")
+    return len(rows)
@@ -0,0 +1,181 @@
+"""
+Write coalescing for the Resource Allocation System.
+
+SQLite allows one writer at a time, so many threads each committing small
+changes spend their time waiting on the database lock and hitting busy
+timeouts. A WriteQueue funnels writes through one dedicated writer thread
+instead: callers submit operations and get futures back, and the writer
+runs every operation that arrives within a latency budget in one
+transaction, so a whole batch costs a single lock acquisition and a single
+commit.
+
+Each operation runs inside its own SAVEPOINT, so an operation that raises
+is rolled back alone and only its own future fails.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_LATENCY = 0.005
+
+T = TypeVar("T")
+
+# Queued on close() to stop the writer thread
+_STOP = object()
+
+
+class WriteQueue:
+    """
+    A single writer thread running queued write operations in batched transactions.
+
+    Operations are callables taking the writer's Session. Their return
+    values are handed back through the futures after the batch commits, when
+    the session has been closed, so they should return plain values such as
+    ids rather than ORM objects.
+
+    Attributes:
+        session_factory (Callable[[], Session]): Creates the writer's session for each batch.
+        max_batch (int): The most operations committed in one transaction.
+        max_latency (float): The longest time in seconds an operation waits for
+            its batch to fill up before the batch is committed.
+        batches (int): The number of transactions committed so far.
+        operations (int): The number of operations run so far.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_latency: float = DEFAULT_MAX_LATENCY,
+    ):
+        if max_batch < 1:
+            raise ValueError("Batch size must be at least 1")
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.batches = 0
+        self.operations = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="write-queue", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, operation: Callable[[Session], T]) -> "Future[T]":
+        """
+        Queue a write operation.
+
+        Args:
+            operation (Callable[[Session], T]): The operation, called with the writer's session.
+                It must not commit or roll back the session itself.
+
+        Returns:
+            Future[T]: Resolves to the operation's return value once its batch has
+                committed, or to the exception it or the commit raised.
+
+        Raises:
+            RuntimeError: If the queue has been closed.
+        """
+        future: "Future[T]" = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Write queue is closed")
+            self._queue.put((operation, future, time.monotonic()))
+        return future
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stop accepting operations and stop the writer once the queue is drained.
+
+        Args:
+            wait (bool): Block until every queued operation has been run.
+        """
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(_STOP)
+        if wait:
+            self._thread.join()
+
+    def __enter__(self) -> "WriteQueue":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _collect(self) -> Tuple[List[tuple], bool]:
+        """Wait for one operation, then gather more until the batch is full or due."""
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        # The budget runs from submission, so operations that queued up while
+        # the previous batch was committing do not wait any longer
+        deadline = first[2] + self.max_latency
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                item = (
+                    self._queue.get(timeout=timeout)
+                    if timeout > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = self._collect()
+            if batch:
+                self._commit(batch)
+
+    def _commit(self, batch: List[tuple]) -> None:
+        """Run a batch of operations in one transaction and resolve their futures."""
+        results: List[Tuple[Future, Optional[object]]] = []
+        try:
+            with self.session_factory() as db:
+                connection = db.connection()
+                if connection.dialect.name == "sqlite":
+                    # pysqlite only opens a transaction on the first DML
+                    # statement; without an explicit BEGIN, releasing the
+                    # first SAVEPOINT would commit it on its own. IMMEDIATE
+                    # also takes the write lock up front.
+                    connection.exec_driver_sql("BEGIN IMMEDIATE")
+                for operation, future, _ in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with db.begin_nested():
+                            result = operation(db)
+                    except Exception as e:
+                        future.set_exception(e)
+                    else:
+                        results.append((future, result))
+                db.commit()
+        except Exception as e:
+            logger.error(f"Write batch of {len(batch)} operations failed: {str(e)}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.operations += len(batch)
+        for future, result in results:
+            future.set_result(result)
@@ -2,6 +2,7 @@ import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from src.change_log import enable_change_capture
 from src.models.base import BaseModel
 
 
@@ -40,3 +41,36 @@ def db_session():
         # Close the session
         session.close()
         BaseModel.metadata.drop_all(engine)  # Clean up the database schema
+
+
+@pytest.fixture(scope="function")
+def hooked_session():
+    """
+    Fixture to provide a factory of sessions with session hooks installed.
+
+    Each call creates an in-memory database and returns a session from a
+    sessionmaker passed to every given installer, e.g.
+    hooked_session(enable_change_capture).
+    """
+    opened = []
+
+    def make(*installers):
+        engine = create_engine("sqlite:///:memory:")
+        BaseModel.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        for install in installers:
+            install(Session)
+        session = Session()
+        opened.append((session, engine))
+        return session
+
+    yield make
+    for session, engine in opened:
+        session.close()
+        BaseModel.metadata.drop_all(engine)
+
+
+@pytest.fixture(scope="function")
+def capture_session(hooked_session):
+    """Fixture to provide a session with change capture enabled."""
+    return hooked_session(enable_change_capture)
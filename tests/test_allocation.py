@@ -0,0 +1,131 @@
+import threading
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.exc import StaleDataError
+
+from src.allocation import AllocationError, allocate, allocate_with_retry
+from src.models import (
+    Assignment,
+    Availability,
+    Individual,
+    ProjectRequirement,
+    RoleRequirement,
+    TimeRequirement,
+)
+from src.models.base import BaseModel
+
+
+def _staff(session, individuals, requirements, hours, number_needed, capacity):
+    """Add individuals with availability and requirements needing some people."""
+    people = [
+        Individual(
+            name=f"Person {i}",
+            email=f"person{i}@example.com",
+            employment_type="Full-time",
+            hire_date=date(2020, 1, 1),
+        )
+        for i in range(individuals)
+    ]
+    for person in people:
+        person.availabilities = [
+            Availability(
+                start_date=date(2024, 1, 1),
+                end_date=date(2024, 12, 31),
+                hours_per_week=capacity,
+            )
+        ]
+    needs = [
+        ProjectRequirement(
+            project_id=1,
+            description=f"Requirement {i}",
+            start_date=date(2024, 2, 1),
+            end_date=date(2024, 5, 31),
+            time_requirement=TimeRequirement(hours_per_week=hours, total_hours=100),
+            role_requirements=[RoleRequirement(role_id=1, number_needed=number_needed)],
+        )
+        for i in range(requirements)
+    ]
+    session.add_all(people + needs)
+    session.commit()
+    return [p.id for p in people], [r.id for r in needs]
+
+
+def test_allocation_rules(db_session):
+    people, needs = _staff(db_session, 3, 2, hours=20, number_needed=2, capacity=30)
+
+    allocate(db_session, people[0], needs[0])
+    allocate(db_session, people[1], needs[0])
+    db_session.commit()
+
+    with pytest.raises(AllocationError, match="fully staffed"):
+        allocate(db_session, people[2], needs[0])
+    # 20 of 30 hours are booked, so a second 20 hour requirement does not fit
+    with pytest.raises(AllocationError, match="hours"):
+        allocate(db_session, people[0], needs[1])
+
+
+def test_version_conflict_is_detected(db_session):
+    people, needs = _staff(db_session, 2, 1, hours=10, number_needed=1, capacity=40)
+    engine = db_session.get_bind()
+    other = sessionmaker(bind=engine)()
+
+    allocate(db_session, people[0], needs[0])
+    allocate(other, people[1], needs[0])
+    other.commit()
+
+    with pytest.raises(StaleDataError):
+        db_session.commit()
+    other.close()
+
+
+def test_no_over_allocation_under_contention(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'stress.db'}", connect_args={"timeout": 30}
+    )
+    BaseModel.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        people, needs = _staff(session, 8, 6, hours=10, number_needed=3, capacity=20)
+
+    errors, barrier = [], threading.Barrier(len(people))
+
+    def worker(individual_id):
+        barrier.wait()
+        for requirement_id in needs:
+            try:
+                allocate_with_retry(Session, individual_id, requirement_id, attempts=50)
+            except AllocationError:
+                pass
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(p,)) for p in people]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with Session() as session:
+        per_requirement = dict(
+            session.execute(
+                select(Assignment.requirement_id, func.count()).group_by(
+                    Assignment.requirement_id
+                )
+            ).all()
+        )
+        per_individual = dict(
+            session.execute(
+                select(Assignment.individual_id, func.count()).group_by(
+                    Assignment.individual_id
+                )
+            ).all()
+        )
+    # 18 places on the requirements, but each person only has hours for two
+    assert all(count <= 3 for count in per_requirement.values())
+    assert all(count <= 2 for count in per_individual.values())
+    assert sum(per_requirement.values()) == 16
+    engine.dispose()
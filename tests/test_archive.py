@@ -0,0 +1,187 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from src.archive import (
+    ARCHIVE_TABLES,
+    archive_closed_projects,
+    attach_archive,
+    create_archive_tables,
+    including_archive,
+)
+from src.change_log import DELETE, enable_change_capture, read_changes
+from src.feasibility import check_feasibility
+from src.forecast import SKILL, forecast
+from src.models import (
+    Assignment,
+    Project,
+    ProjectRequirement,
+    RequirementEligibility,
+    SkillRequirement,
+    TimeRequirement,
+)
+from src.models.base import BaseModel
+
+
+@pytest.fixture
+def archive_session(tmp_path):
+    """Fixture to provide a session on a database with an attached archive."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'hot.db'}")
+    attach_archive(engine, str(tmp_path / "archive.db"))
+    BaseModel.metadata.create_all(engine)
+    create_archive_tables(engine)
+    Session = sessionmaker(bind=engine)
+    enable_change_capture(Session)
+    session = Session()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _project(db, name, end_date, status):
+    project = Project(
+        client_id=1,
+        name=name,
+        start_date=date(2022, 1, 1),
+        end_date=end_date,
+        status=status,
+    )
+    requirement = ProjectRequirement(
+        project=project,
+        description=f"{name} work",
+        start_date=date(2022, 1, 1),
+        end_date=end_date,
+    )
+    db.add_all([project, requirement])
+    db.flush()
+    db.add_all(
+        [
+            TimeRequirement(
+                requirement_id=requirement.id, hours_per_week=20, total_hours=100
+            ),
+            SkillRequirement(
+                requirement_id=requirement.id, skill_id=1, minimum_proficiency=3
+            ),
+            RequirementEligibility(
+                requirement_id=requirement.id, individual_id=1, score=1.0
+            ),
+            *(
+                Assignment(
+                    individual_id=individual_id,
+                    requirement_id=requirement.id,
+                    start_date=date(2022, 1, 1),
+                    end_date=end_date,
+                    status="Completed",
+                )
+                for individual_id in (1, 2)
+            ),
+        ]
+    )
+    return project
+
+
+@pytest.fixture
+def projects(archive_session):
+    """Fixture to provide three old closed projects, a recent one and an active one."""
+    db = archive_session
+    result = {
+        "old": _project(db, "Old", date(2022, 6, 30), "Completed"),
+        "dropped": _project(db, "Dropped", date(2022, 3, 31), "Cancelled"),
+        "older": _project(db, "Older", date(2022, 2, 28), "Completed"),
+        "recent": _project(db, "Recent", date(2023, 6, 30), "Completed"),
+        "running": _project(db, "Running", date(2022, 6, 30), "Active"),
+    }
+    db.commit()
+    return result
+
+
+def _count(db, table):
+    return db.scalar(select(func.count()).select_from(table))
+
+
+def test_archive_moves_closed_projects_before_cutoff(archive_session, projects):
+    db = archive_session
+    ids = {name: project.id for name, project in projects.items()}
+
+    result = archive_closed_projects(db, date(2023, 1, 1), batch_size=2)
+
+    assert (result.projects, result.batches) == (3, 2)
+    assert result.rows == {
+        "projects": 3,
+        "project_requirements": 3,
+        "assignments": 6,
+        "time_requirements": 3,
+        "role_requirements": 0,
+        "skill_requirements": 3,
+    }
+    assert result.rows_per_second > 0
+    assert set(db.scalars(select(Project.name))) == {"Recent", "Running"}
+    assert _count(db, Assignment.__table__) == 4
+    assert _count(db, ARCHIVE_TABLES["assignments"]) == 6
+    assert _count(db, RequirementEligibility.__table__) == 2
+    deleted = read_changes(db, tables=["projects"])
+    assert [c.row_id for c in deleted if c.operation == DELETE] == [
+        ids["old"],
+        ids["dropped"],
+        ids["older"],
+    ]
+
+    assert archive_closed_projects(db, date(2023, 1, 1)).projects == 0
+
+
+def test_interrupted_archival_resumes(archive_session, projects):
+    db = archive_session
+
+    first = archive_closed_projects(db, date(2023, 1, 1), batch_size=1, max_batches=1)
+    # A copy that reached the archive before its deletes did is copied again
+    db.execute(
+        ARCHIVE_TABLES["projects"]
+        .insert()
+        .from_select(
+            list(Project.__table__.columns.keys()),
+            select(Project.__table__).where(Project.id == projects["dropped"].id),
+        )
+    )
+    db.commit()
+    rest = archive_closed_projects(db, date(2023, 1, 1), batch_size=1)
+
+    assert (first.projects, rest.projects) == (1, 2)
+    assert _count(db, ARCHIVE_TABLES["projects"]) == 3
+    assert _count(db, Project.__table__) == 2
+
+
+def test_including_archive_queries_both(archive_session, projects):
+    db = archive_session
+    archive_closed_projects(db, date(2023, 1, 1))
+    db.expunge_all()
+
+    everything = including_archive(Project)
+    names = db.scalars(
+        select(everything.name)
+        .where(everything.status == "Completed")
+        .order_by(everything.end_date)
+    ).all()
+    assignments = including_archive(Assignment)
+
+    assert names == ["Older", "Old", "Recent"]
+    assert db.scalar(select(func.count(assignments.id))) == 10
+    old = db.scalars(select(everything).where(everything.name == "Old")).one()
+    assert isinstance(old, Project) and old.end_date == date(2022, 6, 30)
+    with pytest.raises(ValueError):
+        including_archive(RequirementEligibility)
+
+
+def test_reports_include_archived_projects_on_request(archive_session, projects):
+    db = archive_session
+    archive_closed_projects(db, date(2023, 1, 1))
+
+    hot = forecast(db, SKILL, date(2022, 1, 3), weeks=4)
+    everything = forecast(db, SKILL, date(2022, 1, 3), weeks=4, include_archive=True)
+
+    assert hot.demand.tolist() == [pytest.approx([40.0] * 4)]
+    assert everything.demand.tolist() == [pytest.approx([100.0] * 4)]
+    assert len(check_feasibility(db).requirement_ids) == 2
+    archived = check_feasibility(db, include_archive=True)
+    assert archived.total_hours.tolist() == [100.0] * 5
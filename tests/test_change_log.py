@@ -0,0 +1,107 @@
+from datetime import date
+
+import pytest
+
+from src.change_log import (
+    compact_changes,
+    enable_change_capture,
+    latest_seq,
+    read_changes,
+    record_changes,
+)
+from src.models import Client, Individual
+
+
+def test_insert_update_delete_are_captured(capture_session):
+    client = Client(name="Test Client", contact_information="test@example.com")
+    capture_session.add(client)
+    capture_session.commit()
+
+    client.name = "Renamed Client"
+    capture_session.commit()
+
+    capture_session.delete(client)
+    capture_session.commit()
+
+    changes = read_changes(capture_session)
+    assert [(c.table_name, c.row_id, c.operation) for c in changes] == [
+        ("clients", client.id, "insert"),
+        ("clients", client.id, "update"),
+        ("clients", client.id, "delete"),
+    ]
+    assert changes[1].changed_columns == ["name"]
+    assert changes[0].seq < changes[1].seq < changes[2].seq
+
+
+def test_unchanged_dirty_objects_are_not_captured(capture_session):
+    client = Client(name="Test Client", contact_information="test@example.com")
+    capture_session.add(client)
+    capture_session.commit()
+    capture_session.refresh(client)
+
+    # Assigning the same value marks the object dirty without changing it
+    client.name = "Test Client"
+    capture_session.commit()
+
+    assert len(read_changes(capture_session)) == 1
+
+
+def test_read_changes_cursor_and_table_filter(capture_session):
+    capture_session.add(Client(name="A", contact_information="a@example.com"))
+    capture_session.add(
+        Individual(
+            name="John Doe",
+            email="john@example.com",
+            employment_type="Full-time",
+            hire_date=date.today(),
+        )
+    )
+    capture_session.commit()
+    cursor = latest_seq(capture_session)
+
+    capture_session.add(Client(name="B", contact_information="b@example.com"))
+    capture_session.commit()
+
+    newer = read_changes(capture_session, since_seq=cursor)
+    assert len(newer) == 1
+    assert newer[0].table_name == "clients"
+
+    individuals = read_changes(capture_session, tables=["individuals"])
+    assert [c.table_name for c in individuals] == ["individuals"]
+
+
+def test_record_changes_for_set_based_writes(capture_session):
+    record_changes(capture_session, "assignments", [1, 2, 3], "update", ["status"])
+    capture_session.commit()
+
+    changes = read_changes(capture_session)
+    assert [c.row_id for c in changes] == [1, 2, 3]
+    assert all(c.changed_columns == ["status"] for c in changes)
+
+
+def test_compaction_keeps_sequence_monotonic(capture_session):
+    for name in ("A", "B", "C"):
+        capture_session.add(Client(name=name, contact_information="x@example.com"))
+        capture_session.commit()
+    last = latest_seq(capture_session)
+
+    assert compact_changes(capture_session, before_seq=last + 1) == 3
+    capture_session.commit()
+    assert read_changes(capture_session) == []
+
+    capture_session.add(Client(name="D", contact_information="d@example.com"))
+    capture_session.commit()
+    assert read_changes(capture_session)[0].seq > last
+
+
+def test_compaction_requires_a_bound(capture_session):
+    with pytest.raises(ValueError):
+        compact_changes(capture_session)
+
+
+def test_enabling_twice_captures_once(hooked_session):
+    session = hooked_session(enable_change_capture, enable_change_capture)
+
+    session.add(Client(name="A", contact_information="a@example.com"))
+    session.commit()
+    assert len(read_changes(session)) == 1
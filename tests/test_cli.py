@@ -0,0 +1,152 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.cli import build_parser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(*args, database=None, check=True, input=None):
+    env = {**os.environ}
+    env.pop("METRICS_PORT", None)
+    if database is not None:
+        env["DATABASE_URL"] = f"sqlite:///{database}"
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        env=env,
+        input=input,
+        capture_output=True,
+        text=True,
+        check=check,
+    )
+
+
+def test_parsing_imports_no_command():
+    probe = (
+        "import sys\n"
+        "from src.cli import main\n"
+        "try:\n"
+        "    main(['match', '--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "heavy = {'sqlalchemy', 'numpy', 'cProfile', 'http', 'config'}\n"
+        "print(sorted(m for m in sys.modules\n"
+        "             if m.split('.')[0] in heavy or m.startswith('src.')))\n"
+    )
+    result = _run("-c", probe)
+    assert result.stdout.splitlines()[-1] == "['src.cli', 'src.profiling']"
+
+
+def test_parser_rejects_bad_arguments(capsys):
+    parser = build_parser()
+    assert parser.parse_args(["match", "7", "-k", "3"]).k == 3
+    with pytest.raises(SystemExit) as error:
+        parser.parse_args(["report", "velocity"])
+    assert error.value.code == 2
+    with pytest.raises(SystemExit):
+        parser.parse_args([])
+
+
+def test_commands_end_to_end(tmp_path):
+    database = tmp_path / "cli.db"
+    _run("main.py", "demo", database=database)
+
+    people = tmp_path / "people.json"
+    _run("main.py", "export", "individuals", "-o", str(people), database=database)
+    exported = json.loads(people.read_text())
+    assert [person["name"] for person in exported] == ["John Doe"]
+
+    copy = tmp_path / "copy.db"
+    _run("main.py", "init", database=copy)
+    _run("main.py", "load", "Individual", str(people), database=copy)
+    result = _run("main.py", "export", "individuals", database=copy)
+    assert json.loads(result.stdout) == exported
+
+    result = _run("main.py", "match", "1", "-k", "1", database=database)
+    assert [c["individual_id"] for c in json.loads(result.stdout)] == [1]
+    result = _run("main.py", "report", "feasibility", database=database)
+    assert json.loads(result.stdout) == {"infeasible": [], "understaffed": [1]}
+
+    result = _run("main.py", "export", "nothing", database=database, check=False)
+    assert result.returncode == 1
+    assert "Unknown table nothing" in result.stderr
+
+
+def test_replicate_refreshes_the_replica_directory(tmp_path, monkeypatch):
+    database = tmp_path / "cli.db"
+    _run("main.py", "demo", database=database)
+
+    monkeypatch.delenv("REPLICA_DIRECTORY", raising=False)
+    result = _run("main.py", "replicate", database=database, check=False)
+    assert result.returncode == 1
+
+    monkeypatch.setenv("REPLICA_DIRECTORY", str(tmp_path / "replicas"))
+    result = _run("main.py", "replicate", database=database)
+    assert json.loads(result.stdout)["generation"] == 1
+    result = _run("main.py", "replicate", database=database)
+    assert json.loads(result.stdout)["generation"] == 2
+    assert sorted(os.listdir(tmp_path / "replicas")) == [
+        "replica-000001.db",
+        "replica-000002.db",
+    ]
+
+
+def test_reports_are_cached_across_commands(tmp_path, monkeypatch):
+    database = tmp_path / "cli.db"
+    _run("main.py", "demo", database=database)
+    monkeypatch.setenv("REPORT_CACHE_FILE", str(tmp_path / "reports.json"))
+
+    report = ("main.py", "report", "shortfalls", "--as-of", "2024-01-01")
+    first = _run(*report, database=database)
+    assert "Saved 1 report results" in first.stderr
+    second = _run(*report, database=database)
+    assert "Loaded 1 of 1 report results" in second.stderr
+    assert "Saved" not in second.stderr
+    assert json.loads(second.stdout) == json.loads(first.stdout)
+
+    availability = {
+        "individual_id": 1,
+        "start_date": "2024-01-01",
+        "end_date": "2024-01-31",
+        "hours_per_week": 10,
+    }
+    _run(
+        "main.py",
+        "load",
+        "Availability",
+        "-",
+        database=database,
+        input=json.dumps([availability]),
+    )
+    third = _run(*report, database=database)
+    assert "Loaded 0 of 1" in third.stderr
+    assert "Saved 1 report results" in third.stderr
+
+
+def test_include_archive_needs_an_archive(tmp_path, monkeypatch):
+    database = tmp_path / "cli.db"
+    _run("main.py", "init", database=database)
+    monkeypatch.delenv("ARCHIVE_DATABASE", raising=False)
+
+    for report in ("feasibility", "skill-gaps"):
+        result = _run(
+            "main.py",
+            "report",
+            report,
+            "--include-archive",
+            database=database,
+            check=False,
+        )
+        assert result.returncode == 1
+
+    monkeypatch.setenv("ARCHIVE_DATABASE", str(tmp_path / "archive.db"))
+    _run("main.py", "archive", "--cutoff", "2024-01-01", database=database)
+    result = _run(
+        "main.py", "report", "feasibility", "--include-archive", database=database
+    )
+    assert json.loads(result.stdout) == {"infeasible": [], "understaffed": []}
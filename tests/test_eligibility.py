@@ -0,0 +1,169 @@
+from datetime import date
+
+import pytest
+
+from src.eligibility import (
+    eligible_individuals,
+    enable_eligibility_maintenance,
+    rebuild_eligibility,
+    verify_eligibility,
+)
+from src.models import (
+    Availability,
+    Individual,
+    IndividualRole,
+    IndividualSkill,
+    ProjectRequirement,
+    RequirementEligibility,
+    Role,
+    RoleRequirement,
+    Skill,
+    SkillRequirement,
+)
+
+
+@pytest.fixture
+def indexed_session(hooked_session):
+    """Fixture to provide a session with eligibility maintenance enabled."""
+    return hooked_session(enable_eligibility_maintenance)
+
+
+@pytest.fixture
+def staffing(indexed_session):
+    """Fixture to provide two individuals and a requirement needing Python >= 4."""
+    python = Skill(name="Python")
+    sql = Skill(name="SQL")
+    alice = Individual(
+        name="Alice",
+        email="alice@example.com",
+        employment_type="Full-time",
+        hire_date=date(2020, 1, 1),
+    )
+    bob = Individual(
+        name="Bob",
+        email="bob@example.com",
+        employment_type="Contract",
+        hire_date=date(2021, 1, 1),
+    )
+    requirement = ProjectRequirement(
+        project_id=1,
+        description="Backend work",
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 3, 31),
+    )
+    indexed_session.add_all([python, sql, alice, bob, requirement])
+    indexed_session.flush()
+
+    indexed_session.add_all(
+        [
+            IndividualSkill(individual=alice, skill=python, proficiency_level=5),
+            IndividualSkill(individual=bob, skill=python, proficiency_level=3),
+            Availability(
+                individual=alice,
+                start_date=date(2024, 1, 1),
+                end_date=date(2024, 12, 31),
+                hours_per_week=40,
+            ),
+            Availability(
+                individual=bob,
+                start_date=date(2024, 1, 1),
+                end_date=date(2024, 12, 31),
+                hours_per_week=40,
+            ),
+            SkillRequirement(
+                requirement_id=requirement.id,
+                skill_id=python.id,
+                minimum_proficiency=4,
+            ),
+        ]
+    )
+    indexed_session.commit()
+    return {
+        "python": python,
+        "sql": sql,
+        "alice": alice,
+        "bob": bob,
+        "requirement": requirement,
+    }
+
+
+def _eligible_ids(session, requirement):
+    return [row.individual_id for row in eligible_individuals(session, requirement.id)]
+
+
+def test_index_tracks_initial_data(indexed_session, staffing):
+    rows = eligible_individuals(indexed_session, staffing["requirement"].id)
+    assert [row.individual_id for row in rows] == [staffing["alice"].id]
+    assert rows[0].score == 1.0
+    assert verify_eligibility(indexed_session) == []
+
+
+def test_proficiency_change_updates_index(indexed_session, staffing):
+    bob_python = staffing["bob"].skills[0]
+    bob_python.proficiency_level = 6
+    indexed_session.commit()
+
+    assert _eligible_ids(indexed_session, staffing["requirement"]) == [
+        staffing["bob"].id,
+        staffing["alice"].id,
+    ]
+    assert verify_eligibility(indexed_session) == []
+
+
+def test_new_skill_requirement_narrows_candidates(indexed_session, staffing):
+    indexed_session.add(
+        IndividualSkill(
+            individual=staffing["bob"], skill=staffing["sql"], proficiency_level=4
+        )
+    )
+    indexed_session.add(
+        SkillRequirement(
+            requirement_id=staffing["requirement"].id,
+            skill_id=staffing["sql"].id,
+            minimum_proficiency=2,
+        )
+    )
+    indexed_session.commit()
+
+    assert _eligible_ids(indexed_session, staffing["requirement"]) == []
+    assert verify_eligibility(indexed_session) == []
+
+
+def test_role_requirement_and_availability(indexed_session, staffing):
+    role = Role(name="Developer", role_level_id=1, role_type_id=1)
+    indexed_session.add(role)
+    indexed_session.flush()
+    indexed_session.add(
+        RoleRequirement(
+            requirement_id=staffing["requirement"].id, role_id=role.id, number_needed=1
+        )
+    )
+    indexed_session.commit()
+    assert _eligible_ids(indexed_session, staffing["requirement"]) == []
+
+    indexed_session.add(
+        IndividualRole(
+            individual=staffing["alice"], role=role, start_date=date(2020, 1, 1)
+        )
+    )
+    indexed_session.commit()
+    assert _eligible_ids(indexed_session, staffing["requirement"]) == [
+        staffing["alice"].id
+    ]
+
+    availability = staffing["alice"].availabilities[0]
+    availability.start_date = date(2025, 1, 1)
+    availability.end_date = date(2025, 12, 31)
+    indexed_session.commit()
+    assert _eligible_ids(indexed_session, staffing["requirement"]) == []
+    assert verify_eligibility(indexed_session) == []
+
+
+def test_rebuild_repairs_index(indexed_session, staffing):
+    indexed_session.query(RequirementEligibility).delete()
+    indexed_session.commit()
+    assert len(verify_eligibility(indexed_session)) == 1
+
+    assert rebuild_eligibility(indexed_session) == 1
+    indexed_session.commit()
+    assert verify_eligibility(indexed_session) == []
@@ -0,0 +1,234 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, func, insert, inspect, select
+from sqlalchemy.exc import StatementError
+from sqlalchemy.orm import Session
+
+from src import migrate_enums as migrate_enums_module
+from src.enums import AssignmentStatus, EmploymentType, ProjectStatus
+from src.migrate_enums import migrate_enums
+from src.models import Assignment, Individual, Project
+from src.models.base import BaseModel
+from src.search import create_search_index, search
+from src.validation import ValidationError
+
+
+def test_coded_columns_round_trip(db_session):
+    individual = Individual(
+        name="Ada",
+        email="ada@example.com",
+        employment_type="Part-time",
+        hire_date=date(2020, 1, 1),
+    )
+    db_session.add(individual)
+    db_session.commit()
+    db_session.expire_all()
+
+    assert individual.employment_type is EmploymentType.PART_TIME
+    assert individual.employment_type == "Part-time"
+    assert f"{individual.employment_type}" == "Part-time"
+    assert (
+        db_session.scalar(
+            select(Individual.id).where(Individual.employment_type == "Part-time")
+        )
+        == individual.id
+    )
+    stored = db_session.connection().exec_driver_sql(
+        "SELECT employment_type FROM individuals"
+    )
+    assert stored.scalar() == 2
+
+
+def test_unknown_values_are_rejected(db_session):
+    with pytest.raises(ValidationError):
+        Individual(name="Ada", email="ada@example.com", employment_type="Intern")
+
+    with pytest.raises(ValidationError, match="Invalid project status"):
+        Project(name="Website", status="Paused")
+
+    # Core statements bypass the validators; the column type still refuses
+    stmt = insert(Project).values(
+        client_id=1,
+        name="Website",
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 6, 30),
+        status="Paused",
+    )
+    with pytest.raises(StatementError, match="Invalid ProjectStatus 'Paused'"):
+        db_session.execute(stmt)
+
+
+# The tables with coded columns as the first release created them, before
+# the columns were coded and assignments gained version_id
+LEGACY_DDL = (
+    """
+    CREATE TABLE individuals (
+        name VARCHAR(100) NOT NULL,
+        email VARCHAR(100) NOT NULL,
+        employment_type VARCHAR(100) NOT NULL,
+        hire_date DATE NOT NULL,
+        id INTEGER NOT NULL,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME,
+        PRIMARY KEY (id)
+    )
+    """,
+    "CREATE INDEX ix_individuals_employment_type ON individuals (employment_type)",
+    "CREATE UNIQUE INDEX ix_individuals_email ON individuals (email)",
+    """
+    CREATE TABLE projects (
+        client_id INTEGER NOT NULL,
+        name VARCHAR(100) NOT NULL,
+        description TEXT,
+        start_date DATE NOT NULL,
+        end_date DATE NOT NULL,
+        status VARCHAR(100) NOT NULL,
+        id INTEGER NOT NULL,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(client_id) REFERENCES clients (id)
+    )
+    """,
+    """
+    CREATE TABLE assignments (
+        individual_id INTEGER NOT NULL,
+        requirement_id INTEGER NOT NULL,
+        start_date DATE NOT NULL,
+        end_date DATE NOT NULL,
+        status VARCHAR(20) NOT NULL,
+        id INTEGER NOT NULL,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(individual_id) REFERENCES individuals (id),
+        FOREIGN KEY(requirement_id) REFERENCES project_requirements (id)
+    )
+    """,
+    "CREATE INDEX ix_assignments_individual_id ON assignments (individual_id)",
+    "CREATE INDEX ix_assignments_requirement_id ON assignments (requirement_id)",
+)
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    """Fixture to provide a database with string statuses and employment types."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        for statement in LEGACY_DDL:
+            conn.exec_driver_sql(statement)
+    # As after upgrading: the newer tables exist, the legacy ones are kept
+    BaseModel.metadata.create_all(engine)
+    create_search_index(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO individuals (id, name, email, employment_type, hire_date, "
+            "created_at) VALUES (1, 'Ada', 'Ada@example.com', 'Contract', "
+            "'2020-01-01', '2024-01-01'), (2, 'Bo', 'Bo@example.com', 'Full-time', "
+            "'2020-01-01', '2024-01-01')"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO projects (id, client_id, name, start_date, end_date, "
+            "status, created_at) VALUES (1, 1, 'Website Redesign', '2024-01-01', "
+            "'2024-06-30', 'In Progress', '2024-01-01')"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO assignments (individual_id, requirement_id, start_date, "
+            "end_date, status, created_at) VALUES "
+            + ", ".join(
+                f"(1, 1, '2024-01-01', '2024-06-30', '{status}', '2024-01-01')"
+                for status in ("Assigned", "Cancelled", "Assigned")
+            )
+        )
+    yield engine
+    engine.dispose()
+
+
+def test_migration_converts_legacy_strings(legacy_engine):
+    assert migrate_enums(legacy_engine) == {
+        "individuals": 2,
+        "projects": 1,
+        "assignments": 3,
+    }
+
+    with Session(legacy_engine) as db:
+        assert db.scalars(
+            select(Individual.name).where(Individual.employment_type == "Contract")
+        ).all() == ["Ada"]
+        assert db.get(Project, 1).status is ProjectStatus.IN_PROGRESS
+        assert db.scalars(select(Assignment.status).order_by(Assignment.id)).all() == [
+            AssignmentStatus.ASSIGNED,
+            AssignmentStatus.CANCELLED,
+            AssignmentStatus.ASSIGNED,
+        ]
+        assert db.scalars(select(Assignment.version_id)).all() == [1, 1, 1]
+        assert [(hit.kind, hit.id) for hit in search(db, "redesign")] == [
+            ("project", 1)
+        ]
+        db.add(
+            Project(
+                client_id=1,
+                name="Intranet Redesign",
+                start_date=date(2024, 1, 1),
+                end_date=date(2024, 3, 31),
+                status="Planned",
+            )
+        )
+        db.commit()
+        assert len(search(db, "redesign")) == 2
+
+    indexes = {
+        index["name"] for index in inspect(legacy_engine).get_indexes("assignments")
+    }
+    assert "ix_assignments_status" in indexes
+    assert migrate_enums(legacy_engine) == {}
+
+
+def test_migration_refuses_unknown_values(legacy_engine):
+    with legacy_engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE projects SET status = 'On Hold'")
+
+    with pytest.raises(ValueError, match="'On Hold'"):
+        migrate_enums(legacy_engine)
+
+    with legacy_engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT status FROM projects").scalar() == "On Hold"
+        assert conn.execute(select(func.count()).select_from(Individual)).scalar() == 2
+
+
+def test_failed_migration_changes_nothing(legacy_engine, monkeypatch):
+    rebuild = migrate_enums_module._rebuild
+
+    def fail_on_assignments(connection, table, column):
+        if table.name == "assignments":
+            raise RuntimeError("disk full")
+        return rebuild(connection, table, column)
+
+    monkeypatch.setattr(migrate_enums_module, "_rebuild", fail_on_assignments)
+    with pytest.raises(RuntimeError):
+        migrate_enums(legacy_engine)
+
+    with legacy_engine.connect() as conn:
+        declared = {
+            row[1]: row[2]
+            for table in ("individuals", "projects")
+            for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")
+        }
+        assert (declared["employment_type"], declared["status"]) == (
+            "VARCHAR(100)",
+            "VARCHAR(100)",
+        )
+        assert (
+            conn.exec_driver_sql(
+                "SELECT count(*) FROM sqlite_master WHERE name LIKE '%_new'"
+            ).scalar()
+            == 0
+        )
+
+    monkeypatch.undo()
+    assert migrate_enums(legacy_engine) == {
+        "individuals": 2,
+        "projects": 1,
+        "assignments": 3,
+    }
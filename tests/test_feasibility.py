@@ -0,0 +1,159 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.feasibility import (
+    business_calendar,
+    check_feasibility,
+    disjoint_periods,
+    working_days,
+)
+from src.models import Assignment, Availability, ProjectRequirement, TimeRequirement
+
+# Monday 2024-01-01 to Friday 2024-01-12 is ten weekdays
+START, END = date(2024, 1, 1), date(2024, 1, 12)
+
+
+def _requirement(db, total_hours, hours_per_week=40):
+    requirement = ProjectRequirement(
+        project_id=1, description="Work", start_date=START, end_date=END
+    )
+    db.add(requirement)
+    db.flush()
+    db.add(
+        TimeRequirement(
+            requirement_id=requirement.id,
+            hours_per_week=hours_per_week,
+            total_hours=total_hours,
+        )
+    )
+    return requirement
+
+
+def _assign(db, requirement, individual_id, hours_per_week, status="Assigned"):
+    db.add_all(
+        [
+            Availability(
+                individual_id=individual_id,
+                start_date=START,
+                end_date=END,
+                hours_per_week=hours_per_week,
+            ),
+            Assignment(
+                individual_id=individual_id,
+                requirement_id=requirement.id,
+                start_date=START,
+                end_date=END,
+                status=status,
+            ),
+        ]
+    )
+
+
+def _dates(*days):
+    return np.array(days, dtype="datetime64[D]")
+
+
+def test_working_days_respects_holidays_and_unknown__dates():
+    calendar = business_calendar(["2024-01-01"], "1111100")
+    start = np.array(["2024-01-01", "2024-01-06", "NaT"], dtype="datetime64[D]")
+    end = np.array(["2024-01-12", "2024-01-07", "2024-01-12"], dtype="datetime64[D]")
+
+    assert working_days(start, end, calendar).tolist() == [9, 0, 0]
+    assert working_days(end[:1], start[:1], calendar).tolist() == [0]
+
+
+def test_calendar_needs_working_days():
+    with pytest.raises(ValueError, match="no working days"):
+        business_calendar([], "0000000")
+
+
+def test_disjoint_periods_take_the_lowest_overlapping_rate():
+    keys, start, end, rates = disjoint_periods(
+        np.array([0, 0, 1, 1]),
+        _dates("2024-01-01", "2024-01-03", "2024-01-01", "2024-01-01"),
+        _dates("2024-01-05", "2024-01-04", "2024-01-02", "NaT"),
+        np.array([40.0, 10.0, 20.0, 30.0]),
+    )
+
+    assert keys.tolist() == [0, 0, 0, 1]
+    assert (
+        start.tolist()
+        == _dates("2024-01-01", "2024-01-03", "2024-01-05", "2024-01-01").tolist()
+    )
+    assert (
+        end.tolist()
+        == _dates("2024-01-02", "2024-01-04", "2024-01-05", "2024-01-02").tolist()
+    )
+    assert rates.tolist() == [40, 10, 40, 20]
+
+
+def test_requirement_must_fit_its_working_days(db_session):
+    fits = _requirement(db_session, total_hours=80)
+    too_long = _requirement(db_session, total_hours=81)
+    db_session.commit()
+
+    report = check_feasibility(db_session, business_calendar([], "1111100"))
+
+    assert report.requirement_ids.tolist() == [fits.id, too_long.id]
+    assert report.working_days.tolist() == [10, 10]
+    assert report.infeasible() == [too_long.id]
+
+    holiday = check_feasibility(
+        db_session, business_calendar(["2024-01-01"], "1111100")
+    )
+    assert holiday.infeasible() == [fits.id, too_long.id]
+
+
+def test_assignees_capped_and_cancelled_ignored(db_session):
+    staffed = _requirement(db_session, total_hours=60, hours_per_week=30)
+    understaffed = _requirement(db_session, total_hours=60, hours_per_week=30)
+    _assign(db_session, staffed, 1, 40)
+    _assign(db_session, understaffed, 2, 20)
+    _assign(db_session, understaffed, 3, 40, status="Cancelled")
+    db_session.commit()
+
+    report = check_feasibility(db_session, business_calendar([], "1111100"))
+
+    assert report.assigned_hours.tolist() == [60, 40]
+    assert report.infeasible() == []
+    assert report.understaffed() == [understaffed.id]
+
+
+def test_restricted_to_requirement_ids(db_session):
+    first = _requirement(db_session, total_hours=10)
+    second = _requirement(db_session, total_hours=10)
+    _assign(db_session, first, 1, 40)
+    _assign(db_session, second, 2, 40)
+    db_session.commit()
+
+    report = check_feasibility(
+        db_session, business_calendar([], "1111100"), requirement_ids=[second.id]
+    )
+
+    assert report.requirement_ids.tolist() == [second.id]
+    assert report.assigned_hours.tolist() == [pytest.approx(80)]
+    assert check_feasibility(db_session, requirement_ids=[]).requirement_ids.size == 0
+
+
+def test_overlapping_availability_counts_once(db_session):
+    requirement = _requirement(db_session, total_hours=60, hours_per_week=40)
+    _assign(db_session, requirement, 1, 20)
+    # A second, overlapping availability row and a duplicate assignment
+    _assign(db_session, requirement, 1, 30)
+    db_session.add(
+        Availability(
+            individual_id=1,
+            start_date=date(2024, 1, 8),
+            end_date=END,
+            hours_per_week=10,
+        )
+    )
+    db_session.commit()
+
+    report = check_feasibility(db_session, business_calendar([], "1111100"))
+
+    # 20 hours in the first week and 10 in the second, when all three overlap
+    assert report.assigned_hours.tolist() == [pytest.approx(30)]
+    assert report.understaffed() == [requirement.id]
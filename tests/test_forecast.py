@@ -0,0 +1,132 @@
+from datetime import date
+
+import pytest
+
+from src.forecast import ROLE, SKILL, cached_forecast, forecast
+from src.models import (
+    Availability,
+    IndividualRole,
+    IndividualSkill,
+    ProjectRequirement,
+    RoleRequirement,
+    Skill,
+    SkillRequirement,
+    TimeRequirement,
+)
+from src.report_cache import ReportCache, enable_version_tracking
+
+MONDAY = date(2024, 1, 1)
+
+
+@pytest.fixture
+def tracked_session(hooked_session):
+    """Fixture to provide a session with table version tracking enabled."""
+    return hooked_session(enable_version_tracking)
+
+
+def _requirement(db, start, end, hours_per_week):
+    requirement = ProjectRequirement(
+        project_id=1, description="Work", start_date=start, end_date=end
+    )
+    db.add(requirement)
+    db.flush()
+    db.add(
+        TimeRequirement(
+            requirement_id=requirement.id,
+            hours_per_week=hours_per_week,
+            total_hours=100,
+        )
+    )
+    return requirement
+
+
+@pytest.fixture
+def planned(tracked_session):
+    """Fixture to provide demand for roles 1 and 2 and skills 5 and 6 in January 2024."""
+    db = tracked_session
+    # Two full weeks at 2 x 20 hours
+    first = _requirement(db, MONDAY, date(2024, 1, 14), 20)
+    # Ends on the Wednesday of the third week
+    second = _requirement(db, date(2023, 12, 1), date(2024, 1, 17), 14)
+    third = _requirement(db, date(2024, 1, 22), date(2024, 1, 28), 7)
+    db.add_all(
+        [
+            RoleRequirement(requirement_id=first.id, role_id=1, number_needed=2),
+            RoleRequirement(requirement_id=second.id, role_id=2, number_needed=1),
+            SkillRequirement(
+                requirement_id=first.id, skill_id=5, minimum_proficiency=1
+            ),
+            SkillRequirement(
+                requirement_id=third.id, skill_id=6, minimum_proficiency=1
+            ),
+            # Role 1 from the third week, skill 5 throughout
+            IndividualRole(individual_id=1, role_id=1, start_date=date(2024, 1, 15)),
+            IndividualSkill(individual_id=1, skill_id=5, proficiency_level=3),
+            Availability(
+                individual_id=1,
+                start_date=date(2023, 6, 1),
+                end_date=date(2024, 12, 31),
+                hours_per_week=35,
+            ),
+        ]
+    )
+    db.commit()
+    return db
+
+
+def test_role_forecast_prorates_partial_weeks(planned):
+    result = forecast(planned, ROLE, date(2024, 1, 3), weeks=4)
+
+    assert result.weeks[0] == MONDAY
+    assert result.keys.tolist() == [1, 2]
+    assert result.demand.tolist() == [
+        pytest.approx([40, 40, 0, 0]),
+        pytest.approx([14, 14, 6, 0]),
+    ]
+    assert result.supply.tolist() == [
+        pytest.approx([0, 0, 35, 35]),
+        pytest.approx([0, 0, 0, 0]),
+    ]
+    assert [(key, week) for key, week, _ in result.shortfalls()] == [
+        (1, date(2024, 1, 1)),
+        (1, date(2024, 1, 8)),
+        (2, date(2024, 1, 1)),
+        (2, date(2024, 1, 8)),
+        (2, date(2024, 1, 15)),
+    ]
+
+
+def test_skill_forecast_uses_requirement_headcount(planned):
+    result = forecast(planned, SKILL, MONDAY, weeks=4)
+
+    assert result.keys.tolist() == [5, 6]
+    assert result.demand.tolist() == [
+        pytest.approx([40, 40, 0, 0]),
+        pytest.approx([0, 0, 0, 7]),
+    ]
+    assert result.supply[0].tolist() == pytest.approx([35, 35, 35, 35])
+
+
+def test_invalid_forecast_arguments(tracked_session):
+    with pytest.raises(ValueError):
+        forecast(tracked_session, "team")
+    with pytest.raises(ValueError):
+        forecast(tracked_session, weeks=0)
+
+
+def test_cache_kept_until_source_tables_change(planned):
+    cache = ReportCache()
+    first = cached_forecast(cache, planned, ROLE, MONDAY, weeks=4)
+
+    planned.add(Skill(name="Unrelated"))
+    planned.commit()
+    assert cached_forecast(cache, planned, ROLE, MONDAY, weeks=4) is first
+
+    availability = planned.query(Availability).one()
+    availability.hours_per_week = 40
+    planned.commit()
+    refreshed = cached_forecast(cache, planned, ROLE, MONDAY, weeks=4)
+
+    assert refreshed is not first
+    assert refreshed.supply[0].tolist() == pytest.approx([0, 0, 40, 40])
+    assert len(cache) == 1
@@ -0,0 +1,141 @@
+from datetime import date
+
+import pytest
+
+from src.change_log import read_changes
+from src.housekeeping import (
+    close_expired_assignments,
+    nightly_housekeeping,
+    reschedule_requirement,
+)
+from src.models import Assignment, Client, Project, ProjectRequirement
+
+
+@pytest.fixture
+def project(capture_session):
+    """Fixture to provide a project with one requirement and four assignments."""
+    client = Client(name="Test Client", contact_information="test@example.com")
+    project = Project(
+        client=client,
+        name="Test Project",
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 3, 31),
+        status="Active",
+    )
+    requirement = ProjectRequirement(
+        project=project,
+        description="Backend developer",
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 3, 31),
+    )
+    requirement.assignments = [
+        Assignment(
+            individual_id=individual_id,
+            start_date=date(2024, 1, 1),
+            end_date=end_date,
+            status=status,
+        )
+        for individual_id, end_date, status in [
+            (1, date(2024, 1, 31), "Assigned"),
+            (2, date(2024, 2, 29), "Assigned"),
+            (3, date(2024, 1, 31), "Cancelled"),
+            (4, date(2024, 3, 31), "Assigned"),
+        ]
+    ]
+    capture_session.add(project)
+    capture_session.commit()
+    return project
+
+
+def test_close_expired_assignments(capture_session, project):
+    assignments = project.requirements[0].assignments
+    before = {a.id: a.updated_at for a in assignments}
+
+    assert close_expired_assignments(capture_session, date(2024, 3, 1)) == 2
+    capture_session.commit()
+
+    assert [a.status for a in assignments] == [
+        "Completed",
+        "Completed",
+        "Cancelled",
+        "Assigned",
+    ]
+    assert assignments[0].updated_at > before[assignments[0].id]
+    assert assignments[3].updated_at == before[assignments[3].id]
+
+    changes = read_changes(capture_session, tables=["assignments"])
+    updates = [c for c in changes if c.operation == "update"]
+    assert sorted(c.row_id for c in updates) == [assignments[0].id, assignments[1].id]
+    assert updates[0].changed_columns == ["status", "version_id", "updated_at"]
+
+    # Running again finds nothing left to close
+    assert close_expired_assignments(capture_session, date(2024, 3, 1)) == 0
+
+
+def test_reschedule_requirement_shifts_assignments(capture_session, project):
+    requirement = project.requirements[0]
+
+    moved = reschedule_requirement(
+        capture_session, requirement, date(2024, 1, 15), date(2024, 3, 31)
+    )
+    capture_session.commit()
+
+    assert moved == 4
+    assert [(a.start_date, a.end_date) for a in requirement.assignments] == [
+        (date(2024, 1, 15), date(2024, 2, 14)),
+        (date(2024, 1, 15), date(2024, 3, 14)),
+        (date(2024, 1, 15), date(2024, 2, 14)),
+        # Clamped to the new end of the requirement
+        (date(2024, 1, 15), date(2024, 3, 31)),
+    ]
+    assert requirement.start_date == date(2024, 1, 15)
+
+    with pytest.raises(ValueError):
+        reschedule_requirement(
+            capture_session, requirement, date(2024, 3, 1), date(2024, 2, 1)
+        )
+
+
+def test_reschedule_requirement_keeps_assignments_inside_it(capture_session, project):
+    requirement = project.requirements[0]
+    late = requirement.assignments[3]
+    late.start_date = date(2024, 3, 1)
+    capture_session.commit()
+
+    # Shifted by 45 days, the late assignment would start after the new end
+    reschedule_requirement(
+        capture_session, requirement, date(2024, 2, 15), date(2024, 2, 20)
+    )
+    capture_session.commit()
+    assert (late.start_date, late.end_date) == (date(2024, 2, 20), date(2024, 2, 20))
+    assert all(
+        date(2024, 2, 15) <= a.start_date <= a.end_date <= date(2024, 2, 20)
+        for a in requirement.assignments
+    )
+
+    # A new requirement without dates has nothing to shift from; dates are clamped
+    pending = ProjectRequirement(project=project, description="Tester")
+    pending.assignments = [
+        Assignment(
+            individual_id=5,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 31),
+            status="Assigned",
+        )
+    ]
+    capture_session.add(pending)
+    reschedule_requirement(
+        capture_session, pending, date(2024, 1, 15), date(2024, 3, 31)
+    )
+    capture_session.commit()
+    assert (pending.assignments[0].start_date, pending.assignments[0].end_date) == (
+        date(2024, 1, 15),
+        date(2024, 1, 31),
+    )
+
+
+def test_nightly_housekeeping_counts(capture_session, project):
+    counts = nightly_housekeeping(capture_session, date(2024, 6, 1))
+
+    assert counts == {"assignments_closed": 3, "projects_completed": 1}
+    assert project.status == "Completed"
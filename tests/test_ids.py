@@ -0,0 +1,80 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from src.ids import IdAllocator, reserve_ids
+from src.models import Client, Project, ProjectRequirement, SkillRequirement
+
+
+def test_blocks_start_above_existing_rows(db_session):
+    db_session.add(Client(name="Existing", contact_information="a@example.com"))
+    db_session.commit()
+
+    assert reserve_ids(db_session, Client, 10) == range(2, 12)
+    assert reserve_ids(db_session, Client, 5) == range(12, 17)
+    with pytest.raises(ValueError):
+        reserve_ids(db_session, Client, 0)
+
+
+def test_allocator_reserves_new_blocks(db_session):
+    ids = IdAllocator(db_session, block_size=3)
+    assert [ids.next_id(Client) for _ in range(5)] == [1, 2, 3, 4, 5]
+    assert ids.next_id(Project) == 1
+
+    client = ids.assign(Client(id=42, name="Kept", contact_information="x"))
+    assert client.id == 42
+
+
+def test_graph_is_written_in_one_flush(db_session):
+    flushes = []
+    event.listen(db_session, "after_flush", lambda session, ctx: flushes.append(1))
+
+    ids = IdAllocator(db_session)
+    client = ids.assign(Client(name="Test Client", contact_information="c"))
+    project = ids.assign(
+        Project(
+            client_id=client.id,
+            name="Template",
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 12, 31),
+            status="Planned",
+        )
+    )
+    requirements = [
+        ids.assign(
+            ProjectRequirement(
+                project_id=project.id,
+                description=f"Requirement {i}",
+                start_date=date(2024, 1, 1),
+                end_date=date(2024, 6, 30),
+            )
+        )
+        for i in range(20)
+    ]
+    db_session.add_all([client, project, *requirements])
+    db_session.add_all(
+        SkillRequirement(requirement_id=r.id, skill_id=1, minimum_proficiency=3)
+        for r in requirements
+    )
+    db_session.commit()
+
+    assert flushes == [1]
+    assert [r.id for r in project.requirements] == [r.id for r in requirements]
+
+
+def test_unused_ids_are_not_reused_after_the_transaction(db_session):
+    ids = IdAllocator(db_session, block_size=10)
+    db_session.add(ids.assign(Client(name="Allocated", contact_information="a")))
+    db_session.commit()
+
+    # Autoincrement takes the next id of the old block once it is released
+    later = Client(name="Autoincrement", contact_information="b")
+    db_session.add(later)
+    db_session.commit()
+    assert later.id == 2
+
+    client = ids.assign(Client(name="Allocated again", contact_information="c"))
+    db_session.add(client)
+    db_session.commit()
+    assert client.id == 11
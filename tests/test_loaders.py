@@ -0,0 +1,151 @@
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from src.loaders import BatchLoader, _relationship
+from src.models import (
+    Assignment,
+    Client,
+    Individual,
+    IndividualSkill,
+    Project,
+    ProjectRequirement,
+    Skill,
+)
+from src.models.base import BaseModel
+
+
+@pytest.fixture
+def statements(db_session):
+    """Fixture to count the statements a test executes."""
+    executed = []
+    engine = db_session.get_bind()
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    yield executed
+    event.remove(engine, "before_cursor_execute", count)
+
+
+@pytest.fixture
+def staffed_projects(db_session):
+    """Fixture to provide three projects with two staffed requirements each."""
+    client = Client(name="NHS", contact_information="contact@nhs.co.uk")
+    skills = [Skill(name=name) for name in ("Python", "SQL", "Design")]
+    skills[1].parent = skills[0]
+    people = [
+        Individual(
+            name=f"Person {i}",
+            email=f"person{i}@example.com",
+            employment_type="Full-time",
+            hire_date=date(2020, 1, 1),
+        )
+        for i in range(4)
+    ]
+    db_session.add_all([client, *skills, *people])
+    db_session.flush()
+    db_session.add_all(
+        IndividualSkill(individual=person, skill=skill, proficiency_level=3)
+        for i, person in enumerate(people)
+        for skill in skills[: i % 3 + 1]
+    )
+    projects = []
+    for p in range(3):
+        project = Project(
+            client=client,
+            name=f"Project {p}",
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 12, 31),
+            status="Active",
+        )
+        for r in range(2):
+            requirement = ProjectRequirement(
+                project=project,
+                description=f"Requirement {r}",
+                start_date=date(2024, 1, 1),
+                end_date=date(2024, 12, 31),
+            )
+            db_session.add(
+                Assignment(
+                    individual=people[(p + r) % 4],
+                    requirement=requirement,
+                    start_date=date(2024, 1, 1),
+                    end_date=date(2024, 12, 31),
+                    status="Assigned",
+                )
+            )
+        projects.append(project)
+    db_session.commit()
+    db_session.expire_all()
+    return projects
+
+
+def test_prime_loads_one_query_per_level(db_session, staffed_projects, statements):
+    projects = db_session.query(Project).order_by(Project.id).all()
+    loader = BatchLoader(db_session)
+    statements.clear()
+
+    loader.prime(projects, "requirements.assignments.individual")
+
+    assert len(statements) == loader.queries == 3
+    names = [
+        [a.individual.name for r in p.requirements for a in r.assignments]
+        for p in projects
+    ]
+    assert names == [
+        ["Person 0", "Person 1"],
+        ["Person 1", "Person 2"],
+        ["Person 2", "Person 3"],
+    ]
+    assert len(statements) == 3
+
+    loader.load_many(projects, "requirements")
+    loader.prime(projects[0].requirements, "assignments")
+    assert len(statements) == 3
+
+
+def test_many_to_one_and_missing_values(db_session, staffed_projects):
+    skills = db_session.query(Skill).order_by(Skill.name).all()
+    loader = BatchLoader(db_session)
+
+    parents = loader.load_many(skills, "parent")
+    children = loader.load_many(skills, "children")
+
+    assert [skill.name for skill in skills] == ["Design", "Python", "SQL"]
+    assert parents == [None, None, skills[1]]
+    assert [[child.name for child in c] for c in children] == [[], ["SQL"], []]
+    assert loader.queries == 2
+    with pytest.raises(ValueError):
+        loader.load_many(skills, "nonexistent")
+
+
+def test_async_loads_are_batched_per_tick(db_session, staffed_projects, statements):
+    people = db_session.query(Individual).order_by(Individual.id).all()
+    loader = BatchLoader(db_session)
+    statements.clear()
+
+    async def skill_names(person):
+        links = await loader.load(person, "skills")
+        skills = await asyncio.gather(*(loader.load(link, "skill") for link in links))
+        return sorted(skill.name for skill in skills)
+
+    async def resolve():
+        return await asyncio.gather(*(skill_names(person) for person in people))
+
+    assert asyncio.run(resolve()) == [
+        ["Python"],
+        ["Python", "SQL"],
+        ["Design", "Python", "SQL"],
+        ["Python"],
+    ]
+    assert len(statements) == loader.queries == 2
+
+
+def test_every_model_relationship_is_supported():
+    for mapper in BaseModel.registry.mappers:
+        for relationship in mapper.relationships:
+            assert _relationship(mapper.class_, relationship.key) is relationship
@@ -0,0 +1,135 @@
+import urllib.request
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from src.metrics import (
+    CHECKOUT_SECONDS,
+    COMMIT_SECONDS,
+    QUERY_SECONDS,
+    ROWS_LOADED,
+    SESSION_SECONDS,
+    CallbackMetric,
+    MetricsRegistry,
+    enable_metrics,
+    fingerprint,
+    registry,
+    track_cache,
+)
+from src.models import Skill
+from src.models.base import BaseModel
+from src.report_cache import ReportCache
+
+
+def test_render_prometheus_text_format():
+    metrics = MetricsRegistry()
+    requests = metrics.counter("requests_total", "Requests served.", ("path",))
+    latency = metrics.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    metrics.register(CallbackMetric("queue_depth", "Queued jobs.", lambda: [((), 3)]))
+    requests.inc('/a"b')
+    requests.inc('/a"b', amount=2)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+
+    assert metrics.counter("requests_total", "Requests served.", ("path",)) is requests
+    with pytest.raises(ValueError):
+        metrics.histogram("requests_total", "Not a histogram.")
+    assert metrics.render() == (
+        "# HELP latency_seconds Latency.\n"
+        "# TYPE latency_seconds histogram\n"
+        'latency_seconds_bucket{le="0.1"} 2\n'
+        'latency_seconds_bucket{le="1"} 3\n'
+        'latency_seconds_bucket{le="+Inf"} 4\n'
+        "latency_seconds_sum 3.65\n"
+        "latency_seconds_count 4\n"
+        "# HELP queue_depth Queued jobs.\n"
+        "# TYPE queue_depth gauge\n"
+        "queue_depth 3\n"
+        "# HELP requests_total Requests served.\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{path="/a\\"b"} 3\n'
+    )
+
+
+def test_fingerprints_ignore_literals_and_list_lengths():
+    assert fingerprint("SELECT * FROM t WHERE id IN (?, ?)") == fingerprint(
+        "SELECT *\n  FROM t WHERE id IN (?, ?, ?, ?)"
+    )
+    assert fingerprint("INSERT INTO t (a) VALUES (?), (?), (?)") == fingerprint(
+        "INSERT INTO t (a) VALUES (?)"
+    )
+    assert fingerprint("SELECT * FROM t WHERE name = 'x' LIMIT 10") == fingerprint(
+        "SELECT * FROM t WHERE name = 'y' LIMIT 20"
+    )
+    assert fingerprint("SELECT a FROM t") != fingerprint("SELECT b FROM t")
+
+
+def test_engine_and_session_events_feed_the_registry(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'metrics.db'}")
+    BaseModel.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    enable_metrics(engine, Session)
+    enable_metrics(engine, Session)
+    before = (
+        CHECKOUT_SECONDS.count(),
+        SESSION_SECONDS.count(),
+        COMMIT_SECONDS.count(),
+        ROWS_LOADED.value("Skill"),
+    )
+
+    with Session() as db:
+        db.add_all([Skill(name=f"Skill {i}") for i in range(3)])
+        db.commit()
+    with Session() as db:
+        for ids in ([1], [1, 2], [1, 2, 3]):
+            db.scalars(select(Skill).where(Skill.id.in_(ids))).all()
+            db.expunge_all()
+        statement = str(
+            select(Skill).where(Skill.id.in_([1, 2])).compile(engine)
+        ).replace("__[POSTCOMPILE_id_1]", "?, ?")
+
+    assert (
+        CHECKOUT_SECONDS.count() - before[0],
+        SESSION_SECONDS.count() - before[1],
+        COMMIT_SECONDS.count() - before[2],
+        ROWS_LOADED.value("Skill") - before[3],
+    ) == (2, 2, 1, 6)
+    assert QUERY_SECONDS.count(fingerprint(statement)) == 3
+    rendered = registry.render()
+    assert (
+        f'db_query_statement_info{{fingerprint="{fingerprint(statement)}"' in rendered
+    )
+    assert 'db_pool_connections{state="idle"}' in rendered
+
+    engine.dispose()
+    with engine.connect() as conn:
+        conn.exec_driver_sql("SELECT 1")
+    assert CHECKOUT_SECONDS.count() - before[0] == 3
+
+
+def test_export_to_file_and_http(tmp_path):
+    cache = ReportCache()
+    cache.get_or_compute("report", ("skills",), lambda: 1)
+    cache.get_or_compute("report", ("skills",), lambda: 1)
+    track_cache("reports", cache)
+    path = tmp_path / "resource_allocation.prom"
+
+    registry.write(str(path))
+    server = registry.serve(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/metrics"
+        with urllib.request.urlopen(url) as response:
+            served = response.read().decode()
+            content_type = response.headers["Content-Type"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    written = path.read_text()
+    for text in (written, served):
+        assert 'cache_requests_total{cache="reports",result="hit"} 1' in text
+        assert 'cache_hit_ratio{cache="reports"} 0.5' in text
+        assert "# TYPE db_query_seconds histogram" in text
+    assert content_type.startswith("text/plain; version=0.0.4")
+    assert not list(tmp_path.glob("*.tmp"))
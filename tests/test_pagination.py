@@ -0,0 +1,101 @@
+from datetime import date, timedelta
+
+import pytest
+
+from src.models import Assignment, Individual
+from src.pagination import iterate, paginate
+
+
+@pytest.fixture
+def individuals(db_session):
+    """Fixture to provide 25 individuals with repeating hire dates."""
+    people = [
+        Individual(
+            name=f"Person {i:02d}",
+            email=f"person{i}@example.com",
+            employment_type="Contract" if i % 3 == 0 else "Full-time",
+            hire_date=date(2020, 1, 1) + timedelta(days=i % 5),
+        )
+        for i in range(25)
+    ]
+    db_session.add_all(people)
+    db_session.commit()
+    return people
+
+
+def _walk(db_session, model, **options):
+    pages, cursor = [], None
+    while True:
+        page = paginate(db_session, model, cursor=cursor, **options)
+        pages.append([item.id for item in page.items])
+        if page.next_cursor is None:
+            return pages
+        cursor = page.next_cursor
+
+
+def test_pages_cover_listing_once_in_order(db_session, individuals):
+    pages = _walk(db_session, Individual, sort_key="hire_date", limit=7)
+
+    assert [len(page) for page in pages] == [7, 7, 7, 4]
+    expected = [p.id for p in sorted(individuals, key=lambda p: (p.hire_date, p.id))]
+    assert [i for page in pages for i in page] == expected
+
+
+def test_descending_pages(db_session, individuals):
+    pages = _walk(
+        db_session, Individual, sort_key="hire_date", descending=True, limit=10
+    )
+    expected = [
+        p.id
+        for p in sorted(individuals, key=lambda p: (p.hire_date, p.id), reverse=True)
+    ]
+    assert [i for page in pages for i in page] == expected
+
+
+def test_filters_and_date_range(db_session, individuals):
+    contractors = list(iterate(db_session, Individual, employment_type="Contract"))
+    assert {p.employment_type for p in contractors} == {"Contract"}
+    assert len(contractors) == 9
+
+    hired = list(
+        iterate(
+            db_session,
+            Individual,
+            date_from=date(2020, 1, 2),
+            date_to=date(2020, 1, 3),
+        )
+    )
+    assert {p.hire_date for p in hired} == {date(2020, 1, 2), date(2020, 1, 3)}
+
+
+def test_assignment_listing_by_status(db_session):
+    db_session.add_all(
+        [
+            Assignment(
+                individual_id=1,
+                requirement_id=1,
+                start_date=date(2024, 1, day),
+                end_date=date(2024, 2, 1),
+                status="Assigned" if day % 2 else "Completed",
+            )
+            for day in range(1, 11)
+        ]
+    )
+    db_session.commit()
+
+    page = paginate(db_session, Assignment, sort_key="start_date", status="Completed")
+    assert [a.start_date.day for a in page.items] == [2, 4, 6, 8, 10]
+    assert page.next_cursor is None
+
+
+def test_invalid_requests_are_rejected(db_session, individuals):
+    with pytest.raises(ValueError):
+        paginate(db_session, Individual, sort_key="created_at")
+    with pytest.raises(ValueError):
+        paginate(db_session, Individual, status="Active")
+    with pytest.raises(ValueError):
+        paginate(db_session, Individual, cursor="not-a-cursor")
+
+    cursor = paginate(db_session, Individual, limit=5).next_cursor
+    with pytest.raises(ValueError):
+        paginate(db_session, Individual, sort_key="name", cursor=cursor)
@@ -0,0 +1,59 @@
+import pstats
+import tracemalloc
+
+import pytest
+
+from src.profiling import Profiler
+
+
+def _work():
+    return [str(i) * 10 for i in range(20_000)]
+
+
+def test_phases_are_profiled_and_saved(tmp_path):
+    profiler = Profiler(str(tmp_path / "profiles"))
+    kept = []
+
+    with profiler.phase("build"):
+        kept.append(_work())
+    with profiler.phase("discard"):
+        _work()
+    profiler.close()
+
+    build, discard = profiler.phases
+    assert [build.name, discard.name] == ["build", "discard"]
+    assert build.stats_path.endswith("01_build.prof")
+    assert discard.snapshot_path.endswith("02_discard.snapshot")
+    assert build.seconds > 0
+    assert build.allocated > 1_000_000 > discard.allocated
+    assert discard.peak > 1_000_000
+    assert "test_profiling.py" in build.top[0]
+    functions = {name for _, _, name in pstats.Stats(build.stats_path).stats}
+    assert "_work" in functions
+    assert tracemalloc.Snapshot.load(discard.snapshot_path).traces
+    assert not tracemalloc.is_tracing()
+
+
+def test_disabled_profiler_does_nothing(tmp_path):
+    profiler = Profiler()
+
+    with profiler.phase("build"):
+        with profiler.phase("nested"):
+            _work()
+    profiler.close()
+
+    assert not profiler.enabled
+    assert profiler.phases == []
+    assert not tracemalloc.is_tracing()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_phases_do_not_nest(tmp_path):
+    profiler = Profiler(str(tmp_path))
+
+    with profiler.phase("outer"):
+        with pytest.raises(ValueError):
+            profiler.phase("inner")
+    profiler.close()
+
+    assert [phase.name for phase in profiler.phases] == ["outer"]
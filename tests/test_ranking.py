@@ -0,0 +1,144 @@
+from datetime import date
+
+import pytest
+
+from src.eligibility import rebuild_eligibility
+from src.models import (
+    Assignment,
+    Availability,
+    Individual,
+    IndividualRole,
+    IndividualSkill,
+    ProjectRequirement,
+    Role,
+    RoleLevel,
+    RoleType,
+    Skill,
+    SkillRequirement,
+    TimeRequirement,
+)
+from src.ranking import RankingWeights, score_candidates, top_candidates
+
+
+@pytest.fixture
+def candidates(db_session):
+    """Fixture to provide three candidates for a requirement needing Python >= 4."""
+    python = Skill(name="Python")
+    senior = RoleLevel(name="Senior", seniority=3)
+    developer = Role(
+        name="Senior Developer", role_level=senior, role_type=RoleType(name="Dev")
+    )
+    people = {
+        name: Individual(
+            name=name,
+            email=f"{name.lower()}@example.com",
+            employment_type="Full-time",
+            hire_date=date(2020, 1, 1),
+        )
+        for name in ("Alice", "Bob", "Carol")
+    }
+    requirement = ProjectRequirement(
+        project_id=1,
+        description="Backend work",
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 3, 31),
+    )
+    other = ProjectRequirement(
+        project_id=1,
+        description="Frontend work",
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 6, 30),
+    )
+    db_session.add_all([python, developer, requirement, other, *people.values()])
+    db_session.flush()
+
+    for person, level in zip(people.values(), (5, 6, 4)):
+        db_session.add_all(
+            [
+                IndividualSkill(
+                    individual=person, skill=python, proficiency_level=level
+                ),
+                Availability(
+                    individual=person,
+                    start_date=date(2024, 1, 1),
+                    end_date=date(2024, 12, 31),
+                    hours_per_week=40,
+                ),
+            ]
+        )
+    db_session.add_all(
+        [
+            SkillRequirement(
+                requirement_id=requirement.id, skill_id=python.id, minimum_proficiency=4
+            ),
+            TimeRequirement(
+                requirement_id=other.id, hours_per_week=20, total_hours=500
+            ),
+            IndividualRole(
+                individual=people["Alice"], role=developer, start_date=date(2023, 1, 1)
+            ),
+            Assignment(
+                individual=people["Bob"],
+                requirement=other,
+                start_date=date(2024, 1, 1),
+                end_date=date(2024, 6, 30),
+                status="Assigned",
+            ),
+        ]
+    )
+    db_session.commit()
+    rebuild_eligibility(db_session)
+    return people, requirement
+
+
+def test_features(db_session, candidates):
+    people, requirement = candidates
+    scored = {c.individual_id: c for c in score_candidates(db_session, requirement.id)}
+
+    alice, bob, carol = (scored[people[name].id] for name in ("Alice", "Bob", "Carol"))
+    assert (alice.surplus, alice.seniority, alice.free_capacity) == (1, 3, 1.0)
+    assert (bob.surplus, bob.free_capacity, bob.continuity) == (2, 0.5, 1)
+    assert (carol.surplus, carol.seniority, carol.continuity) == (0, 0, 0)
+    assert alice.score == pytest.approx(1 + 0.5 * 3 + 2.0)
+
+
+def test_top_candidates_follow_weights(db_session, candidates):
+    people, requirement = candidates
+    names = {person.id: name for name, person in people.items()}
+
+    ranked = top_candidates(db_session, requirement.id, k=2)
+    assert [names[c.individual_id] for c in ranked] == ["Alice", "Bob"]
+
+    by_surplus = RankingWeights(surplus=1.0, seniority=0, free_capacity=0, continuity=0)
+    ranked = top_candidates(db_session, requirement.id, k=3, weights=by_surplus)
+    assert [names[c.individual_id] for c in ranked] == ["Bob", "Alice", "Carol"]
+
+
+def test_top_candidates_rejects_bad_input(db_session, candidates):
+    _, requirement = candidates
+    with pytest.raises(ValueError):
+        top_candidates(db_session, requirement.id, k=0)
+    with pytest.raises(ValueError):
+        top_candidates(db_session, 999)
+
+
+@pytest.mark.parametrize(
+    "weights",
+    [RankingWeights(), RankingWeights(surplus=0), RankingWeights(0.1, 2.0, 5.0, 3.0)],
+)
+def test_pruned_ranking_matches_full_sort(db_session, candidates, weights):
+    _, requirement = candidates
+    for k in (1, 2, 3):
+        everyone = sorted(
+            score_candidates(db_session, requirement.id, weights),
+            key=lambda c: (-c.score, c.individual_id),
+        )
+        assert top_candidates(db_session, requirement.id, k, weights) == everyone[:k]
+
+
+def test_negative_weights_are_rejected(db_session, candidates):
+    _, requirement = candidates
+    with pytest.raises(ValueError, match="continuity"):
+        top_candidates(
+            db_session, requirement.id, weights=RankingWeights(continuity=-1)
+        )
@@ -0,0 +1,195 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from functools import partial
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from src.change_log import enable_change_capture
+from src.models import Client
+from src.models.base import BaseModel
+from src.replicas import ReplicaManager
+
+
+@pytest.fixture
+def primary(tmp_path):
+    """Fixture to provide a file based primary with change capture."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    BaseModel.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    enable_change_capture(Session)
+    yield engine, Session
+    engine.dispose()
+
+
+def _add_clients(Session, count, prefix="Client"):
+    with Session() as db:
+        db.add_all(
+            Client(name=f"{prefix} {i}", contact_information="c") for i in range(count)
+        )
+        db.commit()
+
+
+def _count(db):
+    return db.scalar(select(func.count(Client.id)))
+
+
+def test_replica_is_a_read_only_snapshot(primary, tmp_path):
+    engine, Session = primary
+    _add_clients(Session, 5)
+    replicas = ReplicaManager(engine, str(tmp_path / "replicas"), pages_per_step=2)
+
+    snapshot = replicas.refresh()
+    _add_clients(Session, 3, "Later")
+
+    with replicas.read_session() as db:
+        assert _count(db) == 5
+        db.add(Client(name="Not allowed", contact_information="c"))
+        with pytest.raises(OperationalError):
+            db.commit()
+
+    status = replicas.status()
+    assert status["generation"] == snapshot.generation == 1
+    assert status["lag_changes"] == 3
+    assert status["pages"] > 0 and status["pages_per_second"] > 0
+    replicas.stop()
+
+
+def test_old_generations_are_removed(primary, tmp_path):
+    engine, Session = primary
+    replicas = ReplicaManager(engine, str(tmp_path / "replicas"), keep=2)
+
+    paths = [replicas.refresh().path for _ in range(3)]
+
+    assert [os.path.exists(path) for path in paths] == [False, True, True]
+    assert replicas.latest().path == paths[-1]
+    replicas.stop()
+
+
+def test_stale_replica_falls_back_to_primary(primary, tmp_path):
+    engine, Session = primary
+    replicas = ReplicaManager(engine, str(tmp_path / "replicas"))
+
+    with replicas.read_session() as db:
+        assert db.get_bind() is engine
+
+    replicas.refresh()
+    _add_clients(Session, 2)
+    with replicas.read_session(max_lag=0) as db:
+        assert _count(db) == 2
+    with replicas.read_session() as db:
+        assert _count(db) == 0
+    replicas.stop()
+
+
+def test_writers_proceed_during_refresh(primary, tmp_path):
+    engine, Session = primary
+    _add_clients(Session, 2000)
+    replicas = ReplicaManager(
+        engine, str(tmp_path / "replicas"), pages_per_step=1, step_sleep=0.001
+    )
+    replicas.start(interval=0.01)
+
+    writes = threading.Thread(target=_add_clients, args=(Session, 10, "During"))
+    writes.start()
+    writes.join(timeout=5)
+    replicas.stop()
+
+    assert not writes.is_alive()
+    with Session() as db:
+        assert _count(db) == 2010
+
+
+def test_existing_generations_are_found(primary, tmp_path):
+    engine, Session = primary
+    _add_clients(Session, 4)
+    first = ReplicaManager(engine, str(tmp_path / "replicas"))
+    snapshot = first.refresh()
+    first.stop()
+
+    replicas = ReplicaManager(engine, str(tmp_path / "replicas"))
+
+    assert replicas.latest().path == snapshot.path
+    assert replicas.latest().seq == snapshot.seq
+    with replicas.read_session() as db:
+        assert db.get_bind() is not engine
+        assert _count(db) == 4
+    assert replicas.refresh().generation == snapshot.generation + 1
+    replicas.stop()
+
+
+def test_refresh_gives_up_when_writes_keep_restarting_it(primary, tmp_path):
+    engine, Session = primary
+    _add_clients(Session, 2000)
+    replicas = ReplicaManager(
+        engine,
+        str(tmp_path / "replicas"),
+        pages_per_step=1,
+        step_sleep=0.01,
+        max_restarts=0,
+    )
+    writing, done = threading.Event(), threading.Event()
+
+    def write():
+        while not done.is_set():
+            _add_clients(Session, 1, "During")
+            writing.set()
+
+    writes = threading.Thread(target=write)
+    writes.start()
+    writing.wait(timeout=5)
+    try:
+        with pytest.raises(RuntimeError):
+            replicas.refresh()
+    finally:
+        done.set()
+        writes.join()
+    replicas.stop()
+
+    assert replicas.latest() is None
+    assert os.listdir(tmp_path / "replicas") == []
+
+
+def test_refresh_waits_out_a_write_lock_without_restarting(
+    primary, tmp_path, monkeypatch
+):
+    engine, Session = primary
+    # Without a busy timeout, steps that find the primary locked report it
+    monkeypatch.setattr(
+        "src.replicas.sqlite3.connect", partial(sqlite3.connect, timeout=0)
+    )
+    _add_clients(Session, 2000)
+    replicas = ReplicaManager(
+        engine,
+        str(tmp_path / "replicas"),
+        pages_per_step=1,
+        step_sleep=0.05,
+        max_restarts=0,
+    )
+    locked = threading.Event()
+
+    def hold_lock():
+        with closing(sqlite3.connect(engine.url.database, timeout=5)) as writer:
+            time.sleep(0.2)
+            writer.execute("BEGIN EXCLUSIVE")
+            locked.set()
+            time.sleep(0.6)
+            writer.rollback()
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    try:
+        snapshot = replicas.refresh()
+    finally:
+        holder.join()
+    replicas.stop()
+
+    assert locked.is_set()
+    with replicas.read_session() as db:
+        assert _count(db) == 2000
+    assert snapshot.generation == 1
@@ -0,0 +1,155 @@
+from datetime import date
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from src.change_log import enable_change_capture
+from src.forecast import Forecast
+from src.models import Skill
+from src.models.base import BaseModel
+from src.report_cache import ReportCache, TableVersions, enable_version_tracking
+from src.skill_gaps import SkillGap
+
+MONDAY = date(2024, 1, 1)
+
+
+@pytest.fixture
+def Session(tmp_path):
+    """Fixture to provide a sessionmaker with version tracking and change capture."""
+    # A file database, so uncommitted writes are not visible to other sessions
+    engine = create_engine(f"sqlite:///{tmp_path / 'reports.db'}")
+    BaseModel.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    enable_version_tracking(Session)
+    enable_change_capture(Session)
+    yield Session
+    BaseModel.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def _skill_count(Session):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        with Session() as db:
+            return db.query(Skill).count()
+
+    return calls, compute
+
+
+def test_result_kept_until_a_source_table_is_written(Session):
+    cache = ReportCache()
+    calls, compute = _skill_count(Session)
+
+    assert cache.get_or_compute("skills", ["skills"], compute) == 0
+    assert cache.get_or_compute("skills", ["skills"], compute) == 0
+    assert (len(calls), cache.hits, cache.misses) == (1, 1, 1)
+
+    with Session() as db:
+        db.add(Skill(name="Python"))
+        db.commit()
+    assert cache.get_or_compute("skills", ["skills"], compute) == 1
+
+    with Session() as db:
+        db.execute(update(Skill).values(name="Python 3"))
+        db.commit()
+    cache.get_or_compute("skills", ["skills"], compute)
+    assert len(calls) == 3
+
+
+def test_flushed_but_uncommitted_writes_invalidate_again_on_commit(Session):
+    cache = ReportCache()
+    calls, compute = _skill_count(Session)
+
+    with Session() as writer:
+        writer.add(Skill(name="Python"))
+        writer.flush()
+        # Computed from another session, before the write is committed
+        assert cache.get_or_compute("skills", ["skills"], compute) == 0
+        writer.commit()
+
+    assert cache.get_or_compute("skills", ["skills"], compute) == 1
+    assert len(calls) == 2
+
+
+def test_parameters_and_lru_eviction():
+    versions = TableVersions()
+    cache = ReportCache(max_entries=2, versions=versions)
+
+    for week in (1, 2, 1, 3):
+        cache.get_or_compute("fill", ["projects"], lambda: week, week=week)
+
+    assert len(cache) == 2
+    assert cache.get_or_compute("fill", ["projects"], lambda: "new", week=1) == 1
+    assert cache.get_or_compute("fill", ["projects"], lambda: "new", week=2) == "new"
+
+    versions.bump("projects")
+    assert cache.get_or_compute("fill", ["projects"], lambda: "bumped", week=1) == (
+        "bumped"
+    )
+    assert cache.invalidate("fill") == 2
+    with pytest.raises(ValueError):
+        ReportCache(max_entries=0)
+
+
+def test_saved_results_load_only_if_unchanged(Session, tmp_path):
+    path = str(tmp_path / "reports.json")
+    cache = ReportCache(path=path)
+    with Session() as db:
+        cache.get_or_compute("a", ["skills"], lambda: "skills report", db)
+        cache.get_or_compute("b", ["projects"], lambda: "projects report", db)
+    # Not stamped with a change log position, so never saved
+    cache.get_or_compute("c", ["projects"], lambda: "unstamped")
+    assert cache.save() == 2
+
+    with Session() as db:
+        db.add(Skill(name="Python"))
+        db.commit()
+
+        restarted = ReportCache(path=path)
+        assert restarted.load(db) == 1
+        assert ReportCache().load(db, str(tmp_path / "missing.json")) == 0
+    assert restarted.get_or_compute("b", ["projects"], lambda: "new") == (
+        "projects report"
+    )
+    assert restarted.hits == 1
+
+
+def test_saved_results_keep_their_types(Session, tmp_path):
+    path = str(tmp_path / "reports.json")
+    forecast = Forecast(
+        dimension="role",
+        weeks=np.array(["2024-01-01", "2024-01-08"], dtype="datetime64[D]"),
+        keys=np.array([3], dtype=np.int64),
+        demand=np.array([[1.5, 0.0]]),
+        supply=np.empty((0, 2)),
+    )
+    gaps = [SkillGap(1, 2, "2024-01", 1, 2, 0)]
+    cache = ReportCache(path=path)
+    with Session() as db:
+        cache.get_or_compute("forecast", ["skills"], lambda: forecast, db, start=MONDAY)
+        cache.get_or_compute("gaps", ["skills"], lambda: gaps, db, as_of=MONDAY)
+        cache.get_or_compute("raw", ["skills"], lambda: object(), db)
+    assert cache.save() == 2
+
+    restarted = ReportCache(path=path)
+    with Session() as db:
+        assert restarted.load(db) == 2
+    loaded = restarted.get_or_compute("forecast", ["skills"], None, start=MONDAY)
+    assert isinstance(loaded, Forecast)
+    for field in ("weeks", "keys", "demand", "supply"):
+        np.testing.assert_array_equal(getattr(loaded, field), getattr(forecast, field))
+        assert getattr(loaded, field).dtype == getattr(forecast, field).dtype
+    assert restarted.get_or_compute("gaps", ["skills"], None, as_of=MONDAY) == gaps
+
+
+def test_unreadable_cache_file_loads_nothing(Session, tmp_path):
+    path = tmp_path / "reports.json"
+    path.write_bytes(b"\x80\x05not json")
+    with Session() as db:
+        assert ReportCache(path=str(path)).load(db) == 0
+        path.write_text('{"version": 1, "entries": [{"key": {"$type": "os"}}]}')
+        assert ReportCache(path=str(path)).load(db) == 0
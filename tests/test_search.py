@@ -0,0 +1,90 @@
+from datetime import date
+
+import pytest
+
+from src.models import Client, Individual, Project, Skill
+from src.search import (
+    create_search_index,
+    drop_search_index,
+    match_expression,
+    rebuild_search_index,
+    search,
+)
+
+
+@pytest.fixture
+def search_session(db_session):
+    """Fixture to provide a session on a database with the search index."""
+    create_search_index(db_session)
+    db_session.add_all(
+        [
+            Skill(name="Python", description="Python programming language"),
+            Skill(name="Project Management", description="Planning and delivery"),
+            Individual(
+                name="Ada Python",
+                email="ada@example.com",
+                employment_type="Full-time",
+                hire_date=date(2020, 1, 1),
+            ),
+        ]
+    )
+    client = Client(name="NHS", contact_information="contact@nhs.co.uk")
+    db_session.add(client)
+    db_session.flush()
+    db_session.add(
+        Project(
+            client_id=client.id,
+            name="Website Redesign",
+            description="Rewrite the backend in Python",
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 6, 30),
+            status="Planning",
+        )
+    )
+    db_session.commit()
+    yield db_session
+    drop_search_index(db_session)
+
+
+def test_match_expression_quotes_user_input():
+    assert match_expression('pyth" OR x') == '"pyth"* "OR"* "x"*'
+    assert match_expression("  ") is None
+
+
+def test_search_ranks_name_matches_first(search_session):
+    results = search(search_session, "python")
+
+    assert {(r.kind, r.title) for r in results} == {
+        ("skill", "Python"),
+        ("individual", "Ada Python"),
+        ("project", "Website Redesign"),
+    }
+    assert results[0].kind == "skill"
+    assert [r.rank for r in results] == sorted(r.rank for r in results)
+
+
+def test_search_prefix_and_kind_filter(search_session):
+    results = search(search_session, "manag", kinds=["skill"])
+    assert [r.title for r in results] == ["Project Management"]
+
+    with pytest.raises(ValueError):
+        search(search_session, "python", kinds=["unknown"])
+
+
+def test_triggers_keep_index_in_sync(search_session):
+    skill = search_session.query(Skill).filter_by(name="Python").one()
+    skill.name = "Rust"
+    skill.description = "Systems programming"
+    search_session.commit()
+
+    assert search(search_session, "rust", kinds=["skill"])[0].id == skill.id
+    assert search(search_session, "python", kinds=["skill"]) == []
+
+    search_session.delete(skill)
+    search_session.commit()
+    assert search(search_session, "rust") == []
+
+
+def test_rebuild_search_index(search_session):
+    rebuild_search_index(search_session)
+    assert len(search(search_session, "python")) == 3
@@ -0,0 +1,104 @@
+import json
+from datetime import date
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src import serialization
+from src.models import Client, Individual, Project, ProjectRequirement, Skill
+from src.serialization import dump, dumps, field_plan, load, to_dicts
+
+
+@pytest.fixture
+def projects(db_session):
+    """Fixture to provide two clients, one with two projects."""
+    busy = Client(name="Busy", contact_information="busy@example.com")
+    idle = Client(name="Idle", contact_information="idle@example.com")
+    for name in ("Alpha", "Beta"):
+        busy.projects.append(
+            Project(
+                name=name,
+                start_date=date(2024, 1, 1),
+                end_date=date(2024, 12, 31),
+                status="Active",
+                requirements=[
+                    ProjectRequirement(
+                        description=f"{name} developer",
+                        start_date=date(2024, 1, 1),
+                        end_date=date(2024, 6, 30),
+                    )
+                ],
+            )
+        )
+    db_session.add_all([busy, idle])
+    db_session.commit()
+    return busy, idle
+
+
+def test_dump_selected_fields(db_session, projects):
+    rows = dump(db_session, Client, fields=["name"])
+    assert rows == [{"name": "Busy"}, {"name": "Idle"}]
+
+    rows = dump(db_session, Project, Project.name == "Beta", fields=["id", "end_date"])
+    assert rows == [{"id": 2, "end_date": date(2024, 12, 31)}]
+
+    with pytest.raises(ValueError):
+        dump(db_session, Client, fields=["email"])
+
+
+def test_dump_includes_relationships(db_session, projects):
+    clients = dump(db_session, Client, fields=["name"], include=["projects"])
+    assert [c["name"] for c in clients] == ["Busy", "Idle"]
+    assert [p["name"] for p in clients[0]["projects"]] == ["Alpha", "Beta"]
+    assert clients[1]["projects"] == []
+    # The join column is used but not output
+    assert set(clients[0]) == {"name", "projects"}
+
+    requirements = dump(
+        db_session, ProjectRequirement, fields=["description"], include=["project"]
+    )
+    assert [r["project"]["name"] for r in requirements] == ["Alpha", "Beta"]
+
+
+def test_to_dicts_matches_dump(db_session, projects):
+    loaded = to_dicts(db_session.query(Project).order_by(Project.id))
+    assert loaded == dump(db_session, Project)
+    assert field_plan(Project) is field_plan(Project)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_encodes_dates(db_session, projects, monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(serialization, "orjson", None)
+    data = json.loads(dumps(dump(db_session, Project, fields=["name", "start_date"])))
+    assert data[0] == {"name": "Alpha", "start_date": "2024-01-01"}
+
+
+def test_load_round_trips_dumped_rows(db_session, projects, engine, tables):
+    exported = {
+        model: json.loads(dumps(dump(db_session, model)))
+        for model in (Client, Project, ProjectRequirement)
+    }
+
+    with Session(engine) as other:
+        for model, rows in exported.items():
+            assert load(other, model, rows) == len(rows)
+        other.commit()
+        for model in exported:
+            assert dump(other, model) == dump(db_session, model)
+        with pytest.raises(ValueError):
+            load(other, Client, [{"name": "Acme", "email": "acme@example.com"}])
+
+
+def test_repr_of_fixed_models():
+    client = Client(id=1, name="NHS", contact_information="contact@nhs.co.uk")
+    individual = Individual(id=2, name="Jane", email="jane@example.com")
+    skill = Skill(id=3, name="Python")
+
+    assert repr(client) == (
+        "<Client(id=1, name='NHS', contact_information='contact@nhs.co.uk')>"
+    )
+    assert (
+        repr(individual) == "<Individual(id=2, name='Jane', email='jane@example.com')>"
+    )
+    assert repr(skill) == "<Skill(id=3, name='Python', parent_id=None)>"
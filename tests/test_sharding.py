@@ -0,0 +1,183 @@
+import os
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from src import sharding
+from src.change_log import read_changes
+from src.eligibility import eligible_individuals
+from src.models import (
+    Availability,
+    Client,
+    Individual,
+    IndividualSkill,
+    Project,
+    ProjectRequirement,
+    Skill,
+    SkillRequirement,
+)
+from src.models.base import BaseModel
+from src.sharding import ShardRouter
+
+
+@pytest.fixture
+def main_session(tmp_path):
+    """Fixture to provide a session on a main database with three clients."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'main.db'}")
+    BaseModel.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [Client(name=f"Client {i}", contact_information="c") for i in range(1, 4)]
+        + [
+            Skill(name="Python"),
+            Individual(
+                name="Alice",
+                email="alice@example.com",
+                employment_type="Full-time",
+                hire_date=date(2020, 1, 1),
+            ),
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def router(tmp_path):
+    """Fixture to provide a router with two shared shards and a dedicated one."""
+    router = ShardRouter(str(tmp_path), shard_count=2, dedicated={3: "big_client"})
+    yield router
+    router.dispose()
+
+
+def _project(client_id, name):
+    return Project(
+        client_id=client_id,
+        name=name,
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 12, 31),
+        status="Active",
+        requirements=[
+            ProjectRequirement(
+                description=f"{name} requirement",
+                start_date=date(2024, 1, 1),
+                end_date=date(2024, 6, 30),
+            )
+        ],
+    )
+
+
+def test_clients_are_routed_to_their_shard(router, tmp_path):
+    assert router.shard_for(1) == "shard_01"
+    assert router.shard_for(2) == "shard_00"
+    assert router.shard_for(3) == "big_client"
+    assert router.shard_names == ["shard_00", "shard_01", "big_client"]
+
+    for client_id in (1, 2, 3):
+        with router.get_db(client_id) as db:
+            db.add(_project(client_id, f"Project of {client_id}"))
+            db.commit()
+
+    assert os.path.exists(tmp_path / "big_client.db")
+    with router.session("big_client") as db:
+        assert list(db.scalars(select(Project.name))) == ["Project of 3"]
+
+
+def test_reference_data_is_replicated(router, main_session):
+    router.replicate_reference_data(main_session)
+    # Refreshing again replaces rather than duplicates
+    counts = router.replicate_reference_data(main_session)
+
+    assert counts["clients"] == 3 and counts["individuals"] == 1
+    results = router.fan_out(lambda db: db.scalar(select(func.count(Skill.id))))
+    assert results == {"shard_00": 1, "shard_01": 1, "big_client": 1}
+
+
+def test_fan_out_reads_every_shard(router):
+    for client_id in (1, 2, 3, 4):
+        with router.get_db(client_id) as db:
+            db.add(_project(client_id, f"Project of {client_id}"))
+            db.commit()
+
+    names = router.scalars(select(Project.name))
+    assert sorted(names) == [f"Project of {i}" for i in (1, 2, 3, 4)]
+
+
+def test_migrate_tenant_data(router, main_session):
+    main_session.add_all([_project(1, "One"), _project(2, "Two"), _project(3, "Three")])
+    main_session.commit()
+
+    moved = router.migrate_tenant_data(main_session)
+
+    assert moved == {"shard_01": 2, "shard_00": 2, "big_client": 2}
+    assert main_session.scalar(select(func.count(Project.id))) == 0
+    assert main_session.scalar(select(func.count(ProjectRequirement.id))) == 0
+    deletes = [c for c in read_changes(main_session) if c.operation == "delete"]
+    assert len(deletes) == 6
+    with router.get_db(3) as db:
+        project = db.scalars(select(Project)).one()
+        assert project.name == "Three"
+        assert [r.description for r in project.requirements] == ["Three requirement"]
+
+
+def test_failed_migration_can_be_rerun(router, main_session, monkeypatch):
+    alice = main_session.scalars(select(Individual)).one()
+    python = main_session.scalars(select(Skill)).one()
+    main_session.add_all(
+        [
+            IndividualSkill(individual=alice, skill=python, proficiency_level=4),
+            Availability(
+                individual=alice,
+                start_date=date(2024, 1, 1),
+                end_date=date(2024, 12, 31),
+                hours_per_week=40,
+            ),
+        ]
+    )
+    projects = [_project(1, "One"), _project(2, "Two"), _project(3, "Three")]
+    for project in projects:
+        project.requirements[0].skill_requirements = [
+            SkillRequirement(skill=python, minimum_proficiency=3)
+        ]
+    main_session.add_all(projects)
+    main_session.commit()
+    router.replicate_reference_data(main_session)
+
+    # Fail after the first shard has committed its copy
+    rebuild = sharding.rebuild_eligibility
+    calls = []
+
+    def failing_rebuild(db):
+        calls.append(db)
+        if len(calls) == 2:
+            raise RuntimeError("disk full")
+        return rebuild(db)
+
+    monkeypatch.setattr(sharding, "rebuild_eligibility", failing_rebuild)
+    with pytest.raises(RuntimeError):
+        router.migrate_tenant_data(main_session)
+    main_session.rollback()
+    assert main_session.scalar(select(func.count(Project.id))) == 3
+
+    monkeypatch.setattr(sharding, "rebuild_eligibility", rebuild)
+    assert router.migrate_tenant_data(main_session) == {
+        "shard_01": 3,
+        "shard_00": 3,
+        "big_client": 3,
+    }
+    assert router.scalars(select(func.count(Project.id))) == [1, 1, 1]
+
+    with router.get_db(3) as db:
+        requirement_id = db.scalars(select(ProjectRequirement.id)).one()
+        eligible = eligible_individuals(db, requirement_id)
+        assert [row.individual_id for row in eligible] == [alice.id]
+
+        # Shard writes reach the shard's change log
+        db.scalars(select(Project)).one().name = "Renamed"
+        db.commit()
+        changes = read_changes(db, tables=["projects"])
+        assert [c.operation for c in changes][-1] == "update"
@@ -0,0 +1,140 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.models import (
+    Individual,
+    IndividualSkill,
+    ProjectRequirement,
+    Skill,
+    SkillRequirement,
+)
+from src.similarity import SkillVectorIndex, SkillVectors
+
+
+def _person(name):
+    return Individual(
+        name=name,
+        email=f"{name.lower()}@example.com",
+        employment_type="Full-time",
+        hire_date=date(2020, 1, 1),
+    )
+
+
+@pytest.fixture
+def skilled(capture_session):
+    """Fixture to provide three people and a requirement needing Python and SQL."""
+    db = capture_session
+    python, sql, java = Skill(name="Python"), Skill(name="SQL"), Skill(name="Java")
+    alice, bob, carol = _person("Alice"), _person("Bob"), _person("Carol")
+    requirement = ProjectRequirement(
+        project_id=1,
+        description="Data work",
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 3, 31),
+    )
+    db.add_all([python, sql, java, alice, bob, carol, requirement])
+    db.flush()
+    db.add_all(
+        [
+            IndividualSkill(individual=alice, skill=python, proficiency_level=4),
+            IndividualSkill(individual=alice, skill=sql, proficiency_level=4),
+            IndividualSkill(individual=bob, skill=python, proficiency_level=5),
+            IndividualSkill(individual=carol, skill=java, proficiency_level=5),
+            SkillRequirement(
+                requirement_id=requirement.id, skill_id=python.id, minimum_proficiency=3
+            ),
+            SkillRequirement(
+                requirement_id=requirement.id, skill_id=sql.id, minimum_proficiency=3
+            ),
+        ]
+    )
+    db.commit()
+    skills = {"python": python.id, "sql": sql.id, "java": java.id}
+    people = {"alice": alice, "bob": bob, "carol": carol}
+    return skills, people, requirement
+
+
+def test_substitutes_ranked_by_cosine_similarity(capture_session, skilled):
+    _, people, requirement = skilled
+    index = SkillVectorIndex().build(capture_session)
+
+    matches = index.substitutes([requirement.id])[requirement.id]
+
+    assert [m.id for m in matches] == [people["alice"].id, people["bob"].id]
+    assert matches[0].similarity == pytest.approx(1.0)
+    assert matches[1].similarity == pytest.approx(1 / np.sqrt(2))
+    assert index.similar_requirements(people["bob"].id) == [
+        (requirement.id, pytest.approx(1 / np.sqrt(2)))
+    ]
+
+
+def test_search_excludes_and_ignores_unknown_skills(capture_session, skilled):
+    skills, people, _ = skilled
+    index = SkillVectorIndex().build(capture_session)
+
+    matches = index.search({skills["python"]: 5, 999: 5}, exclude=[people["bob"].id])
+
+    assert [m.id for m in matches] == [people["alice"].id]
+    assert index.search({999: 5}) == []
+
+
+def test_refresh_recomputes_changed_vectors(capture_session, skilled):
+    db = capture_session
+    skills, people, requirement = skilled
+    index = SkillVectorIndex(block_size=2).build(db)
+
+    carol = people["carol"]
+    carol.skills[0].proficiency_level = 1
+    db.add_all(
+        [
+            IndividualSkill(
+                individual=carol, skill_id=skills["python"], proficiency_level=5
+            ),
+            IndividualSkill(
+                individual=carol, skill_id=skills["sql"], proficiency_level=5
+            ),
+        ]
+    )
+    db.delete(people["alice"].skills[1])
+    dave = _person("Dave")
+    db.add(dave)
+    db.flush()
+    db.add(
+        IndividualSkill(individual=dave, skill=Skill(name="Go"), proficiency_level=3)
+    )
+    db.commit()
+
+    assert index.refresh(db) == 3
+    assert index.refresh(db) == 0
+    matches = index.substitutes([requirement.id])[requirement.id]
+    assert matches[0].id == carol.id
+    assert index.search({skills["sql"]: 1}) == [
+        (carol.id, pytest.approx(5 / np.sqrt(51)))
+    ]
+    assert [m.id for m in index.search({dave.skills[0].skill_id: 1})] == [dave.id]
+
+    db.delete(people["bob"].skills[0])
+    db.commit()
+    index.refresh(db)
+    assert people["bob"].id not in index.individuals
+
+
+def test_blocked_top_k_matches_full_sort():
+    rng = np.random.default_rng(7)
+    vectors = SkillVectors()
+    vectors.resize(20)
+    for entity_id in range(1, 3001):
+        columns = rng.choice(20, size=4, replace=False)
+        vectors.set(
+            entity_id, dict(zip(columns.tolist(), rng.integers(1, 6, 4).tolist()))
+        )
+    queries = vectors.matrix[:5, :20]
+
+    blocked = vectors.top_k(queries, 25, block_size=128)
+
+    scores = queries @ vectors.matrix[:3000, :20].T
+    for query, matches in zip(scores, blocked):
+        expected = np.sort(query)[::-1][:25]
+        assert [m.similarity for m in matches] == pytest.approx(expected.tolist())
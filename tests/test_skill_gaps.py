@@ -0,0 +1,161 @@
+from datetime import date
+
+import pytest
+
+from src.models import (
+    Assignment,
+    Availability,
+    IndividualSkill,
+    Project,
+    ProjectRequirement,
+    RoleRequirement,
+    SkillRequirement,
+    TimeRequirement,
+)
+from src.report_cache import ReportCache
+from src.skill_gaps import SkillGap, cached_skill_gaps, skill_gaps
+
+TODAY = date(2024, 3, 15)
+PYTHON, SQL = 1, 2
+
+
+def _requirement(db, project, start, end, skill_id, proficiency, needed=None):
+    requirement = ProjectRequirement(
+        project=project, description="Work", start_date=start, end_date=end
+    )
+    db.add(requirement)
+    db.flush()
+    db.add_all(
+        [
+            TimeRequirement(
+                requirement_id=requirement.id, hours_per_week=20, total_hours=100
+            ),
+            SkillRequirement(
+                requirement_id=requirement.id,
+                skill_id=skill_id,
+                minimum_proficiency=proficiency,
+            ),
+        ]
+    )
+    if needed is not None:
+        db.add(
+            RoleRequirement(
+                requirement_id=requirement.id, role_id=1, number_needed=needed
+            )
+        )
+    return requirement
+
+
+def _person(db, individual_id, skills, hours_per_week=40):
+    db.add(
+        Availability(
+            individual_id=individual_id,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 12, 31),
+            hours_per_week=hours_per_week,
+        )
+    )
+    for skill_id, level in skills.items():
+        db.add(
+            IndividualSkill(
+                individual_id=individual_id, skill_id=skill_id, proficiency_level=level
+            )
+        )
+
+
+@pytest.fixture
+def workforce(db_session):
+    """Fixture to provide open Python and SQL requirements and four people."""
+    db = db_session
+    active, closed = (
+        Project(
+            client_id=1,
+            name=status,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 12, 31),
+            status=status,
+        )
+        for status in ("Active", "Completed")
+    )
+    db.add_all([active, closed])
+    db.flush()
+    running = _requirement(
+        db, active, date(2024, 3, 1), date(2024, 4, 30), PYTHON, 3, needed=3
+    )
+    _requirement(db, active, date(2024, 4, 10), date(2024, 6, 30), PYTHON, 3)
+    _requirement(db, active, date(2024, 3, 20), date(2024, 4, 30), PYTHON, 5)
+    _requirement(db, active, date(2024, 3, 20), date(2024, 4, 30), SQL, 2)
+    # Ended, or in a completed project: not open
+    _requirement(db, active, date(2024, 1, 1), date(2024, 2, 29), SQL, 2)
+    _requirement(db, closed, date(2024, 3, 1), date(2024, 6, 30), SQL, 2)
+
+    _person(db, 1, {PYTHON: 5, SQL: 2})
+    _person(db, 2, {PYTHON: 3})
+    # Fully booked by the running requirement
+    _person(db, 3, {PYTHON: 4}, hours_per_week=20)
+    _person(db, 4, {PYTHON: 1})
+    db.add_all(
+        [
+            Assignment(
+                individual_id=3,
+                requirement_id=running.id,
+                start_date=date(2024, 3, 1),
+                end_date=date(2024, 4, 30),
+                status="Assigned",
+            ),
+            Assignment(
+                individual_id=2,
+                requirement_id=running.id,
+                start_date=date(2024, 3, 1),
+                end_date=date(2024, 4, 30),
+                status="Cancelled",
+            ),
+        ]
+    )
+    db.commit()
+    return db
+
+
+def test_skill_gaps_by_proficiency_and_window(workforce):
+    gaps = skill_gaps(workforce, TODAY)
+
+    assert gaps == [
+        # Three needed, one assigned; person 3 is booked, person 4 is too junior
+        SkillGap(PYTHON, 3, "2024-03", requirements=1, demand=2, supply=2),
+        SkillGap(PYTHON, 3, "2024-04", requirements=1, demand=1, supply=2),
+        SkillGap(PYTHON, 5, "2024-03", requirements=1, demand=1, supply=1),
+        SkillGap(SQL, 2, "2024-03", requirements=1, demand=1, supply=1),
+    ]
+    assert [gap.gap for gap in gaps] == [0, 0, 0, 0]
+
+
+def test_filled_requirements_and_booked_people_drop_out(workforce):
+    python_expert, sql = workforce.query(ProjectRequirement).all()[2:4]
+    for requirement in (python_expert, sql):
+        workforce.add(
+            Assignment(
+                individual_id=1,
+                requirement_id=requirement.id,
+                start_date=date(2024, 3, 1),
+                end_date=date(2024, 4, 30),
+                status="Assigned",
+            )
+        )
+    workforce.commit()
+
+    gaps = skill_gaps(workforce, TODAY)
+
+    assert [(gap.window, gap.demand, gap.supply, gap.gap) for gap in gaps] == [
+        ("2024-03", 2, 1, 1),
+        ("2024-04", 1, 1, 0),
+    ]
+    assert skill_gaps(workforce, date(2025, 1, 1)) == []
+
+
+def test_cached_skill_gaps(workforce):
+    cache = ReportCache()
+
+    first = cached_skill_gaps(cache, workforce, TODAY)
+
+    assert cached_skill_gaps(cache, workforce, TODAY) is first
+    assert cache.hits == 1
@@ -0,0 +1,213 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from src.eligibility import (
+    eligible_individuals,
+    enable_eligibility_maintenance,
+    verify_eligibility,
+)
+from src.models import (
+    Availability,
+    Individual,
+    IndividualSkill,
+    ProjectRequirement,
+    Skill,
+    SkillClosure,
+    SkillRequirement,
+    SkillSynonym,
+)
+from src.search import create_search_index, search
+from src.taxonomy import (
+    ancestor_ids,
+    descendant_ids,
+    enable_taxonomy_maintenance,
+    individuals_with_skill,
+    rebuild_closure,
+    resolve_skill,
+)
+
+
+@pytest.fixture
+def taxonomy_session(hooked_session):
+    """Fixture to provide a session with taxonomy and eligibility maintenance."""
+    return hooked_session(enable_taxonomy_maintenance, enable_eligibility_maintenance)
+
+
+@pytest.fixture
+def skills(taxonomy_session):
+    """Fixture to provide Programming > Python > Django and a separate SQL skill."""
+    programming = Skill(name="Programming")
+    python = Skill(name="Python", parent=programming)
+    django = Skill(name="Django", parent=python)
+    sql = Skill(name="SQL")
+    taxonomy_session.add_all([programming, python, django, sql])
+    taxonomy_session.commit()
+    return {"programming": programming, "python": python, "django": django, "sql": sql}
+
+
+def _closure(session):
+    rows = session.execute(
+        select(SkillClosure.ancestor_id, SkillClosure.descendant_id, SkillClosure.depth)
+    )
+    return set(rows)
+
+
+def test_closure_follows_inserts_and_moves(taxonomy_session, skills):
+    programming, python, django, sql = (
+        skills["programming"].id,
+        skills["python"].id,
+        skills["django"].id,
+        skills["sql"].id,
+    )
+    assert descendant_ids(taxonomy_session, programming) == {
+        programming,
+        python,
+        django,
+    }
+    assert ancestor_ids(taxonomy_session, django) == {programming, python, django}
+
+    # Move the Python subtree below SQL
+    skills["python"].parent = skills["sql"]
+    taxonomy_session.commit()
+
+    assert descendant_ids(taxonomy_session, programming) == {programming}
+    assert ancestor_ids(taxonomy_session, django) == {sql, python, django}
+    assert (sql, django, 2) in _closure(taxonomy_session)
+
+
+def test_cache_forgets_rolled_back_moves_and_is_per_engine(
+    hooked_session, taxonomy_session, skills
+):
+    python, django, sql = (skills[name].id for name in ("python", "django", "sql"))
+
+    skills["python"].parent = skills["sql"]
+    taxonomy_session.flush()
+    assert sql in ancestor_ids(taxonomy_session, django)
+    taxonomy_session.rollback()
+    assert sql not in ancestor_ids(taxonomy_session, django)
+
+    # Another database with the same skill ids but a different hierarchy
+    other = hooked_session(enable_taxonomy_maintenance)
+    other.add_all(
+        [Skill(id=skill_id, name=f"Skill {skill_id}") for skill_id in (1, 2, 3, 4)]
+    )
+    other.commit()
+    assert ancestor_ids(other, django) == {django}
+    assert ancestor_ids(taxonomy_session, django) == {
+        python,
+        django,
+        skills["programming"].id,
+    }
+
+
+def test_moving_below_a_descendant_is_rejected(taxonomy_session, skills):
+    skills["programming"].parent = skills["django"]
+    with pytest.raises(ValueError):
+        taxonomy_session.commit()
+
+
+def test_rebuild_closure_matches_maintained_closure(taxonomy_session, skills):
+    skills["django"].parent = skills["programming"]
+    taxonomy_session.commit()
+    maintained = _closure(taxonomy_session)
+
+    assert rebuild_closure(taxonomy_session) == len(maintained)
+    assert _closure(taxonomy_session) == maintained
+
+
+def test_individuals_with_descendant_skill(taxonomy_session, skills):
+    alice = Individual(
+        name="Alice",
+        email="alice@example.com",
+        employment_type="Full-time",
+        hire_date=date(2020, 1, 1),
+    )
+    bob = Individual(
+        name="Bob",
+        email="bob@example.com",
+        employment_type="Full-time",
+        hire_date=date(2020, 1, 1),
+    )
+    taxonomy_session.add_all(
+        [
+            IndividualSkill(
+                individual=alice, skill=skills["django"], proficiency_level=4
+            ),
+            IndividualSkill(
+                individual=bob, skill=skills["python"], proficiency_level=2
+            ),
+        ]
+    )
+    taxonomy_session.commit()
+
+    programming = skills["programming"].id
+    assert individuals_with_skill(taxonomy_session, programming) == [alice.id, bob.id]
+    assert individuals_with_skill(taxonomy_session, programming, 3) == [alice.id]
+    assert individuals_with_skill(taxonomy_session, skills["sql"].id) == []
+
+
+def test_resolve_skill_by_synonym(taxonomy_session, skills):
+    taxonomy_session.add(SkillSynonym(skill=skills["python"], name="py"))
+    taxonomy_session.commit()
+
+    assert resolve_skill(taxonomy_session, "PYTHON") == skills["python"]
+    assert resolve_skill(taxonomy_session, "Py") == skills["python"]
+    assert resolve_skill(taxonomy_session, "cobol") is None
+
+
+def test_search_matches_synonyms(taxonomy_session, skills):
+    create_search_index(taxonomy_session)
+    taxonomy_session.add(SkillSynonym(skill=skills["sql"], name="Structured Query"))
+    taxonomy_session.commit()
+
+    results = search(taxonomy_session, "structured", kinds=["skill"])
+    assert [(r.id, r.title) for r in results] == [(skills["sql"].id, "SQL")]
+
+
+def test_eligibility_accepts_descendant_skills(taxonomy_session, skills):
+    alice = Individual(
+        name="Alice",
+        email="alice@example.com",
+        employment_type="Full-time",
+        hire_date=date(2020, 1, 1),
+    )
+    requirement = ProjectRequirement(
+        project_id=1,
+        description="Any programmer",
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 6, 30),
+    )
+    taxonomy_session.add_all([alice, requirement])
+    taxonomy_session.flush()
+    programming_id = skills["programming"].id
+    taxonomy_session.add_all(
+        [
+            IndividualSkill(
+                individual=alice, skill=skills["django"], proficiency_level=5
+            ),
+            Availability(
+                individual=alice,
+                start_date=date(2024, 1, 1),
+                end_date=date(2024, 12, 31),
+                hours_per_week=40,
+            ),
+            SkillRequirement(
+                requirement_id=requirement.id,
+                skill_id=programming_id,
+                minimum_proficiency=4,
+            ),
+        ]
+    )
+    taxonomy_session.commit()
+    assert [
+        row.individual_id
+        for row in eligible_individuals(taxonomy_session, requirement.id)
+    ] == [alice.id]
+
+    # Moving Python out from under Programming takes Django with it
+    skills["python"].parent = None
+    taxonomy_session.commit()
+    assert eligible_individuals(taxonomy_session, requirement.id) == []
+    assert verify_eligibility(taxonomy_session) == []
@@ -0,0 +1,108 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from src.enums import AssignmentStatus
+from src.models import Assignment, Client, Individual, Project
+from src.validation import (
+    RowError,
+    ValidationError,
+    bulk_insert,
+    check_rows,
+    validate_rows,
+)
+
+
+def _individual(**overrides):
+    row = {
+        "name": "Test Person",
+        "email": "test@example.com",
+        "employment_type": "Full-time",
+        "hire_date": date(2020, 1, 1),
+    }
+    row.update(overrides)
+    return row
+
+
+def test_validate_rows_reports_every_error():
+    rows = [
+        _individual(),
+        _individual(employment_type="Intern"),
+        _individual(hire_date=date.today() + timedelta(days=1)),
+        _individual(name=None, hire_date="2020-01-01"),
+    ]
+
+    assert validate_rows(Individual.__table__, rows) == [
+        RowError(
+            1,
+            "employment_type",
+            "Invalid employment type. Must be one of: Full-time, Part-time, Contract",
+        ),
+        RowError(2, "hire_date", "Hire date cannot be in the future"),
+        RowError(3, "name", "Value is required"),
+        RowError(3, "hire_date", "Must be a date"),
+    ]
+
+
+def test_date_ordering_and_foreign_keys(db_session):
+    client = Client(name="Test Client", contact_information="test@example.com")
+    db_session.add(client)
+    db_session.commit()
+
+    project = {
+        "client_id": client.id,
+        "name": "Test Project",
+        "start_date": date(2024, 1, 1),
+        "end_date": date(2024, 6, 30),
+        "status": "Active",
+    }
+    rows = [
+        project,
+        {**project, "end_date": date(2024, 1, 1)},
+        {**project, "client_id": client.id + 1},
+        {**project, "status": "Paused"},
+    ]
+
+    with pytest.raises(ValidationError) as excinfo:
+        check_rows(Project.__table__, rows, db_session)
+    assert [(e.row, e.field) for e in excinfo.value.errors] == [
+        (1, "end_date"),
+        (2, "client_id"),
+        (3, "status"),
+    ]
+
+    # Foreign keys are only checked with a session
+    assert len(validate_rows(Project.__table__, rows)) == 2
+
+
+def test_bulk_insert_validates_before_inserting(db_session):
+    rows = [_individual(email=f"person{i}@example.com") for i in range(10)]
+
+    assert bulk_insert(db_session, Individual, rows) == 10
+
+    rows = [_individual(email="late@example.com"), _individual(employment_type="")]
+    with pytest.raises(ValidationError):
+        bulk_insert(db_session, Individual, rows)
+    assert db_session.scalar(select(func.count(Individual.id))) == 10
+
+
+def test_orm_validators_use_the_same_rules():
+    with pytest.raises(ValidationError) as excinfo:
+        Individual(employment_type="Intern")
+    assert str(excinfo.value).startswith("Invalid employment type")
+
+    with pytest.raises(ValueError):
+        Project(start_date=date(2024, 1, 1), end_date=date(2023, 12, 31))
+
+
+def test_orm_validators_check_statuses():
+    with pytest.raises(ValidationError, match="Invalid project status"):
+        Project(status="Paused")
+    with pytest.raises(ValidationError, match="Invalid assignment status"):
+        Assignment(status="Lost")
+    with pytest.raises(ValueError, match="Status is required"):
+        Assignment(status=None)
+
+    assignment = Assignment(status="Cancelled")
+    assert assignment.status is AssignmentStatus.CANCELLED
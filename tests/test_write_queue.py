@@ -0,0 +1,89 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from src.models import Client
+from src.models.base import BaseModel
+from src.write_queue import WriteQueue
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Fixture to provide a sessionmaker bound to a file database."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'queue.db'}")
+    BaseModel.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _add_client(name):
+    def operation(db):
+        client = Client(name=name, contact_information=f"{name}@example.com")
+        db.add(client)
+        db.flush()
+        return client.id
+
+    return operation
+
+
+def _count(session_factory):
+    with session_factory() as db:
+        return db.scalar(select(func.count(Client.id)))
+
+
+def test_operations_from_many_threads_are_coalesced(session_factory):
+    with WriteQueue(session_factory, max_latency=0.05) as writes:
+        futures, lock = [], threading.Lock()
+
+        def producer(n):
+            for i in range(10):
+                future = writes.submit(_add_client(f"client-{n}-{i}"))
+                with lock:
+                    futures.append(future)
+
+        threads = [threading.Thread(target=producer, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        ids = [future.result(timeout=5) for future in futures]
+
+    assert len(set(ids)) == 80
+    assert _count(session_factory) == 80
+    assert writes.operations == 80
+    assert writes.batches < 80
+
+
+def test_failing_operation_only_fails_its_future(session_factory):
+    def fail(db):
+        db.add(Client(name="Rolled back", contact_information="x"))
+        db.flush()
+        raise RuntimeError("boom")
+
+    with WriteQueue(session_factory, max_latency=0.05) as writes:
+        first = writes.submit(_add_client("first"))
+        failed = writes.submit(fail)
+        last = writes.submit(_add_client("last"))
+
+        assert first.result(timeout=5) and last.result(timeout=5)
+        with pytest.raises(RuntimeError):
+            failed.result(timeout=5)
+
+    with session_factory() as db:
+        assert list(db.scalars(select(Client.name).order_by(Client.id))) == [
+            "first",
+            "last",
+        ]
+
+
+def test_closed_queue_rejects_operations(session_factory):
+    writes = WriteQueue(session_factory)
+    future = writes.submit(_add_client("queued"))
+    writes.close()
+
+    assert future.done()
+    assert _count(session_factory) == 1
+    with pytest.raises(RuntimeError):
+        writes.submit(_add_client("too late"))